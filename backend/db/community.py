@@ -41,7 +41,8 @@ class CommunityDB:
         pillar: Optional[str] = None,
         role: Optional[str] = None,
         region: Optional[str] = None,
-        verified_only: bool = False
+        verified_only: bool = False,
+        projection: Optional[Dict] = None
     ) -> List[Dict]:
         """Get community professionals with filters"""
         query = {}
@@ -55,7 +56,7 @@ class CommunityDB:
         if verified_only:
             query["is_verified"] = True
         
-        pros = await self.pros.find(query, {"_id": 0}).sort("name", 1).to_list(1000)
+        pros = await self.pros.find(query, projection or {"_id": 0}).sort("name", 1).to_list(1000)
         return pros
     
     # ==================== HEALTH OPERATIONS ====================
@@ -64,7 +65,8 @@ class CommunityDB:
         self,
         category: Optional[str] = None,
         tags: Optional[List[str]] = None,
-        limit: int = 50
+        limit: int = 50,
+        projection: Optional[Dict] = None
     ) -> List[Dict]:
         """Get health resources with optional filters"""
         query = {}
@@ -76,7 +78,7 @@ class CommunityDB:
         
         resources = await self.health_resources.find(
             query,
-            {"_id": 0}
+            projection or {"_id": 0}
         ).sort("created_at", -1).limit(limit).to_list(limit)
         
         return resources
@@ -112,7 +114,8 @@ class CommunityDB:
         accepts_uninsured: Optional[bool] = None,
         sliding_scale: Optional[bool] = None,
         ability_friendly: Optional[bool] = None,
-        limit: int = 50
+        limit: int = 50,
+        projection: Optional[Dict] = None
     ) -> List[Dict]:
         """Get health providers with filters - Phase 11.6.1 enhanced"""
         query = {}
@@ -141,7 +144,7 @@ class CommunityDB:
         
         providers = await self.health_providers.find(
             query,
-            {"_id": 0}
+            projection or {"_id": 0}
         ).sort(sort_order).limit(limit).to_list(limit)
         
         return providers
@@ -164,7 +167,8 @@ class CommunityDB:
         focus: Optional[List[str]] = None,
         delivery: Optional[str] = None,
         chronic_friendly: Optional[List[str]] = None,
-        limit: int = 50
+        limit: int = 50,
+        projection: Optional[Dict] = None
     ) -> List[Dict]:
         """Get fitness programs with filters"""
         query = {}
@@ -180,7 +184,7 @@ class CommunityDB:
         
         programs = await self.fitness_programs.find(
             query,
-            {"_id": 0}
+            projection or {"_id": 0}
         ).sort("created_at", -1).limit(limit).to_list(limit)
         
         return programs
@@ -217,7 +221,8 @@ class CommunityDB:
         region: Optional[str] = None,
         specialization: Optional[str] = None,
         online_only: Optional[bool] = None,
-        limit: int = 50
+        limit: int = 50,
+        projection: Optional[Dict] = None
     ) -> List[Dict]:
         """Get fitness coaches/trainers"""
         query = {"pillar_focus": "fitness", "role": {"$in": ["trainer", "coach"]}}
@@ -231,7 +236,7 @@ class CommunityDB:
         
         coaches = await self.pros.find(
             query,
-            {"_id": 0}
+            projection or {"_id": 0}
         ).sort("name", 1).limit(limit).to_list(limit)
         
         return coaches
@@ -289,7 +294,8 @@ class CommunityDB:
         difficulty: Optional[str] = None,
         tags: Optional[List[str]] = None,
         approved_only: bool = True,
-        limit: int = 50
+        limit: int = 50,
+        projection: Optional[Dict] = None
     ) -> List[Dict]:
         """Get recipes with filters"""
         query = {}
@@ -307,7 +313,7 @@ class CommunityDB:
         
         recipes = await self.recipes.find(
             query,
-            {"_id": 0}
+            projection or {"_id": 0}
         ).sort("created_at", -1).limit(limit).to_list(limit)
         
         return recipes
@@ -363,7 +369,8 @@ class CommunityDB:
         cost_range: Optional[str] = None,
         verified_only: bool = False,
         approved_only: bool = True,  # Phase 11.6.4 - Only show approved by default
-        limit: int = 50
+        limit: int = 50,
+        projection: Optional[Dict] = None
     ) -> List[Dict]:
         """Get school resources with filters"""
         query = {}
@@ -387,7 +394,7 @@ class CommunityDB:
         
         resources = await self.school_resources.find(
             query,
-            {"_id": 0}
+            projection or {"_id": 0}
         ).sort("created_at", -1).limit(limit).to_list(limit)
         
         return resources
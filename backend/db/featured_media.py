@@ -65,6 +65,11 @@ async def set_featured_media(media_id: str) -> bool:
     return result.modified_count > 0
 
 async def delete_featured_media(media_id: str) -> bool:
-    """Delete a featured media item"""
+    """Delete a featured media item (and its CDN image reference)"""
+    from db.news_images import release_image_refs
+    
+    item = await featured_media_collection.find_one({"id": media_id}, {"_id": 0, "thumbnailHash": 1})
     result = await featured_media_collection.delete_one({"id": media_id})
+    if result.deleted_count and item:
+        await release_image_refs([item.get("thumbnailHash")])
     return result.deleted_count > 0
\ No newline at end of file
@@ -5,6 +5,7 @@ Creates necessary indices for fast queries
 
 import logging
 from db.connection import get_db
+from db.rss_pipeline_runs import RSS_RUN_RETENTION_DAYS
 
 logger = logging.getLogger(__name__)
 
@@ -82,6 +83,188 @@ async def ensure_social_feed_indices():
         logger.error(f"Error creating social feed indices: {e}")
 
 
+async def ensure_social_posts_indices():
+    """
+    Ensure indices for the social_posts feed, user timelines and reactions
+    Compound (created_at, id) keys back keyset (cursor) pagination
+    """
+    db = await get_db()
+    collection = db.social_posts
+    
+    try:
+        # Global feed keyset scan: equality on moderation flags, then sort key
+        await collection.create_index([
+            ("is_deleted", 1), ("is_hidden", 1), ("created_at", -1), ("id", -1)
+        ])
+        logger.info("✓ Created index on (is_deleted, is_hidden, created_at, id)")
+        
+        # User timeline keyset scan
+        await collection.create_index([
+            ("author_id", 1), ("is_deleted", 1), ("is_hidden", 1), ("created_at", -1), ("id", -1)
+        ])
+        logger.info("✓ Created index on (author_id, is_deleted, is_hidden, created_at, id)")
+        
+        # Post lookups by public id
+        await collection.create_index([("id", 1)], unique=True)
+        logger.info("✓ Created unique index on id")
+        
+        # Viewer like-state lookups during feed hydration
+        await db.social_reactions.create_index([("user_id", 1), ("post_id", 1)])
+        logger.info("✓ Created index on social_reactions (user_id, post_id)")
+        
+        logger.info("✅ All social_posts indices ensured")
+        
+    except Exception as e:
+        logger.error(f"Error creating social_posts indices: {e}")
+    
+    # Separate step: fails until existing duplicate reactions are removed
+    # (scripts/dedupe_social_reactions.py) without blocking the indices above
+    try:
+        # One reaction per (post, user): makes like/high-five toggles atomic
+        await db.social_reactions.create_index([("post_id", 1), ("user_id", 1)], unique=True)
+        logger.info("✓ Created unique index on social_reactions (post_id, user_id)")
+    except Exception as e:
+        logger.error(f"Error creating unique social_reactions (post_id, user_id) index: {e}")
+
+
+async def ensure_social_timeline_indices():
+    """
+    Ensure indices for fan-out home timelines (social_timelines)
+    and the circle_edges lookups used during fan-out
+    """
+    db = await get_db()
+    
+    try:
+        # Home feed page: single range scan per viewer
+        await db.social_timelines.create_index([
+            ("owner_id", 1), ("created_at", -1), ("post_id", -1)
+        ])
+        logger.info("✓ Created index on social_timelines (owner_id, created_at, post_id)")
+        
+        # One delivery per (owner, post); makes backfills idempotent
+        await db.social_timelines.create_index([("owner_id", 1), ("post_id", 1)], unique=True)
+        logger.info("✓ Created unique index on social_timelines (owner_id, post_id)")
+        
+        # Consistency checker / cleanup by post
+        await db.social_timelines.create_index([("post_id", 1)])
+        logger.info("✓ Created index on social_timelines post_id")
+        
+        await db.social_pull_authors.create_index([("author_id", 1)], unique=True)
+        logger.info("✓ Created unique index on social_pull_authors author_id")
+        
+        # Fan-out audience: who has this author in their circle
+        await db.circle_edges.create_index([("targetUserId", 1), ("tier", 1)])
+        logger.info("✓ Created index on circle_edges (targetUserId, tier)")
+        
+        await db.circle_edges.create_index([("ownerUserId", 1), ("tier", 1)])
+        logger.info("✓ Created index on circle_edges (ownerUserId, tier)")
+        
+        logger.info("✅ All social timeline indices ensured")
+        
+    except Exception as e:
+        logger.error(f"Error creating social timeline indices: {e}")
+
+
+async def ensure_feed_analytics_indices():
+    """
+    Ensure indices for feed shadow-mode analytics
+    """
+    db = await get_db()
+    
+    try:
+        # Daily rollups are upserted by day and range-scanned for stats
+        await db.feed_shadow_daily.create_index([("day", 1)], unique=True)
+        logger.info("✓ Created unique index on feed_shadow_daily day")
+        
+        # Retention cleanup
+        await db.feed_shadow_logs.create_index([("timestamp", 1)])
+        logger.info("✓ Created index on feed_shadow_logs timestamp")
+        
+        logger.info("✅ All feed analytics indices ensured")
+        
+    except Exception as e:
+        logger.error(f"Error creating feed analytics indices: {e}")
+
+
+async def ensure_news_indices():
+    """
+    Ensure indices for news_items homepage / section reads
+    """
+    db = await get_db()
+    
+    try:
+        # Latest stories / trending window
+        await db.news_items.create_index([("publishedAt", -1)])
+        logger.info("✓ Created index on news_items publishedAt")
+        
+        # Story pages and /api/news/{id}/related: one read by id
+        await db.news_items.create_index([("id", 1)])
+        logger.info("✓ Created index on news_items id")
+        
+        # Related-stories window (services/related_stories)
+        await db.news_items.create_index([("createdAt", -1)])
+        logger.info("✓ Created index on news_items createdAt")
+        
+        # Homepage: one read per stored section
+        await db.news_items.create_index([("section", 1), ("publishedAt", -1)])
+        logger.info("✓ Created index on news_items (section, publishedAt)")
+        
+        # /api/news/section pages (multikey on section_tags)
+        await db.news_items.create_index([("section_tags", 1), ("publishedAt", -1)])
+        logger.info("✓ Created index on news_items (section_tags, publishedAt)")
+        
+        # Homepage hero
+        await db.news_items.create_index([("isFeatured", 1), ("publishedAt", -1)])
+        logger.info("✓ Created index on news_items (isFeatured, publishedAt)")
+        
+        # Near-duplicate clustering: SimHash band lookup over the recent window
+        await db.news_items.create_index([("simhash_bands", 1), ("createdAt", -1)])
+        logger.info("✓ Created index on news_items (simhash_bands, createdAt)")
+        
+        # RSS source registry, one document per source id
+        await db.rss_sources.create_index([("id", 1)], unique=True)
+        logger.info("✓ Created unique index on rss_sources id")
+        
+        # Conditional-fetch validators, one per feed URL
+        await db.rss_feed_state.create_index([("url", 1)], unique=True)
+        logger.info("✓ Created unique index on rss_feed_state url")
+        
+        # Content-addressed CDN images: upsert by hash, reuse by source URL
+        await db.news_images.create_index([("hash", 1)], unique=True)
+        logger.info("✓ Created unique index on news_images hash")
+        await db.news_images.create_index([("source_urls", 1)])
+        logger.info("✓ Created index on news_images source_urls")
+        
+        # Pipeline run ledger: at most one run in progress, listed newest
+        # first, expiring after RSS_RUN_RETENTION_DAYS
+        await db.rss_pipeline_runs.create_index([("running_lock", 1)], unique=True, sparse=True)
+        await db.rss_pipeline_runs.create_index([("id", 1)], unique=True)
+        await db.rss_pipeline_runs.create_index(
+            [("started_at", -1)],
+            expireAfterSeconds=RSS_RUN_RETENTION_DAYS * 24 * 3600
+        )
+        logger.info("✓ Created indices on rss_pipeline_runs")
+        
+        logger.info("✅ All news indices ensured")
+        
+    except Exception as e:
+        logger.error(f"Error creating news indices: {e}")
+    
+    # Separate step: fails until existing duplicates are removed
+    # (scripts/dedupe_news_fingerprints.py) without blocking the reads above
+    try:
+        # RSS ingest dedupe; concurrent runs can't both insert a story.
+        # Partial so items without a fingerprint (dev seeds) are exempt
+        await db.news_items.create_index(
+            [("fingerprint", 1)],
+            unique=True,
+            partialFilterExpression={"fingerprint": {"$type": "string"}}
+        )
+        logger.info("✓ Created unique index on news_items fingerprint")
+    except Exception as e:
+        logger.error(f"Error creating unique news_items fingerprint index: {e}")
+
+
 async def ensure_peoples_room_indices():
     """
     Ensure indices for Peoples Room collections (MEGADROP V1)
@@ -97,4 +280,8 @@ async def ensure_all_indices():
     """
     await ensure_business_indices()
     await ensure_social_feed_indices()
+    await ensure_social_posts_indices()
+    await ensure_social_timeline_indices()
+    await ensure_feed_analytics_indices()
+    await ensure_news_indices()
     await ensure_peoples_room_indices()
@@ -1,7 +1,12 @@
 from motor.motor_asyncio import AsyncIOMotorClient
-from typing import List, Dict, Any
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+import asyncio
 import os
 
+from db.news_images import release_image_refs
+from services.heavy_content_service import enrich_item_with_banner_data
+
 client = AsyncIOMotorClient(os.environ['MONGO_URL'])
 db = client[os.environ['DB_NAME']]
 news_collection = db.news_items
@@ -9,6 +14,59 @@ news_collection = db.news_items
 # Fallback image URL for news items without images
 FALLBACK_IMAGE_URL = "/static/img/fallbacks/news_default.jpg"
 
+
+def make_dedupe_key(item):
+    """
+    Create deduplication key - near-duplicate cluster preferred
+    (services/news_clustering), then fingerprint, fallback to sourceName::title
+    """
+    if item.get('cluster_id'):
+        return item['cluster_id']
+    if item.get('fingerprint'):
+        return item['fingerprint']
+    # Fallback for older items without fingerprint
+    source = item.get('sourceName', 'unknown')
+    title = item.get('title', 'untitled')
+    return f"{source}::{title}"
+
+
+def prepare_news_items(items: List[dict]) -> List[dict]:
+    """
+    Deduplicate and shape raw news documents for the public payloads
+    (homepage, sections, trending): fallback imageUrl, ISO timestamps,
+    heavy content banner.
+    """
+    seen_keys = set()
+    unique_items = []
+    
+    for item in items:
+        dedupe_key = make_dedupe_key(item)
+        if dedupe_key in seen_keys:
+            continue
+        seen_keys.add(dedupe_key)
+        
+        # Ensure every item has an imageUrl
+        if not item.get('imageUrl'):
+            item['imageUrl'] = FALLBACK_IMAGE_URL
+        
+        # Convert datetime to ISO string
+        if 'publishedAt' in item and hasattr(item['publishedAt'], 'isoformat'):
+            item['publishedAt'] = item['publishedAt'].isoformat()
+        if 'sentiment_at' in item and hasattr(item['sentiment_at'], 'isoformat'):
+            item['sentiment_at'] = item['sentiment_at'].isoformat()
+        
+        # Stored at ingest; the frontend reads it as mapped_section
+        if item.get('section'):
+            item['mapped_section'] = item['section']
+        
+        # Enrich with heavy content banner data
+        enrich_item_with_banner_data(item)
+        
+        unique_items.append(item)
+    
+    return unique_items
+
+
 async def get_latest_news(limit: int = 10) -> List[Dict[str, Any]]:
     """
     Get latest news items sorted by publishedAt descending
@@ -31,3 +89,249 @@ async def get_latest_news(limit: int = 10) -> List[Dict[str, Any]]:
             item["imageUrl"] = FALLBACK_IMAGE_URL
     
     return items
+
+
+async def get_featured_news_item() -> Optional[Dict[str, Any]]:
+    """Most recent featured (hero) story, or None"""
+    return await news_collection.find_one(
+        {"isFeatured": True},
+        {"_id": 0},
+        sort=[("publishedAt", -1)]
+    )
+
+
+async def get_news_by_homepage_section(section: str, limit: int) -> List[Dict[str, Any]]:
+    """
+    Newest non-featured items stored under a homepage section.
+    Served by the (section, publishedAt) index.
+    """
+    return await news_collection.find(
+        {"section": section, "isFeatured": {"$ne": True}},
+        {"_id": 0}
+    ).sort("publishedAt", -1).limit(limit).to_list(length=limit)
+
+
+async def get_news_by_section_page(section: str, limit: int) -> List[Dict[str, Any]]:
+    """
+    Newest items tagged for a /api/news/section page ("top-stories" is everything).
+    Served by the (section_tags, publishedAt) index.
+    """
+    query = {} if section == "top-stories" else {"section_tags": section}
+    return await news_collection.find(
+        query,
+        {"_id": 0}
+    ).sort("publishedAt", -1).limit(limit).to_list(length=limit)
+
+
+async def get_related_stories(news_id: str) -> Optional[List[Dict[str, Any]]]:
+    """
+    Precomputed related stories for an item (services/related_stories),
+    one read on the id index. None if the item doesn't exist.
+    """
+    item = await news_collection.find_one({"id": news_id}, {"_id": 0, "related": 1})
+    if item is None:
+        return None
+    return item.get("related") or []
+
+
+async def update_related_stories(now: Optional[datetime] = None) -> Dict[str, int]:
+    """
+    Score stories stored since the last update against the recent window
+    and store their related lists, plus the older lists they change.
+    Stories get related_at once scored.
+    
+    Returns:
+        {"pool": stories in the window, "scored": new stories, "updated": lists written}
+    """
+    from pymongo import UpdateOne
+    from services.related_stories import RELATED_POOL_LIMIT, plan_related, related_window_start
+    
+    now = now or datetime.utcnow()
+    pool = await news_collection.find(
+        {"createdAt": {"$gte": related_window_start(now)}},
+        {"_id": 0, "id": 1, "title": 1, "summary": 1, "sourceName": 1, "imageUrl": 1,
+         "publishedAt": 1, "category": 1, "cluster_id": 1, "related": 1, "related_at": 1}
+    ).sort("createdAt", -1).limit(RELATED_POOL_LIMIT).to_list(length=None)
+    
+    new_ids = [item["id"] for item in pool if not item.get("related_at")]
+    stats = {"pool": len(pool), "scored": len(new_ids), "updated": 0}
+    if not new_ids:
+        return stats
+    
+    # NumPy scoring of the whole window; keep it off the event loop
+    plans = await asyncio.to_thread(plan_related, pool, new_ids)
+    
+    scored = set(new_ids)
+    ops = [
+        UpdateOne(
+            {"id": story_id},
+            {"$set": dict({"related": related}, **({"related_at": now} if story_id in scored else {}))}
+        )
+        for story_id, related in plans.items()
+    ]
+    # New stories with no neighbours still count as scored
+    ops.extend(
+        UpdateOne({"id": story_id}, {"$set": {"related": [], "related_at": now}})
+        for story_id in scored - set(plans)
+    )
+    await news_collection.bulk_write(ops, ordered=False)
+    stats["updated"] = len(plans)
+    return stats
+
+
+async def backfill_news_sections(batch_size: int = 500, recompute_all: bool = False) -> Dict[str, int]:
+    """
+    Store section/section_tags on existing news items.
+    
+    By default only items missing a section are touched; recompute_all
+    re-derives every item (use after changing categorization rules or
+    bulk-editing categories).
+    
+    Returns:
+        {"scanned": n, "updated": n}
+    """
+    from pymongo import UpdateOne
+    from services.news_categorization_service import compute_section_fields
+    
+    query = {} if recompute_all else {"section": {"$exists": False}}
+    projection = {"_id": 1, "category": 1, "region": 1, "sourceName": 1,
+                  "title": 1, "section": 1, "section_tags": 1}
+    
+    stats = {"scanned": 0, "updated": 0}
+    ops = []
+    
+    async for item in news_collection.find(query, projection):
+        stats["scanned"] += 1
+        fields = compute_section_fields(item)
+        if item.get("section") == fields["section"] and item.get("section_tags") == fields["section_tags"]:
+            continue
+        ops.append(UpdateOne({"_id": item["_id"]}, {"$set": fields}))
+        
+        if len(ops) >= batch_size:
+            result = await news_collection.bulk_write(ops, ordered=False)
+            stats["updated"] += result.modified_count
+            ops = []
+    
+    if ops:
+        result = await news_collection.bulk_write(ops, ordered=False)
+        stats["updated"] += result.modified_count
+    
+    return stats
+
+
+async def rebuild_simhash_bands(batch_size: int = 500) -> Dict[str, int]:
+    """
+    Recompute simhash_bands from the stored simhash on items in the cluster
+    window, after the band layout (services/news_clustering) changed. Older
+    items are never clustering candidates and are left alone.
+    
+    Returns:
+        {"scanned": n, "updated": n}
+    """
+    from pymongo import UpdateOne
+    from services.news_clustering import band_keys, cluster_window_start
+    
+    query = {"createdAt": {"$gte": cluster_window_start(datetime.utcnow())}, "simhash": {"$ne": None}}
+    
+    stats = {"scanned": 0, "updated": 0}
+    ops = []
+    
+    async for item in news_collection.find(query, {"_id": 0, "id": 1, "simhash": 1, "simhash_bands": 1}):
+        stats["scanned"] += 1
+        bands = band_keys(item["simhash"])
+        if item.get("simhash_bands") == bands:
+            continue
+        ops.append(UpdateOne({"id": item["id"]}, {"$set": {"simhash_bands": bands}}))
+        
+        if len(ops) >= batch_size:
+            result = await news_collection.bulk_write(ops, ordered=False)
+            stats["updated"] += result.modified_count
+            ops = []
+    
+    if ops:
+        result = await news_collection.bulk_write(ops, ordered=False)
+        stats["updated"] += result.modified_count
+    
+    return stats
+
+
+async def retag_black_news(batch_size: int = 500) -> Dict[str, int]:
+    """
+    Re-run Black News tagging (is_black_focus / black_focus_type) over every
+    news item, e.g. after changing the keyword lists or source flags.
+    
+    Source flags come from the RSS source registry (db/rss_sources) by
+    sourceName, the same ones the RSS ingest passes to tag_black_news_item. Only items whose tags
+    change are written, in unordered bulk batches.
+    
+    Returns:
+        {"scanned": n, "updated": n}
+    """
+    from pymongo import UpdateOne
+    from db.rss_sources import load_rss_sources
+    from services.black_news_tagging_service import tag_black_news_item
+    
+    sources = {source["source_name"]: source for source in await load_rss_sources()}
+    projection = {"_id": 1, "title": 1, "summary": 1, "description": 1, "category": 1,
+                  "sourceName": 1, "is_black_focus": 1, "black_focus_type": 1}
+    
+    stats = {"scanned": 0, "updated": 0}
+    ops = []
+    
+    async for item in news_collection.find({}, projection):
+        stats["scanned"] += 1
+        source = sources.get(item.get("sourceName"), {})
+        tagged = tag_black_news_item(
+            {"title": item.get("title", ""), "summary": item.get("summary", ""),
+             "description": item.get("description", "")},
+            source_is_black_owned=source.get("is_black_owned", False),
+            source_is_black_focus=source.get("is_black_focus", False),
+            source_category=item.get("category") or ""
+        )
+        fields = {"is_black_focus": tagged["is_black_focus"], "black_focus_type": tagged["black_focus_type"]}
+        if all(key in item and item[key] == value for key, value in fields.items()):
+            continue
+        ops.append(UpdateOne({"_id": item["_id"]}, {"$set": fields}))
+        
+        if len(ops) >= batch_size:
+            result = await news_collection.bulk_write(ops, ordered=False)
+            stats["updated"] += result.modified_count
+            ops = []
+    
+    if ops:
+        result = await news_collection.bulk_write(ops, ordered=False)
+        stats["updated"] += result.modified_count
+    
+    return stats
+
+
+async def remove_duplicate_fingerprints() -> Dict[str, int]:
+    """
+    Delete all but the earliest-stored news item per fingerprint, so the
+    unique fingerprint index (db/indices.ensure_news_indices) can be built
+    on a collection that predates it.
+    
+    Returns:
+        {"fingerprints": n duplicated fingerprints, "removed": n items deleted}
+    """
+    pipeline = [
+        {"$match": {"fingerprint": {"$type": "string"}}},
+        {"$sort": {"createdAt": 1, "_id": 1}},
+        {"$group": {
+            "_id": "$fingerprint",
+            "ids": {"$push": "$_id"},
+            "image_hashes": {"$push": "$imageHash"},
+            "count": {"$sum": 1}
+        }},
+        {"$match": {"count": {"$gt": 1}}},
+    ]
+    
+    stats = {"fingerprints": 0, "removed": 0}
+    async for group in news_collection.aggregate(pipeline, allowDiskUse=True):
+        stats["fingerprints"] += 1
+        result = await news_collection.delete_many({"_id": {"$in": group["ids"][1:]}})
+        stats["removed"] += result.deleted_count
+        await release_image_refs(group["image_hashes"][1:])
+    
+    return stats
+
@@ -0,0 +1,147 @@
+"""
+News Images - Database Operations
+One document per content-addressed image in the CDN store
+(utils/news_image_store): rendition metadata, the source URLs it was
+mirrored from, and a reference count of the news items / featured media
+using it. Images whose count drops to zero are orphans the cleanup job
+(tasks/cdn_image_gc) deletes after a grace period.
+"""
+
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Set
+
+from db.connection import get_db
+
+# (collection, image URL field, image hash field) for everything that shows a mirrored image
+IMAGE_REFERENCES = [
+    ("news_items", "imageUrl", "imageHash"),
+    ("featured_media", "thumbnailUrl", "thumbnailHash"),
+]
+
+
+async def get_images_for_urls(urls: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Already-stored images by source URL (one query), so they aren't downloaded again"""
+    if not urls:
+        return {}
+    db = await get_db()
+    wanted = set(urls)
+    docs = await db.news_images.find(
+        {"source_urls": {"$in": list(wanted)}},
+        {"_id": 0, "hash": 1, "width": 1, "height": 1, "renditions": 1, "source_urls": 1}
+    ).to_list(length=None)
+    return {url: doc for doc in docs for url in doc["source_urls"] if url in wanted}
+
+
+async def add_image_refs(refs: Dict[str, Dict[str, Any]]) -> int:
+    """
+    Upsert images and add references, one bulk_write.
+
+    Args:
+        refs: hash -> {"count": n new references, "image": render metadata,
+              "source_urls": URLs the image was downloaded from}
+
+    Returns:
+        Number of images written
+    """
+    from pymongo import UpdateOne
+
+    if not refs:
+        return 0
+
+    db = await get_db()
+    now = datetime.now(timezone.utc)
+    ops = []
+    for digest, ref in refs.items():
+        image = ref["image"]
+        ops.append(UpdateOne(
+            {"hash": digest},
+            {
+                "$inc": {"refs": ref["count"]},
+                "$addToSet": {"source_urls": {"$each": sorted(ref["source_urls"])}},
+                "$set": {"updated_at": now},
+                "$setOnInsert": {
+                    "width": image["width"],
+                    "height": image["height"],
+                    "renditions": image["renditions"],
+                    "created_at": now,
+                },
+            },
+            upsert=True
+        ))
+    await db.news_images.bulk_write(ops, ordered=False)
+    return len(ops)
+
+
+async def release_image_refs(hashes: Iterable[Optional[str]]) -> int:
+    """
+    Drop one reference per hash occurrence (items being deleted).
+
+    Returns:
+        Number of images updated
+    """
+    from pymongo import UpdateOne
+
+    counts = Counter(digest for digest in hashes if digest)
+    if not counts:
+        return 0
+
+    db = await get_db()
+    now = datetime.now(timezone.utc)
+    ops = [
+        UpdateOne({"hash": digest}, {"$inc": {"refs": -count}, "$set": {"updated_at": now}})
+        for digest, count in counts.items()
+    ]
+    await db.news_images.bulk_write(ops, ordered=False)
+    return len(ops)
+
+
+async def iter_referenced_images(cdn_base_url: str) -> AsyncIterator[str]:
+    """
+    Stream everything the CDN store must keep: image hashes used by items
+    or still counted in news_images, and the flat filenames of legacy
+    mirror URLs ({cdn_base_url}/{filename}) items still point at.
+    Values may repeat.
+    """
+    db = await get_db()
+    prefix = f"{cdn_base_url}/"
+    for collection, url_field, hash_field in IMAGE_REFERENCES:
+        cursor = db[collection].find(
+            {"$or": [
+                {hash_field: {"$exists": True, "$ne": None}},
+                {url_field: {"$regex": f"^{prefix}"}},
+            ]},
+            {"_id": 0, url_field: 1, hash_field: 1}
+        )
+        async for doc in cursor:
+            if doc.get(hash_field):
+                yield doc[hash_field]
+            url = doc.get(url_field) or ""
+            if url.startswith(prefix):
+                yield url[len(prefix):]
+
+    async for doc in db.news_images.find({"refs": {"$gt": 0}}, {"_id": 0, "hash": 1}):
+        yield doc["hash"]
+
+
+async def delete_orphan_images(hashes: List[str], cutoff: datetime) -> Set[str]:
+    """
+    Drop news_images documents for images the cleanup job found unused.
+    Images counted again, or touched since cutoff (a mirror run may be
+    reusing them), are kept.
+
+    Returns:
+        Hashes whose files may be deleted (including ones with no document)
+    """
+    if not hashes:
+        return set()
+
+    db = await get_db()
+    protected = await db.news_images.find(
+        {"hash": {"$in": hashes}, "$or": [{"refs": {"$gt": 0}}, {"updated_at": {"$gte": cutoff}}]},
+        {"_id": 0, "hash": 1}
+    ).to_list(length=None)
+    orphans = set(hashes) - {doc["hash"] for doc in protected}
+    if orphans:
+        await db.news_images.delete_many({"hash": {"$in": sorted(orphans)}, "$nor": [{"refs": {"$gt": 0}}]})
+    return orphans
@@ -60,9 +60,17 @@ async def get_resources(
     featured: Optional[bool] = None,
     search: Optional[str] = None,
     limit: int = 20,
-    skip: int = 0
-) -> tuple[List[Dict[str, Any]], int]:
-    """Get resources with filtering and pagination"""
+    skip: int = 0,
+    projection: Optional[Dict[str, Any]] = None,
+    count: bool = True
+) -> tuple[List[Dict[str, Any]], Optional[int]]:
+    """
+    Get resources with filtering and pagination
+
+    projection narrows the returned fields (e.g. the conditional GET version
+    probe only needs ids and timestamps). count=False skips the total
+    (returned as None) when the caller already has it.
+    """
     query = {"published_at": {"$ne": None}}  # Only published resources
     
     if category:
@@ -80,12 +88,12 @@ async def get_resources(
         ]
     
     # Get total count
-    total = await resources_collection.count_documents(query)
+    total = await resources_collection.count_documents(query) if count else None
     
     # Get paginated results
     resources = await resources_collection.find(
         query,
-        {"_id": 0}
+        projection or {"_id": 0}
     ).sort("published_at", -1).skip(skip).limit(limit).to_list(length=None)
     
     return resources, total
@@ -0,0 +1,84 @@
+"""
+RSS Feed State - Database Operations
+Per-feed state keyed by feed URL:
+- HTTP validators (ETag / Last-Modified) from the last successful fetch;
+  the sync sends them back as If-None-Match / If-Modified-Since so
+  unchanged feeds answer 304 and are skipped
+- Poll schedule (services/rss_poll_schedule): next_poll_at, interval,
+  smoothed publish interval and failure / empty-poll streaks
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+from db.connection import get_db
+
+
+async def get_feed_states(urls: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Stored validators and schedule for the given feed URLs (one query), keyed by URL"""
+    db = await get_db()
+    docs = await db.rss_feed_state.find(
+        {"url": {"$in": list(urls)}},
+        {"_id": 0}
+    ).to_list(length=None)
+    return {doc["url"]: doc for doc in docs}
+
+
+async def save_feed_validators(states: List[Dict[str, Any]]) -> int:
+    """
+    Upsert validators after a sync run.
+
+    Args:
+        states: [{"url", "etag", "last_modified", "status"}] for feeds that
+                were fetched and stored successfully
+
+    Returns:
+        Number of feed states written
+    """
+    from pymongo import UpdateOne
+
+    if not states:
+        return 0
+
+    db = await get_db()
+    now = datetime.now(timezone.utc)
+    ops = [
+        UpdateOne(
+            {"url": state["url"]},
+            {"$set": {
+                "etag": state.get("etag"),
+                "last_modified": state.get("last_modified"),
+                "last_status": state.get("status"),
+                "checked_at": now,
+            }},
+            upsert=True
+        )
+        for state in states
+    ]
+    await db.rss_feed_state.bulk_write(ops, ordered=False)
+    return len(ops)
+
+
+async def save_poll_schedules(schedules: List[Dict[str, Any]]) -> int:
+    """
+    Upsert poll schedules (services/rss_poll_schedule.plan_next_polls output).
+
+    Returns:
+        Number of feed states written
+    """
+    from pymongo import UpdateOne
+
+    if not schedules:
+        return 0
+
+    db = await get_db()
+    ops = [
+        UpdateOne(
+            {"url": schedule["url"]},
+            {"$set": {key: value for key, value in schedule.items() if key != "url"}},
+            upsert=True
+        )
+        for schedule in schedules
+    ]
+    await db.rss_feed_state.bulk_write(ops, ordered=False)
+    return len(ops)
@@ -0,0 +1,102 @@
+"""
+RSS Pipeline Runs - Database Operations
+Run ledger for scheduler.run_all_feeds_job: one document per execution
+(shape in services/rss_run_ledger).
+
+Only one run may be in progress across every server process: the running
+document carries running_lock, which has a unique sparse index, so a second
+run's insert fails and is recorded as skipped. Runs older than
+RUN_STALE_AFTER_MINUTES that still hold the lock belong to a process that
+died; they are marked abandoned so the pipeline isn't blocked forever.
+Documents expire after RSS_RUN_RETENTION_DAYS (TTL index on started_at).
+"""
+
+import os
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+
+from db.connection import get_db
+
+RUN_STALE_AFTER_MINUTES = int(os.environ.get("RSS_RUN_STALE_AFTER_MINUTES", "120"))
+RSS_RUN_RETENTION_DAYS = int(os.environ.get("RSS_RUN_RETENTION_DAYS", "30"))
+
+RUNNING_LOCK = "rss_pipeline"
+
+# Per-source entries are left out of run listings
+SUMMARY_PROJECTION = {"_id": 0, "sources": 0, "running_lock": 0}
+
+
+async def start_run(run: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Insert a running run document unless another run holds the lock.
+
+    Returns:
+        None when the run was started, else the run in progress (the new
+        run is recorded as skipped, with overlapped_run_id)
+    """
+    from pymongo.errors import DuplicateKeyError
+
+    db = await get_db()
+    stale_before = run["started_at"] - timedelta(minutes=RUN_STALE_AFTER_MINUTES)
+    await db.rss_pipeline_runs.update_many(
+        {"running_lock": RUNNING_LOCK, "started_at": {"$lt": stale_before}},
+        {"$set": {"status": "abandoned"}, "$unset": {"running_lock": ""}}
+    )
+
+    try:
+        await db.rss_pipeline_runs.insert_one(dict(run, running_lock=RUNNING_LOCK))
+        return None
+    except DuplicateKeyError:
+        active = await db.rss_pipeline_runs.find_one({"running_lock": RUNNING_LOCK}, SUMMARY_PROJECTION)
+        await record_skipped_run(run, reason="run_in_progress", active=active)
+        return active or {}
+
+
+async def record_skipped_run(
+    run: Dict[str, Any],
+    reason: str,
+    active: Optional[Dict[str, Any]] = None
+) -> None:
+    """Record a tick that didn't run; `active` is the run it overlapped (looked up if omitted)"""
+    db = await get_db()
+    if active is None:
+        active = await db.rss_pipeline_runs.find_one({"running_lock": RUNNING_LOCK}, {"_id": 0, "id": 1})
+    await db.rss_pipeline_runs.insert_one(dict(
+        run,
+        status="skipped",
+        skipped_reason=reason,
+        overlapped_run_id=(active or {}).get("id"),
+        finished_at=run["started_at"],
+        wall_seconds=0.0,
+    ))
+
+
+async def finish_run(run_id: str, fields: Dict[str, Any]) -> None:
+    """Store the run's outcome (status, stages, totals, sources, ...) and release the lock"""
+    db = await get_db()
+    await db.rss_pipeline_runs.update_one(
+        {"id": run_id},
+        {"$set": fields, "$unset": {"running_lock": ""}}
+    )
+
+
+async def list_runs(limit: int = 20) -> List[Dict[str, Any]]:
+    """Newest runs first, without per-source entries"""
+    db = await get_db()
+    return await db.rss_pipeline_runs.find({}, SUMMARY_PROJECTION).sort(
+        "started_at", -1
+    ).limit(limit).to_list(length=limit)
+
+
+async def list_runs_with_sources(limit: int = 20) -> List[Dict[str, Any]]:
+    """Newest runs that synced at least one source, with their per-source entries"""
+    db = await get_db()
+    return await db.rss_pipeline_runs.find(
+        {"totals.sources_synced": {"$gt": 0}},
+        {"_id": 0, "running_lock": 0}
+    ).sort("started_at", -1).limit(limit).to_list(length=limit)
+
+
+async def get_run(run_id: str) -> Optional[Dict[str, Any]]:
+    db = await get_db()
+    return await db.rss_pipeline_runs.find_one({"id": run_id}, {"_id": 0, "running_lock": 0})
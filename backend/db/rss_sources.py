@@ -0,0 +1,182 @@
+"""
+RSS Sources - Database Operations
+Registry of the feeds the news pipeline syncs, one document per source id.
+
+- Seeded from config/rss_sources.py at startup (seed_rss_sources): new
+  config sources are added and config changes are applied, except to
+  sources an admin has edited (admin_edited), which keep their edits
+- Admin routes (/api/admin/rss/sources) add, edit and remove sources
+  without a restart; the scheduler reads the registry on every tick
+- Each document also carries the source's rolling health and quarantine
+  state (services/rss_source_health)
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from db.connection import get_db
+
+# Source fields that come from config / admin edits (the rest is pipeline state)
+SOURCE_FIELDS = [
+    "category", "source_name", "rss_url", "language", "active", "featured_source",
+    "priority", "region", "is_black_owned", "is_black_focus",
+]
+
+
+async def seed_rss_sources(sources: Optional[List[Dict[str, Any]]] = None) -> Dict[str, int]:
+    """
+    Upsert config sources into the registry (config/rss_sources.RSS_SOURCES if omitted).
+
+    Returns:
+        {"seeded": n, "kept": n admin-edited sources left untouched}
+    """
+    from pymongo import UpdateOne
+
+    if sources is None:
+        from config.rss_sources import RSS_SOURCES
+        sources = RSS_SOURCES
+
+    db = await get_db()
+    edited = await db.rss_sources.find(
+        {"id": {"$in": [source["id"] for source in sources]}, "admin_edited": True},
+        {"_id": 0, "id": 1}
+    ).to_list(length=None)
+    edited_ids = {doc["id"] for doc in edited}
+
+    now = datetime.now(timezone.utc)
+    ops = [
+        UpdateOne(
+            {"id": source["id"]},
+            {
+                "$set": dict({field: source[field] for field in SOURCE_FIELDS if field in source}, updated_at=now),
+                "$setOnInsert": {"origin": "config", "created_at": now},
+            },
+            upsert=True
+        )
+        for source in sources
+        if source["id"] not in edited_ids
+    ]
+    if ops:
+        await db.rss_sources.bulk_write(ops, ordered=False)
+    return {"seeded": len(ops), "kept": len(edited_ids)}
+
+
+async def get_rss_sources() -> List[Dict[str, Any]]:
+    """Every registered source (active or not), with health and quarantine state"""
+    db = await get_db()
+    return await db.rss_sources.find({}, {"_id": 0}).to_list(length=None)
+
+
+async def load_rss_sources() -> List[Dict[str, Any]]:
+    """get_rss_sources, seeding the registry from config first if it is empty"""
+    sources = await get_rss_sources()
+    if not sources:
+        await seed_rss_sources()
+        sources = await get_rss_sources()
+    return sources
+
+
+async def get_rss_source(source_id: str) -> Optional[Dict[str, Any]]:
+    db = await get_db()
+    return await db.rss_sources.find_one({"id": source_id}, {"_id": 0})
+
+
+async def create_rss_source(source: Dict[str, Any]) -> Dict[str, Any]:
+    """Add an admin-defined source; raises DuplicateKeyError if the id is taken"""
+    db = await get_db()
+    now = datetime.now(timezone.utc)
+    doc = dict(source, origin="admin", admin_edited=True, created_at=now, updated_at=now)
+    await db.rss_sources.insert_one(doc)
+    doc.pop("_id", None)
+    return doc
+
+
+async def update_rss_source(source_id: str, fields: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Apply an admin edit; the source then keeps its values across config re-seeds"""
+    from pymongo import ReturnDocument
+
+    db = await get_db()
+    return await db.rss_sources.find_one_and_update(
+        {"id": source_id},
+        {"$set": dict(fields, admin_edited=True, updated_at=datetime.now(timezone.utc))},
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER
+    )
+
+
+async def delete_rss_source(source_id: str) -> bool:
+    """
+    Remove a source. A config source is added back by the next seed; set
+    active=False to retire one for good.
+    """
+    db = await get_db()
+    result = await db.rss_sources.delete_one({"id": source_id})
+    return result.deleted_count > 0
+
+
+async def release_quarantine(source_id: str) -> Optional[Dict[str, Any]]:
+    """Put a quarantined source back into regular syncs ahead of its next probe"""
+    from pymongo import ReturnDocument
+
+    db = await get_db()
+    now = datetime.now(timezone.utc)
+    return await db.rss_sources.find_one_and_update(
+        {"id": source_id},
+        {"$set": {
+            "quarantine": {"active": False, "released_at": now, "released_by": "admin"},
+            "health.consecutive_failures": 0,
+            "updated_at": now,
+        }},
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER
+    )
+
+
+def _quarantine_unchanged(previous: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Filter matching a source whose quarantine is still the one seen at tick start"""
+    previous = previous or {}
+    # Every quarantine transition sets a new since / released_at
+    return {f"quarantine.{key}": previous.get(key) for key in ("active", "since", "released_at")}
+
+
+async def save_source_health(updates: List[Dict[str, Any]]) -> int:
+    """
+    Store health after a sync run.
+
+    Health metrics are $set field by field. The quarantine (and the
+    consecutive failure count it is based on) is only written if the
+    source's quarantine is still the previous_quarantine the run started
+    from, so an admin release made mid-run is not undone.
+
+    Args:
+        updates: [{"id", "health", "quarantine", "previous_quarantine"}]
+            (rss_source_health.plan_source_health); without
+            previous_quarantine the quarantine is written unconditionally
+
+    Returns:
+        Number of sources updated
+    """
+    from pymongo import UpdateOne
+
+    if not updates:
+        return 0
+
+    db = await get_db()
+    ops = []
+    for update in updates:
+        health = dict(update["health"])
+        quarantine_fields = {
+            "quarantine": update["quarantine"],
+            "health.consecutive_failures": health.pop("consecutive_failures", 0),
+        }
+        ops.append(UpdateOne(
+            {"id": update["id"]},
+            {"$set": {f"health.{key}": value for key, value in health.items()}}
+        ))
+        quarantine_filter = {"id": update["id"]}
+        if "previous_quarantine" in update:
+            quarantine_filter.update(_quarantine_unchanged(update["previous_quarantine"]))
+        ops.append(UpdateOne(quarantine_filter, {"$set": quarantine_fields}))
+
+    await db.rss_sources.bulk_write(ops, ordered=False)
+    return len(updates)
@@ -0,0 +1,128 @@
+"""
+Social Hydration - Batched enrichment for social posts and comments
+Resolves authors and viewer reaction state for a whole page with one
+$in query per relation (instead of one find_one per post).
+"""
+
+import os
+from typing import Dict, Iterable, List, Optional, Set
+
+
+POST_AUTHOR_PROJECTION = {"_id": 0, "id": 1, "name": 1, "avatar_url": 1, "profile": 1}
+COMMENT_AUTHOR_PROJECTION = {"_id": 0, "id": 1, "name": 1, "avatar_url": 1}
+
+
+def _unique(values: Iterable[str]) -> List[str]:
+    """De-duplicate ids while keeping first-seen order"""
+    return list(dict.fromkeys(v for v in values if v))
+
+
+async def load_authors(db, author_ids: Iterable[str], projection: Optional[dict] = None) -> Dict[str, dict]:
+    """Fetch all referenced users in one query, keyed by user id"""
+    ids = _unique(author_ids)
+    if not ids:
+        return {}
+
+    users = await db.banibs_users.find(
+        {"id": {"$in": ids}},
+        projection or POST_AUTHOR_PROJECTION
+    ).to_list(length=None)
+
+    return {user["id"]: user for user in users}
+
+
+async def load_viewer_likes(db, post_ids: Iterable[str], viewer_id: Optional[str]) -> Set[str]:
+    """Return the subset of post ids the viewer has liked (one query)"""
+    ids = _unique(post_ids)
+    if not viewer_id or not ids:
+        return set()
+
+    reactions = await db.social_reactions.find(
+        {"post_id": {"$in": ids}, "user_id": viewer_id},
+        {"_id": 0, "post_id": 1}
+    ).to_list(length=None)
+
+    return {reaction["post_id"] for reaction in reactions}
+
+
+def extract_media_urls(post: dict) -> List[str]:
+    """Extract absolute media URLs from the media array (S-MEDIA v1.0 compatibility)"""
+    media_urls = []
+    for item in post.get("media") or []:
+        if isinstance(item, dict) and item.get("url"):
+            # If URL is relative, make it absolute
+            url = item["url"]
+            if not url.startswith('http'):
+                backend_url = os.environ.get('REACT_APP_BACKEND_URL', '')
+                url = f"{backend_url}{url}"
+            media_urls.append(url)
+    return media_urls
+
+
+def build_post_author(author: dict) -> dict:
+    """Shape a banibs_users document into the SocialPostAuthor payload"""
+    profile = author.get("profile", {}) or {}
+    return {
+        "id": author["id"],
+        "display_name": author.get("name", "Unknown User"),
+        "avatar_url": profile.get("avatar_url") or author.get("avatar_url"),
+        "handle": profile.get("handle")
+    }
+
+
+async def hydrate_posts(db, posts: List[dict], viewer_id: Optional[str] = None) -> List[dict]:
+    """
+    Enrich a page of posts with author info and viewer like status.
+
+    Issues at most two queries regardless of page size. Posts whose author
+    no longer exists are dropped, matching the previous per-post behaviour.
+    """
+    if not posts:
+        return []
+
+    authors = await load_authors(db, (post["author_id"] for post in posts))
+    liked_ids = await load_viewer_likes(db, (post["id"] for post in posts), viewer_id)
+
+    enriched_posts = []
+    for post in posts:
+        author = authors.get(post["author_id"])
+        if not author:
+            continue
+
+        enriched_posts.append({
+            **post,
+            "media_urls": extract_media_urls(post),  # S-MEDIA v1.0 compatibility
+            "author": build_post_author(author),
+            "viewer_has_liked": post["id"] in liked_ids
+        })
+
+    return enriched_posts
+
+
+async def hydrate_comments(db, comments: List[dict]) -> List[dict]:
+    """Enrich a page of comments with author info (one query)"""
+    if not comments:
+        return []
+
+    authors = await load_authors(
+        db,
+        (comment["author_id"] for comment in comments),
+        COMMENT_AUTHOR_PROJECTION
+    )
+
+    enriched_comments = []
+    for comment in comments:
+        author = authors.get(comment["author_id"])
+        if not author:
+            continue
+
+        enriched_comments.append({
+            **comment,
+            "author": {
+                "id": author["id"],
+                "display_name": author.get("name", "Unknown User"),
+                "avatar_url": author.get("avatar_url")
+            }
+        })
+
+    return enriched_comments
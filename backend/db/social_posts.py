@@ -4,11 +4,17 @@ Social Posts Database Operations - Phase 8.3
 
 from motor.motor_asyncio import AsyncIOMotorClient
 from datetime import datetime, timezone
+import base64
+import binascii
+import json
 import uuid
-import os
 from typing import Optional
 
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import DuplicateKeyError
+
 from db.connection import get_db
+from db.social_hydration import hydrate_posts, hydrate_comments
 
 
 async def create_post(
@@ -45,6 +51,108 @@ async def create_post(
     return post
 
 
+# ==========================================
+# KEYSET (CURSOR) PAGINATION
+# ==========================================
+# Cursors are opaque tokens encoding the (created_at, id) of the last post
+# on the previous page. Pages are fetched with a range predicate on the
+# (created_at, id) compound index instead of skip(), so page N costs the
+# same as page 1.
+
+FEED_SORT = [("created_at", -1), ("id", -1)]
+
+
+def encode_feed_cursor(post: dict) -> str:
+    """Encode the sort key of a post into an opaque, URL-safe cursor"""
+    created_at = post["created_at"]
+    if isinstance(created_at, datetime):
+        created_at = created_at.isoformat()
+    payload = json.dumps({"t": created_at, "id": post["id"]}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_feed_cursor(cursor: str) -> tuple:
+    """
+    Decode a cursor produced by encode_feed_cursor.
+    Raises ValueError for malformed or tampered tokens.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(payload["t"]), str(payload["id"])
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError, KeyError, TypeError) as e:
+        raise ValueError("Invalid feed cursor") from e
+
+
+def keyset_filter(base_filter: dict, cursor: Optional[str], id_field: str = "id") -> dict:
+    """Combine a filter with the keyset predicate for (created_at, id_field) DESC"""
+    if not cursor:
+        return base_filter
+
+    created_at, post_id = decode_feed_cursor(cursor)
+    return {
+        **base_filter,
+        "$or": [
+            {"created_at": {"$lt": created_at}},
+            {"created_at": created_at, id_field: {"$lt": post_id}}
+        ]
+    }
+
+
+async def _get_posts_by_cursor(
+    db,
+    base_filter: dict,
+    cursor: Optional[str],
+    page_size: int,
+    viewer_id: Optional[str],
+    total_items: Optional[int]
+):
+    """Fetch one keyset page (page_size + 1 rows to detect has_more)"""
+    posts = await db.social_posts.find(
+        keyset_filter(base_filter, cursor),
+        {"_id": 0}
+    ).sort(FEED_SORT).limit(page_size + 1).to_list(length=None)
+
+    has_more = len(posts) > page_size
+    posts = posts[:page_size]
+
+    # Cursor comes from the raw page so dropped (author-less) posts don't stall paging
+    next_cursor = encode_feed_cursor(posts[-1]) if has_more and posts else None
+
+    return {
+        "page_size": page_size,
+        "items": await hydrate_posts(db, posts, viewer_id),
+        "next_cursor": next_cursor,
+        "has_more": has_more,
+        "total_items": total_items,
+        "total_is_estimate": total_items is not None
+    }
+
+
+async def get_feed_by_cursor(
+    cursor: Optional[str] = None,
+    page_size: int = 20,
+    viewer_id: Optional[str] = None,
+    include_total: bool = False
+):
+    """
+    Get social feed using keyset pagination (no count_documents, no skip).
+    include_total adds an approximate total from collection metadata.
+    """
+    db = await get_db()
+    
+    feed_filter = {
+        "is_deleted": False,
+        "is_hidden": False
+    }
+    
+    total_items = None
+    if include_total:
+        total_items = await db.social_posts.estimated_document_count()
+    
+    return await _get_posts_by_cursor(db, feed_filter, cursor, page_size, viewer_id, total_items)
+
+
 async def get_feed(page: int = 1, page_size: int = 20, viewer_id: Optional[str] = None):
     """Get paginated social feed (Phase 8.3.1: excludes hidden/deleted posts)"""
     db = await get_db()
@@ -67,52 +175,8 @@ async def get_feed(page: int = 1, page_size: int = 20, viewer_id: Optional[str]
         {"_id": 0}
     ).sort("created_at", -1).skip(skip).limit(page_size).to_list(length=None)
     
-    # Enrich posts with author info and viewer like status
-    enriched_posts = []
-    for post in posts:
-        author = await db.banibs_users.find_one(
-            {"id": post["author_id"]},
-            {"_id": 0, "id": 1, "name": 1, "avatar_url": 1, "profile": 1}
-        )
-        
-        if not author:
-            continue
-        
-        # Check if viewer has liked
-        viewer_has_liked = False
-        if viewer_id:
-            like = await db.social_reactions.find_one({
-                "post_id": post["id"],
-                "user_id": viewer_id
-            })
-            viewer_has_liked = like is not None
-        
-        # Extract profile data
-        profile = author.get("profile", {}) or {}
-        
-        # Extract media URLs from media array for S-MEDIA compatibility
-        media_urls = []
-        if post.get("media"):
-            for item in post["media"]:
-                if isinstance(item, dict) and item.get("url"):
-                    # If URL is relative, make it absolute
-                    url = item["url"]
-                    if not url.startswith('http'):
-                        backend_url = os.environ.get('REACT_APP_BACKEND_URL', '')
-                        url = f"{backend_url}{url}"
-                    media_urls.append(url)
-        
-        enriched_posts.append({
-            **post,
-            "media_urls": media_urls,  # S-MEDIA v1.0 compatibility
-            "author": {
-                "id": author["id"],
-                "display_name": author.get("name", "Unknown User"),
-                "avatar_url": profile.get("avatar_url") or author.get("avatar_url"),
-                "handle": profile.get("handle")
-            },
-            "viewer_has_liked": viewer_has_liked
-        })
+    # Enrich posts with author info and viewer like status (batched)
+    enriched_posts = await hydrate_posts(db, posts, viewer_id)
     
     return {
         "page": page,
@@ -131,92 +195,59 @@ async def get_post_by_id(post_id: str, viewer_id: Optional[str] = None):
     if not post:
         return None
     
-    # Enrich with author
-    author = await db.banibs_users.find_one(
-        {"id": post["author_id"]},
-        {"_id": 0, "id": 1, "name": 1, "avatar_url": 1, "profile": 1}
-    )
-    
-    if not author:
-        return None
-    
-    # Check viewer like status
-    viewer_has_liked = False
-    if viewer_id:
-        like = await db.social_reactions.find_one({
-            "post_id": post_id,
-            "user_id": viewer_id
-        })
-        viewer_has_liked = like is not None
-    
-    # Extract profile data
-    profile = author.get("profile", {}) or {}
-    
-    # Extract media URLs from media array for S-MEDIA compatibility
-    media_urls = []
-    if post.get("media"):
-        for item in post["media"]:
-            if isinstance(item, dict) and item.get("url"):
-                # If URL is relative, make it absolute
-                url = item["url"]
-                if not url.startswith('http'):
-                    backend_url = os.environ.get('REACT_APP_BACKEND_URL', '')
-                    url = f"{backend_url}{url}"
-                media_urls.append(url)
-    
-    return {
-        **post,
-        "media_urls": media_urls,  # S-MEDIA v1.0 compatibility
-        "author": {
-            "id": author["id"],
-            "display_name": author.get("name", "Unknown User"),
-            "avatar_url": profile.get("avatar_url") or author.get("avatar_url"),
-            "handle": profile.get("handle")
-        },
-        "viewer_has_liked": viewer_has_liked
-    }
+    # Enrich with author and viewer like status
+    enriched = await hydrate_posts(db, [post], viewer_id)
+    return enriched[0] if enriched else None
 
 
 async def toggle_like(post_id: str, user_id: str):
-    """Toggle like on a post"""
+    """
+    Toggle like on a post (also serves High Five).
+    
+    Backed by the unique (post_id, user_id) index on social_reactions, so
+    concurrent double-taps cannot create duplicate reactions or drift the
+    counter: only the request that actually inserts/deletes the reaction
+    moves like_count, in a single find_one_and_update.
+    
+    Returns None if the post does not exist.
+    """
     db = await get_db()
     
-    # Check if already liked
-    existing_like = await db.social_reactions.find_one({
-        "post_id": post_id,
-        "user_id": user_id
-    })
+    reaction_key = {"post_id": post_id, "user_id": user_id}
     
-    if existing_like:
-        # Unlike
-        await db.social_reactions.delete_one({
-            "post_id": post_id,
-            "user_id": user_id
-        })
-        await db.social_posts.update_one(
-            {"id": post_id},
-            {"$inc": {"like_count": -1}}
-        )
-        liked = False
+    # Unlike if a reaction exists, otherwise like
+    removed = await db.social_reactions.delete_one(reaction_key)
+    if removed.deleted_count:
+        liked, delta = False, -1
     else:
-        # Like
-        await db.social_reactions.insert_one({
-            "id": str(uuid.uuid4()),
-            "post_id": post_id,
-            "user_id": user_id,
-            "created_at": datetime.now(timezone.utc)
-        })
-        await db.social_posts.update_one(
+        try:
+            await db.social_reactions.insert_one({
+                "id": str(uuid.uuid4()),
+                **reaction_key,
+                "created_at": datetime.now(timezone.utc)
+            })
+            liked, delta = True, 1
+        except DuplicateKeyError:
+            # A concurrent request already liked it; don't count twice
+            liked, delta = True, 0
+    
+    if delta:
+        post = await db.social_posts.find_one_and_update(
             {"id": post_id},
-            {"$inc": {"like_count": 1}}
+            {"$inc": {"like_count": delta}},
+            projection={"_id": 0, "like_count": 1},
+            return_document=ReturnDocument.AFTER
         )
-        liked = True
+    else:
+        post = await db.social_posts.find_one({"id": post_id}, {"_id": 0, "like_count": 1})
     
-    # Get updated like count
-    post = await db.social_posts.find_one({"id": post_id}, {"_id": 0, "like_count": 1})
-    like_count = post["like_count"] if post else 0
+    if post is None:
+        # Unknown post: undo the reaction we just wrote
+        if delta > 0:
+            await db.social_reactions.delete_one(reaction_key)
+        return None
     
-    return {"liked": liked, "like_count": like_count}
+    return {"liked": liked, "like_count": max(post.get("like_count", 0), 0)}
 
 
 async def create_comment(post_id: str, author_id: str, text: str):
@@ -262,25 +293,8 @@ async def get_comments(post_id: str, page: int = 1, page_size: int = 20):
         {"_id": 0}
     ).sort("created_at", 1).skip(skip).limit(page_size).to_list(length=None)
     
-    # Enrich with author info
-    enriched_comments = []
-    for comment in comments:
-        author = await db.banibs_users.find_one(
-            {"id": comment["author_id"]},
-            {"_id": 0, "id": 1, "name": 1, "avatar_url": 1}
-        )
-        
-        if not author:
-            continue
-        
-        enriched_comments.append({
-            **comment,
-            "author": {
-                "id": author["id"],
-                "display_name": author.get("name", "Unknown User"),
-                "avatar_url": author.get("avatar_url")
-            }
-        })
+    # Enrich with author info (batched)
+    enriched_comments = await hydrate_comments(db, comments)
     
     return {
         "page": page,
@@ -389,52 +403,8 @@ async def get_user_posts(user_id: str, page: int = 1, page_size: int = 20, viewe
         {"_id": 0}
     ).sort("created_at", -1).skip(skip).limit(page_size).to_list(length=None)
     
-    # Enrich posts with author info and viewer like status
-    enriched_posts = []
-    for post in posts:
-        author = await db.banibs_users.find_one(
-            {"id": post["author_id"]},
-            {"_id": 0, "id": 1, "name": 1, "avatar_url": 1, "profile": 1}
-        )
-        
-        if not author:
-            continue
-        
-        # Check if viewer has liked
-        viewer_has_liked = False
-        if viewer_id:
-            like = await db.social_reactions.find_one({
-                "post_id": post["id"],
-                "user_id": viewer_id
-            })
-            viewer_has_liked = like is not None
-        
-        # Extract profile data
-        profile = author.get("profile", {}) or {}
-        
-        # Extract media URLs from media array for S-MEDIA compatibility
-        media_urls = []
-        if post.get("media"):
-            for item in post["media"]:
-                if isinstance(item, dict) and item.get("url"):
-                    # If URL is relative, make it absolute
-                    url = item["url"]
-                    if not url.startswith('http'):
-                        backend_url = os.environ.get('REACT_APP_BACKEND_URL', '')
-                        url = f"{backend_url}{url}"
-                    media_urls.append(url)
-        
-        enriched_posts.append({
-            **post,
-            "media_urls": media_urls,  # S-MEDIA v1.0 compatibility
-            "author": {
-                "id": author["id"],
-                "display_name": author.get("name", "Unknown User"),
-                "avatar_url": profile.get("avatar_url") or author.get("avatar_url"),
-                "handle": profile.get("handle")
-            },
-            "viewer_has_liked": viewer_has_liked
-        })
+    # Enrich posts with author info and viewer like status (batched)
+    enriched_posts = await hydrate_posts(db, posts, viewer_id)
     
     return {
         "page": page,
@@ -443,3 +413,118 @@ async def get_user_posts(user_id: str, page: int = 1, page_size: int = 20, viewe
         "total_pages": total_pages,
         "items": enriched_posts
     }
+
+
+async def get_user_posts_by_cursor(
+    user_id: str,
+    cursor: Optional[str] = None,
+    page_size: int = 20,
+    viewer_id: Optional[str] = None,
+    include_total: bool = False
+):
+    """
+    Get posts by a specific user using keyset pagination.
+    include_total adds an approximate total (all of the author's posts,
+    including moderated ones) served from the author_id index.
+    """
+    db = await get_db()
+    
+    post_filter = {
+        "author_id": user_id,
+        "is_deleted": False,
+        "is_hidden": False
+    }
+    
+    total_items = None
+    if include_total:
+        total_items = await db.social_posts.count_documents({"author_id": user_id})
+    
+    return await _get_posts_by_cursor(db, post_filter, cursor, page_size, viewer_id, total_items)
+
+
+async def remove_duplicate_reactions():
+    """
+    Delete all but the earliest reaction per (post, user), left by toggles
+    that raced before the unique (post_id, user_id) index existed, so the
+    index (db/indices.ensure_social_posts_indices) can be built.
+    
+    like_count is not touched; run reconcile_engagement_counts afterwards.
+    
+    Returns:
+        {"pairs": n duplicated (post, user) pairs, "removed": n reactions deleted}
+    """
+    db = await get_db()
+    
+    pipeline = [
+        {"$sort": {"created_at": 1, "_id": 1}},
+        {"$group": {
+            "_id": {"post_id": "$post_id", "user_id": "$user_id"},
+            "ids": {"$push": "$_id"},
+            "count": {"$sum": 1}
+        }},
+        {"$match": {"count": {"$gt": 1}}},
+    ]
+    
+    stats = {"pairs": 0, "removed": 0}
+    async for group in db.social_reactions.aggregate(pipeline, allowDiskUse=True):
+        stats["pairs"] += 1
+        result = await db.social_reactions.delete_many({"_id": {"$in": group["ids"][1:]}})
+        stats["removed"] += result.deleted_count
+    
+    return stats
+
+
+async def reconcile_engagement_counts(batch_size: int = 1000):
+    """
+    Repair drifted like_count / comment_count values.
+    
+    Recomputes true counts with two aggregation pipelines (distinct
+    reactions per post, non-deleted comments per post) and writes only the
+    posts that differ, in unordered bulk_write batches.
+    """
+    db = await get_db()
+    
+    like_counts = {
+        doc["_id"]: doc["count"]
+        async for doc in db.social_reactions.aggregate([
+            {"$group": {"_id": {"post_id": "$post_id", "user_id": "$user_id"}}},
+            {"$group": {"_id": "$_id.post_id", "count": {"$sum": 1}}}
+        ])
+    }
+    comment_counts = {
+        doc["_id"]: doc["count"]
+        async for doc in db.social_comments.aggregate([
+            {"$match": {"is_deleted": False}},
+            {"$group": {"_id": "$post_id", "count": {"$sum": 1}}}
+        ])
+    }
+    
+    stats = {"posts_scanned": 0, "posts_repaired": 0, "like_fixes": 0, "comment_fixes": 0}
+    pending = []
+    
+    async for post in db.social_posts.find({}, {"_id": 0, "id": 1, "like_count": 1, "comment_count": 1}):
+        stats["posts_scanned"] += 1
+        fixes = {}
+        
+        true_likes = like_counts.get(post["id"], 0)
+        if post.get("like_count", 0) != true_likes:
+            fixes["like_count"] = true_likes
+            stats["like_fixes"] += 1
+        
+        true_comments = comment_counts.get(post["id"], 0)
+        if post.get("comment_count", 0) != true_comments:
+            fixes["comment_count"] = true_comments
+            stats["comment_fixes"] += 1
+        
+        if fixes:
+            pending.append(UpdateOne({"id": post["id"]}, {"$set": fixes}))
+            stats["posts_repaired"] += 1
+        
+        if len(pending) >= batch_size:
+            await db.social_posts.bulk_write(pending, ordered=False)
+            pending = []
+    
+    if pending:
+        await db.social_posts.bulk_write(pending, ordered=False)
+    
+    return stats
@@ -0,0 +1,437 @@
+"""
+Social Timelines - Fan-out-on-write home timelines
+Materialized per-user timelines built from circle_edges.
+
+When a post is created its id is pushed into the timeline of every user who
+has the author in their circle (PEOPLES..OTHERS). SAFE MODE and BLOCKED edges
+in either direction suppress delivery. Authors whose audience exceeds
+FANOUT_MAX_DEGREE are not fanned out; their posts are merged in at read time.
+Such an author stays on read-time merge until backfill_timelines has pushed
+their recent posts again and clears the flag.
+
+Timeline entries are one document per (owner_id, post_id) so a home feed page
+is a single range scan on (owner_id, created_at, post_id).
+"""
+
+from datetime import datetime, timezone, timedelta
+from typing import Dict, List, Optional, Set
+import logging
+import os
+import time
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from db.connection import get_db
+from db.relationships import (
+    TIER_PEOPLES,
+    TIER_COOL,
+    TIER_CHILL,
+    TIER_ALRIGHT,
+    TIER_OTHERS,
+    TIER_OTHERS_SAFE_MODE,
+    TIER_BLOCKED
+)
+from db.social_posts import FEED_SORT, encode_feed_cursor, keyset_filter
+from db.social_hydration import hydrate_posts
+
+logger = logging.getLogger(__name__)
+
+
+# Timeline entries kept per user. Fan-out does not trim: a timeline can run
+# past the cap by what it receives between hourly maintenance trims (reads
+# are keyset pages, so only storage grows)
+TIMELINE_MAX_ENTRIES = int(os.environ.get("SOCIAL_TIMELINE_MAX_ENTRIES", "800"))
+
+# Authors with a larger audience are merged at read time instead of fanned out
+FANOUT_MAX_DEGREE = int(os.environ.get("SOCIAL_FANOUT_MAX_DEGREE", "5000"))
+
+# Tiers that receive an author's posts
+FANOUT_TIERS = [TIER_PEOPLES, TIER_COOL, TIER_CHILL, TIER_ALRIGHT, TIER_OTHERS]
+
+# Tiers that suppress delivery (in either direction)
+SUPPRESSED_TIERS = [TIER_OTHERS_SAFE_MODE, TIER_BLOCKED]
+
+TIMELINE_SORT = [("created_at", -1), ("post_id", -1)]
+
+VISIBLE_POST_FILTER = {"is_deleted": False, "is_hidden": False}
+
+# High-degree author ids change rarely; keep a short-lived copy per process
+PULL_AUTHORS_TTL_SECONDS = 60
+_pull_authors_cache = {"ids": None, "loaded_at": 0.0}
+
+
+def _timeline_entry(owner_id: str, post: dict) -> dict:
+    return {
+        "owner_id": owner_id,
+        "post_id": post["id"],
+        "author_id": post["author_id"],
+        "created_at": post["created_at"]
+    }
+
+
+async def get_fanout_audience(db, author_id: str) -> List[str]:
+    """
+    Users whose home timeline should receive author_id's posts.
+    Always includes the author; excludes anyone either side has suppressed.
+    """
+    followers = await db.circle_edges.find(
+        {"targetUserId": author_id, "tier": {"$in": FANOUT_TIERS}},
+        {"_id": 0, "ownerUserId": 1}
+    ).to_list(length=None)
+
+    suppressed = await db.circle_edges.find(
+        {"ownerUserId": author_id, "tier": {"$in": SUPPRESSED_TIERS}},
+        {"_id": 0, "targetUserId": 1}
+    ).to_list(length=None)
+    excluded = {edge["targetUserId"] for edge in suppressed}
+
+    audience = [author_id]
+    for edge in followers:
+        owner_id = edge["ownerUserId"]
+        if owner_id != author_id and owner_id not in excluded:
+            audience.append(owner_id)
+
+    return list(dict.fromkeys(audience))
+
+
+async def _write_entries(db, owner_ids: List[str], post: dict, upsert: bool = False) -> int:
+    """Write timeline entries; upsert mode is idempotent for backfills/repairs"""
+    if not owner_ids:
+        return 0
+
+    if upsert:
+        result = await db.social_timelines.bulk_write([
+            UpdateOne(
+                {"owner_id": owner_id, "post_id": post["id"]},
+                {"$setOnInsert": _timeline_entry(owner_id, post)},
+                upsert=True
+            )
+            for owner_id in owner_ids
+        ], ordered=False)
+        return result.upserted_count
+
+    try:
+        result = await db.social_timelines.insert_many(
+            [_timeline_entry(owner_id, post) for owner_id in owner_ids],
+            ordered=False
+        )
+        return len(result.inserted_ids)
+    except BulkWriteError as e:
+        # Duplicate (owner_id, post_id) entries are harmless - already delivered
+        details = e.details or {}
+        return details.get("nInserted", 0)
+
+
+async def _mark_pull_author(db, author_id: str, degree: int):
+    await db.social_pull_authors.update_one(
+        {"author_id": author_id},
+        {"$set": {"degree": degree, "updated_at": datetime.now(timezone.utc)}},
+        upsert=True
+    )
+    _pull_authors_cache["ids"] = None
+
+
+async def _deliver(db, post: dict, audience: List[str], upsert: bool) -> Dict:
+    degree = len(audience) - 1
+
+    pulled = degree > FANOUT_MAX_DEGREE
+    if pulled:
+        await _mark_pull_author(db, post["author_id"], degree)
+    elif not upsert:
+        # An author who dropped under the cap keeps read-time merge until the
+        # backfill re-delivers their older posts and clears the flag
+        pulled = post["author_id"] in await _get_pull_author_ids(db)
+
+    mode = "push"
+    if pulled:
+        # High-degree author: only the author's own timeline is materialized
+        audience = [post["author_id"]]
+        mode = "pull"
+
+    written = await _write_entries(db, audience, post, upsert=upsert)
+
+    return {"mode": mode, "audience": degree, "written": written}
+
+
+async def fan_out_post(post: dict) -> Dict:
+    """
+    Push a new post into its audience's home timelines.
+
+    Returns:
+        {"mode": "push"|"pull", "audience": int, "written": int}
+    """
+    db = await get_db()
+
+    audience = await get_fanout_audience(db, post["author_id"])
+    return await _deliver(db, post, audience, upsert=False)
+
+
+async def _get_pull_author_ids(db) -> List[str]:
+    now = time.monotonic()
+    if (
+        _pull_authors_cache["ids"] is None
+        or now - _pull_authors_cache["loaded_at"] > PULL_AUTHORS_TTL_SECONDS
+    ):
+        docs = await db.social_pull_authors.find({}, {"_id": 0, "author_id": 1}).to_list(length=None)
+        _pull_authors_cache["ids"] = [doc["author_id"] for doc in docs]
+        _pull_authors_cache["loaded_at"] = now
+    return _pull_authors_cache["ids"]
+
+
+async def _get_pulled_entries(db, viewer_id: str, cursor: Optional[str], limit: int) -> List[dict]:
+    """Recent posts from high-degree authors in the viewer's circle (read-time merge)"""
+    pull_author_ids = await _get_pull_author_ids(db)
+    if not pull_author_ids:
+        return []
+
+    edges = await db.circle_edges.find(
+        {
+            "ownerUserId": viewer_id,
+            "targetUserId": {"$in": pull_author_ids},
+            "tier": {"$in": FANOUT_TIERS}
+        },
+        {"_id": 0, "targetUserId": 1}
+    ).to_list(length=None)
+    author_ids = [edge["targetUserId"] for edge in edges]
+    if not author_ids:
+        return []
+
+    # Drop authors who have suppressed the viewer
+    suppressed = await db.circle_edges.find(
+        {
+            "ownerUserId": {"$in": author_ids},
+            "targetUserId": viewer_id,
+            "tier": {"$in": SUPPRESSED_TIERS}
+        },
+        {"_id": 0, "ownerUserId": 1}
+    ).to_list(length=None)
+    excluded = {edge["ownerUserId"] for edge in suppressed}
+    author_ids = [a for a in author_ids if a not in excluded]
+    if not author_ids:
+        return []
+
+    posts = await db.social_posts.find(
+        keyset_filter({**VISIBLE_POST_FILTER, "author_id": {"$in": author_ids}}, cursor),
+        {"_id": 0, "id": 1, "author_id": 1, "created_at": 1}
+    ).sort(FEED_SORT).limit(limit).to_list(length=None)
+
+    return [
+        {"post_id": p["id"], "author_id": p["author_id"], "created_at": p["created_at"]}
+        for p in posts
+    ]
+
+
+async def _get_viewer_suppressed_authors(db, viewer_id: str) -> Set[str]:
+    """Authors the viewer has BLOCKED or put in SAFE MODE since delivery"""
+    edges = await db.circle_edges.find(
+        {"ownerUserId": viewer_id, "tier": {"$in": SUPPRESSED_TIERS}},
+        {"_id": 0, "targetUserId": 1}
+    ).to_list(length=None)
+    return {edge["targetUserId"] for edge in edges}
+
+
+async def get_home_timeline(viewer_id: str, cursor: Optional[str] = None, page_size: int = 20):
+    """
+    Read the viewer's materialized home timeline (keyset paginated).
+    Response shape matches db.social_posts.get_feed_by_cursor.
+    """
+    db = await get_db()
+
+    limit = page_size + 1
+    entries = await db.social_timelines.find(
+        keyset_filter({"owner_id": viewer_id}, cursor, id_field="post_id"),
+        {"_id": 0, "post_id": 1, "author_id": 1, "created_at": 1}
+    ).sort(TIMELINE_SORT).limit(limit).to_list(length=None)
+
+    pulled = await _get_pulled_entries(db, viewer_id, cursor, limit)
+    if pulled:
+        seen = {e["post_id"] for e in entries}
+        entries.extend(e for e in pulled if e["post_id"] not in seen)
+        entries.sort(key=lambda e: (e["created_at"], e["post_id"]), reverse=True)
+        entries = entries[:limit]
+
+    has_more = len(entries) > page_size
+    entries = entries[:page_size]
+    next_cursor = None
+    if has_more and entries:
+        last = entries[-1]
+        next_cursor = encode_feed_cursor({"id": last["post_id"], "created_at": last["created_at"]})
+
+    suppressed = await _get_viewer_suppressed_authors(db, viewer_id)
+    post_ids = [e["post_id"] for e in entries if e.get("author_id") not in suppressed]
+
+    posts = []
+    if post_ids:
+        found = await db.social_posts.find(
+            {**VISIBLE_POST_FILTER, "id": {"$in": post_ids}},
+            {"_id": 0}
+        ).to_list(length=None)
+        by_id = {p["id"]: p for p in found}
+        posts = [by_id[pid] for pid in post_ids if pid in by_id]
+
+    return {
+        "page_size": page_size,
+        "items": await hydrate_posts(db, posts, viewer_id),
+        "next_cursor": next_cursor,
+        "has_more": has_more,
+        "total_items": None,
+        "total_is_estimate": False
+    }
+
+
+# ==========================================
+# MAINTENANCE: TRIM / BACKFILL / CONSISTENCY
+# ==========================================
+
+async def trim_timeline(db, owner_id: str, max_entries: int = TIMELINE_MAX_ENTRIES) -> int:
+    """Delete entries beyond the newest max_entries for one user"""
+    boundary = await db.social_timelines.find(
+        {"owner_id": owner_id},
+        {"_id": 0, "post_id": 1, "created_at": 1}
+    ).sort(TIMELINE_SORT).skip(max_entries - 1).limit(1).to_list(length=1)
+
+    if not boundary:
+        return 0
+
+    oldest_kept = boundary[0]
+    result = await db.social_timelines.delete_many({
+        "owner_id": owner_id,
+        "$or": [
+            {"created_at": {"$lt": oldest_kept["created_at"]}},
+            {"created_at": oldest_kept["created_at"], "post_id": {"$lt": oldest_kept["post_id"]}}
+        ]
+    })
+    return result.deleted_count
+
+
+async def trim_all_timelines(max_entries: int = TIMELINE_MAX_ENTRIES) -> Dict[str, int]:
+    """Enforce the per-user cap across every timeline that exceeds it"""
+    db = await get_db()
+
+    over_cap = await db.social_timelines.aggregate([
+        {"$group": {"_id": "$owner_id", "count": {"$sum": 1}}},
+        {"$match": {"count": {"$gt": max_entries}}}
+    ]).to_list(length=None)
+
+    deleted = 0
+    for doc in over_cap:
+        deleted += await trim_timeline(db, doc["_id"], max_entries)
+
+    return {"timelines_trimmed": len(over_cap), "entries_deleted": deleted}
+
+
+async def backfill_timelines(days: int = 30, batch_size: int = 500) -> Dict[str, int]:
+    """
+    Rebuild timelines from recent posts (idempotent upserts).
+
+    Also recomputes which authors are served by read-time merge: authors over
+    FANOUT_MAX_DEGREE are flagged, and flagged authors whose recent posts were
+    pushed here (their audience fell back under the cap) are unflagged.
+    Authors with no posts in the window keep their flag. Timelines are trimmed
+    back to TIMELINE_MAX_ENTRIES every batch_size posts and at the end.
+    """
+    db = await get_db()
+
+    since = datetime.now(timezone.utc) - timedelta(days=days)
+    cursor = db.social_posts.find(
+        {**VISIBLE_POST_FILTER, "created_at": {"$gte": since}},
+        {"_id": 0, "id": 1, "author_id": 1, "created_at": 1}
+    ).sort(FEED_SORT)
+
+    stats = {"posts": 0, "entries_written": 0, "pull_posts": 0, "errors": 0, "entries_trimmed": 0}
+    audiences: Dict[str, List[str]] = {}
+    pushed_authors: Set[str] = set()
+    async for post in cursor:
+        try:
+            author_id = post["author_id"]
+            if author_id not in audiences:
+                audiences[author_id] = await get_fanout_audience(db, author_id)
+            result = await _deliver(db, post, audiences[author_id], upsert=True)
+            stats["posts"] += 1
+            stats["entries_written"] += result["written"]
+            if result["mode"] == "pull":
+                stats["pull_posts"] += 1
+            else:
+                pushed_authors.add(author_id)
+        except Exception as e:
+            logger.error(f"Timeline backfill failed for post {post.get('id')}: {e}")
+            stats["errors"] += 1
+
+        if stats["posts"] % batch_size == 0:
+            stats["entries_trimmed"] += (await trim_all_timelines(TIMELINE_MAX_ENTRIES))["entries_deleted"]
+            logger.info(f"Timeline backfill progress: {stats}")
+
+    stale = await db.social_pull_authors.delete_many({"author_id": {"$in": sorted(pushed_authors)}})
+    _pull_authors_cache["ids"] = None
+    stats["pull_authors_cleared"] = stale.deleted_count
+
+    stats["entries_trimmed"] += (await trim_all_timelines(TIMELINE_MAX_ENTRIES))["entries_deleted"]
+    return stats
+
+
+async def check_timeline_consistency(sample_size: int = 200, repair: bool = False) -> Dict:
+    """
+    Compare the most recent posts' timeline entries against the audience
+    computed from circle_edges.
+
+    Reports missing deliveries, unexpected deliveries (e.g. a block added
+    after posting) and entries pointing at deleted/hidden posts. With
+    repair=True the differences are fixed in place.
+    """
+    db = await get_db()
+
+    posts = await db.social_posts.find(
+        {},
+        {"_id": 0, "id": 1, "author_id": 1, "created_at": 1, "is_deleted": 1, "is_hidden": 1}
+    ).sort(FEED_SORT).limit(sample_size).to_list(length=None)
+
+    pull_author_ids = set(await _get_pull_author_ids(db))
+
+    report = {
+        "posts_checked": len(posts),
+        "missing_entries": 0,
+        "unexpected_entries": 0,
+        "stale_entries": 0,
+        "inconsistent_posts": [],
+        "repaired": repair
+    }
+
+    for post in posts:
+        entries = await db.social_timelines.find(
+            {"post_id": post["id"]},
+            {"_id": 0, "owner_id": 1}
+        ).to_list(length=None)
+        actual = {e["owner_id"] for e in entries}
+
+        if post.get("is_deleted") or post.get("is_hidden"):
+            if actual:
+                report["stale_entries"] += len(actual)
+                report["inconsistent_posts"].append(post["id"])
+                if repair:
+                    await db.social_timelines.delete_many({"post_id": post["id"]})
+            continue
+
+        if post["author_id"] in pull_author_ids:
+            expected = {post["author_id"]}
+        else:
+            expected = set(await get_fanout_audience(db, post["author_id"]))
+
+        missing = expected - actual
+        unexpected = actual - expected
+        if not missing and not unexpected:
+            continue
+
+        report["missing_entries"] += len(missing)
+        report["unexpected_entries"] += len(unexpected)
+        report["inconsistent_posts"].append(post["id"])
+
+        if repair:
+            await _write_entries(db, sorted(missing), post, upsert=True)
+            if unexpected:
+                await db.social_timelines.delete_many({
+                    "post_id": post["id"],
+                    "owner_id": {"$in": sorted(unexpected)}
+                })
+
+    return report
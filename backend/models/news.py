@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Dict, Optional
 from pydantic import BaseModel, Field
 from datetime import datetime
 import uuid
@@ -33,6 +33,10 @@ class NewsItemPublic(BaseModel):
     title: str
     summary: str
     imageUrl: Optional[str] = None
+    # Mirrored images: {"webp": srcset, "jpeg": srcset} + largest rendition size
+    imageSrcset: Optional[Dict[str, str]] = None
+    imageWidth: Optional[int] = None
+    imageHeight: Optional[int] = None
     publishedAt: str  # ISO timestamp string
     category: str
     region: Optional[str] = None  # Geographic region for filtering
@@ -0,0 +1,46 @@
+from typing import Optional
+from pydantic import BaseModel, Field, field_validator
+
+
+# RSS source registry (db/rss_sources) - admin edits
+class RSSSourceCreate(BaseModel):
+    """New source added from the admin panel"""
+    id: str = Field(..., pattern=r"^[a-z0-9_]+$", max_length=80)
+    category: str
+    source_name: str
+    rss_url: str
+    language: str = "en"
+    active: bool = True
+    featured_source: bool = False
+    priority: int = Field(2, ge=1, le=5)
+    region: Optional[str] = None
+    is_black_owned: bool = False
+    is_black_focus: bool = False
+
+    @field_validator("rss_url")
+    @classmethod
+    def check_feed_url(cls, v):
+        if v is not None and not v.startswith(("http://", "https://")):
+            raise ValueError("rss_url must be an http(s) URL")
+        return v
+
+
+class RSSSourceUpdate(BaseModel):
+    """Partial edit of a registered source; omitted fields are unchanged"""
+    category: Optional[str] = None
+    source_name: Optional[str] = None
+    rss_url: Optional[str] = None
+    language: Optional[str] = None
+    active: Optional[bool] = None
+    featured_source: Optional[bool] = None
+    priority: Optional[int] = Field(None, ge=1, le=5)
+    region: Optional[str] = None
+    is_black_owned: Optional[bool] = None
+    is_black_focus: Optional[bool] = None
+
+    @field_validator("rss_url")
+    @classmethod
+    def check_feed_url(cls, v):
+        if v is not None and not v.startswith(("http://", "https://")):
+            raise ValueError("rss_url must be an http(s) URL")
+        return v
@@ -72,6 +72,16 @@ class SocialFeedResponse(BaseModel):
     items: list[SocialPost]
 
 
+class SocialFeedCursorResponse(BaseModel):
+    """Social feed keyset-paginated response (cursor mode)"""
+    page_size: int
+    items: list[SocialPost]
+    next_cursor: Optional[str] = None
+    has_more: bool = False
+    total_items: Optional[int] = None  # Approximate, only when include_total=true
+    total_is_estimate: bool = False
+
+
 class SocialCommentCreate(BaseModel):
     """Create comment request"""
     text: str = Field(..., min_length=1, max_length=2000, description="Comment text (includes emoji placeholders)")
@@ -1,29 +1,63 @@
 """
 Admin RSS Management Endpoint
-Simple functional view for RSS source management
+RSS source registry (db/rss_sources): list with health / quarantine state,
+add, edit and remove sources without a restart; plus the pipeline run
+ledger (rss_pipeline_runs) for spotting slow sources and capacity trends
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pymongo.errors import DuplicateKeyError
 from typing import List, Dict, Any
 from datetime import datetime
 import sys
 sys.path.append('/app/backend')
 
-from config.rss_sources import RSS_SOURCES, get_stats, get_categories
+from db.rss_pipeline_runs import get_run, list_runs, list_runs_with_sources
+from db.rss_sources import (
+    create_rss_source,
+    delete_rss_source,
+    load_rss_sources,
+    release_quarantine,
+    update_rss_source,
+)
+from middleware.auth_guard import require_role
+from models.rss_source import RSSSourceCreate, RSSSourceUpdate
+from services.rss_run_ledger import source_latency_report
+from services.rss_source_health import is_quarantined
 
 router = APIRouter(prefix="/api/admin/rss", tags=["admin-rss"])
 
 
+def _registry_stats(sources: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Same shape as config.rss_sources.get_stats, over the registry"""
+    active = len([s for s in sources if s.get("active", True)])
+    categories = sorted(set(s["category"] for s in sources))
+    return {
+        "total_sources": len(sources),
+        "active_sources": active,
+        "inactive_sources": len(sources) - active,
+        "quarantined_sources": len([s for s in sources if is_quarantined(s)]),
+        "categories": len(categories),
+        "category_list": categories,
+    }
+
+
 @router.get("/sources")
-async def list_rss_sources():
+async def list_rss_sources(
+    current_user: dict = Depends(require_role("super_admin", "moderator"))
+):
     """
     List all RSS sources with their status
     
+    Requires JWT token with super_admin or moderator role (health and
+    quarantine entries carry feed error text).
+    
     Returns:
-        List of RSS sources with metadata
+        List of RSS sources with metadata, rolling health and quarantine state
     """
+    registry = await load_rss_sources()
     sources_with_status = []
     
-    for source in RSS_SOURCES:
+    for source in registry:
         sources_with_status.append({
             "id": source["id"],
             "source_name": source["source_name"],
@@ -33,38 +67,121 @@ async def list_rss_sources():
             "priority": source.get("priority", 2),
             "featured_source": source.get("featured_source", False),
             "language": source.get("language", "en"),
+            "origin": source.get("origin"),
+            "admin_edited": source.get("admin_edited", False),
+            "health": source.get("health"),
+            "quarantine": source.get("quarantine"),
         })
     
     return {
         "sources": sources_with_status,
-        "stats": get_stats()
+        "stats": _registry_stats(registry)
     }
 
 
+@router.post("/sources", status_code=201)
+async def add_rss_source(
+    source: RSSSourceCreate,
+    current_user: dict = Depends(require_role("super_admin"))
+):
+    """
+    Add a source; the next scheduler tick picks it up
+    
+    Requires JWT token with super_admin role.
+    """
+    try:
+        return await create_rss_source(source.model_dump())
+    except DuplicateKeyError:
+        raise HTTPException(status_code=409, detail=f"Source {source.id} already exists")
+
+
+@router.patch("/sources/{source_id}")
+async def edit_rss_source(
+    source_id: str,
+    update: RSSSourceUpdate,
+    current_user: dict = Depends(require_role("super_admin"))
+):
+    """
+    Edit a source (e.g. active=false to disable it). Edited config sources
+    keep the edit when config/rss_sources.py is re-seeded.
+    
+    Requires JWT token with super_admin role.
+    """
+    fields = update.model_dump(exclude_none=True)
+    if not fields:
+        raise HTTPException(status_code=400, detail="No fields to update")
+    
+    source = await update_rss_source(source_id, fields)
+    if not source:
+        raise HTTPException(status_code=404, detail="Source not found")
+    return source
+
+
+@router.delete("/sources/{source_id}")
+async def remove_rss_source(
+    source_id: str,
+    current_user: dict = Depends(require_role("super_admin"))
+):
+    """
+    Remove a source. Config sources come back on the next seed; disable
+    them with PATCH active=false instead.
+    
+    Requires JWT token with super_admin role.
+    """
+    if not await delete_rss_source(source_id):
+        raise HTTPException(status_code=404, detail="Source not found")
+    return {"success": True, "id": source_id}
+
+
+@router.post("/sources/{source_id}/release")
+async def release_rss_source(
+    source_id: str,
+    current_user: dict = Depends(require_role("super_admin"))
+):
+    """
+    Take a source out of quarantine now instead of waiting for its probe
+    
+    Requires JWT token with super_admin role.
+    """
+    source = await release_quarantine(source_id)
+    if not source:
+        raise HTTPException(status_code=404, detail="Source not found")
+    return source
+
+
 @router.get("/stats")
-async def get_rss_stats():
+async def get_rss_stats(
+    current_user: dict = Depends(require_role("super_admin", "moderator"))
+):
     """
     Get RSS feed statistics
     
+    Requires JWT token with super_admin or moderator role.
+    
     Returns:
         Statistics about RSS sources
     """
-    return get_stats()
+    return _registry_stats(await load_rss_sources())
 
 
 @router.get("/categories")
-async def get_rss_categories():
+async def get_rss_categories(
+    current_user: dict = Depends(require_role("super_admin", "moderator"))
+):
     """
     Get list of all RSS categories
     
+    Requires JWT token with super_admin or moderator role.
+    
     Returns:
         List of categories with source counts
     """
-    categories = get_categories()
+    registry = await load_rss_sources()
+    categories = sorted(set(s["category"] for s in registry))
     category_stats = {}
     
     for category in categories:
-        sources = [s for s in RSS_SOURCES if s["category"] == category]
+        sources = [s for s in registry if s["category"] == category]
         active_count = len([s for s in sources if s.get("active", True)])
         
         category_stats[category] = {
@@ -80,17 +197,74 @@ async def get_rss_categories():
 
 
 @router.get("/health")
-async def get_feed_health():
+async def get_feed_health(
+    current_user: dict = Depends(require_role("super_admin", "moderator"))
+):
     """
     Get health status of RSS feeds
     
+    Same access as /runs: the last run and quarantine entries carry feed
+    error text.
+    
     Returns:
-        Health report including recent sync results
+        Registry stats, quarantined sources and the last pipeline run
     """
-    # This would be enhanced to show actual sync results from database
-    # For now, return basic stats
+    registry = await load_rss_sources()
+    runs = await list_runs(limit=1)
     return {
-        "message": "Feed health endpoint - to be enhanced with sync history",
-        "stats": get_stats(),
+        "message": "Feed health endpoint; per-run history at /api/admin/rss/runs",
+        "stats": _registry_stats(registry),
+        "quarantined": [
+            {"id": s["id"], "source_name": s["source_name"], **s["quarantine"]}
+            for s in registry if is_quarantined(s)
+        ],
+        "last_run": runs[0] if runs else None,
         "note": "Run POST /api/news/rss-sync to trigger a sync and see detailed results"
     }
+
+
+@router.get("/runs")
+async def list_pipeline_runs(
+    limit: int = Query(20, ge=1, le=200),
+    current_user: dict = Depends(require_role("super_admin", "moderator"))
+):
+    """
+    Recent scheduled pipeline runs, newest first: status, wall clock,
+    per-stage seconds and totals (per-source entries via /runs/{run_id})
+    
+    Requires JWT token with super_admin or moderator role.
+    """
+    runs = await list_runs(limit=limit)
+    return {"runs": runs, "count": len(runs)}
+
+
+@router.get("/runs/source-latency")
+async def get_source_latency(
+    runs: int = Query(20, ge=1, le=100),
+    current_user: dict = Depends(require_role("super_admin", "moderator"))
+):
+    """
+    Per-source fetch latency, bytes and failures over the last `runs` runs
+    that synced anything, slowest first
+    
+    Requires JWT token with super_admin or moderator role.
+    """
+    recent = await list_runs_with_sources(limit=runs)
+    return {"runs": len(recent), "sources": source_latency_report(recent)}
+
+
+@router.get("/runs/{run_id}")
+async def get_pipeline_run(
+    run_id: str,
+    current_user: dict = Depends(require_role("super_admin", "moderator"))
+):
+    """
+    One run with its per-source entries (HTTP status, bytes, items parsed /
+    added / duplicate, fetch / parse / sentiment / store seconds)
+    
+    Requires JWT token with super_admin or moderator role.
+    """
+    run = await get_run(run_id)
+    if not run:
+        raise HTTPException(status_code=404, detail="Run not found")
+    return run
@@ -5,10 +5,11 @@ Phase 11.6-11.9
 Base path: /api/community/*
 """
 
-from fastapi import APIRouter, Query, HTTPException, Depends, Request
+from fastapi import APIRouter, Query, HTTPException, Depends, Request, Response
 from typing import Optional, List
 from uuid import uuid4
 from datetime import datetime, timezone
+from functools import partial
 
 from models.community import (
     HealthResourcesResponse,
@@ -27,6 +28,7 @@ from models.community import (
 from db.community import CommunityDB
 from db.connection import get_db_client
 from middleware.auth_guard import get_current_user as get_current_user_dependency
+from utils.conditional_get import fetch_listing
 
 
 router = APIRouter(prefix="/api/community", tags=["Community Life Hub"])
@@ -36,6 +38,8 @@ router = APIRouter(prefix="/api/community", tags=["Community Life Hub"])
 
 @router.get("/pros", response_model=CommunityProsResponse)
 async def get_community_pros(
+    request: Request,
+    response: Response,
     pillar: Optional[str] = None,
     role: Optional[str] = None,
     region: Optional[str] = None,
@@ -45,13 +49,19 @@ async def get_community_pros(
     db = get_db_client()
     community_db = CommunityDB(db)
     
-    pros = await community_db.get_all_pros(
+    fetch = partial(
+        community_db.get_all_pros,
         pillar=pillar,
         role=role,
         region=region,
         verified_only=verified_only
     )
     
+    # Conditional GET: a revalidation is answered from an ids/timestamps-only probe
+    pros = await fetch_listing(request, response, fetch)
+    if isinstance(pros, Response):
+        return pros
+    
     return {
         "pros": pros,
         "total": len(pros)
@@ -62,6 +72,8 @@ async def get_community_pros(
 
 @router.get("/health/resources", response_model=HealthResourcesResponse)
 async def get_health_resources(
+    request: Request,
+    response: Response,
     category: Optional[str] = None,
     tags: Optional[str] = Query(None, description="Comma-separated tags"),
     limit: int = Query(50, le=100)
@@ -72,12 +84,17 @@ async def get_health_resources(
     
     tags_list = tags.split(",") if tags else None
     
-    resources = await community_db.get_health_resources(
+    fetch = partial(
+        community_db.get_health_resources,
         category=category,
         tags=tags_list,
         limit=limit
     )
     
+    resources = await fetch_listing(request, response, fetch)
+    if isinstance(resources, Response):
+        return resources
+    
     return {
         "resources": resources,
         "total": len(resources)
@@ -100,6 +117,8 @@ async def get_health_resource(slug: str):
 
 @router.get("/health/providers", response_model=HealthProvidersResponse)
 async def get_health_providers(
+    request: Request,
+    response: Response,
     type: Optional[str] = None,
     service_types: Optional[str] = Query(None, description="Comma-separated service types"),
     region: Optional[str] = None,
@@ -117,7 +136,8 @@ async def get_health_providers(
     
     service_types_list = service_types.split(",") if service_types else None
     
-    providers = await community_db.get_health_providers(
+    fetch = partial(
+        community_db.get_health_providers,
         type=type,
         service_types=service_types_list,
         region=region,
@@ -130,6 +150,10 @@ async def get_health_providers(
         limit=limit
     )
     
+    providers = await fetch_listing(request, response, fetch)
+    if isinstance(providers, Response):
+        return providers
+    
     return {
         "providers": providers,
         "total": len(providers)
@@ -157,6 +181,8 @@ async def get_health_provider_detail(provider_id: str):
 
 @router.get("/fitness/programs", response_model=FitnessProgramsResponse)
 async def get_fitness_programs(
+    request: Request,
+    response: Response,
     level: Optional[str] = None,
     focus: Optional[str] = Query(None, description="Comma-separated focus areas"),
     delivery: Optional[str] = None,
@@ -170,7 +196,8 @@ async def get_fitness_programs(
     focus_list = focus.split(",") if focus else None
     chronic_list = chronic_friendly.split(",") if chronic_friendly else None
     
-    programs = await community_db.get_fitness_programs(
+    fetch = partial(
+        community_db.get_fitness_programs,
         level=level,
         focus=focus_list,
         delivery=delivery,
@@ -178,6 +205,10 @@ async def get_fitness_programs(
         limit=limit
     )
     
+    programs = await fetch_listing(request, response, fetch)
+    if isinstance(programs, Response):
+        return programs
+    
     return {
         "programs": programs,
         "total": len(programs)
@@ -203,6 +234,8 @@ async def get_fitness_program(program_id: str):
 
 @router.get("/fitness/coaches", response_model=CommunityProsResponse)
 async def get_fitness_coaches(
+    request: Request,
+    response: Response,
     region: Optional[str] = None,
     specialization: Optional[str] = None,
     online_only: Optional[bool] = None
@@ -211,12 +244,17 @@ async def get_fitness_coaches(
     db = get_db_client()
     community_db = CommunityDB(db)
     
-    coaches = await community_db.get_fitness_coaches(
+    fetch = partial(
+        community_db.get_fitness_coaches,
         region=region,
         specialization=specialization,
         online_only=online_only
     )
     
+    coaches = await fetch_listing(request, response, fetch)
+    if isinstance(coaches, Response):
+        return coaches
+    
     return {
         "pros": coaches,
         "total": len(coaches)
@@ -298,6 +336,8 @@ async def enroll_in_program(
 
 @router.get("/food/recipes", response_model=RecipesResponse)
 async def get_recipes(
+    request: Request,
+    response: Response,
     category: Optional[str] = None,
     origin_region: Optional[str] = None,
     difficulty: Optional[str] = None,
@@ -310,7 +350,8 @@ async def get_recipes(
     
     tags_list = tags.split(",") if tags else None
     
-    recipes = await community_db.get_recipes(
+    fetch = partial(
+        community_db.get_recipes,
         category=category,
         origin_region=origin_region,
         difficulty=difficulty,
@@ -319,6 +360,10 @@ async def get_recipes(
         limit=limit
     )
     
+    recipes = await fetch_listing(request, response, fetch)
+    if isinstance(recipes, Response):
+        return recipes
+    
     return {
         "recipes": recipes,
         "total": len(recipes)
@@ -397,6 +442,8 @@ async def submit_recipe(
 
 @router.get("/school/resources", response_model=SchoolResourcesResponse)
 async def get_school_resources(
+    request: Request,
+    response: Response,
     type: Optional[str] = None,
     subject: Optional[str] = Query(None, description="Comma-separated subjects"),
     age_range: Optional[str] = None,
@@ -411,7 +458,8 @@ async def get_school_resources(
     
     subject_list = subject.split(",") if subject else None
     
-    resources = await community_db.get_school_resources(
+    fetch = partial(
+        community_db.get_school_resources,
         type=type,
         subject=subject_list,
         age_range=age_range,
@@ -421,6 +469,10 @@ async def get_school_resources(
         limit=limit
     )
     
+    resources = await fetch_listing(request, response, fetch)
+    if isinstance(resources, Response):
+        return resources
+    
     return {
         "resources": resources,
         "total": len(resources)
@@ -1,11 +1,22 @@
 """
 Feed Aggregation Routes - Phase 6.2.4
 Unified feed endpoint that aggregates content from multiple sources
+
+Sources are queried concurrently, each in (time field DESC, _id DESC) order
+starting after its own keyset position, and merged lazily with a heap. The
+composite cursor carries one position per source, so any page costs
+O(page size) per source regardless of depth.
 """
 
+import asyncio
+import base64
+import binascii
+import heapq
+import json
 from fastapi import APIRouter, Query, HTTPException
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime, timedelta, timezone
+from bson import ObjectId
 from pydantic import BaseModel
 
 from db.connection import get_db
@@ -30,9 +41,11 @@ class FeedItem(BaseModel):
 
 class FeedResponse(BaseModel):
     items: List[FeedItem]
-    total: int
-    page: int
-    pages: int
+    total: Optional[int] = None  # Page mode only
+    page: Optional[int] = None  # Page mode only
+    pages: Optional[int] = None  # Page mode only
+    next_cursor: Optional[str] = None
+    has_more: bool = False
 
 
 def get_date_filter(date_range: str) -> Optional[datetime]:
@@ -49,181 +62,300 @@ def get_date_filter(date_range: str) -> Optional[datetime]:
         return None
 
 
-async def fetch_news_items(date_cutoff: Optional[datetime], limit: int) -> List[FeedItem]:
-    """Fetch news items for feed"""
-    db = await get_db()
-    collection = db["news_items"]
-    
-    query = {}
-    if date_cutoff:
-        query["published_at"] = {"$gte": date_cutoff}
-    
-    cursor = collection.find(query).sort("published_at", -1).limit(limit)
-    items = []
-    
-    async for item in cursor:
-        # Phase 6.6 - Compute heavy content banner data
-        heavy = is_heavy_content(item)
-        banner_msg = get_banner_message(item)
-        
-        items.append(FeedItem(
-            id=item["id"],
-            type="news",
-            title=item["title"],
-            summary=item["summary"][:200] if item.get("summary") else "",
-            link=f"/world-news/{item['id']}",
-            thumbnail=item.get("imageUrl", "/static/img/fallbacks/news_default.jpg"),
-            created_at=item.get("published_at", item.get("created_at", datetime.now(timezone.utc))).isoformat(),
-            metadata={
-                "category": item.get("category", "General"),
-                "region": item.get("region"),
-                "sentiment_label": item.get("sentiment_label"),
-                "sentiment_score": item.get("sentiment_score")
-            },
-            heavy_content=heavy,
-            banner_message=banner_msg
-        ))
-    
-    return items
+def _news_item(item: dict) -> FeedItem:
+    # Phase 6.6 - Compute heavy content banner data
+    heavy = is_heavy_content(item)
+    banner_msg = get_banner_message(item)
+    
+    return FeedItem(
+        id=item["id"],
+        type="news",
+        title=item["title"],
+        summary=item["summary"][:200] if item.get("summary") else "",
+        link=f"/world-news/{item['id']}",
+        thumbnail=item.get("imageUrl", "/static/img/fallbacks/news_default.jpg"),
+        created_at=(item.get("publishedAt") or item.get("createdAt") or datetime.now(timezone.utc)).isoformat(),
+        metadata={
+            "category": item.get("category", "General"),
+            "region": item.get("region"),
+            "sentiment_label": item.get("sentiment_label"),
+            "sentiment_score": item.get("sentiment_score")
+        },
+        heavy_content=heavy,
+        banner_message=banner_msg
+    )
 
 
-async def fetch_opportunity_items(date_cutoff: Optional[datetime], limit: int) -> List[FeedItem]:
-    """Fetch opportunities for feed"""
-    db = await get_db()
-    collection = db["opportunities"]
-    
-    query = {"status": "approved"}
-    if date_cutoff:
-        query["created_at"] = {"$gte": date_cutoff}
-    
-    cursor = collection.find(query).sort("created_at", -1).limit(limit)
-    items = []
-    
-    async for item in cursor:
-        items.append(FeedItem(
-            id=item.get("id", str(item["_id"])),  # Use id if exists, else _id
-            type="opportunity",
-            title=item["title"],
-            summary=item.get("description", "")[:200],
-            link=f"/opportunities/{item.get('id', str(item['_id']))}",
-            thumbnail=item.get("thumbnail") or "/static/img/fallbacks/news_default.jpg",
-            created_at=item.get("created_at", datetime.now(timezone.utc)).isoformat(),
-            metadata={
-                "type": item.get("type", "Job"),
-                "deadline": item.get("deadline")
-            }
-        ))
-    
-    return items
+def _opportunity_item(item: dict) -> FeedItem:
+    return FeedItem(
+        id=item.get("id", str(item["_id"])),  # Use id if exists, else _id
+        type="opportunity",
+        title=item["title"],
+        summary=item.get("description", "")[:200],
+        link=f"/opportunities/{item.get('id', str(item['_id']))}",
+        thumbnail=item.get("thumbnail") or "/static/img/fallbacks/news_default.jpg",
+        created_at=item.get("created_at", datetime.now(timezone.utc)).isoformat(),
+        metadata={
+            "type": item.get("type", "Job"),
+            "deadline": item.get("deadline")
+        }
+    )
 
 
-async def fetch_resource_items(date_cutoff: Optional[datetime], limit: int) -> List[FeedItem]:
-    """Fetch resources for feed"""
-    db = await get_db()
-    collection = db["banibs_resources"]
-    
-    query = {}
-    if date_cutoff:
-        created_field = "created_at"
-        query[created_field] = {"$gte": date_cutoff}
-    
-    cursor = collection.find(query).sort("created_at", -1).limit(limit)
-    items = []
-    
-    async for item in cursor:
-        # Phase 6.6 - Compute heavy content banner data
-        heavy = is_heavy_content(item)
-        banner_msg = get_banner_message(item)
-        
-        items.append(FeedItem(
-            id=item["id"],
-            type="resource",
-            title=item["title"],
-            summary=item.get("description", "")[:200],
-            link=f"/resources/{item['id']}",
-            thumbnail=item.get("thumbnail_url") or "/static/img/fallbacks/news_default.jpg",
-            created_at=item.get("created_at", datetime.now(timezone.utc)).isoformat(),
-            metadata={
-                "category": item.get("category", "General"),
-                "type": item.get("type", "Article"),
-                "sentiment_label": item.get("sentiment_label"),
-                "sentiment_score": item.get("sentiment_score")
-            },
-            heavy_content=heavy,
-            banner_message=banner_msg
-        ))
-    
-    return items
+def _resource_item(item: dict) -> FeedItem:
+    # Phase 6.6 - Compute heavy content banner data
+    heavy = is_heavy_content(item)
+    banner_msg = get_banner_message(item)
+    
+    return FeedItem(
+        id=item["id"],
+        type="resource",
+        title=item["title"],
+        summary=item.get("description", "")[:200],
+        link=f"/resources/{item['id']}",
+        thumbnail=item.get("thumbnail_url") or "/static/img/fallbacks/news_default.jpg",
+        created_at=item.get("created_at", datetime.now(timezone.utc)).isoformat(),
+        metadata={
+            "category": item.get("category", "General"),
+            "type": item.get("type", "Article"),
+            "sentiment_label": item.get("sentiment_label"),
+            "sentiment_score": item.get("sentiment_score")
+        },
+        heavy_content=heavy,
+        banner_message=banner_msg
+    )
 
 
-async def fetch_event_items(date_cutoff: Optional[datetime], limit: int) -> List[FeedItem]:
-    """Fetch events for feed (upcoming only by default)"""
-    db = await get_db()
-    collection = db["banibs_events"]
-    
-    now = datetime.now(timezone.utc)
-    query = {"start_date": {"$gte": now}}  # Only upcoming events
+def _event_item(item: dict) -> FeedItem:
+    return FeedItem(
+        id=item["id"],
+        type="event",
+        title=item["title"],
+        summary=item.get("description", "")[:200],
+        link=f"/events/{item['id']}",
+        thumbnail=item.get("image_url") or "/static/img/fallbacks/news_default.jpg",
+        created_at=item.get("created_at", datetime.now(timezone.utc)).isoformat(),
+        metadata={
+            "category": item.get("category", "Event"),
+            "event_date": item.get("start_date").isoformat() if item.get("start_date") else None,
+            "location": item.get("location_name") or ("Virtual" if item.get("event_type") == "Virtual" else None)
+        }
+    )
+
+
+def _business_item(item: dict) -> FeedItem:
+    location = []
+    if item.get("city"):
+        location.append(item["city"])
+    if item.get("state"):
+        location.append(item["state"])
+    location_str = ", ".join(location) if location else "Location TBA"
+    
+    return FeedItem(
+        id=item.get("id", str(item["_id"])),  # Use id if exists, else _id
+        type="business",
+        title=item["name"],
+        summary=item.get("description", "")[:200],
+        link=f"/business/directory/{item.get('id', str(item['_id']))}",
+        thumbnail=item.get("logo_url") or "/static/img/fallbacks/news_default.jpg",
+        created_at=item.get("created_at", datetime.now(timezone.utc)).isoformat(),
+        metadata={
+            "category": item.get("category", "Business"),
+            "location": location_str
+        }
+    )
+
+
+# Merge order: each source is read newest-first on its time field, with _id
+# as the tie-breaker (legacy opportunities/businesses have no `id` field).
+FEED_SOURCES = {
+    "news": {
+        "collection": "news_items",
+        "time_field": "publishedAt",
+        "query": lambda now: {},
+        "to_item": _news_item,
+    },
+    "opportunity": {
+        "collection": "opportunities",
+        "time_field": "created_at",
+        "query": lambda now: {"status": "approved"},
+        "to_item": _opportunity_item,
+    },
+    "resource": {
+        "collection": "banibs_resources",
+        "time_field": "created_at",
+        "query": lambda now: {},
+        "to_item": _resource_item,
+    },
+    "event": {
+        "collection": "banibs_events",
+        "time_field": "created_at",
+        "query": lambda now: {"start_date": {"$gte": now}},  # Only upcoming events
+        "to_item": _event_item,
+    },
+    "business": {
+        "collection": "business_listings",
+        "time_field": "created_at",
+        "query": lambda now: {"status": "approved"},
+        "to_item": _business_item,
+    },
+}
+
+_MIN_TIME = datetime.min.replace(tzinfo=timezone.utc)
+
+
+def _as_utc(value) -> Optional[datetime]:
+    """Normalize a stored timestamp (naive UTC, aware, or ISO string) for comparison"""
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def encode_feed_cursor(positions: Dict[str, Tuple[Optional[datetime], Any]]) -> str:
+    """Encode per-source (time, _id) positions into an opaque, URL-safe cursor"""
+    payload = {
+        source: [
+            ts.isoformat() if ts else None,
+            str(doc_id),
+            isinstance(doc_id, ObjectId)
+        ]
+        for source, (ts, doc_id) in positions.items()
+    }
+    raw = json.dumps(payload, separators=(",", ":"), sort_keys=True)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_feed_cursor(cursor: str) -> Dict[str, Tuple[Optional[datetime], Any]]:
+    """
+    Decode a cursor produced by encode_feed_cursor.
+    Raises ValueError for malformed or tampered tokens.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        positions = {}
+        for source, (ts, doc_id, is_oid) in payload.items():
+            if source not in FEED_SOURCES:
+                raise KeyError(source)
+            positions[source] = (
+                datetime.fromisoformat(ts) if ts else None,
+                ObjectId(doc_id) if is_oid else doc_id
+            )
+        return positions
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError,
+            KeyError, TypeError, ValueError, AttributeError) as e:
+        raise ValueError("Invalid feed cursor") from e
+
+
+def _after_position(time_field: str, position: Tuple[Optional[datetime], Any]) -> dict:
+    """Keyset predicate for rows strictly after `position` in (time DESC, _id DESC) order"""
+    ts, doc_id = position
+    if ts is None:
+        # Undated rows sort last; only the _id tie-breaker is left to advance
+        return {time_field: None, "_id": {"$lt": doc_id}}
+    return {"$or": [
+        {time_field: {"$lt": ts}},
+        {time_field: ts, "_id": {"$lt": doc_id}},
+        {time_field: None}
+    ]}
+
+
+async def fetch_source_rows(
+    db,
+    source: str,
+    date_cutoff: Optional[datetime],
+    after: Optional[Tuple[Optional[datetime], Any]],
+    limit: int,
+    now: datetime
+) -> List[tuple]:
+    """
+    Fetch up to `limit` raw rows of one source after its cursor position.
+    Returns (sort_key, source, doc) tuples already in merge order.
+    """
+    spec = FEED_SOURCES[source]
+    time_field = spec["time_field"]
     
+    query = spec["query"](now)
     if date_cutoff:
-        query["created_at"] = {"$gte": date_cutoff}
-    
-    cursor = collection.find(query).sort("start_date", 1).limit(limit)  # Sort by event date
-    items = []
+        query[time_field] = {"$gte": date_cutoff}
+    if after:
+        query = {"$and": [query, _after_position(time_field, after)]}
+    
+    docs = await db[spec["collection"]].find(query).sort(
+        [(time_field, -1), ("_id", -1)]
+    ).limit(limit).to_list(length=None)
+    
+    rows = []
+    for doc in docs:
+        ts = _as_utc(doc.get(time_field))
+        rows.append(((ts or _MIN_TIME, str(doc["_id"])), source, doc))
+    return rows
+
+
+async def get_merged_feed(
+    sources: List[str],
+    date_cutoff: Optional[datetime],
+    limit: int,
+    cursor: Optional[str] = None,
+    offset: int = 0
+) -> dict:
+    """
+    Fetch every source concurrently and k-way merge them newest-first.
     
-    async for item in cursor:
-        items.append(FeedItem(
-            id=item["id"],
-            type="event",
-            title=item["title"],
-            summary=item.get("description", "")[:200],
-            link=f"/events/{item['id']}",
-            thumbnail=item.get("image_url") or "/static/img/fallbacks/news_default.jpg",
-            created_at=item.get("created_at", datetime.now(timezone.utc)).isoformat(),
-            metadata={
-                "category": item.get("category", "Event"),
-                "event_date": item.get("start_date").isoformat() if item.get("start_date") else None,
-                "location": item.get("location_name") or ("Virtual" if item.get("event_type") == "Virtual" else None)
-            }
-        ))
+    Each source is asked for offset + limit + 1 rows after its own position,
+    which is enough to fill the page and detect has_more without over-reading.
+    Only the rows that land on the page are converted to FeedItems.
+    """
+    positions = decode_feed_cursor(cursor) if cursor else {}
+    positions = {s: p for s, p in positions.items() if s in sources}
     
-    return items
+    db = await get_db()
+    now = datetime.now(timezone.utc)
+    per_source = offset + limit + 1
+    
+    streams = await asyncio.gather(*[
+        fetch_source_rows(db, source, date_cutoff, positions.get(source), per_source, now)
+        for source in sources
+    ])
+    merged = heapq.merge(*streams, key=lambda row: row[0], reverse=True)
+    
+    page_rows = []
+    for index, (_, source, doc) in enumerate(merged):
+        if index >= offset + limit:
+            has_more = True
+            break
+        time_value = _as_utc(doc.get(FEED_SOURCES[source]["time_field"]))
+        positions[source] = (time_value, doc["_id"])
+        if index >= offset:
+            page_rows.append((source, doc))
+    else:
+        has_more = False
+    
+    return {
+        "items": [FEED_SOURCES[source]["to_item"](doc) for source, doc in page_rows],
+        "has_more": has_more,
+        "next_cursor": encode_feed_cursor(positions) if has_more else None,
+    }
 
 
-async def fetch_business_items(date_cutoff: Optional[datetime], limit: int) -> List[FeedItem]:
-    """Fetch businesses for feed"""
+async def count_source_items(sources: List[str], date_cutoff: Optional[datetime]) -> int:
+    """Total matching items across sources (page mode only)"""
     db = await get_db()
-    collection = db["business_listings"]
-    
-    query = {"status": "approved"}
-    if date_cutoff:
-        query["created_at"] = {"$gte": date_cutoff}
-    
-    cursor = collection.find(query).sort("created_at", -1).limit(limit)
-    items = []
+    now = datetime.now(timezone.utc)
     
-    async for item in cursor:
-        location = []
-        if item.get("city"):
-            location.append(item["city"])
-        if item.get("state"):
-            location.append(item["state"])
-        location_str = ", ".join(location) if location else "Location TBA"
-        
-        items.append(FeedItem(
-            id=item.get("id", str(item["_id"])),  # Use id if exists, else _id
-            type="business",
-            title=item["name"],
-            summary=item.get("description", "")[:200],
-            link=f"/business/directory/{item.get('id', str(item['_id']))}",
-            thumbnail=item.get("logo_url") or "/static/img/fallbacks/news_default.jpg",
-            created_at=item.get("created_at", datetime.now(timezone.utc)).isoformat(),
-            metadata={
-                "category": item.get("category", "Business"),
-                "location": location_str
-            }
-        ))
+    async def _count(source):
+        spec = FEED_SOURCES[source]
+        query = spec["query"](now)
+        if date_cutoff:
+            query[spec["time_field"]] = {"$gte": date_cutoff}
+        return await db[spec["collection"]].count_documents(query)
     
-    return items
+    return sum(await asyncio.gather(*[_count(source) for source in sources]))
 
 
 @router.get("", response_model=FeedResponse)
@@ -231,7 +363,8 @@ async def get_unified_feed(
     type: str = Query("all", description="Filter by content type: all, news, opportunity, resource, event, business"),
     date_range: str = Query("all", description="Filter by date: today, week, month, all"),
     limit: int = Query(20, ge=1, le=100, description="Items per page"),
-    page: int = Query(1, ge=1, description="Page number")
+    page: int = Query(1, ge=1, description="Page number"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous response's next_cursor")
 ):
     """
     Get unified feed aggregating content from multiple sources
@@ -239,46 +372,31 @@ async def get_unified_feed(
     - **type**: Filter by content type (all, news, opportunity, resource, event, business)
     - **date_range**: Filter by date (today, week, month, all)
     - **limit**: Number of items per page (1-100, default 20)
-    - **page**: Page number (default 1)
+    - **page**: Page number (default 1); ignored when a cursor is given
+    - **cursor**: Continue after a previous page; preferred for deep scrolling
     """
     
     date_cutoff = get_date_filter(date_range)
-    all_items = []
-    
-    # Determine which sources to query based on type filter
-    if type in ["all", "news"]:
-        news_items = await fetch_news_items(date_cutoff, limit if type == "news" else limit // 5)
-        all_items.extend(news_items)
-    
-    if type in ["all", "opportunity"]:
-        opportunity_items = await fetch_opportunity_items(date_cutoff, limit if type == "opportunity" else limit // 5)
-        all_items.extend(opportunity_items)
+    sources = [source for source in FEED_SOURCES if type in ("all", source)]
     
-    if type in ["all", "resource"]:
-        resource_items = await fetch_resource_items(date_cutoff, limit if type == "resource" else limit // 5)
-        all_items.extend(resource_items)
+    if not sources:
+        return FeedResponse(items=[], total=0, page=page, pages=1)
     
-    if type in ["all", "event"]:
-        event_items = await fetch_event_items(date_cutoff, limit if type == "event" else limit // 5)
-        all_items.extend(event_items)
-    
-    if type in ["all", "business"]:
-        business_items = await fetch_business_items(date_cutoff, limit if type == "business" else limit // 5)
-        all_items.extend(business_items)
-    
-    # Sort all items by created_at (newest first)
-    all_items.sort(key=lambda x: x.created_at, reverse=True)
-    
-    # Apply pagination
-    total = len(all_items)
-    start_idx = (page - 1) * limit
-    end_idx = start_idx + limit
-    paginated_items = all_items[start_idx:end_idx]
+    if cursor is not None:
+        try:
+            merged = await get_merged_feed(sources, date_cutoff, limit, cursor=cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return FeedResponse(**merged)
     
+    merged, total = await asyncio.gather(
+        get_merged_feed(sources, date_cutoff, limit, offset=(page - 1) * limit),
+        count_source_items(sources, date_cutoff)
+    )
     pages = (total + limit - 1) // limit if total > 0 else 1
     
     return FeedResponse(
-        items=paginated_items,
+        **merged,
         total=total,
         page=page,
         pages=pages
@@ -1,14 +1,17 @@
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
 from typing import List, Optional
 from datetime import datetime
+import asyncio
 import os
 import hashlib
 
-from db.news import get_latest_news
+from db.news import get_latest_news, get_related_stories, make_dedupe_key, prepare_news_items
+from db.news_images import release_image_refs
 from models.news import NewsItemPublic, NewsItemDB
 from middleware.auth_guard import get_current_user, require_role
 from motor.motor_asyncio import AsyncIOMotorClient
 from services.heavy_content_service import enrich_item_with_banner_data
+from utils.snapshot_cache import news_snapshot_cache, snapshot_key
 
 # -------------------------------------------------
 # BANIBS NEWS CONTRACT (DO NOT REMOVE)
@@ -22,14 +25,19 @@ from services.heavy_content_service import enrich_item_with_banner_data
 #    We absolutely do not show the same TechCrunch or Essence
 #    headline twice in Latest Stories. That looks amateur.
 #
-# 2. Each unique story is defined by its fingerprint.
-#    If fingerprint is missing, we fall back to sourceName + title.
+# 2. Each unique story is defined by its near-duplicate cluster
+#    (cluster_id: the same wire story from several outlets), then its
+#    fingerprint. If both are missing, we fall back to sourceName + title.
 #
 # 3. /api/news/featured MUST return exactly one "hero" story
 #    where isFeatured == True, OR {} if none is set.
 #
 # 4. RSS sync logic lives in tasks/rss_sync.py (not here).
 #
+# 5. /api/news/{id}/related reads the list precomputed by the
+#    scheduler (services/related_stories); it never lists the story
+#    itself or another copy of it (same cluster_id).
+#
 # If you change these endpoints, you are changing public homepage
 # behavior. Treat that as a product decision, not "cleanup."
 # -------------------------------------------------
@@ -40,17 +48,8 @@ client = AsyncIOMotorClient(os.environ['MONGO_URL'])
 db = client[os.environ['DB_NAME']]
 news_collection = db.news_items
 
-def make_dedupe_key(item):
-    """Create deduplication key - fingerprint preferred, fallback to sourceName::title"""
-    if item.get('fingerprint'):
-        return item['fingerprint']
-    # Fallback for older items without fingerprint
-    source = item.get('sourceName', 'unknown')
-    title = item.get('title', 'untitled')
-    return f"{source}::{title}"
-
 @router.get("/latest", response_model=List[NewsItemPublic])
-async def get_latest_news_feed():
+async def get_latest_news_feed(request: Request):
     """
     Get latest news items for homepage feed with deduplication
     
@@ -59,12 +58,25 @@ async def get_latest_news_feed():
     same story twice if the sync ran at the same time from two places.
 
     Deduplication key priority:
-    1. fingerprint (stable SHA256(sourceName + "::" + title))
-    2. fallback: sourceName + "::" + title
+    1. cluster_id (near-duplicate copies of one story, services/news_clustering)
+    2. fingerprint (stable SHA256(sourceName + "::" + title))
+    3. fallback: sourceName + "::" + title
     
     This endpoint feeds the 'Latest Stories' section on the homepage.
     Returns empty array [] if no news items exist.
+
+    Responses carry ETag / Last-Modified; polling clients that send them
+    back get a 304 straight from the snapshot.
     """
+    return await news_snapshot_cache.response(
+        snapshot_key("latest"),
+        build_latest_news_payload,
+        request
+    )
+
+
+async def build_latest_news_payload():
+    """Latest stories payload (uncached)"""
     # Fallback image URL for items without images
     FALLBACK_IMAGE = "/static/img/fallbacks/news_default.jpg"
     
@@ -77,7 +89,7 @@ async def get_latest_news_feed():
     if not items:
         return []
     
-    # Deduplicate by fingerprint/sourceName+title
+    # Deduplicate by cluster/fingerprint/sourceName+title
     seen_keys = set()
     unique_items = []
     
@@ -128,6 +140,14 @@ async def get_featured_news():
     
     Used by: Homepage "Featured Story" hero section
     """
+    return await news_snapshot_cache.response(
+        snapshot_key("featured"),
+        build_featured_news_payload
+    )
+
+
+async def build_featured_news_payload():
+    """Featured story payload (uncached)"""
     from config.rss_sources import RSS_SOURCES
     
     # Get list of featured source names
@@ -270,8 +290,12 @@ async def seed_dev_news():
     news_items = [NewsItemDB(**item) for item in sample_items]
     
     # Insert into MongoDB
+    from services.news_categorization_service import compute_section_fields
     items_dict = [item.dict() for item in news_items]
+    for item in items_dict:
+        item.update(compute_section_fields(item))
     result = await news_collection.insert_many(items_dict)
+    news_snapshot_cache.clear()
     
     return {
         "inserted": len(result.inserted_ids),
@@ -339,6 +363,9 @@ async def feature_news_item(
         {"$set": {"isFeatured": True}}
     )
     
+    # Editorial change: drop snapshots so the new hero shows immediately
+    news_snapshot_cache.clear()
+    
     return {
         "success": True,
         "message": f"News item {news_id} is now featured",
@@ -363,7 +390,14 @@ async def clear_dev_news():
             detail="Clear endpoint not allowed in this environment"
         )
     
+    # Drop the CDN image references the cleared items held
+    with_images = await news_collection.find(
+        {"imageHash": {"$exists": True}},
+        {"_id": 0, "imageHash": 1}
+    ).to_list(length=None)
     result = await news_collection.delete_many({})
+    await release_image_refs(item["imageHash"] for item in with_images)
+    news_snapshot_cache.clear()
     
     return {
         "success": True,
@@ -394,6 +428,14 @@ async def get_news_by_category(category_slug: str, region: Optional[str] = Query
         GET /api/news/category/world-news?region=Europe -> European coverage
         GET /api/news/category/business -> All business articles
     """
+    return await news_snapshot_cache.response(
+        snapshot_key("category", slug=category_slug, region=region),
+        lambda: build_category_news_payload(category_slug, region)
+    )
+
+
+async def build_category_news_payload(category_slug: str, region: Optional[str] = None):
+    """Category page payload (uncached)"""
     # Fallback image URL for items without images
     FALLBACK_IMAGE = "/static/img/fallbacks/news_default.jpg"
     
@@ -463,11 +505,24 @@ async def delete_news_item(
     
     Requires JWT token with super_admin or moderator role.
     """
+    item = await news_collection.find_one({"id": news_id}, {"_id": 0, "imageHash": 1})
     result = await news_collection.delete_one({"id": news_id})
     
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="News item not found")
     
+    # The stored CDN image may now be unused (see db/news_images)
+    await release_image_refs([item.get("imageHash")])
+    
+    # Drop it from the precomputed related lists it appears in
+    await news_collection.update_many(
+        {"related.id": news_id},
+        {"$pull": {"related": {"id": news_id}}}
+    )
+    
+    # Never keep serving a removed story from a stale snapshot
+    news_snapshot_cache.clear()
+    
     return {
         "success": True,
         "message": f"News item {news_id} deleted successfully",
@@ -482,8 +537,16 @@ async def delete_news_item(
 # PHASE 7.6.1 - CNN-STYLE HOMEPAGE ENDPOINT
 # ==========================================
 
+# Homepage sections (as stored on news_items.section) and per-section cap
+HOMEPAGE_SECTIONS = [
+    'us', 'world', 'business', 'tech', 'sports',
+    'entertainment', 'lifestyle', 'health', 'civil_rights', 'education'
+]
+HOMEPAGE_SECTION_LIMIT = 12
+
+
 @router.get("/homepage")
-async def get_homepage_news():
+async def get_homepage_news(request: Request):
     """
     Get structured news data for CNN-style homepage (Phase 7.6.1)
     
@@ -493,25 +556,39 @@ async def get_homepage_news():
     - sections: News items organized by section (us, world, business, tech, sports)
     - banibs_tv: Featured video for BANIBS TV (1 item)
     
-    This endpoint aggregates and categorizes news from the database,
-    intelligently sorting stories into sections based on category, region,
-    and source metadata.
+    Sections are computed once at ingest (news_items.section), so each
+    section is one small (section, publishedAt) index read; nothing is
+    re-categorized per request.
+    
+    Conditional GET (If-None-Match / If-Modified-Since) is answered with a
+    304 from the snapshot, like /latest.
     
     Used by: CNN-style news homepage at /
     """
-    from services.news_categorization_service import sort_items_by_section
+    return await news_snapshot_cache.response(
+        snapshot_key("homepage"),
+        build_homepage_payload,
+        request
+    )
+
+
+async def build_homepage_payload():
+    """Homepage payload (uncached)"""
+    from services.news_categorization_service import pick_top_stories
+    from db.news import get_featured_news_item, get_news_by_homepage_section
     from db.featured_media import get_featured_media, get_latest_media_with_thumbnail
     
-    # Fallback image URL for items without images
-    FALLBACK_IMAGE = "/static/img/fallbacks/news_default.jpg"
-    
-    # Fetch recent news items (over-fetch for categorization)
-    items = await news_collection.find(
-        {},
-        {"_id": 0}
-    ).sort("publishedAt", -1).limit(100).to_list(length=None)
+    # Over-fetch each section slightly so dedupe can't leave it short
+    hero_item, recent_items, *section_items = await asyncio.gather(
+        get_featured_news_item(),
+        news_collection.find({}, {"_id": 0}).sort("publishedAt", -1).limit(100).to_list(length=None),
+        *[
+            get_news_by_homepage_section(section, HOMEPAGE_SECTION_LIMIT * 2)
+            for section in HOMEPAGE_SECTIONS
+        ]
+    )
     
-    if not items:
+    if not recent_items:
         # Return empty structure if no news exists
         return {
             "hero": None,
@@ -526,49 +603,24 @@ async def get_homepage_news():
             "banibs_tv": None
         }
     
-    # Deduplicate items
-    seen_keys = set()
-    unique_items = []
-    
-    for item in items:
-        dedupe_key = make_dedupe_key(item)
-        
-        if dedupe_key in seen_keys:
-            continue
-        seen_keys.add(dedupe_key)
-        
-        # Ensure every item has an imageUrl
-        if not item.get('imageUrl'):
-            item['imageUrl'] = FALLBACK_IMAGE
-        
-        # Convert datetime to ISO string
-        if 'publishedAt' in item and hasattr(item['publishedAt'], 'isoformat'):
-            item['publishedAt'] = item['publishedAt'].isoformat()
-        
-        if 'sentiment_at' in item and hasattr(item['sentiment_at'], 'isoformat'):
-            item['sentiment_at'] = item['sentiment_at'].isoformat()
-        
-        # Enrich with heavy content banner data
-        enrich_item_with_banner_data(item)
-        
-        unique_items.append(item)
-    
-    # Sort items into sections
-    categorized = sort_items_by_section(unique_items)
-    
     # Extract hero story
-    hero = categorized['hero'][0] if categorized['hero'] else None
+    hero = prepare_news_items([hero_item])[0] if hero_item else None
+    
+    by_section = {
+        section: prepare_news_items(items)[:HOMEPAGE_SECTION_LIMIT]
+        for section, items in zip(HOMEPAGE_SECTIONS, section_items)
+    }
     
     # Get top stories
-    top_stories = categorized['top_stories']
+    top_stories = pick_top_stories(by_section)
     
     # Build sections object
     sections = {
-        'us': categorized['us'][:12],  # Limit per section
-        'world': categorized['world'][:12],
-        'business': categorized['business'][:12],
-        'tech': categorized['tech'][:12],
-        'sports': categorized['sports'][:12]
+        'us': by_section['us'],
+        'world': by_section['world'],
+        'business': by_section['business'],
+        'tech': by_section['tech'],
+        'sports': by_section['sports']
     }
     
     # Get BANIBS TV featured video
@@ -586,6 +638,8 @@ async def get_homepage_news():
     # Phase 7.6.4 - Add trending and sentiment summary
     from services.trending_service import get_trending_items, compute_sentiment_summary
     
+    unique_items = prepare_news_items(recent_items)
+    
     # Get global trending items
     trending_items = get_trending_items(unique_items, section='all', limit=10)
     
@@ -637,13 +691,10 @@ async def get_news_section(
     
     Sections: us, world, politics, healthwatch, moneywatch, entertainment,
               crime, sports, culture, science-tech, civil-rights, business, education
-    """
-    from services.news_categorization_service import (
-        filter_items_by_section,
-        paginate_items,
-        get_section_display_name
-    )
     
+    Section membership is stored at ingest (news_items.section_tags) and
+    read through the (section_tags, publishedAt) index.
+    """
     # Validate section
     if section not in VALID_SECTIONS:
         raise HTTPException(
@@ -651,14 +702,31 @@ async def get_news_section(
             detail=f"Invalid section. Valid sections: {', '.join(VALID_SECTIONS)}"
         )
     
-    # Fallback image URL
-    FALLBACK_IMAGE = "/static/img/fallbacks/news_default.jpg"
+    return await news_snapshot_cache.response(
+        snapshot_key(
+            "section", section=section, page=page, page_size=page_size,
+            sentiment=sentiment, region=region
+        ),
+        lambda: build_section_payload(section, page, page_size, sentiment, region)
+    )
+
+
+async def build_section_payload(
+    section: str,
+    page: int = 1,
+    page_size: int = 20,
+    sentiment: Optional[str] = None,
+    region: Optional[str] = None
+):
+    """Section page payload (uncached)"""
+    from services.news_categorization_service import (
+        paginate_items,
+        get_section_display_name
+    )
+    from db.news import get_news_by_section_page
     
-    # Fetch news items from database
-    items = await news_collection.find(
-        {},
-        {"_id": 0}
-    ).sort("publishedAt", -1).limit(200).to_list(length=None)
+    # Fetch this section's newest items
+    items = await get_news_by_section_page(section, limit=200)
     
     if not items:
         return {
@@ -673,33 +741,7 @@ async def get_news_section(
             "items": []
         }
     
-    # Deduplicate items
-    seen_keys = set()
-    unique_items = []
-    
-    for item in items:
-        dedupe_key = make_dedupe_key(item)
-        if dedupe_key in seen_keys:
-            continue
-        seen_keys.add(dedupe_key)
-        
-        # Ensure imageUrl
-        if not item.get('imageUrl'):
-            item['imageUrl'] = FALLBACK_IMAGE
-        
-        # Convert datetime to ISO string
-        if 'publishedAt' in item and hasattr(item['publishedAt'], 'isoformat'):
-            item['publishedAt'] = item['publishedAt'].isoformat()
-        if 'sentiment_at' in item and hasattr(item['sentiment_at'], 'isoformat'):
-            item['sentiment_at'] = item['sentiment_at'].isoformat()
-        
-        # Enrich with heavy content banner
-        enrich_item_with_banner_data(item)
-        
-        unique_items.append(item)
-    
-    # Filter by section
-    filtered_items = filter_items_by_section(unique_items, section)
+    filtered_items = prepare_news_items(items)
     
     # Apply sentiment filter if provided
     if sentiment:
@@ -766,6 +808,7 @@ async def get_trending_news_analytics(
     
     Returns top trending stories based on recency and sentiment intensity.
     Can be filtered by section or return global trending.
+    Candidates come from the latest TRENDING_WINDOW stories.
     
     Query params:
     - section: Optional section filter (e.g., 'us', 'world', 'business')
@@ -776,55 +819,11 @@ async def get_trending_news_analytics(
     - updated_at: Timestamp of calculation
     - items: Array of trending items with trending_score
     """
-    from services.trending_service import get_trending_items, compute_sentiment_summary
-    
-    # Fallback image URL
-    FALLBACK_IMAGE = "/static/img/fallbacks/news_default.jpg"
-    
-    # Fetch recent news items
-    items = await news_collection.find(
-        {},
-        {"_id": 0}
-    ).sort("publishedAt", -1).limit(200).to_list(length=None)
-    
-    if not items:
-        return {
-            "section": section or "all",
-            "updated_at": datetime.utcnow().isoformat() + "Z",
-            "items": []
-        }
-    
-    # Deduplicate and prepare items
-    seen_keys = set()
-    unique_items = []
-    
-    for item in items:
-        dedupe_key = make_dedupe_key(item)
-        if dedupe_key in seen_keys:
-            continue
-        seen_keys.add(dedupe_key)
-        
-        # Ensure imageUrl
-        if not item.get('imageUrl'):
-            item['imageUrl'] = FALLBACK_IMAGE
-        
-        # Convert datetime to ISO string
-        if 'publishedAt' in item and hasattr(item['publishedAt'], 'isoformat'):
-            item['publishedAt'] = item['publishedAt'].isoformat()
-        if 'sentiment_at' in item and hasattr(item['sentiment_at'], 'isoformat'):
-            item['sentiment_at'] = item['sentiment_at'].isoformat()
-        
-        # Enrich with heavy content banner
-        enrich_item_with_banner_data(item)
-        
-        unique_items.append(item)
+    from services.trending_service import trending_index
     
-    # Get trending items (with optional section filter)
-    trending_items = get_trending_items(
-        unique_items,
-        section=section,
-        limit=limit
-    )
+    # Served from the maintained in-memory leaderboards (refreshed by the
+    # scheduler, patched at ingest), so this is O(limit) per request
+    trending_items = await trending_index.get_top(section=section, limit=limit)
     
     return {
         "section": section or "all",
@@ -923,3 +922,34 @@ async def get_admin_engagement_summary(
             "regions": [],
             "error": "Unable to fetch engagement data"
         }
+
+
+# Registered last: /{news_id}/related must not shadow the fixed paths above
+@router.get("/{news_id}/related")
+async def get_related_news(news_id: str):
+    """
+    Related stories for a news item (story page sidebar).
+    
+    The list is precomputed when stories are ingested (TF-IDF similarity
+    over the recent window, see services/related_stories), so this is one
+    read by id. Stories ingested since the last pipeline run have an empty
+    list until the next run scores them.
+    
+    Returns:
+    - news_id: The requested item
+    - items: Up to NEWS_RELATED_TOP_K stories, most similar first, each
+      with id, title, sourceName, imageUrl, publishedAt, category, score
+    """
+    related = await get_related_stories(news_id)
+    if related is None:
+        raise HTTPException(status_code=404, detail="News item not found")
+    
+    items = []
+    for entry in related:
+        entry = dict(entry)
+        if hasattr(entry.get("publishedAt"), "isoformat"):
+            entry["publishedAt"] = entry["publishedAt"].isoformat() + "Z"
+        entry.pop("cluster_id", None)
+        items.append(entry)
+    
+    return {"news_id": news_id, "items": items}
@@ -3,7 +3,7 @@ Resources API Routes
 Phase 6.2.3 - Resources & Events
 """
 
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
 from typing import Optional, List
 from models.resource import (
     ResourceCreate,
@@ -20,6 +20,13 @@ from db.resources import (
 )
 from middleware.auth_guard import get_current_user, require_role
 from services.heavy_content_service import enrich_item_with_banner_data
+from utils.conditional_get import (
+    LISTING_VERSION_PROJECTION,
+    check_not_modified,
+    is_revalidation,
+    listing_validators,
+    set_validators
+)
 import math
 
 router = APIRouter(prefix="/api/resources", tags=["resources"])
@@ -27,6 +34,8 @@ router = APIRouter(prefix="/api/resources", tags=["resources"])
 
 @router.get("", response_model=ResourceListResponse)
 async def list_resources(
+    request: Request,
+    response: Response,
     category: Optional[str] = Query(None),
     type: Optional[str] = Query(None),
     tags: Optional[str] = Query(None, description="Comma-separated tags"),
@@ -46,12 +55,14 @@ async def list_resources(
     - search: Search in title/description
     - limit: Items per page (1-50, default 20)
     - skip: Pagination offset
+    
+    Supports conditional GET: the ETag covers the page's ids, their newest
+    updated_at and the total. A revalidation is answered with 304 from an
+    ids/timestamps-only probe; other requests fetch the page once.
     """
     # Parse tags if provided
     tag_list = tags.split(",") if tags else None
-    
-    # Get resources
-    resources, total = await get_resources(
+    filters = dict(
         category=category,
         resource_type=type,
         tags=tag_list,
@@ -61,6 +72,17 @@ async def list_resources(
         skip=skip
     )
     
+    if is_revalidation(request):
+        probe, total = await get_resources(**filters, projection=LISTING_VERSION_PROJECTION)
+        not_modified = check_not_modified(request, response, probe, total)
+        if not_modified:
+            return not_modified
+        # Stale copy: the probe already counted
+        resources, _ = await get_resources(**filters, count=False)
+    else:
+        resources, total = await get_resources(**filters)
+    set_validators(response, *listing_validators(resources, total))
+    
     # Phase 6.6 - Enrich with heavy content banner data
     enriched_resources = []
     for resource in resources:
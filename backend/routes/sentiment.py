@@ -9,6 +9,8 @@ import logging
 
 from db.connection import get_db
 from services.sentiment_service import analyze_text_sentiment
+from services.trending_service import trending_index
+from utils.snapshot_cache import news_snapshot_cache
 from models.sentiment import SentimentRecalculateRequest, SentimentRecalculateResponse
 from middleware.auth_guard import require_role
 
@@ -76,12 +78,24 @@ async def recalculate_sentiment(request: SentimentRecalculateRequest = Sentiment
                     }
                 )
                 
+                # Rescore the story if it's on a trending leaderboard
+                trending_index.update_sentiment(
+                    item.get("id"),
+                    sentiment["score"],
+                    sentiment["label"],
+                    sentiment["analyzed_at"]
+                )
+                
                 news_processed += 1
                 
             except Exception as e:
                 logger.error(f"Error processing news item: {e}")
                 news_errors += 1
         
+        # Sentiment is part of the public news payloads
+        if news_processed:
+            news_snapshot_cache.invalidate()
+        
         results["collections"]["news"] = {
             "processed": news_processed,
             "skipped": news_skipped,
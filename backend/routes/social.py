@@ -4,12 +4,13 @@ BANIBS Social Portal feed and engagement endpoints
 """
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from typing import Optional
+from typing import Optional, Union
 
 from models.social_post import (
     SocialPostCreate,
     SocialPost,
     SocialFeedResponse,
+    SocialFeedCursorResponse,
     SocialCommentCreate,
     SocialComment,
     SocialCommentsResponse,
@@ -17,6 +18,11 @@ from models.social_post import (
 )
 from middleware.auth_guard import require_role
 from db import social_posts as db_social
+from db import social_timelines as db_timelines
+from services.feed_ranker import get_trust_ranked_feed
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 router = APIRouter(prefix="/api/social", tags=["social"])
@@ -26,16 +32,59 @@ router = APIRouter(prefix="/api/social", tags=["social"])
 # FEED
 # ==========================================
 
-@router.get("/feed", response_model=SocialFeedResponse)
+def _use_cursor_mode(paginate: str, cursor: Optional[str]) -> bool:
+    """Cursor mode is opt-in; page-number mode stays the default for old clients"""
+    return paginate == "cursor" or cursor is not None
+
+
+@router.get("/feed", response_model=Union[SocialFeedResponse, SocialFeedCursorResponse])
 async def get_social_feed(
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=50, description="Items per page"),
+    paginate: str = Query("page", regex="^(page|cursor)$", description="Pagination mode"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous cursor-mode page"),
+    include_total: bool = Query(False, description="Cursor mode: include an approximate total"),
+    scope: str = Query("all", regex="^(all|circle)$", description="all = every member post, circle = home timeline"),
+    ranking: str = Query("chronological", regex="^(chronological|trust)$", description="Feed ordering"),
     current_user=Depends(require_role("user", "member"))
 ):
     """
     Get social feed for authenticated members
-    Returns paginated list of posts with author info and like status
+    Returns paginated list of posts with author info and like status.
+    
+    Cursor mode (paginate=cursor or cursor=...) uses keyset pagination and
+    returns next_cursor instead of page counts.
+    scope=circle reads the viewer's materialized home timeline (always cursor mode).
+    ranking=trust orders a recent candidate window by circle trust tier (page mode).
     """
+    if ranking == "trust":
+        return await get_trust_ranked_feed(
+            viewer_id=current_user["id"],
+            page=page,
+            page_size=page_size
+        )
+    
+    if scope == "circle":
+        try:
+            return await db_timelines.get_home_timeline(
+                viewer_id=current_user["id"],
+                cursor=cursor,
+                page_size=page_size
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    if _use_cursor_mode(paginate, cursor):
+        try:
+            return await db_social.get_feed_by_cursor(
+                cursor=cursor,
+                page_size=page_size,
+                viewer_id=current_user["id"],
+                include_total=include_total
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
     feed_data = await db_social.get_feed(
         page=page,
         page_size=page_size,
@@ -70,6 +119,13 @@ async def create_post(
         link_meta=link_meta_dict
     )
     
+    # Deliver to circle home timelines; a failure here is repaired by the
+    # timeline consistency checker and must not fail the post itself
+    try:
+        await db_timelines.fan_out_post(post)
+    except Exception as e:
+        logger.error(f"Timeline fan-out failed for post {post['id']}: {e}")
+    
     # Return enriched post
     enriched_post = await db_social.get_post_by_id(
         post["id"],
@@ -116,15 +172,13 @@ async def toggle_like_post(
     """
     Toggle like on a post (like if not liked, unlike if already liked)
     """
-    # Check if post exists
-    post = await db_social.get_post_by_id(post_id)
-    if not post:
+    result = await db_social.toggle_like(post_id, current_user["id"])
+    if result is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Post not found"
         )
     
-    result = await db_social.toggle_like(post_id, current_user["id"])
     return result
 
 
@@ -137,16 +191,13 @@ async def toggle_highfive_post(
     Toggle High Five on a post (BANIBS branded like system)
     Alias for /like endpoint with High Five response format
     """
-    # Check if post exists
-    post = await db_social.get_post_by_id(post_id)
-    if not post:
+    result = await db_social.toggle_like(post_id, current_user["id"])
+    if result is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Post not found"
         )
     
-    result = await db_social.toggle_like(post_id, current_user["id"])
-    
     # Map response to High Five format for frontend compatibility
     return {
         "highfived": result["liked"],
@@ -273,11 +324,14 @@ async def delete_comment(
 # USER POSTS - Phase 9.1
 # ==========================================
 
-@router.get("/users/{user_id}/posts", response_model=SocialFeedResponse)
+@router.get("/users/{user_id}/posts", response_model=Union[SocialFeedResponse, SocialFeedCursorResponse])
 async def get_user_posts(
     user_id: str,
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=50, description="Items per page"),
+    paginate: str = Query("page", regex="^(page|cursor)$", description="Pagination mode"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous cursor-mode page"),
+    include_total: bool = Query(False, description="Cursor mode: include an approximate total"),
     current_user=Depends(require_role("user", "member"))
 ):
     """
@@ -286,7 +340,20 @@ async def get_user_posts(
     
     Returns posts authored by the specified user, respecting visibility rules.
     Used for profile "Posts" tab and "My Posts" view.
+    Supports the same cursor mode as /feed.
     """
+    if _use_cursor_mode(paginate, cursor):
+        try:
+            return await db_social.get_user_posts_by_cursor(
+                user_id=user_id,
+                cursor=cursor,
+                page_size=page_size,
+                viewer_id=current_user["id"],
+                include_total=include_total
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
     posts_data = await db_social.get_user_posts(
         user_id=user_id,
         page=page,
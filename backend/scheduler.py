@@ -1,21 +1,30 @@
 """
 BANIBS Automated RSS Sync Scheduler
 
-Uses APScheduler to automatically sync RSS feeds every 6 hours.
+Uses APScheduler to poll RSS feeds on a short tick; each source is only
+fetched when its adaptive schedule says it is due (services/rss_poll_schedule).
 Full pipeline: RSS sync → Image mirror/optimize → Health report
 """
 
+from apscheduler.events import EVENT_JOB_MAX_INSTANCES
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from datetime import datetime
+from datetime import datetime, timezone
 import asyncio
 import sys
+import time
 sys.path.append('/app/backend')
 
-from config.rss_sources import RSS_SOURCES
-from utils.rss_parser import fetch_and_store_feed
+from db.rss_sources import load_rss_sources
+from services.rss_source_health import pollable_sources
+from utils.rss_parser import sync_due_feed_sources
+from services.rss_poll_schedule import RSS_POLL_TICK_MINUTES
+from services.rss_run_ledger import new_run, run_totals, source_entry
+from db.rss_pipeline_runs import finish_run, record_skipped_run, start_run
 from utils.cdn_mirror import mirror_all_images
+from db.news import update_related_stories
 from scripts.rss_health_report import generate_health_report, write_report_to_log
 from tasks.sentiment_sweep import run_sentiment_sweep
+from utils.snapshot_cache import news_snapshot_cache
 
 # Global scheduler instance
 scheduler = None
@@ -30,64 +39,168 @@ FALLBACK_IMAGES = {
 }
 
 
+async def _start_run(run):
+    """Ledger entry for this run; False if another run is in progress (recorded as skipped)"""
+    try:
+        active = await start_run(run)
+    except Exception as e:
+        print(f"[BANIBS RSS Sync] Run ledger unavailable: {e}")
+        return True
+    if active is not None:
+        print(f"[BANIBS RSS Sync] Run {active.get('id')} still in progress, skipping this tick")
+        return False
+    return True
+
+
+async def _finish_run(run, started, status, stages, sources, error=None):
+    """Close the ledger entry; a ledger failure never fails the pipeline"""
+    try:
+        await finish_run(run["id"], {
+            "status": status,
+            "finished_at": datetime.now(timezone.utc),
+            "wall_seconds": round(time.perf_counter() - started, 4),
+            "stages": stages,
+            "totals": run_totals(sources),
+            "sources": sources,
+            "error": error,
+        })
+    except Exception as e:
+        print(f"[BANIBS RSS Sync] Run ledger update failed: {e}")
+
+
 async def run_all_feeds_job():
     """
-    This is the full BANIBS news refresh pipeline.
+    This is the full BANIBS news refresh pipeline, run every
+    RSS_POLL_TICK_MINUTES.
 
     Steps:
-    1. Pull latest RSS stories from all configured feeds.
+    1. Pull latest RSS stories from the registered feeds that are due
+       (quarantined feeds only when their probe is due).
     2. Mirror & optimize all story images into cdn.banibs.com/news.
-    3. Generate and log a health report (coverage/CDN/size).
+    3. Score the new stories' related stories (after the mirror, so the
+       stored neighbour entries carry CDN image URLs).
+    4. Generate and log a health report (coverage/CDN/size).
+    5. Invalidate the public news snapshot cache.
+
+    Steps 2-5 only run when step 1 stored new stories.
+
+    Each run is recorded in the rss_pipeline_runs ledger with per-stage and
+    per-source timings (GET /api/admin/rss/runs). A tick that finds another
+    run in progress, in any server process, is recorded as skipped.
     """
     print(f"[BANIBS RSS Sync] Starting full pipeline at {datetime.utcnow().isoformat()}Z")
     
+    started = time.perf_counter()
+    run = new_run()
+    if not await _start_run(run):
+        return
+    
+    stages = {}
+    sources = []
+    status, error = "completed", None
+    total_new_items = 0
     try:
-        # Step 1: Ingest fresh stories from all RSS sources (only active)
-        total_new_items = 0
-        active_sources = [s for s in RSS_SOURCES if s.get('active', True)]
+        # Step 1: Ingest fresh stories from the active registry sources that
+        # are due, fetched concurrently; unchanged feeds answer 304 and are
+        # skipped, quarantined feeds are only probed now and then
+        active_sources, probes = pollable_sources(await load_rss_sources())
+        
+        stage_started = time.perf_counter()
+        results = await sync_due_feed_sources(
+            active_sources,
+            limit=5,
+            fallback_image_for=lambda source: FALLBACK_IMAGES.get(source["category"]),
+            probes=probes
+        )
+        stages["sync"] = {
+            "seconds": round(time.perf_counter() - stage_started, 4),
+            "sources_active": len(active_sources),
+            "sources_probed": len(probes),
+            "sources_due": len(results),
+        }
+        sources = [source_entry(result) for result in results]
+        print(f"[BANIBS RSS Sync] {len(results)} of {len(active_sources)} sources due, {len(probes)} quarantine probes")
         
-        for source in active_sources:
-            try:
-                # Get fallback image for this category
-                fallback_image = FALLBACK_IMAGES.get(source["category"])
-                
-                count = await fetch_and_store_feed(
-                    url=source["rss_url"],
-                    category=source["category"],
-                    source_name=source["source_name"],
-                    limit=5,
-                    fallback_image=fallback_image,
-                    region=source.get("region")
+        for result in results:
+            if result["status"] == "failed":
+                print(f"[RSS] {result['source']}: Error - {result['error']}")
+            elif result["status"] == "not_modified":
+                print(f"[RSS] {result['source']}: not modified")
+            else:
+                total_new_items += result["items_added"]
+                print(
+                    f"[RSS] {result['source']}: {result['items_added']} new items, "
+                    f"{result['duplicates']} duplicates, {result['errors']} errors"
                 )
-                total_new_items += count
-                print(f"[RSS] {source['source_name']}: {count} new items")
-            except Exception as e:
-                print(f"[RSS] {source['name']}: Error - {str(e)}")
         
         print(f"[BANIBS RSS Sync] Ingested {total_new_items} new stories")
+        if not total_new_items:
+            print(f"[BANIBS RSS Sync] Nothing new, pipeline done at {datetime.utcnow().isoformat()}Z")
+            await _finish_run(run, started, "completed", stages, sources)
+            return
 
         # Step 2: Mirror & optimize thumbnails to CDN
+        stage_started = time.perf_counter()
         mirror_result = await mirror_all_images()
+        stages["mirror"] = {
+            "seconds": round(time.perf_counter() - stage_started, 4),
+            "unique_images": mirror_result["unique_images"],
+            "downloaded": mirror_result["downloaded"],
+            "mirrored": mirror_result["mirrored_successfully"],
+            "failed": mirror_result["failed_or_skipped"],
+        }
         print(f"[BANIBS RSS Sync] CDN mirror completed: {mirror_result}")
 
+        # Step 3: Related stories for the new items (and the lists they join)
+        # (best effort: unscored stories are picked up by the next run)
+        stage_started = time.perf_counter()
+        try:
+            related_result = await update_related_stories()
+            print(f"[BANIBS RSS Sync] Related stories: {related_result['scored']} scored, {related_result['updated']} lists updated")
+        except Exception as e:
+            related_result = {"error": str(e) or type(e).__name__}
+            print(f"[BANIBS RSS Sync] Related stories error: {e}")
+        stages["related"] = dict(related_result, seconds=round(time.perf_counter() - stage_started, 4))
+
     except Exception as e:
         print(f"[BANIBS RSS Sync] Pipeline error: {e}")
+        status, error = "failed", str(e) or type(e).__name__
 
-    # Step 3: Generate and log health snapshot
+    # Step 4: Generate and log health snapshot
+    stage_started = time.perf_counter()
     try:
         report = await generate_health_report()
         write_report_to_log(report)
         print("[BANIBS RSS Sync] Health report written to log")
     except Exception as e:
         print(f"[BANIBS RSS Sync] Health report error: {e}")
+    stages["health_report"] = {"seconds": round(time.perf_counter() - stage_started, 4)}
     
+    # Step 5: Public news snapshots are now stale; each rebuilds on its next hit
+    news_snapshot_cache.invalidate()
+    print("[BANIBS RSS Sync] News snapshot cache invalidated")
+    
+    await _finish_run(run, started, status, stages, sources, error)
     print(f"[BANIBS RSS Sync] Full pipeline completed at {datetime.utcnow().isoformat()}Z")
 
 
+def _record_skipped_tick(event):
+    """APScheduler skipped a tick because the previous run is still going"""
+    if event.job_id != "rss_sync_job":
+        return
+    
+    async def _record():
+        try:
+            await record_skipped_run(new_run(), reason="max_instances")
+        except Exception as e:
+            print(f"[BANIBS RSS Sync] Run ledger unavailable: {e}")
+    asyncio.ensure_future(_record())
+
+
 def init_scheduler():
     """
     Initialize APScheduler and register jobs:
-    1. RSS sync job - runs every 6 hours (RSS + CDN mirror + health report)
+    1. RSS sync job - ticks every RSS_POLL_TICK_MINUTES, fetching due sources (RSS + CDN mirror + health report)
     2. Sentiment sweep job - runs every 3 hours (AI sentiment analysis + cleanup)
     
     Called from FastAPI startup event in server.py.
@@ -100,16 +213,19 @@ def init_scheduler():
     
     scheduler = AsyncIOScheduler()
     
-    # Job 1: Full RSS pipeline (every 6 hours)
+    # Job 1: Full RSS pipeline (short tick; sources are polled when due)
     scheduler.add_job(
         run_all_feeds_job,
         trigger="interval",
-        hours=6,
+        minutes=RSS_POLL_TICK_MINUTES,
         id="rss_sync_job",
         name="BANIBS Full RSS Pipeline",
         replace_existing=True,
+        coalesce=True,
+        max_instances=1,
         next_run_time=datetime.now()  # Run immediately on startup
     )
+    scheduler.add_listener(_record_skipped_tick, EVENT_JOB_MAX_INSTANCES)
     
     # Job 2: Sentiment sweep (every 3 hours)
     scheduler.add_job(
@@ -150,13 +266,65 @@ def init_scheduler():
     from tasks.uptime_monitor import schedule_uptime_monitoring
     schedule_uptime_monitoring(scheduler)
     
+    # Job 6: Social home timeline trim + consistency repair (hourly)
+    from tasks.timeline_maintenance import run_timeline_maintenance
+    scheduler.add_job(
+        run_timeline_maintenance,
+        trigger="interval",
+        hours=1,
+        id="timeline_maintenance_job",
+        name="BANIBS Social Timeline Maintenance",
+        replace_existing=True
+    )
+    
+    # Job 7: Repair drifted like/comment counters (every 6 hours)
+    from tasks.engagement_reconciliation import run_engagement_reconciliation
+    scheduler.add_job(
+        run_engagement_reconciliation,
+        trigger="interval",
+        hours=6,
+        id="engagement_reconciliation_job",
+        name="BANIBS Social Engagement Reconciliation",
+        replace_existing=True
+    )
+    
+    # Job 8: Rebuild trending leaderboards (every 10 minutes)
+    from tasks.trending_refresh import run_trending_refresh
+    scheduler.add_job(
+        run_trending_refresh,
+        trigger="interval",
+        minutes=10,
+        id="trending_refresh_job",
+        name="BANIBS Trending Leaderboard Refresh",
+        replace_existing=True,
+        next_run_time=datetime.now()  # Warm the leaderboards on startup
+    )
+    
+    # Job 9: Delete unreferenced CDN image files (daily at 03:30 UTC)
+    from tasks.cdn_image_gc import run_cdn_image_gc
+    scheduler.add_job(
+        run_cdn_image_gc,
+        trigger="cron",
+        hour=3,
+        minute=30,
+        timezone="UTC",
+        id="cdn_image_gc_job",
+        name="BANIBS CDN Image Garbage Collection",
+        replace_existing=True,
+        max_instances=1
+    )
+    
     scheduler.start()
     print("[BANIBS Scheduler] Started.")
-    print("  - RSS pipeline: every 6 hours")
+    print(f"  - RSS pipeline: every {RSS_POLL_TICK_MINUTES} minutes (adaptive per-source polling)")
     print("  - Sentiment sweep: every 3 hours")
     print("  - Sentiment aggregation: daily at 00:30 UTC")
     print("  - RSS health check: daily at 01:00 UTC")
     print("  - Uptime monitoring: every 5 minutes")
+    print("  - Social timeline maintenance: every hour")
+    print("  - Social engagement reconciliation: every 6 hours")
+    print("  - Trending leaderboard refresh: every 10 minutes")
+    print("  - CDN image garbage collection: daily at 03:30 UTC")
 
 
 def shutdown_scheduler():
@@ -0,0 +1,46 @@
+"""
+News Section Backfill Script - Phase 7.6.1
+Store the homepage section (news_items.section) and section page tags
+(news_items.section_tags) on existing news items, so /api/news/homepage and
+/api/news/section can read them by index instead of categorizing per request.
+
+New items get these fields at ingest (utils/rss_parser.fetch_and_store_feed).
+
+Usage:
+    python scripts/backfill_news_sections.py [--all]
+
+Options:
+    --all    Recompute every item, not just items missing a section
+             (run after changing categorization rules or item categories)
+"""
+
+import asyncio
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db.news import backfill_news_sections
+
+
+async def main():
+    """Main entry point"""
+    recompute_all = "--all" in sys.argv
+
+    print("=" * 60)
+    print("BANIBS News Section Backfill")
+    print("=" * 60)
+    print(f"\n🔄 {'Recomputing all items' if recompute_all else 'Filling items without a section'}...")
+
+    stats = await backfill_news_sections(recompute_all=recompute_all)
+
+    print("\n" + "=" * 60)
+    print("Backfill Complete!")
+    print("=" * 60)
+    print(f"📊 Items scanned: {stats['scanned']}")
+    print(f"✅ Items updated: {stats['updated']}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,88 @@
+"""
+Social Timeline Backfill & Consistency Script
+Rebuild fan-out home timelines from recent posts, or check them for drift.
+
+Usage:
+    python scripts/backfill_social_timelines.py backfill [days]
+    python scripts/backfill_social_timelines.py check [sample_size] [--repair]
+"""
+
+import asyncio
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db.social_timelines import backfill_timelines, check_timeline_consistency
+
+
+USAGE = (
+    "Usage:\n"
+    "  python backfill_social_timelines.py backfill [days]\n"
+    "  python backfill_social_timelines.py check [sample_size] [--repair]"
+)
+
+
+async def run_backfill(days: int):
+    print("=" * 60)
+    print("BANIBS Social Timeline Backfill")
+    print("=" * 60)
+    print(f"\n🔄 Fanning out posts from the last {days} days...")
+    
+    stats = await backfill_timelines(days=days)
+    
+    print("\n" + "=" * 60)
+    print("Backfill Complete!")
+    print("=" * 60)
+    print(f"✅ Posts processed: {stats['posts']}")
+    print(f"📬 Timeline entries written: {stats['entries_written']}")
+    print(f"📡 Posts served by read-time merge: {stats['pull_posts']}")
+    print(f"📣 Authors moved back to fan-out: {stats['pull_authors_cleared']}")
+    print(f"✂️  Entries trimmed: {stats['entries_trimmed']}")
+    if stats["errors"]:
+        print(f"❌ Errors: {stats['errors']}")
+
+
+async def run_check(sample_size: int, repair: bool):
+    print("=" * 60)
+    print("BANIBS Social Timeline Consistency Check")
+    print("=" * 60)
+    
+    report = await check_timeline_consistency(sample_size=sample_size, repair=repair)
+    
+    print(f"\n📊 Posts checked: {report['posts_checked']}")
+    print(f"  Missing deliveries: {report['missing_entries']}")
+    print(f"  Unexpected deliveries: {report['unexpected_entries']}")
+    print(f"  Entries for deleted/hidden posts: {report['stale_entries']}")
+    
+    if report["inconsistent_posts"]:
+        print(f"\n⚠️  {len(report['inconsistent_posts'])} inconsistent posts")
+        print("   Repaired." if repair else "   Re-run with --repair to fix.")
+    else:
+        print("\n✅ Timelines are consistent")
+
+
+async def main():
+    """Main entry point"""
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    repair = "--repair" in sys.argv
+    
+    if not args or args[0] not in ("backfill", "check"):
+        print(USAGE)
+        return
+    
+    try:
+        number = int(args[1]) if len(args) > 1 else None
+    except ValueError:
+        print(USAGE)
+        return
+    
+    if args[0] == "backfill":
+        await run_backfill(days=number or 30)
+    else:
+        await run_check(sample_size=number or 200, repair=repair)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
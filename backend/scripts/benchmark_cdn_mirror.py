@@ -0,0 +1,169 @@
+"""
+CDN Mirror Benchmark Script
+Mirrors synthetic images from a local HTTP server (with simulated latency)
+two ways and reports images/sec:
+
+- baseline: the original serial loop (blocking requests download, one
+  1280px JPEG optimized and written on the calling thread, one image at a
+  time)
+- ImageMirror: utils/cdn_mirror's async downloader with the render process
+  pool, writing all six content-addressed renditions per image
+
+Every fifth URL serves a photo already served under another URL (the same
+wire photo at several outlets); the store keeps one copy. No database is
+touched; files go to temporary directories.
+
+Usage:
+    python scripts/benchmark_cdn_mirror.py [--images N] [--latency MS] [--workers N] [--concurrency N]
+
+Options:
+    --images N       Images to mirror (default 60)
+    --latency MS     Server delay per request (default 100)
+    --workers N      Render processes (default CDN_MIRROR_WORKERS)
+    --concurrency N  Concurrent downloads (default CDN_MIRROR_CONCURRENCY)
+"""
+
+import asyncio
+import hashlib
+import io
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+from aiohttp import web
+from PIL import Image
+
+from utils.cdn_mirror import CDN_MIRROR_CONCURRENCY, CDN_MIRROR_WORKERS, ImageMirror, USER_AGENT
+from utils.image_io import optimize_news_image
+from utils.news_image_store import RENDITIONS, FORMATS
+
+
+def arg(name: str, default: int) -> int:
+    if name in sys.argv:
+        return int(sys.argv[sys.argv.index(name) + 1])
+    return default
+
+
+def synthetic_images(n: int):
+    """Noisy photo-sized JPEGs, so resize + encode cost is realistic; every fifth repeats one"""
+    rng = random.Random(7)
+    images = []
+    for i in range(n):
+        if i % 5 == 4:
+            images.append(images[rng.randrange(len(images))])
+            continue
+        width, height = rng.choice([(1920, 1080), (1600, 1200), (1024, 768)])
+        noise = Image.effect_noise((width // 4, height // 4), 60).resize((width, height)).convert("RGB")
+        out = io.BytesIO()
+        noise.save(out, format="JPEG", quality=90)
+        images.append(out.getvalue())
+    return images
+
+
+def start_server(images, latency: float) -> str:
+    """Serve /img/{i}.jpg from a background thread; returns the base URL"""
+    ready = threading.Event()
+    base = {}
+
+    async def handle(request):
+        await asyncio.sleep(latency)
+        return web.Response(body=images[int(request.match_info["index"])], content_type="image/jpeg")
+
+    def run():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        app = web.Application()
+        app.router.add_get("/img/{index}.jpg", handle)
+        runner = web.AppRunner(app)
+        loop.run_until_complete(runner.setup())
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        loop.run_until_complete(site.start())
+        port = site._server.sockets[0].getsockname()[1]
+        base["url"] = f"http://127.0.0.1:{port}"
+        ready.set()
+        loop.run_forever()
+
+    threading.Thread(target=run, daemon=True).start()
+    ready.wait()
+    return base["url"]
+
+
+def baseline_mirror(urls, mirror_dir: str) -> int:
+    """Original implementation: one file per URL, one image at a time, all on this thread"""
+    mirrored = 0
+    for url in urls:
+        response = requests.get(url, headers={"User-Agent": USER_AGENT}, timeout=30)
+        response.raise_for_status()
+        optimized = optimize_news_image(response.content)
+        filename = hashlib.sha256(url.encode()).hexdigest()[:12] + ".jpg"
+        with open(os.path.join(mirror_dir, filename), "wb") as f:
+            f.write(optimized)
+        mirrored += 1
+    return mirrored
+
+
+async def concurrent_mirror(urls, mirror_dir: str, workers: int, concurrency: int):
+    async with ImageMirror(mirror_dir=mirror_dir, workers=workers, concurrency=concurrency,
+                           per_host=concurrency) as mirror:
+        results = await asyncio.gather(*[mirror.mirror(url) for url in urls])
+    for result in [result for result in results if result["error"]][:5]:
+        print(f"  ❌ {result['url']}: {result['error']}")
+    return results
+
+
+def disk_usage(root: str):
+    files = [os.path.join(path, name) for path, _, names in os.walk(root) for name in names]
+    return len(files), sum(os.path.getsize(f) for f in files)
+
+
+def report(label: str, count: int, elapsed: float, root: str):
+    files, size = disk_usage(root)
+    print(f"  {label:<20} {elapsed:8.2f}s  {count / elapsed:>7.1f} images/sec  "
+          f"{files:>5} files  {size / 1024 / 1024:>7.2f} MB")
+
+
+async def main():
+    """Main entry point"""
+    n = arg("--images", 60)
+    latency = arg("--latency", 100) / 1000
+    workers = arg("--workers", CDN_MIRROR_WORKERS)
+    concurrency = arg("--concurrency", CDN_MIRROR_CONCURRENCY)
+
+    print("=" * 60)
+    print("BANIBS CDN Mirror Benchmark")
+    print("=" * 60)
+    images = synthetic_images(n)
+    base_url = start_server(images, latency)
+    urls = [f"{base_url}/img/{i}.jpg" for i in range(n)]
+    print(f"\n📊 {n} images, {latency * 1000:.0f} ms latency, "
+          f"{workers} optimize workers, {concurrency} concurrent downloads\n")
+
+    with tempfile.TemporaryDirectory() as baseline_dir, tempfile.TemporaryDirectory() as mirror_dir:
+        started = time.perf_counter()
+        baseline_count = await asyncio.to_thread(baseline_mirror, urls, baseline_dir)
+        report("serial (baseline)", baseline_count, time.perf_counter() - started, baseline_dir)
+
+        started = time.perf_counter()
+        results = await concurrent_mirror(urls, mirror_dir, workers, concurrency)
+        mirrored = [result for result in results if result["image"]]
+        report("ImageMirror", len(mirrored), time.perf_counter() - started, mirror_dir)
+
+    distinct = {result["image"]["hash"] for result in mirrored}
+    expected = len(RENDITIONS) * len(FORMATS)
+    complete = all(len(result["image"]["renditions"]) == expected for result in mirrored)
+    print(f"\n📦 {len(distinct)} distinct images stored for {len(mirrored)} URLs")
+    ok = len(mirrored) == n and complete
+    print(f"{'✅' if ok else '❌'} All images mirrored with {expected} renditions: {ok}")
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,103 @@
+"""
+Sentiment Benchmark Script - Phase 6.3
+Throughput of services/sentiment_service on a news-like corpus, against the
+per-keyword substring scan it replaced (reimplemented here as the baseline).
+
+Scores are compared item by item; the run fails if any differ.
+
+Usage:
+    python scripts/benchmark_sentiment.py [--items N] [--from-db]
+
+Options:
+    --items N    Synthetic corpus size (default 20000)
+    --from-db    Use title + summary of up to N stored news items instead
+"""
+
+import asyncio
+import random
+import sys
+import os
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.sentiment_service import (
+    NEGATIVE_WORDS,
+    POSITIVE_WORDS,
+    analyze_batch_sentiment,
+    analyze_text_sentiment
+)
+
+FILLER = (
+    "the city council said on monday that a new report on local schools and housing "
+    "will be released after weeks of talks with residents business owners and state officials"
+).split()
+
+
+def baseline_score(text: str) -> float:
+    """Original algorithm: one substring check per lexicon word"""
+    text_lower = text.lower()
+    score = 0.0
+    for word in POSITIVE_WORDS:
+        if word in text_lower:
+            score += 0.1
+    for word in NEGATIVE_WORDS:
+        if word in text_lower:
+            score -= 0.1
+    return max(-1.0, min(1.0, score))
+
+
+def synthetic_corpus(n: int):
+    rng = random.Random(42)
+    lexicon = sorted(POSITIVE_WORDS | NEGATIVE_WORDS)
+    corpus = []
+    for _ in range(n):
+        words = rng.choices(FILLER, k=rng.randrange(40, 90)) + rng.choices(lexicon, k=rng.randrange(0, 6))
+        rng.shuffle(words)
+        corpus.append(" ".join(words).capitalize())
+    return corpus
+
+
+async def db_corpus(n: int):
+    from db.connection import get_db
+    db = await get_db()
+    items = await db.news_items.find({}, {"_id": 0, "title": 1, "summary": 1}).limit(n).to_list(n)
+    return [f"{item.get('title', '')} {item.get('summary') or ''}" for item in items]
+
+
+def timed(label: str, fn, corpus):
+    started = time.perf_counter()
+    result = fn(corpus)
+    elapsed = time.perf_counter() - started
+    print(f"  {label:<28} {elapsed:8.3f}s  {len(corpus) / elapsed:>10.0f} items/sec")
+    return result
+
+
+async def main():
+    """Main entry point"""
+    n = 20000
+    if "--items" in sys.argv:
+        n = int(sys.argv[sys.argv.index("--items") + 1])
+
+    print("=" * 60)
+    print("BANIBS Sentiment Benchmark")
+    print("=" * 60)
+    corpus = await db_corpus(n) if "--from-db" in sys.argv else synthetic_corpus(n)
+    print(f"\n📊 Corpus: {len(corpus)} texts\n")
+
+    baseline = timed("substring scan (baseline)", lambda texts: [baseline_score(t) for t in texts], corpus)
+    single = timed("analyze_text_sentiment", lambda texts: [analyze_text_sentiment(t) for t in texts], corpus)
+    timed("analyze_batch_sentiment", analyze_batch_sentiment, corpus)
+
+    mismatches = sum(
+        1 for expected, result in zip(baseline, single)
+        if round(expected, 3) != result["score"]
+    )
+    print(f"\n{'✅' if not mismatches else '❌'} Score mismatches vs baseline: {mismatches}")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,43 @@
+"""
+News Fingerprint Dedupe Script
+Remove duplicate news items (same fingerprint) left by older concurrent RSS
+syncs, keeping the earliest stored copy, then build the unique fingerprint
+index that makes the RSS ingest reject duplicates at the database.
+
+Usage:
+    python scripts/dedupe_news_fingerprints.py
+"""
+
+import asyncio
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db.news import remove_duplicate_fingerprints
+from db.indices import ensure_news_indices
+
+
+async def main():
+    """Main entry point"""
+    print("=" * 60)
+    print("BANIBS News Fingerprint Dedupe")
+    print("=" * 60)
+    print("\n🔄 Removing duplicate fingerprints...")
+
+    stats = await remove_duplicate_fingerprints()
+
+    print(f"📊 Duplicated fingerprints: {stats['fingerprints']}")
+    print(f"🗑️  Items removed: {stats['removed']}")
+
+    print("\n🔄 Ensuring news indices (including unique fingerprint)...")
+    await ensure_news_indices()
+
+    print("\n" + "=" * 60)
+    print("Dedupe Complete!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
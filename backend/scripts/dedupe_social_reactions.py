@@ -0,0 +1,51 @@
+"""
+Social Reaction Dedupe Script
+Remove duplicate reactions (same post and user) left by like/high-five
+toggles that raced before reactions were unique, keeping the earliest,
+then build the unique (post_id, user_id) index toggle_like relies on and
+recount like_count / comment_count from what is left.
+
+Usage:
+    python scripts/dedupe_social_reactions.py
+"""
+
+import asyncio
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db.social_posts import reconcile_engagement_counts, remove_duplicate_reactions
+from db.indices import ensure_social_posts_indices
+
+
+async def main():
+    """Main entry point"""
+    print("=" * 60)
+    print("BANIBS Social Reaction Dedupe")
+    print("=" * 60)
+    print("\n🔄 Removing duplicate reactions...")
+
+    stats = await remove_duplicate_reactions()
+
+    print(f"📊 Duplicated (post, user) pairs: {stats['pairs']}")
+    print(f"🗑️  Reactions removed: {stats['removed']}")
+
+    print("\n🔄 Ensuring social_posts indices (including unique reactions)...")
+    await ensure_social_posts_indices()
+
+    print("\n🔄 Reconciling like/comment counts...")
+    counts = await reconcile_engagement_counts()
+
+    print(f"📊 Posts scanned: {counts['posts_scanned']}")
+    print(f"🔧 Posts repaired: {counts['posts_repaired']} "
+          f"({counts['like_fixes']} like counts, {counts['comment_fixes']} comment counts)")
+
+    print("\n" + "=" * 60)
+    print("Dedupe Complete!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,171 @@
+"""
+CDN Mirror Layout Migration
+One-shot move of the old mirror's flat files ({date}_{urlhash}.jpg in the
+root of the CDN directory) into the sharded, content-addressed store
+(utils/news_image_store):
+
+- Each file is rendered into {hash[:2]}/{hash[2:4]}/{hash}-{size}.{ext}
+- News items / featured media pointing at its old URL get the new
+  imageUrl / thumbnailUrl and srcset fields, and are counted in news_images
+- The external URL the file was downloaded from is not recoverable (the
+  flat name only hashes it), so migrated images get no source_urls and
+  items record mirror_state.migrated_from (the old CDN URL) instead of
+  mirror_state.source_url
+- The flat file is removed once nothing points at it
+
+Files no item references are left for the CDN image GC job
+(tasks/cdn_image_gc), which deletes them after its grace period.
+Safe to re-run: migrated files are gone from the root.
+
+Usage:
+    python scripts/migrate_cdn_mirror_layout.py [--dry-run] [--mirror-dir DIR]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db.connection import get_db
+from utils import cdn_mirror
+from utils.cdn_mirror import CDN_MIRROR_WORKERS, MIRROR_FLUSH_BATCH, MIRROR_TARGETS, _flush
+from utils.news_image_store import CDN_BASE_URL, content_hash, render_news_image, scan_mirror_files, srcset_fields
+from utils.process_pool import ProcessPool
+
+
+def _read(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _migrated_update(target: tuple, item: Dict[str, Any], image: Dict[str, Any], legacy_url: str, now: datetime):
+    """UpdateOne pointing one item at the migrated image"""
+    from pymongo import UpdateOne
+
+    _, field, prefix, _, touch_updated_at = target
+    update = srcset_fields(image, prefix)
+    update[field] = update.pop("url")
+    update["mirror_state"] = {"status": "mirrored", "migrated_from": legacy_url, "mirrored_at": now}
+    if touch_updated_at:
+        update["updatedAt"] = now
+    return UpdateOne({"id": item["id"]}, {"$set": update})
+
+
+async def migrate_legacy_files(
+    root: str,
+    dry_run: bool = False,
+    batch_size: int = MIRROR_FLUSH_BATCH,
+    workers: int = CDN_MIRROR_WORKERS
+) -> Dict[str, int]:
+    """
+    Move referenced flat mirror files into the content-addressed store.
+
+    Returns:
+        {"legacy_files", "migrated", "items_rewritten", "unreferenced",
+         "failed", "bytes_moved"}
+    """
+    db = await get_db()
+    legacy = [file for file in scan_mirror_files(root) if file["hash"] is None]
+    stats = {
+        "legacy_files": len(legacy),
+        "migrated": 0,
+        "items_rewritten": 0,
+        "unreferenced": 0,
+        "failed": 0,
+        "bytes_moved": 0,
+    }
+    now = datetime.utcnow()
+
+    async def _render(pool: ProcessPool, file: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            data = await asyncio.to_thread(_read, file["path"])
+            return {"image": await pool.run(render_news_image, data, content_hash(data), root), "error": None}
+        except Exception as e:
+            return {"image": None, "error": str(e) or type(e).__name__}
+
+    async with ProcessPool(0 if dry_run else workers, name="CDN image render") as pool:
+        for start in range(0, len(legacy), batch_size):
+            batch = {f"{CDN_BASE_URL}/{file['filename']}": file for file in legacy[start:start + batch_size]}
+
+            # Legacy URL -> items showing it, one query per collection
+            users: Dict[str, List[tuple]] = defaultdict(list)
+            for target in MIRROR_TARGETS:
+                collection, field = target[0], target[1]
+                items = await db[collection].find(
+                    {field: {"$in": list(batch)}},
+                    {"_id": 0, "id": 1, field: 1}
+                ).to_list(length=None)
+                for item in items:
+                    users[item[field]].append((target, item))
+
+            referenced = [url for url in batch if users[url]]
+            stats["unreferenced"] += len(batch) - len(referenced)
+            if dry_run:
+                stats["migrated"] += len(referenced)
+                stats["items_rewritten"] += sum(len(users[url]) for url in referenced)
+                stats["bytes_moved"] += sum(batch[url]["bytes"] for url in referenced)
+                continue
+
+            rendered = await asyncio.gather(*[_render(pool, batch[url]) for url in referenced])
+
+            ops: Dict[str, List[Any]] = defaultdict(list)
+            refs: Dict[str, Dict[str, Any]] = {}
+            moved = []
+            for url, result in zip(referenced, rendered):
+                if not result["image"]:
+                    stats["failed"] += 1
+                    print(f"⚠️  Kept {batch[url]['filename']}: {result['error']}")
+                    continue
+                for target, item in users[url]:
+                    ops[target[0]].append(_migrated_update(target, item, result["image"], url, now))
+                # No source URL: the old CDN URL isn't where the image came from
+                ref = refs.setdefault(result["image"]["hash"], {"count": 0, "image": result["image"], "source_urls": set()})
+                ref["count"] += len(users[url])
+                stats["items_rewritten"] += len(users[url])
+                moved.append(batch[url])
+
+            # References and URL rewrites first; the flat file goes last
+            await _flush(db, ops, refs)
+            for file in moved:
+                os.remove(file["path"])
+                stats["migrated"] += 1
+                stats["bytes_moved"] += file["bytes"]
+
+            print(f"   ... {min(start + batch_size, len(legacy))}/{len(legacy)} files checked")
+
+    return stats
+
+
+async def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Move flat CDN mirror files into the sharded image store")
+    parser.add_argument("--dry-run", action="store_true", help="report without rendering, rewriting or deleting")
+    parser.add_argument("--mirror-dir", default=cdn_mirror.LOCAL_MIRROR_DIR)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("BANIBS CDN Mirror Layout Migration" + (" (dry run)" if args.dry_run else ""))
+    print("=" * 60)
+    print(f"\n🔄 Migrating flat files in {args.mirror_dir}...")
+
+    stats = await migrate_legacy_files(args.mirror_dir, dry_run=args.dry_run)
+
+    print(f"📊 Flat legacy files: {stats['legacy_files']}")
+    print(f"✅ Migrated: {stats['migrated']} ({stats['bytes_moved'] / (1024 * 1024):.1f} MB)")
+    print(f"🔗 Item URLs rewritten: {stats['items_rewritten']}")
+    print(f"🗑️  Unreferenced (left for the GC job): {stats['unreferenced']}")
+    print(f"⚠️  Failed (kept in place): {stats['failed']}")
+
+    print("\n" + "=" * 60)
+    print("Migration Complete!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
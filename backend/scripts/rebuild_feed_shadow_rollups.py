@@ -0,0 +1,53 @@
+"""
+Feed Shadow Rollup Rebuild Script
+Recount the feed_shadow_daily rollups (read by the shadow-mode stats and
+weekly reports) from the raw feed_shadow_logs:
+
+- Days logged before the rollups existed get one, so stats cover the
+  whole log history after deploy
+- Days flagged needs_rebuild (a rollup write failed after its logs were
+  stored) are recounted
+
+Run once after deploying the rollups, and whenever the writer reports
+rollup errors. --force recounts every day that still has logs, e.g. the
+deploy day, whose rollup only covers the logs written after the deploy.
+
+Usage:
+    python scripts/rebuild_feed_shadow_rollups.py [--force]
+"""
+
+import argparse
+import asyncio
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.feed_analytics import rebuild_shadow_rollups
+
+
+async def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Recount feed_shadow_daily rollups from feed_shadow_logs")
+    parser.add_argument("--force", action="store_true", help="recount every day that still has logs")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("BANIBS Feed Shadow Rollup Rebuild")
+    print("=" * 60)
+    print("\n🔄 Recounting rollups from shadow logs...")
+
+    stats = await rebuild_shadow_rollups(force=args.force)
+
+    print(f"📊 Logs read: {stats['logs']}")
+    print(f"✅ Days rebuilt: {stats['days_rebuilt']}")
+    print(f"⏭️  Days kept (rollup already complete): {stats['days_kept']}")
+
+    print("\n" + "=" * 60)
+    print("Rebuild Complete!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
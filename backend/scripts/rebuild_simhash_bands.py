@@ -0,0 +1,42 @@
+"""
+SimHash Band Rebuild Script
+Recompute news_items.simhash_bands from the stored simhash after the band
+layout in services/news_clustering changes, so stories stored before the
+change are found as near-duplicate candidates by the RSS ingest.
+
+Only items in the cluster window (NEWS_CLUSTER_WINDOW_HOURS) are
+candidates, so only those are rewritten; without this script, clustering
+against older-layout items resumes once they age out of the window.
+
+Usage:
+    python scripts/rebuild_simhash_bands.py
+"""
+
+import asyncio
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db.news import rebuild_simhash_bands
+
+
+async def main():
+    """Main entry point"""
+    print("=" * 60)
+    print("BANIBS SimHash Band Rebuild")
+    print("=" * 60)
+    print("\n🔄 Recomputing band keys for items in the cluster window...")
+
+    stats = await rebuild_simhash_bands()
+
+    print("\n" + "=" * 60)
+    print("Rebuild Complete!")
+    print("=" * 60)
+    print(f"📊 Items scanned: {stats['scanned']}")
+    print(f"✅ Items updated: {stats['updated']}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
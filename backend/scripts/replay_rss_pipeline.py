@@ -0,0 +1,564 @@
+"""
+RSS Pipeline Replay Harness
+Runs scheduler.run_all_feeds_job (fetch, parse, dedupe, sentiment, mirror,
+health report) offline against recorded feeds and images, and reports
+throughput, per-stage timing and peak memory as JSON, so runs can be
+compared between commits.
+
+Fixtures directory:
+    sources.json     [{"id", "source_name", "category", "region", "host",
+                       "is_black_owned", "is_black_focus"}]
+    feeds/{id}.xml   Feed XML; image URLs are written as
+                     {{host:<original host>}}/images/{name}
+    images/{name}    Image bytes
+
+Every original host is served on its own local port, so the per-host fetch
+and mirror limits behave as they do against the live sites. The run uses a
+throwaway database (dropped afterwards) and a temporary mirror directory,
+and doesn't write the health report log.
+
+Usage:
+    python scripts/replay_rss_pipeline.py synthesize DIR [--sources N] [--items N]
+    python scripts/replay_rss_pipeline.py record DIR [--sources N]
+    python scripts/replay_rss_pipeline.py replay DIR [options]
+
+Replay options:
+    --latency MS          Server delay per request (default 50)
+    --mongo-url URL       MongoDB server for the throwaway database
+                          (default mongodb://localhost:27017)
+    --mongomock           In-memory database instead (pip install mongomock-motor)
+    --keep-db             Don't drop the throwaway database
+    --output FILE         Write the JSON report to FILE (default: stdout)
+    --compare FILE        Print changes against an earlier report
+    --max-regression PCT  With --compare, exit 1 if items/sec dropped by more than PCT
+"""
+
+import asyncio
+import contextlib
+import hashlib
+import html
+import io
+import json
+import os
+import platform
+import random
+import re
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from urllib.parse import urlparse
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aiohttp import web
+
+# Backend modules connect to MONGO_URL / DB_NAME at import time, so they are
+# imported inside the commands, after configure_database
+
+# run_all_feeds_job stores this many items per source
+ITEMS_PER_SOURCE = 5
+
+PLACEHOLDER_RE = re.compile(rb"\{\{host:([^}]+)\}\}")
+
+WORDS = (
+    "council community report schools housing business owners residents officials "
+    "festival scholarship investment growth protest court ruling election health clinic "
+    "students market music heritage leaders funding program workers union award"
+).split()
+
+
+def option(name: str, default=None):
+    if name in sys.argv:
+        return sys.argv[sys.argv.index(name) + 1]
+    return default
+
+
+def flag(name: str) -> bool:
+    return name in sys.argv
+
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+def load_fixtures(directory: str):
+    with open(os.path.join(directory, "sources.json")) as f:
+        sources = json.load(f)
+    feeds = {}
+    for source in sources:
+        with open(os.path.join(directory, "feeds", f"{source['id']}.xml"), "rb") as f:
+            feeds[source["id"]] = f.read()
+    images = {}
+    images_dir = os.path.join(directory, "images")
+    if os.path.isdir(images_dir):
+        for name in os.listdir(images_dir):
+            with open(os.path.join(images_dir, name), "rb") as f:
+                images[name] = f.read()
+    return sources, feeds, images
+
+
+def write_fixtures(directory: str, sources, feeds, images) -> None:
+    os.makedirs(os.path.join(directory, "feeds"), exist_ok=True)
+    os.makedirs(os.path.join(directory, "images"), exist_ok=True)
+    with open(os.path.join(directory, "sources.json"), "w") as f:
+        json.dump(sources, f, indent=2)
+    for source_id, content in feeds.items():
+        with open(os.path.join(directory, "feeds", f"{source_id}.xml"), "wb") as f:
+            f.write(content)
+    for name, data in images.items():
+        with open(os.path.join(directory, "images", name), "wb") as f:
+            f.write(data)
+    print(f"✅ Wrote {len(sources)} feeds and {len(images)} images to {directory}")
+
+
+def synthesize(directory: str, n_sources: int, n_items: int) -> None:
+    """Generated feeds and photo-sized images; about a quarter of the photos are shared between outlets"""
+    from PIL import Image
+    from config.rss_sources import RSS_SOURCES
+
+    rng = random.Random(11)
+    categories = sorted({source["category"] for source in RSS_SOURCES})
+    hosts = [f"news{i}.example.com" for i in range(max(1, n_sources // 3))]
+    now = datetime.now(timezone.utc)
+
+    images = {}
+    for i in range(max(1, n_sources * min(n_items, ITEMS_PER_SOURCE) * 3 // 4)):
+        width, height = rng.choice([(1920, 1080), (1600, 1200), (1200, 800)])
+        noise = Image.effect_noise((width // 4, height // 4), 60).resize((width, height)).convert("RGB")
+        out = io.BytesIO()
+        noise.save(out, format="JPEG", quality=90)
+        images[f"photo{i}.jpg"] = out.getvalue()
+    names = sorted(images)
+
+    sources, feeds = [], {}
+    for s in range(n_sources):
+        host = hosts[s % len(hosts)]
+        source = {
+            "id": f"replay_source_{s}",
+            "source_name": f"Replay Source {s}",
+            "category": categories[s % len(categories)],
+            "region": rng.choice(["Americas", "Africa", "Caribbean", "Europe", "Global"]),
+            "host": host,
+            "is_black_owned": s % 4 == 0,
+            "is_black_focus": s % 2 == 0,
+        }
+        entries = []
+        for i in range(n_items):
+            title = f"{' '.join(rng.choices(WORDS, k=6)).capitalize()} ({s}-{i})"
+            summary = " ".join(rng.choices(WORDS, k=rng.randrange(30, 70)))
+            published = format_datetime(now - timedelta(hours=i * rng.uniform(1, 6)))
+            image = rng.choice(names)
+            entries.append(
+                f"<item><title>{title}</title><link>https://{host}/story/{s}/{i}</link>"
+                f"<description><![CDATA[<p>{summary}</p>]]></description><pubDate>{published}</pubDate>"
+                f'<media:content url="{{{{host:{host}}}}}/images/{image}" medium="image" /></item>'
+            )
+        feeds[source["id"]] = (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<rss version="2.0" xmlns:media="http://search.yahoo.com/mrss/"><channel>'
+            f"<title>{source['source_name']}</title><link>https://{host}/</link>"
+            f"<description>Synthetic replay feed</description>{''.join(entries)}</channel></rss>"
+        ).encode("utf-8")
+        sources.append(source)
+
+    write_fixtures(directory, sources, feeds, images)
+
+
+async def record(directory: str, n_sources: int) -> None:
+    """Download the active feeds and their first items' images, with image URLs rewritten to placeholders"""
+    import aiohttp
+    from config.rss_sources import RSS_SOURCES
+    from utils.feed_processing import parse_feed_content
+    from utils.rss_fetcher import FeedFetcher, USER_AGENT
+
+    active = [source for source in RSS_SOURCES if source.get("active", True)][:n_sources]
+    sources, feeds, images = [], {}, {}
+
+    async with FeedFetcher() as fetcher, aiohttp.ClientSession(headers={"User-Agent": USER_AGENT}) as session:
+        async def _record(source):
+            try:
+                response = await fetcher.fetch(source["rss_url"])
+            except Exception as e:
+                print(f"  ❌ {source['source_name']}: {str(e) or type(e).__name__}")
+                return
+            content = response["content"]
+            for item in parse_feed_content(content)[:ITEMS_PER_SOURCE]:
+                url = item.get("imageUrl")
+                if not url or url in images:
+                    continue
+                try:
+                    async with session.get(url) as resp:
+                        resp.raise_for_status()
+                        data = await resp.read()
+                except Exception as e:
+                    print(f"  ⚠️  {source['source_name']} image {url}: {str(e) or type(e).__name__}")
+                    continue
+                extension = os.path.splitext(urlparse(url).path)[1].lower() or ".jpg"
+                name = hashlib.sha256(url.encode()).hexdigest()[:16] + extension
+                images[url] = (name, data)
+                local = f"{{{{host:{urlparse(url).netloc}}}}}/images/{name}".encode()
+                for form in {url, html.escape(url)}:
+                    content = content.replace(form.encode(), local)
+            feeds[source["id"]] = content
+            sources.append({
+                "id": source["id"],
+                "source_name": source["source_name"],
+                "category": source["category"],
+                "region": source.get("region"),
+                "host": urlparse(source["rss_url"]).netloc,
+                "is_black_owned": source.get("is_black_owned", False),
+                "is_black_focus": source.get("is_black_focus", False),
+            })
+            print(f"  ✓ {source['source_name']}")
+
+        await asyncio.gather(*[_record(source) for source in active])
+
+    write_fixtures(directory, sources, feeds, dict(images.values()))
+
+
+# ============================================================================
+# Replay
+# ============================================================================
+
+def start_server(hosts, feeds, images, latency: float):
+    """Serve the fixtures from a background thread, one port per original host; returns host -> base URL"""
+    ready = threading.Event()
+    bases = {}
+    rendered = {}
+
+    async def handle_feed(request):
+        await asyncio.sleep(latency)
+        content = rendered.get(request.match_info["name"][:-len(".xml")])
+        if content is None:
+            raise web.HTTPNotFound()
+        return web.Response(body=content, content_type="application/rss+xml")
+
+    async def handle_image(request):
+        await asyncio.sleep(latency)
+        data = images.get(request.match_info["name"])
+        if data is None:
+            raise web.HTTPNotFound()
+        return web.Response(body=data, content_type="image/jpeg")
+
+    def run():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        app = web.Application()
+        app.router.add_get("/feeds/{name}", handle_feed)
+        app.router.add_get("/images/{name}", handle_image)
+        runner = web.AppRunner(app)
+        loop.run_until_complete(runner.setup())
+        for host in hosts:
+            site = web.TCPSite(runner, "127.0.0.1", 0)
+            loop.run_until_complete(site.start())
+            bases[host] = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+        # Placeholders for hosts without a feed of their own (image CDNs)
+        # point at the first port
+        fallback = next(iter(bases.values()))
+        for source_id, content in feeds.items():
+            rendered[source_id] = PLACEHOLDER_RE.sub(
+                lambda m: bases.get(m.group(1).decode(), fallback).encode(), content
+            )
+        ready.set()
+        loop.run_forever()
+
+    threading.Thread(target=run, daemon=True).start()
+    ready.wait()
+    return bases
+
+
+class MemorySampler(threading.Thread):
+    """Peak resident memory of this process and of this process plus its pool workers, sampled from /proc"""
+
+    def __init__(self, interval: float = 0.05):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.peak_main_kb = 0
+        self.peak_total_kb = 0
+        self._stop_event = threading.Event()
+
+    @staticmethod
+    def _rss_kb(pid) -> int:
+        try:
+            with open(f"/proc/{pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        return int(line.split()[1])
+        except OSError:
+            pass
+        return 0
+
+    @staticmethod
+    def _children(pid):
+        children = []
+        try:
+            for task in os.listdir(f"/proc/{pid}/task"):
+                with open(f"/proc/{pid}/task/{task}/children") as f:
+                    children.extend(int(child) for child in f.read().split())
+        except OSError:
+            pass
+        return children
+
+    def run(self):
+        while not self._stop_event.is_set():
+            main = self._rss_kb(os.getpid())
+            total = main + sum(self._rss_kb(child) for child in self._children(os.getpid()))
+            self.peak_main_kb = max(self.peak_main_kb, main)
+            self.peak_total_kb = max(self.peak_total_kb, total)
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+        if not self.peak_main_kb:
+            # No /proc: ru_maxrss (KB on Linux) covers this process only
+            self.peak_main_kb = self.peak_total_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def configure_database(mongomock: bool) -> str:
+    """Point the backend at a throwaway database; returns its name"""
+    db_name = f"banibs_replay_{os.getpid()}"
+    # Never inherit MONGO_URL: the replay must not touch a real deployment
+    os.environ["MONGO_URL"] = option("--mongo-url", "mongodb://localhost:27017")
+    os.environ["DB_NAME"] = db_name
+    if mongomock:
+        try:
+            import mongomock_motor
+        except ImportError:
+            sys.exit("❌ --mongomock needs mongomock-motor (pip install mongomock-motor)")
+        import motor.motor_asyncio
+        # One in-memory server shared by every module-level client
+        shared = mongomock_motor.AsyncMongoMockClient()
+        motor.motor_asyncio.AsyncIOMotorClient = lambda *args, **kwargs: shared
+    return db_name
+
+
+def stage_totals(results, key: str):
+    """Busy time of one per-source stage, summed over sources (they overlap, so this can exceed wall time)"""
+    values = [result["timings"][key] for result in results if key in result.get("timings", {})]
+    return {
+        "busy_seconds": round(sum(values), 4),
+        "max_seconds": round(max(values, default=0.0), 4),
+        "count": len(values),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+async def replay(directory: str):
+    mongomock = flag("--mongomock")
+    latency = float(option("--latency", 50)) / 1000
+    db_name = configure_database(mongomock)
+
+    import scheduler
+    from db.connection import client
+    from db.rss_sources import seed_rss_sources
+    from utils import cdn_mirror, feed_processing, rss_fetcher
+
+    fixtures, feeds, images = load_fixtures(directory)
+    hosts = sorted({source["host"] for source in fixtures} | {
+        host.decode() for content in feeds.values() for host in PLACEHOLDER_RE.findall(content)
+    })
+    bases = start_server(hosts, feeds, images, latency)
+    sources = [
+        dict(source, active=True, rss_url=f"{bases[source['host']]}/feeds/{source['id']}.xml")
+        for source in fixtures
+    ]
+
+    if not mongomock:
+        try:
+            await client.admin.command("ping")
+        except Exception as e:
+            sys.exit(f"❌ MongoDB not reachable at {os.environ['MONGO_URL']} ({e}); try --mongomock")
+
+    # Wrap the pipeline's stages to time them and keep their results
+    stages = {}
+
+    def timed(name, fn):
+        async def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                stages[name] = {"result": await fn(*args, **kwargs)}
+            finally:
+                stages.setdefault(name, {})["wall_seconds"] = round(time.perf_counter() - started, 4)
+            return stages[name]["result"]
+        return wrapper
+
+    scheduler.sync_due_feed_sources = timed("sync", scheduler.sync_due_feed_sources)
+    scheduler.mirror_all_images = timed("mirror", scheduler.mirror_all_images)
+    scheduler.generate_health_report = timed("health_report", scheduler.generate_health_report)
+    scheduler.write_report_to_log = lambda report: None
+
+    await seed_rss_sources(sources)
+    print(f"🔁 Replaying {len(sources)} feeds, {len(images)} images, {latency * 1000:.0f} ms latency "
+          f"({'mongomock' if mongomock else os.environ['MONGO_URL']} / {db_name})", file=sys.stderr)
+
+    memory = MemorySampler()
+    memory.start()
+    with tempfile.TemporaryDirectory() as mirror_dir:
+        cdn_mirror.LOCAL_MIRROR_DIR = mirror_dir
+        try:
+            # Pipeline logging goes to stderr; stdout is the report
+            with contextlib.redirect_stdout(sys.stderr):
+                started = time.perf_counter()
+                await scheduler.run_all_feeds_job()
+                wall = time.perf_counter() - started
+        finally:
+            if not flag("--keep-db"):
+                await client.drop_database(db_name)
+            memory.stop()
+
+    if "result" not in stages.get("sync", {}):
+        sys.exit("❌ Feed sync did not complete; see the pipeline output above")
+
+    results = stages["sync"]["result"]
+    mirror = stages.get("mirror", {}).get("result") or {}
+    stored = sum(result.get("items_added", 0) for result in results)
+    mirrored = mirror.get("mirrored_successfully", 0)
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+        "config": {
+            "fixtures": os.path.abspath(directory),
+            "sources": len(sources),
+            "hosts": len(hosts),
+            "latency_ms": latency * 1000,
+            "database": "mongomock" if mongomock else "mongodb",
+            "fetch_concurrency": rss_fetcher.RSS_FETCH_CONCURRENCY,
+            "fetch_per_host": rss_fetcher.RSS_FETCH_PER_HOST,
+            "parse_workers": feed_processing.RSS_PARSE_WORKERS,
+            "mirror_concurrency": cdn_mirror.CDN_MIRROR_CONCURRENCY,
+            "mirror_per_host": cdn_mirror.CDN_MIRROR_PER_HOST,
+            "mirror_workers": cdn_mirror.CDN_MIRROR_WORKERS,
+        },
+        "wall_seconds": round(wall, 4),
+        "items": {
+            "stored": stored,
+            "duplicates": sum(result.get("duplicates", 0) for result in results),
+            "errors": sum(result.get("errors", 0) for result in results),
+            "failed_sources": sum(1 for result in results if result["status"] == "failed"),
+        },
+        "items_per_sec": round(stored / wall, 2) if wall else None,
+        "images": {
+            "mirrored": mirrored,
+            "downloaded": mirror.get("downloaded", 0),
+            "failed": mirror.get("failed_or_skipped", 0),
+        },
+        "images_per_sec": round(mirrored / stages["mirror"]["wall_seconds"], 2) if mirrored else None,
+        "stages": {
+            "sync": {"wall_seconds": stages["sync"]["wall_seconds"]},
+            "fetch": stage_totals(results, "fetch_seconds"),
+            "parse": stage_totals(results, "parse_seconds"),
+            "prepare": stage_totals(results, "prepare_seconds"),
+            "sentiment": stage_totals(results, "sentiment_seconds"),
+            "store": stage_totals(results, "store_seconds"),
+            "mirror": {"wall_seconds": stages.get("mirror", {}).get("wall_seconds")},
+            "health_report": {"wall_seconds": stages.get("health_report", {}).get("wall_seconds")},
+        },
+        "peak_rss_mb": {
+            "main": round(memory.peak_main_kb / 1024, 1),
+            "with_workers": round(memory.peak_total_kb / 1024, 1),
+        },
+    }
+    return report
+
+
+# ============================================================================
+# Comparison
+# ============================================================================
+
+# (path, higher is better)
+COMPARED_METRICS = [
+    ("items_per_sec", True),
+    ("images_per_sec", True),
+    ("wall_seconds", False),
+    ("stages.sync.wall_seconds", False),
+    ("stages.fetch.busy_seconds", False),
+    ("stages.parse.busy_seconds", False),
+    ("stages.sentiment.busy_seconds", False),
+    ("stages.store.busy_seconds", False),
+    ("stages.mirror.wall_seconds", False),
+    ("peak_rss_mb.main", False),
+    ("peak_rss_mb.with_workers", False),
+]
+
+# Changes smaller than this are reported without a verdict
+NOISE_PERCENT = 10
+NOISE_SECONDS = 0.1
+
+
+def lookup(report, path: str):
+    value = report
+    for key in path.split("."):
+        value = (value or {}).get(key)
+    return value
+
+
+def compare(before, after) -> float:
+    """Print each metric's change; returns the items/sec change in percent"""
+    print(f"\n📊 {before.get('commit')} → {after.get('commit')}", file=sys.stderr)
+    for path, higher_is_better in COMPARED_METRICS:
+        old, new = lookup(before, path), lookup(after, path)
+        if not old or new is None:
+            continue
+        change = (new - old) / old * 100
+        better = change > 0 if higher_is_better else change < 0
+        noise = abs(change) < NOISE_PERCENT or (path.endswith("seconds") and max(old, new) < NOISE_SECONDS)
+        marker = "  " if noise else ("✅" if better else "❌")
+        print(f"  {marker} {path:<32} {old:>10} → {new:<10} {change:+7.1f}%", file=sys.stderr)
+    old, new = before.get("items_per_sec"), after.get("items_per_sec")
+    return (new - old) / old * 100 if old and new is not None else 0.0
+
+
+def main():
+    """Main entry point"""
+    if len(sys.argv) < 3 or sys.argv[1] not in ("synthesize", "record", "replay"):
+        print(__doc__)
+        sys.exit(1)
+    command, directory = sys.argv[1], sys.argv[2]
+
+    if command == "synthesize":
+        synthesize(directory, int(option("--sources", 30)), int(option("--items", 10)))
+        return
+    if command == "record":
+        asyncio.run(record(directory, int(option("--sources", 1000))))
+        return
+
+    report = asyncio.run(replay(directory))
+    output = json.dumps(report, indent=2)
+    if option("--output"):
+        with open(option("--output"), "w") as f:
+            f.write(output + "\n")
+        print(f"✅ Report written to {option('--output')}", file=sys.stderr)
+    else:
+        print(output)
+
+    if option("--compare"):
+        with open(option("--compare")) as f:
+            change = compare(json.load(f), report)
+        limit = option("--max-regression")
+        if limit is not None and change < -float(limit):
+            print(f"❌ items/sec dropped {-change:.1f}% (limit {limit}%)", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Black News Retag Script
+Recompute is_black_focus / black_focus_type for every news item with the
+compiled keyword scanner (services/black_news_tagging_service.py), writing
+only the items whose tags change.
+
+New items are tagged at ingest (utils/rss_parser.fetch_and_store_feed).
+
+Usage:
+    python scripts/retag_black_news.py [--batch-size N]
+
+Options:
+    --batch-size N    Updates per bulk write (default 500)
+"""
+
+import asyncio
+import sys
+import os
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db.news import retag_black_news
+
+
+async def main():
+    """Main entry point"""
+    batch_size = 500
+    if "--batch-size" in sys.argv:
+        batch_size = int(sys.argv[sys.argv.index("--batch-size") + 1])
+
+    print("=" * 60)
+    print("BANIBS Black News Retag")
+    print("=" * 60)
+    print(f"\n🔄 Retagging all news items (batch size {batch_size})...")
+
+    started = time.perf_counter()
+    stats = await retag_black_news(batch_size=batch_size)
+    elapsed = time.perf_counter() - started
+
+    print("\n" + "=" * 60)
+    print("Retag Complete!")
+    print("=" * 60)
+    print(f"📊 Items scanned: {stats['scanned']}")
+    print(f"✅ Items updated: {stats['updated']}")
+    print(f"⏱️  Elapsed: {elapsed:.2f}s ({stats['scanned'] / elapsed if elapsed else 0:.0f} items/sec)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -15,12 +15,18 @@ and also returned to callers of /api/news/rss-sync.
 """
 
 import os
+import sys
 from datetime import datetime
 from urllib.parse import urlparse
 from motor.motor_asyncio import AsyncIOMotorClient
 import asyncio
 from dotenv import load_dotenv
 
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.news_image_store import resolve_cdn_file
+
 # Load environment variables
 load_dotenv()
 
@@ -49,8 +55,12 @@ def _get_file_size_mb_from_local_path(image_url: str) -> float | None:
     if not image_url or not image_url.startswith(CDN_BASE):
         return None
 
+    # Content-addressed renditions live in shard subdirectories
     filename = os.path.basename(urlparse(image_url).path)
-    local_path = os.path.join(LOCAL_MIRROR_DIR, filename)
+    resolved = resolve_cdn_file(filename, LOCAL_MIRROR_DIR)
+    if resolved is None:
+        return None
+    local_path = resolved[0]
 
     if not os.path.exists(local_path):
         return None
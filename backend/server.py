@@ -502,8 +502,18 @@ from pathlib import Path
 # Custom image serving endpoint with proper content-type
 @app.get("/cdn/news/{filename}")
 async def serve_news_image(filename: str):
-    """Serve news images with proper content-type headers"""
-    file_path = Path("/var/www/cdn.banibs.com/news") / filename
+    """
+    Serve news images with proper content-type headers.
+    Content-addressed renditions ({hash}-{size}.{ext}) live in sharded
+    subdirectories and never change, so they are cached as immutable;
+    flat legacy mirror files are served from the root.
+    """
+    from utils.news_image_store import resolve_cdn_file
+    
+    resolved = resolve_cdn_file(filename, "/var/www/cdn.banibs.com/news")
+    if resolved is None:
+        raise HTTPException(status_code=404, detail="Image not found")
+    file_path, immutable = Path(resolved[0]), resolved[1]
     
     if not file_path.exists():
         raise HTTPException(status_code=404, detail="Image not found")
@@ -517,7 +527,7 @@ async def serve_news_image(filename: str):
         path=str(file_path),
         media_type=content_type,
         headers={
-            "Cache-Control": "public, max-age=3600",
+            "Cache-Control": "public, max-age=31536000, immutable" if immutable else "public, max-age=3600",
             "Access-Control-Allow-Origin": "*"
         }
     )
@@ -589,6 +599,14 @@ async def startup_event():
     except Exception as e:
         logger.error(f"Failed to create indices: {e}")
     
+    # RSS source registry: add / refresh sources from config/rss_sources.py
+    from db.rss_sources import seed_rss_sources
+    try:
+        seeded = await seed_rss_sources()
+        logger.info(f"RSS source registry seeded: {seeded}")
+    except Exception as e:
+        logger.error(f"Failed to seed RSS sources: {e}")
+    
     # ADCS v1.0 - Initialize AI Double-Check System
     from adcs.audit_log import ADCSAuditLog
     try:
@@ -599,4 +617,10 @@ async def startup_event():
 
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    # Drain queued feed shadow comparisons before the client goes away
+    from services.feed_analytics import shadow_log_writer
+    try:
+        await shadow_log_writer.close()
+    except Exception as e:
+        logger.error(f"Failed to flush shadow logs: {e}")
     client.close()
\ No newline at end of file
@@ -1,9 +1,13 @@
 """
 BANIBS Black News Tagging Service
 Identifies and tags stories that center Black people, Black nations, and the global Black diaspora
+
+All keyword lists are compiled once into a single scanner (BLACK_NEWS_SCANNER)
+that reports every matched keyword group in one pass over the text.
 """
 
-from typing import Dict, Any, Optional
+from collections import defaultdict
+from typing import Dict, Any, List, Optional
 import re
 
 
@@ -82,6 +86,82 @@ BLACK_CONTEXT_PHRASES = [
     r'police (brutality|shooting).*(black|african american)',
 ]
 
+# Plain substring signals (no word boundaries)
+CIVIL_RIGHTS_INDICATORS = [
+    'civil rights', 'racial justice', 'police brutality',
+    'discrimination', 'protest', 'activism', 'blm'
+]
+
+BLACK_BUSINESS_INDICATORS = ['black-owned', 'black business']
+
+US_CITY_INDICATORS = ['atlanta', 'detroit', 'chicago', 'harlem', 'baltimore', 'washington']
+
+
+# ============================================================================
+# COMPILED KEYWORD SCANNER
+# ============================================================================
+
+class KeywordScanner:
+    """
+    Single-pass matcher for named groups of regex keywords.
+
+    One alternation of every pattern (leading \\b dropped, so each branch
+    starts with a literal and the regex engine can skip ahead by first
+    character) finds candidate positions; at each candidate only the
+    patterns starting with that character are checked exactly. The result
+    equals running re.search for every pattern, with one scan of the text
+    instead of one per keyword.
+    """
+
+    def __init__(self, groups: Dict[str, List[str]]):
+        self.groups = list(groups)
+        self._by_first_char: Dict[Optional[str], List[tuple]] = defaultdict(list)
+        branches = []
+        for group, patterns in groups.items():
+            for pattern in patterns:
+                head = pattern[2:] if pattern.startswith(r'\b') else pattern
+                first = head[0] if head[:1].isalnum() else None
+                self._by_first_char[first].append((group, pattern, re.compile(pattern)))
+                branches.append(f"(?:{head})")
+        # Patterns without a literal first character are checked everywhere
+        self._any_char = self._by_first_char.pop(None, [])
+        self._candidates = re.compile("|".join(branches))
+
+    def scan(self, text: str) -> Dict[str, int]:
+        """Number of distinct patterns of each group that occur in text"""
+        matched = set()
+        search = self._candidates.search
+        m = search(text)
+        while m is not None:
+            pos = m.start()
+            for entry in self._by_first_char.get(text[pos], []) + self._any_char:
+                if entry not in matched and entry[2].match(text, pos):
+                    matched.add(entry)
+            # Resume one character on: keywords may overlap (south africa / africa)
+            m = search(text, pos + 1)
+
+        counts = dict.fromkeys(self.groups, 0)
+        for group, _, _ in matched:
+            counts[group] += 1
+        return counts
+
+
+BLACK_NEWS_SCANNER = KeywordScanner({
+    'identity': BLACK_IDENTITY_KEYWORDS,
+    'africa': AFRICA_KEYWORDS,
+    'caribbean': CARIBBEAN_KEYWORDS,
+    'hbcu': HBCU_KEYWORDS,
+    'context': BLACK_CONTEXT_PHRASES,
+    'civil_rights': [re.escape(term) for term in CIVIL_RIGHTS_INDICATORS],
+    'business': [re.escape(term) for term in BLACK_BUSINESS_INDICATORS],
+    'us_city': [re.escape(term) for term in US_CITY_INDICATORS],
+})
+
+
+def scan_black_news_text(text: str) -> Dict[str, int]:
+    """Keyword group match counts for text (case-insensitive)"""
+    return BLACK_NEWS_SCANNER.scan(text.lower())
+
 
 def determine_black_focus_type(text: str, source_category: str = None) -> Optional[str]:
     """
@@ -90,49 +170,46 @@ def determine_black_focus_type(text: str, source_category: str = None) -> Option
     Args:
         text: Combined title + description text
         source_category: Original RSS category (for context)
-        
+    
     Returns:
         Black focus type string or None
     """
-    text_lower = text.lower()
-    
+    return _focus_type_from_matches(scan_black_news_text(text), source_category)
+
+
+def _focus_type_from_matches(matches: Dict[str, int], source_category: str = None) -> Optional[str]:
+    """determine_black_focus_type rules, applied to a scan result"""
     # Check HBCU (highest specificity)
-    if any(re.search(pattern, text_lower) for pattern in HBCU_KEYWORDS):
+    if matches['hbcu']:
         return 'hbcu'
     
     # Check Africa
-    if any(re.search(pattern, text_lower) for pattern in AFRICA_KEYWORDS):
+    if matches['africa']:
         return 'africa'
     
     # Check Caribbean
-    if any(re.search(pattern, text_lower) for pattern in CARIBBEAN_KEYWORDS):
+    if matches['caribbean']:
         return 'caribbean'
     
     # Check Civil Rights context
-    civil_rights_indicators = [
-        'civil rights', 'racial justice', 'police brutality',
-        'discrimination', 'protest', 'activism', 'blm'
-    ]
-    if any(indicator in text_lower for indicator in civil_rights_indicators):
+    if matches['civil_rights']:
         return 'civil_rights'
     
     # Check Culture / Entertainment
     if source_category in ['Entertainment', 'Culture / Civil Rights']:
-        if any(re.search(pattern, text_lower) for pattern in BLACK_IDENTITY_KEYWORDS):
+        if matches['identity']:
             return 'culture'
     
     # Check Business context
-    if 'black-owned' in text_lower or 'black business' in text_lower:
+    if matches['business']:
         return 'business'
     
     # Check for U.S. context
-    us_indicators = ['atlanta', 'detroit', 'chicago', 'harlem', 'baltimore', 'washington']
-    if any(indicator in text_lower for indicator in us_indicators):
-        if any(re.search(pattern, text_lower) for pattern in BLACK_IDENTITY_KEYWORDS):
-            return 'black_us'
+    if matches['us_city'] and matches['identity']:
+        return 'black_us'
     
     # Default to diaspora for general Black-focused content
-    if any(re.search(pattern, text_lower) for pattern in BLACK_IDENTITY_KEYWORDS):
+    if matches['identity']:
         return 'diaspora'
     
     return None
@@ -145,33 +222,25 @@ def is_black_focused_content(title: str, description: str = '') -> bool:
     Args:
         title: Story title
         description: Story description/summary
-        
+    
     Returns:
         True if content is Black-focused
     """
-    text = f"{title} {description}".lower()
-    
-    # Check for strong Black identity keywords
-    if any(re.search(pattern, text) for pattern in BLACK_IDENTITY_KEYWORDS):
-        return True
-    
-    # Check for strong context phrases
-    if any(re.search(pattern, text) for pattern in BLACK_CONTEXT_PHRASES):
+    return _is_black_focused_from_matches(scan_black_news_text(f"{title} {description}"))
+
+
+def _is_black_focused_from_matches(matches: Dict[str, int]) -> bool:
+    """is_black_focused_content rules, applied to a scan result"""
+    # Check for strong Black identity keywords or context phrases
+    if matches['identity'] or matches['context']:
         return True
     
-    # Check for Africa-specific content
-    if any(re.search(pattern, text) for pattern in AFRICA_KEYWORDS):
-        # Must have substantial African content, not just mention
-        africa_count = sum(1 for pattern in AFRICA_KEYWORDS if re.search(pattern, text))
-        if africa_count >= 2:
-            return True
-    
-    # Check for Caribbean-specific content
-    if any(re.search(pattern, text) for pattern in CARIBBEAN_KEYWORDS):
+    # Africa-specific content must be substantial, not just a mention
+    if matches['africa'] >= 2:
         return True
     
-    # Check for HBCU content
-    if any(re.search(pattern, text) for pattern in HBCU_KEYWORDS):
+    # Check for Caribbean or HBCU content
+    if matches['caribbean'] or matches['hbcu']:
         return True
     
     return False
@@ -221,12 +290,14 @@ def tag_black_news_item(
     title = item.get('title', '')
     description = item.get('summary', '') or item.get('description', '')
     
-    if is_black_focused_content(title, description):
+    # One scan serves both the focus check and the type
+    matches = scan_black_news_text(f"{title} {description}")
+    
+    if _is_black_focused_from_matches(matches):
         item['is_black_focus'] = True
         
         # Determine specific type
-        combined_text = f"{title} {description}"
-        focus_type = determine_black_focus_type(combined_text, source_category)
+        focus_type = _focus_type_from_matches(matches, source_category)
         item['black_focus_type'] = focus_type or 'diaspora'
     else:
         item['is_black_focus'] = False
@@ -8,6 +8,12 @@ Collects metrics for minimum 2-week evaluation period before activation
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timezone, timedelta
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReplaceOne, UpdateOne
+from pymongo.errors import BulkWriteError
+import asyncio
+import hashlib
+import os
+import random
 import uuid
 import logging
 
@@ -17,17 +23,313 @@ from services.feed_ranker import FeedRankerService
 logger = logging.getLogger(__name__)
 
 
+# Fraction of feed views that produce a shadow comparison (0.0 - 1.0)
+SHADOW_LOG_SAMPLE_RATE = float(os.environ.get("FEED_SHADOW_SAMPLE_RATE", "1.0"))
+
+# Batched writer tuning
+SHADOW_LOG_QUEUE_MAX = int(os.environ.get("FEED_SHADOW_QUEUE_MAX", "5000"))
+SHADOW_LOG_BATCH_SIZE = int(os.environ.get("FEED_SHADOW_BATCH_SIZE", "200"))
+SHADOW_LOG_FLUSH_SECONDS = float(os.environ.get("FEED_SHADOW_FLUSH_SECONDS", "5"))
+
+
+def _warning_key(warning: str) -> str:
+    """Stable Mongo-safe field name for a suppression warning string"""
+    return hashlib.sha1(warning.encode("utf-8")).hexdigest()[:12]
+
+
+def _fold_logs(
+    logs: List[Dict[str, Any]],
+    days: Optional[Dict[str, Dict[str, Any]]] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Fold comparison logs into per-day counters (dotted rollup field names),
+    {day: {"inc": {...}, "texts": {...}}}; pass `days` to keep folding.
+    """
+    days = {} if days is None else days
+    
+    for log in logs:
+        day = log["timestamp"].strftime("%Y-%m-%d")
+        rollup = days.setdefault(day, {"inc": {}, "texts": {}})
+        inc = rollup["inc"]
+        
+        inc["total_comparisons"] = inc.get("total_comparisons", 0) + 1
+        inc["total_posts_analyzed"] = inc.get("total_posts_analyzed", 0) + log.get("total_posts", 0)
+        inc["total_reordered"] = inc.get("total_reordered", 0) + log.get("posts_reordered", 0)
+        inc["sum_avg_rank_delta"] = inc.get("sum_avg_rank_delta", 0) + log.get("avg_rank_delta", 0)
+        inc["sum_diversity_entropy"] = inc.get("sum_diversity_entropy", 0) + (
+            log.get("diversity_analysis", {}).get("diversity_entropy", 0)
+        )
+        
+        for warning in log.get("suppression_warnings", []):
+            key = _warning_key(warning)
+            field = f"suppression_warnings.{key}"
+            inc[field] = inc.get(field, 0) + 1
+            rollup["texts"][f"warning_texts.{key}"] = warning
+    
+    return days
+
+
+def _build_daily_rollups(logs: List[Dict[str, Any]]) -> List[UpdateOne]:
+    """Fold a batch of comparison logs into per-day $inc upserts"""
+    days = _fold_logs(logs)
+    return [
+        UpdateOne(
+            {"day": day},
+            {
+                "$inc": rollup["inc"],
+                "$set": {**rollup["texts"], "updated_at": datetime.now(timezone.utc)}
+            },
+            upsert=True
+        )
+        for day, rollup in days.items()
+    ]
+
+
+def _rollup_document(day: str, rollup: Dict[str, Any]) -> Dict[str, Any]:
+    """A whole feed_shadow_daily document from folded counters"""
+    doc: Dict[str, Any] = {"day": day, "updated_at": datetime.now(timezone.utc)}
+    for field, value in {**rollup["inc"], **rollup["texts"]}.items():
+        if "." in field:
+            parent, key = field.split(".", 1)
+            doc.setdefault(parent, {})[key] = value
+        else:
+            doc[field] = value
+    return doc
+
+
+async def write_shadow_logs(
+    logs: List[Dict[str, Any]],
+    db: Optional[AsyncIOMotorDatabase] = None
+) -> Dict[str, Any]:
+    """
+    Insert one batch of comparison logs and add the stored ones to the
+    feed_shadow_daily rollups.
+    
+    Rollups are built from the logs actually inserted (an unordered
+    insert_many can store part of a batch). If the rollup write fails after
+    the logs are stored, the affected days are flagged needs_rebuild so
+    rebuild_shadow_rollups can recount them from the logs.
+    
+    Raises whatever insert_many raises when the insert outcome is unknown.
+    
+    Returns:
+        {"written": logs stored, "rollup_error": error text or None}
+    """
+    if db is None:
+        db = await get_db()
+    
+    try:
+        await db.feed_shadow_logs.insert_many(logs, ordered=False)
+        inserted = logs
+    except BulkWriteError as e:
+        failed = {error["index"] for error in e.details.get("writeErrors", [])}
+        inserted = [log for index, log in enumerate(logs) if index not in failed]
+        logger.error(f"Shadow log insert stored {len(inserted)} of {len(logs)} logs: {e}")
+    
+    if not inserted:
+        return {"written": 0, "rollup_error": None}
+    
+    try:
+        await db.feed_shadow_daily.bulk_write(_build_daily_rollups(inserted), ordered=False)
+    except Exception as e:
+        days = sorted({log["timestamp"].strftime("%Y-%m-%d") for log in inserted})
+        logger.error(f"Shadow rollup update failed for {days} ({len(inserted)} logs stored): {e}")
+        try:
+            await db.feed_shadow_daily.bulk_write([
+                UpdateOne({"day": day}, {"$set": {"needs_rebuild": True}}, upsert=True)
+                for day in days
+            ], ordered=False)
+        except Exception:
+            logger.error("Could not flag shadow rollups for rebuild; run scripts/rebuild_feed_shadow_rollups.py")
+        return {"written": len(inserted), "rollup_error": str(e) or type(e).__name__}
+    
+    return {"written": len(inserted), "rollup_error": None}
+
+
+async def rebuild_shadow_rollups(
+    force: bool = False,
+    batch_size: int = 1000,
+    db: Optional[AsyncIOMotorDatabase] = None
+) -> Dict[str, int]:
+    """
+    Recount feed_shadow_daily from the raw feed_shadow_logs.
+    
+    Rebuilds days with logs but no rollup (history from before the rollups
+    existed) and days flagged needs_rebuild by write_shadow_logs. force=True
+    rebuilds every day that still has logs; days older than the log
+    retention (cleanup_old_shadow_logs) keep their rollups either way.
+    
+    Returns:
+        {"logs": logs read, "days_rebuilt": n, "days_kept": n}
+    """
+    if db is None:
+        db = await get_db()
+    
+    days: Dict[str, Dict[str, Any]] = {}
+    stats = {"logs": 0, "days_rebuilt": 0, "days_kept": 0}
+    batch = []
+    async for log in db.feed_shadow_logs.find(
+        {},
+        {"_id": 0, "timestamp": 1, "total_posts": 1, "posts_reordered": 1, "avg_rank_delta": 1,
+         "diversity_analysis": 1, "suppression_warnings": 1}
+    ):
+        batch.append(log)
+        if len(batch) >= batch_size:
+            _fold_logs(batch, days)
+            stats["logs"] += len(batch)
+            batch = []
+    _fold_logs(batch, days)
+    stats["logs"] += len(batch)
+    
+    if not days:
+        return stats
+    
+    current = {
+        rollup["day"]: rollup
+        async for rollup in db.feed_shadow_daily.find(
+            {"day": {"$in": list(days)}}, {"_id": 0, "day": 1, "needs_rebuild": 1}
+        )
+    }
+    ops = []
+    for day, rollup in sorted(days.items()):
+        if force or day not in current or current[day].get("needs_rebuild"):
+            ops.append(ReplaceOne({"day": day}, _rollup_document(day, rollup), upsert=True))
+        else:
+            stats["days_kept"] += 1
+    
+    if ops:
+        await db.feed_shadow_daily.bulk_write(ops, ordered=False)
+    stats["days_rebuilt"] = len(ops)
+    return stats
+
+
+class ShadowLogWriter:
+    """
+    In-process batched writer for feed_shadow_logs.
+    
+    Comparisons are queued on a bounded in-memory queue and written with
+    insert_many when the batch size is reached or the flush interval
+    elapses. Each flush also updates the feed_shadow_daily rollups read by
+    get_shadow_mode_stats. When the queue is full new comparisons are dropped
+    and counted - shadow data is best-effort and never blocks a feed request.
+    """
+    
+    def __init__(
+        self,
+        max_queue: int = SHADOW_LOG_QUEUE_MAX,
+        batch_size: int = SHADOW_LOG_BATCH_SIZE,
+        flush_interval: float = SHADOW_LOG_FLUSH_SECONDS,
+        db: Optional[AsyncIOMotorDatabase] = None
+    ):
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._db = db
+        self._queue: List[Dict[str, Any]] = []
+        self._flush_lock = asyncio.Lock()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+        self.stats = {
+            "enqueued": 0, "dropped": 0, "written": 0, "flushes": 0, "errors": 0, "rollup_errors": 0
+        }
+    
+    @property
+    def pending(self) -> int:
+        return len(self._queue)
+    
+    def enqueue(self, doc: Dict[str, Any]) -> bool:
+        """Queue a comparison; returns False (and counts a drop) if the queue is full"""
+        if len(self._queue) >= self.max_queue:
+            self.stats["dropped"] += 1
+            return False
+        
+        self._queue.append(doc)
+        self.stats["enqueued"] += 1
+        self._ensure_running()
+        
+        if len(self._queue) >= self.batch_size and self._wakeup is not None:
+            self._wakeup.set()
+        return True
+    
+    def _ensure_running(self):
+        if self._task is not None and not self._task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # No loop (sync caller); the next flush() drains the queue
+        self._wakeup = asyncio.Event()
+        self._task = loop.create_task(self._run())
+    
+    async def _run(self):
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+    
+    async def flush(self) -> int:
+        """Write everything currently queued; returns number of logs written"""
+        async with self._flush_lock:
+            written = 0
+            while self._queue:
+                batch = self._queue[:self.batch_size]
+                del self._queue[:self.batch_size]
+                written += await self._write_batch(batch)
+            return written
+    
+    async def _write_batch(self, batch: List[Dict[str, Any]]) -> int:
+        try:
+            result = await write_shadow_logs(batch, db=self._db)
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.error(f"Shadow log flush failed ({len(batch)} logs dropped): {e}")
+            return 0
+        
+        if result["written"] < len(batch):
+            self.stats["errors"] += 1
+        if result["rollup_error"]:
+            self.stats["rollup_errors"] += 1
+        self.stats["written"] += result["written"]
+        self.stats["flushes"] += 1
+        return result["written"]
+    
+    async def close(self):
+        """Stop the background flusher and drain the queue (app shutdown)"""
+        # Signal instead of cancel: wait_for can swallow a cancellation that
+        # races with the wakeup event, leaving the loop running
+        self._closing = True
+        if self._task is not None:
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        await self.flush()
+        self._closing = False
+
+
+# Shared writer for the request path
+shadow_log_writer = ShadowLogWriter()
+
+
 async def log_shadow_feed_comparison(
     viewer_id: str,
     chronological_posts: List[Dict[str, Any]],
     trust_ranked_posts: List[Dict[str, Any]],
     rank_deltas: Dict[str, int],
     diversity_analysis: Dict[str, Any],
-    db: Optional[AsyncIOMotorDatabase] = None
-) -> Dict[str, Any]:
+    db: Optional[AsyncIOMotorDatabase] = None,
+    sample_rate: Optional[float] = None
+) -> Optional[Dict[str, Any]]:
     """
     Log a shadow mode feed comparison for analytics.
     
+    Sampled comparisons are queued on the shared batched writer; nothing is
+    written on the request path. Passing an explicit db writes the document
+    (and its rollup) immediately, for scripts and tests.
+    
     Args:
         viewer_id: ID of user viewing feed
         chronological_posts: Posts in chronological order
@@ -35,12 +337,14 @@ async def log_shadow_feed_comparison(
         rank_deltas: Position changes per post
         diversity_analysis: Diversity metrics
         db: Database connection (optional)
+        sample_rate: Override FEED_SHADOW_SAMPLE_RATE for this call
     
     Returns:
-        The logged comparison document
+        The comparison document, or None if this view was not sampled
     """
-    if db is None:
-        db = await get_db()
+    rate = SHADOW_LOG_SAMPLE_RATE if sample_rate is None else sample_rate
+    if rate < 1.0 and random.random() >= rate:
+        return None
     
     now = datetime.now(timezone.utc)
     
@@ -67,10 +371,13 @@ async def log_shadow_feed_comparison(
         "suppression_warnings": FeedRankerService.detect_suppression_effects(diversity_analysis)
     }
     
-    await db.feed_shadow_logs.insert_one(comparison_log)
+    if db is not None:
+        await write_shadow_logs([comparison_log], db=db)
+    else:
+        shadow_log_writer.enqueue(comparison_log)
     
-    logger.info(
-        f"Shadow feed comparison logged for {viewer_id}: "
+    logger.debug(
+        f"Shadow feed comparison queued for {viewer_id}: "
         f"{total_posts} posts, {posts_reordered} reordered, avg delta: {avg_delta:.2f}"
     )
     
@@ -85,6 +392,10 @@ async def get_shadow_mode_stats(
     """
     Get aggregate statistics from shadow mode logs.
     
+    Served from the feed_shadow_daily rollups, so the range is resolved
+    to whole UTC days. Logs written before the rollups existed are counted
+    once scripts/rebuild_feed_shadow_rollups.py has run.
+    
     Args:
         start_date: Start date for analysis (defaults to 7 days ago)
         end_date: End date for analysis (defaults to now)
@@ -102,18 +413,20 @@ async def get_shadow_mode_stats(
     if start_date is None:
         start_date = end_date - timedelta(days=7)
     
-    # Query shadow logs
-    logs = await db.feed_shadow_logs.find(
+    # Read pre-aggregated daily rollups (maintained by ShadowLogWriter)
+    rollups = await db.feed_shadow_daily.find(
         {
-            "timestamp": {
-                "$gte": start_date,
-                "$lte": end_date
+            "day": {
+                "$gte": start_date.strftime("%Y-%m-%d"),
+                "$lte": end_date.strftime("%Y-%m-%d")
             }
         },
         {"_id": 0}
-    ).to_list(10000)
+    ).to_list(length=None)
     
-    if not logs:
+    total_comparisons = sum(r.get("total_comparisons", 0) for r in rollups)
+    
+    if not total_comparisons:
         return {
             "total_comparisons": 0,
             "date_range": {
@@ -123,28 +436,21 @@ async def get_shadow_mode_stats(
         }
     
     # Aggregate metrics
-    total_comparisons = len(logs)
-    total_posts_analyzed = sum(log.get("total_posts", 0) for log in logs)
-    total_reordered = sum(log.get("posts_reordered", 0) for log in logs)
+    total_posts_analyzed = sum(r.get("total_posts_analyzed", 0) for r in rollups)
+    total_reordered = sum(r.get("total_reordered", 0) for r in rollups)
     
-    avg_delta = sum(log.get("avg_rank_delta", 0) for log in logs) / total_comparisons
+    avg_delta = sum(r.get("sum_avg_rank_delta", 0) for r in rollups) / total_comparisons
     
     # Diversity metrics
-    diversity_scores = [
-        log.get("diversity_analysis", {}).get("diversity_entropy", 0)
-        for log in logs
-    ]
-    avg_diversity = sum(diversity_scores) / len(diversity_scores) if diversity_scores else 0
+    avg_diversity = sum(r.get("sum_diversity_entropy", 0) for r in rollups) / total_comparisons
     
     # Suppression warnings
-    all_warnings = []
-    for log in logs:
-        warnings = log.get("suppression_warnings", [])
-        all_warnings.extend(warnings)
-    
     warning_counts = {}
-    for warning in all_warnings:
-        warning_counts[warning] = warning_counts.get(warning, 0) + 1
+    for rollup in rollups:
+        texts = rollup.get("warning_texts", {})
+        for key, count in rollup.get("suppression_warnings", {}).items():
+            warning = texts.get(key, key)
+            warning_counts[warning] = warning_counts.get(warning, 0) + count
     
     return {
         "total_comparisons": total_comparisons,
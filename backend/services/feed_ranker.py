@@ -2,8 +2,9 @@
 Feed Ranker Service - Phase C Circle Trust Order
 Implements trust-weighted feed ranking algorithm
 
-SHADOW MODE ONLY - No user-facing changes
-Runs in parallel to collect data for minimum 2 weeks
+Scalar ranking (rank_feed_by_trust) is used for shadow mode comparisons.
+The vectorized engine (rank_feed_by_trust_vectorized) serves the live
+ranking=trust feed and produces the identical order.
 
 Founder-Approved Trust Weights:
 - PEOPLES: +100
@@ -15,9 +16,18 @@ Founder-Approved Trust Weights:
 - BLOCKED: Not visible (excluded)
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timezone
+from motor.motor_asyncio import AsyncIOMotorDatabase
 import logging
+import math
+import os
+
+import numpy as np
+
+from db.connection import get_db
+from db.social_hydration import hydrate_posts
+from db.social_posts import FEED_SORT
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +44,13 @@ TRUST_TIER_WEIGHTS = {
 }
 
 
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Mongo hands back naive UTC datetimes"""
+    if value is None or value.tzinfo is not None:
+        return value
+    return value.replace(tzinfo=timezone.utc)
+
+
 class FeedRankerService:
     """Service for trust-weighted feed ranking (SHADOW MODE)"""
     
@@ -111,7 +128,8 @@ class FeedRankerService:
     def rank_feed_by_trust(
         posts: List[Dict[str, Any]],
         viewer_id: str,
-        viewer_relationships: Dict[str, str]
+        viewer_relationships: Dict[str, str],
+        now: Optional[datetime] = None
     ) -> List[Dict[str, Any]]:
         """
         Rank feed posts by trust-weighted scoring.
@@ -123,6 +141,7 @@ class FeedRankerService:
             posts: List of post documents (in chronological order)
             viewer_id: ID of viewing user
             viewer_relationships: Map of {author_id: trust_tier}
+            now: Reference time for recency (defaults to current time)
         
         Returns:
             List of posts with trust-weighted ranking scores (sorted by score)
@@ -146,7 +165,7 @@ class FeedRankerService:
             
             # Recency score: newer posts score higher
             created_at = post.get("created_at")
-            recency_score = FeedRankerService.calculate_recency_score(created_at)
+            recency_score = FeedRankerService.calculate_recency_score(created_at, now)
             
             # Engagement score: likes, comments, shares
             engagement_score = FeedRankerService.calculate_engagement_score(post)
@@ -171,7 +190,120 @@ class FeedRankerService:
         return ranked_posts
     
     @staticmethod
-    def calculate_recency_score(created_at: Optional[datetime]) -> float:
+    def score_posts_vectorized(
+        posts: List[Dict[str, Any]],
+        viewer_relationships: Dict[str, str],
+        now: Optional[datetime] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Score a candidate window in one NumPy pass.
+        
+        Uses exactly the same formula and operation order as
+        calculate_post_score / calculate_recency_score /
+        calculate_engagement_score, so scores match the scalar path.
+        
+        Args:
+            posts: Candidate posts
+            viewer_relationships: Map of {author_id: trust_tier}
+            now: Reference time for recency (defaults to current time)
+        
+        Returns:
+            (scores, visible) arrays; visible is False for BLOCKED authors
+        """
+        now = _as_utc(now) or datetime.now(timezone.utc)
+        
+        n = len(posts)
+        trust = np.empty(n, dtype=np.float64)
+        age_us = np.zeros(n, dtype=np.int64)
+        has_time = np.zeros(n, dtype=bool)
+        engagement = np.empty((4, n), dtype=np.float64)
+        default_weight = TRUST_TIER_WEIGHTS["OTHERS"]
+        
+        # Gather columns (the only per-post Python work)
+        for i, post in enumerate(posts):
+            tier = viewer_relationships.get(post.get("author_id", ""), "OTHERS")
+            trust[i] = TRUST_TIER_WEIGHTS.get(tier, default_weight)
+            
+            created_at = post.get("created_at")
+            if created_at:
+                delta = now - _as_utc(created_at)
+                age_us[i] = (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+                has_time[i] = True
+            
+            engagement[0, i] = post.get("comment_count", 0)
+            engagement[1, i] = post.get("like_count", 0)
+            engagement[2, i] = post.get("share_count", 0)
+            engagement[3, i] = post.get("view_count", 0)
+        
+        # Recency: 100 * (1h / (1h + age)), 100 for future posts, 50 without timestamp
+        age_seconds = age_us / 1e6
+        with np.errstate(divide="ignore", invalid="ignore"):
+            recency = 100.0 * (3600 / (3600 + age_seconds))
+        recency = np.where(age_seconds <= 0, 100.0, np.clip(recency, 0.0, 100.0))
+        recency = np.where(has_time, recency, 50.0)
+        
+        # Engagement: log-scaled weighted interactions
+        points = (engagement[0] * 10 + engagement[1] * 2) + engagement[2] * 5 + engagement[3] * 0.1
+        # NumPy's SIMD log10 can differ from math.log10 by 1 ulp, which would
+        # reorder near-ties; evaluate libm once per distinct engagement value
+        unique_points, inverse = np.unique(points, return_inverse=True)
+        unique_log = np.array([math.log10(p) if p > 0 else 0.0 for p in unique_points])
+        eng = 50.0 + (15.0 * unique_log[inverse])
+        eng = np.where(points <= 0, 0.0, np.clip(eng, 0.0, 100.0))
+        
+        scores = 50.0 + trust * 0.4 + recency * 0.3 + eng * 0.3
+        visible = trust >= 0
+        
+        return scores, visible
+    
+    @staticmethod
+    def rank_feed_by_trust_vectorized(
+        posts: List[Dict[str, Any]],
+        viewer_relationships: Dict[str, str],
+        top_k: Optional[int] = None,
+        now: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Live trust ranking: same order as rank_feed_by_trust, without
+        per-post dict copies and without a full sort.
+        
+        Top-k selection uses argpartition; ties at the k boundary are
+        resolved by original position, matching the stable scalar sort.
+        
+        Args:
+            posts: Candidate posts (in chronological order)
+            viewer_relationships: Map of {author_id: trust_tier}
+            top_k: Number of posts to return (None = all visible)
+            now: Reference time for recency (defaults to current time)
+        
+        Returns:
+            The original post dicts in ranked order (BLOCKED excluded)
+        """
+        if not posts:
+            return []
+        
+        scores, visible = FeedRankerService.score_posts_vectorized(posts, viewer_relationships, now)
+        
+        candidates = np.flatnonzero(visible)
+        k = len(candidates) if top_k is None else min(top_k, len(candidates))
+        if k <= 0:
+            return []
+        
+        candidate_scores = scores[candidates]
+        if k < len(candidates):
+            kth = np.argpartition(-candidate_scores, k - 1)[:k]
+            threshold = candidate_scores[kth].min()
+            keep = candidate_scores >= threshold
+            candidates = candidates[keep]
+            candidate_scores = candidate_scores[keep]
+        
+        # Primary key: score DESC; secondary: original index ASC (stable)
+        order = np.lexsort((candidates, -candidate_scores))[:k]
+        
+        return [posts[i] for i in candidates[order]]
+    
+    @staticmethod
+    def calculate_recency_score(created_at: Optional[datetime], now: Optional[datetime] = None) -> float:
         """
         Calculate recency score for a post (0-100).
         
@@ -179,6 +311,7 @@ class FeedRankerService:
         
         Args:
             created_at: Post creation timestamp
+            now: Reference time (defaults to current time)
         
         Returns:
             Recency score (0-100)
@@ -186,8 +319,8 @@ class FeedRankerService:
         if not created_at:
             return 50.0  # Default mid-score
         
-        now = datetime.now(timezone.utc)
-        age_seconds = (now - created_at).total_seconds()
+        now = _as_utc(now) or datetime.now(timezone.utc)
+        age_seconds = (now - _as_utc(created_at)).total_seconds()
         
         # Exponential decay: score decreases as post ages
         # Posts older than 7 days get very low scores
@@ -363,13 +496,24 @@ class FeedRankerService:
 
 
 # Convenience functions
+def rank_feed_by_trust_vectorized(
+    posts: List[Dict[str, Any]],
+    viewer_relationships: Dict[str, str],
+    top_k: Optional[int] = None,
+    now: Optional[datetime] = None
+) -> List[Dict[str, Any]]:
+    """Rank feed posts by trust (live, vectorized)"""
+    return FeedRankerService.rank_feed_by_trust_vectorized(posts, viewer_relationships, top_k, now)
+
+
 def rank_feed_by_trust(
     posts: List[Dict[str, Any]],
     viewer_id: str,
-    viewer_relationships: Dict[str, str]
+    viewer_relationships: Dict[str, str],
+    now: Optional[datetime] = None
 ) -> List[Dict[str, Any]]:
     """Rank feed posts by trust (shadow mode)"""
-    return FeedRankerService.rank_feed_by_trust(posts, viewer_id, viewer_relationships)
+    return FeedRankerService.rank_feed_by_trust(posts, viewer_id, viewer_relationships, now)
 
 
 def calculate_rank_delta(
@@ -378,3 +522,67 @@ def calculate_rank_delta(
 ) -> Dict[str, int]:
     """Calculate rank position changes"""
     return FeedRankerService.calculate_rank_delta(chronological_order, trust_ranked_order)
+
+
+# ==========================================
+# LIVE TRUST-RANKED FEED
+# ==========================================
+
+# Most recent visible posts considered for trust ranking
+TRUST_RANKING_WINDOW = int(os.environ.get("TRUST_RANKING_WINDOW", "200"))
+
+
+async def get_trust_ranked_feed(
+    viewer_id: str,
+    page: int = 1,
+    page_size: int = 20,
+    db: Optional[AsyncIOMotorDatabase] = None
+) -> Dict[str, Any]:
+    """
+    Live ranking=trust feed.
+    
+    Gathers the newest TRUST_RANKING_WINDOW visible posts, resolves the
+    viewer's tier for every author in one query, ranks the window with the
+    vectorized engine and returns the requested page (SocialFeedResponse shape).
+    
+    Args:
+        viewer_id: ID of viewing user
+        page: Page number within the ranked window
+        page_size: Items per page
+        db: Database connection (optional)
+    
+    Returns:
+        Paginated feed dict
+    """
+    if db is None:
+        db = await get_db()
+    
+    posts = await db.social_posts.find(
+        {"is_deleted": False, "is_hidden": False},
+        {"_id": 0}
+    ).sort(FEED_SORT).limit(TRUST_RANKING_WINDOW).to_list(length=None)
+    
+    author_ids = list({p["author_id"] for p in posts})
+    relationships = await db.relationships.find(
+        {"owner_user_id": viewer_id, "target_user_id": {"$in": author_ids}},
+        {"_id": 0, "target_user_id": 1, "tier": 1}
+    ).to_list(length=None)
+    
+    viewer_relationships = {r["target_user_id"]: r.get("tier", "OTHERS") for r in relationships}
+    viewer_relationships[viewer_id] = "PEOPLES"  # Self-relationship is always PEOPLES
+    
+    ranked = rank_feed_by_trust_vectorized(posts, viewer_relationships, top_k=page * page_size)
+    page_posts = ranked[(page - 1) * page_size:]
+    
+    total_items = sum(
+        1 for p in posts
+        if FeedRankerService.get_trust_weight(viewer_relationships.get(p["author_id"], "OTHERS")) >= 0
+    )
+    
+    return {
+        "page": page,
+        "page_size": page_size,
+        "total_items": total_items,
+        "total_pages": (total_items + page_size - 1) // page_size,
+        "items": await hydrate_posts(db, page_posts, viewer_id)
+    }
@@ -240,20 +240,39 @@ def sort_items_by_section(items: List[Dict[str, Any]]) -> Dict[str, List[Dict[st
         item['mapped_section'] = section
         result[section].append(item)
     
-    # Fill top_stories from ALL active sections
-    # Priority order: business, tech, entertainment, world, us, sports, health, civil_rights, lifestyle
+    result['top_stories'] = pick_top_stories(result)
+    
+    return result
+
+
+# Homepage sections that feed the top stories pool, in priority order
+TOP_STORIES_SECTIONS = [
+    'business', 'tech', 'entertainment', 'world', 'us',
+    'sports', 'health', 'civil_rights', 'lifestyle', 'education'
+]
+
+
+def pick_top_stories(sections: Dict[str, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """
+    Fill top_stories from ALL active sections: the 2 newest of each
+    section, then the 6 newest of that pool.
+    
+    Args:
+        sections: Homepage section key -> items (newest first)
+        
+    Returns:
+        Up to 6 items
+    """
     top_stories_pool = []
-    for section in ['business', 'tech', 'entertainment', 'world', 'us', 'sports', 'health', 'civil_rights', 'lifestyle', 'education']:
-        top_stories_pool.extend(result[section][:2])  # Take top 2 from each
+    for section in TOP_STORIES_SECTIONS:
+        top_stories_pool.extend(sections.get(section, [])[:2])  # Take top 2 from each
     
     # Sort by published date and take top 6
     top_stories_pool.sort(
         key=lambda x: x.get('publishedAt', datetime.min),
         reverse=True
     )
-    result['top_stories'] = top_stories_pool[:6]
-    
-    return result
+    return top_stories_pool[:6]
 
 
 def get_section_display_name(section: str) -> str:
@@ -278,6 +297,76 @@ def get_section_display_name(section: str) -> str:
     return display_names.get(section, section.replace('-', ' ').title())
 
 
+# /api/news/section keys -> categorize_news_item() section
+SECTION_MAPPING = {
+    'us': 'us',
+    'world': 'world',
+    'politics': 'politics',
+    'healthwatch': 'health',
+    'health': 'health',
+    'moneywatch': 'business',
+    'entertainment': 'entertainment',
+    'lifestyle': 'lifestyle',
+    'crime': 'crime',
+    'sports': 'sports',
+    'culture': 'culture',
+    'science-tech': 'tech',
+    'tech': 'tech',
+    'civil-rights': 'civil_rights',
+    'civil_rights': 'civil_rights',
+    'business': 'business',
+    'education': 'education'
+}
+
+# Extra title/category keywords that pull an item into a section page
+SECTION_KEYWORDS = {
+    'politics': ['politic', 'election', 'congress', 'senate', 'president'],
+    'healthwatch': ['health', 'medical', 'wellness', 'hospital', 'doctor', 'medicine'],
+    'moneywatch': ['economy', 'finance', 'stock', 'market', 'investment', 'money'],
+    'entertainment': ['entertainment', 'film', 'movie', 'music', 'celebrity', 'tv', 'show'],
+    'crime': ['crime', 'criminal', 'arrest', 'prison', 'jail', 'police', 'law enforcement'],
+    'culture': ['culture', 'art', 'identity', 'heritage', 'tradition', 'lifestyle'],
+    'civil-rights': ['civil rights', 'justice', 'equality', 'discrimination', 'protest', 'activism'],
+    'education': ['education', 'school', 'college', 'university', 'student', 'teacher', 'learning'],
+}
+
+# Section pages served by /api/news/section (besides "top-stories", which is everything)
+SECTION_PAGE_KEYS = [
+    'us', 'world', 'politics', 'healthwatch', 'moneywatch', 'entertainment',
+    'crime', 'sports', 'culture', 'science-tech', 'civil-rights', 'business', 'education'
+]
+
+
+def item_matches_section(
+    item: Dict[str, Any],
+    section: str,
+    item_category: Optional[str] = None
+) -> bool:
+    """
+    Check whether a news item belongs on a section page.
+    
+    Args:
+        item: News item dictionary
+        section: Section identifier (e.g., 'us', 'world', 'business')
+        item_category: Precomputed categorize_news_item() result, if known
+        
+    Returns:
+        True if the item matches the section
+    """
+    if item_category is None:
+        item_category = categorize_news_item(item)
+    
+    if item_category == SECTION_MAPPING.get(section, section):
+        return True
+    
+    # Additional keyword matching for flexible categorization
+    keywords = SECTION_KEYWORDS.get(section)
+    if not keywords:
+        return False
+    text = (item.get('category') or '').lower() + (item.get('title') or '').lower()
+    return any(kw in text for kw in keywords)
+
+
 def filter_items_by_section(items: List[Dict[str, Any]], section: str) -> List[Dict[str, Any]]:
     """
     Filter news items by section identifier.
@@ -292,76 +381,31 @@ def filter_items_by_section(items: List[Dict[str, Any]], section: str) -> List[D
     if section == 'top-stories' or section == 'all':
         return items
     
-    # Map section to categorization
-    section_mapping = {
-        'us': 'us',
-        'world': 'world',
-        'politics': 'politics',
-        'healthwatch': 'health',
-        'health': 'health',
-        'moneywatch': 'business',
-        'entertainment': 'entertainment',
-        'lifestyle': 'lifestyle',
-        'crime': 'crime',
-        'sports': 'sports',
-        'culture': 'culture',
-        'science-tech': 'tech',
-        'tech': 'tech',
-        'civil-rights': 'civil_rights',
-        'civil_rights': 'civil_rights',
-        'business': 'business',
-        'education': 'education'
-    }
+    return [item for item in items if item_matches_section(item, section)]
+
+
+def compute_section_fields(item: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Compute the stored section fields for a news item.
     
-    target_category = section_mapping.get(section, section)
-    filtered = []
+    Run once at ingest (and by scripts/backfill_news_sections.py) so the
+    homepage and section pages can query by section instead of
+    re-categorizing every item on every request.
     
-    for item in items:
-        # Get categorization
-        item_category = categorize_news_item(item)
-        
-        # Check if it matches
-        if item_category == target_category:
-            filtered.append(item)
-            continue
-        
-        # Additional keyword matching for flexible categorization
-        category = (item.get('category') or '').lower()
-        title = (item.get('title') or '').lower()
-        
-        # Politics section
-        if section == 'politics' and any(kw in category + title for kw in ['politic', 'election', 'congress', 'senate', 'president']):
-            filtered.append(item)
-        
-        # HealthWatch section
-        elif section == 'healthwatch' and any(kw in category + title for kw in ['health', 'medical', 'wellness', 'hospital', 'doctor', 'medicine']):
-            filtered.append(item)
-        
-        # MoneyWatch section
-        elif section == 'moneywatch' and any(kw in category + title for kw in ['economy', 'finance', 'stock', 'market', 'investment', 'money']):
-            filtered.append(item)
-        
-        # Entertainment section
-        elif section == 'entertainment' and any(kw in category + title for kw in ['entertainment', 'film', 'movie', 'music', 'celebrity', 'tv', 'show']):
-            filtered.append(item)
-        
-        # Crime section
-        elif section == 'crime' and any(kw in category + title for kw in ['crime', 'criminal', 'arrest', 'prison', 'jail', 'police', 'law enforcement']):
-            filtered.append(item)
-        
-        # Culture section
-        elif section == 'culture' and any(kw in category + title for kw in ['culture', 'art', 'identity', 'heritage', 'tradition', 'lifestyle']):
-            filtered.append(item)
-        
-        # Civil Rights section
-        elif section == 'civil-rights' and any(kw in category + title for kw in ['civil rights', 'justice', 'equality', 'discrimination', 'protest', 'activism']):
-            filtered.append(item)
+    Args:
+        item: News item dictionary (category, region, sourceName, title)
         
-        # Education section
-        elif section == 'education' and any(kw in category + title for kw in ['education', 'school', 'college', 'university', 'student', 'teacher', 'learning']):
-            filtered.append(item)
-    
-    return filtered
+    Returns:
+        {"section": homepage section, "section_tags": matching section page keys}
+    """
+    section = categorize_news_item(item)
+    return {
+        "section": section,
+        "section_tags": [
+            key for key in SECTION_PAGE_KEYS
+            if item_matches_section(item, key, item_category=section)
+        ]
+    }
 
 
 def paginate_items(
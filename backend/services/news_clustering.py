@@ -0,0 +1,176 @@
+"""
+News Clustering Service
+Near-duplicate detection for ingested stories: the same wire story carried
+by several outlets gets one cluster_id, and listings show it once
+(db/news.make_dedupe_key).
+
+- Each story gets a 64-bit SimHash of its title + summary (character
+  4-gram shingles) at ingest, in the parse workers
+  (utils/feed_processing.build_news_doc)
+- The hash is split into SIMHASH_BANDS 16-bit bands stored as
+  simhash_bands (a multikey index). A lookup probes each band and its
+  one-bit neighbours (probe_keys): two hashes within 2 * SIMHASH_BANDS - 1
+  bits differ in at most one bit of some band, so one $in lookup finds
+  every candidate, while each probe key matches ~1/65536 of the window
+  instead of the ~1/256 of narrow exact-match bands
+- A new story joins the cluster of its nearest candidate within
+  SIMHASH_MAX_DISTANCE bits (stored in the last NEWS_CLUSTER_WINDOW_HOURS);
+  otherwise it starts a cluster named after its own id
+
+Headlines are short, so the threshold is wider than the usual 3 bits for
+web pages: copies with a different source suffix or a re-trimmed summary
+land a few bits apart, different stories on the same subject around 20
+and unrelated stories around 32.
+"""
+
+import asyncio
+import hashlib
+import os
+import re
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
+
+import numpy as np
+
+SIMHASH_BITS = 64
+# Stored with every item; changing it needs db/news.rebuild_simhash_bands
+SIMHASH_BANDS = 4
+# One-bit probes per band find every match up to 2 * SIMHASH_BANDS - 1 bits
+SIMHASH_MAX_DISTANCE = min(int(os.environ.get("NEWS_SIMHASH_MAX_DISTANCE", "6")), 2 * SIMHASH_BANDS - 1)
+NEWS_CLUSTER_WINDOW_HOURS = int(os.environ.get("NEWS_CLUSTER_WINDOW_HOURS", "48"))
+SHINGLE_SIZE = 4
+
+BAND_BITS = SIMHASH_BITS // SIMHASH_BANDS
+_BAND_MASK = (1 << BAND_BITS) - 1
+_MASK = (1 << SIMHASH_BITS) - 1
+
+_BIT_SHIFTS = np.arange(SIMHASH_BITS, dtype=np.uint64)
+
+TOKEN_REGEX = re.compile(r"[a-z0-9]+")
+
+
+def _shingles(text: str) -> List[str]:
+    """Overlapping character 4-grams of the lowercased words"""
+    normalized = " ".join(TOKEN_REGEX.findall(text.lower()))
+    if len(normalized) <= SHINGLE_SIZE:
+        return [normalized] if normalized else []
+    return [normalized[i:i + SHINGLE_SIZE] for i in range(len(normalized) - SHINGLE_SIZE + 1)]
+
+
+def _shingle_hash(shingle: str) -> int:
+    return int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def simhash(text: str) -> int:
+    """
+    64-bit SimHash of `text`, as a signed integer (Mongo stores int64).
+    Texts sharing most of their shingles differ in only a few bits.
+    """
+    shingles = _shingles(text)
+    if not shingles:
+        return 0
+    hashes = np.array([_shingle_hash(shingle) for shingle in shingles], dtype=np.uint64)
+    # Per bit: shingles with it set vs. clear; the majority decides
+    ones = ((hashes[:, None] >> _BIT_SHIFTS) & np.uint64(1)).sum(axis=0)
+    value = sum(1 << int(bit) for bit in np.flatnonzero(ones * 2 > len(shingles)))
+    return value - (1 << SIMHASH_BITS) if value >> (SIMHASH_BITS - 1) else value
+
+
+def story_simhash(title: str, summary: str) -> int:
+    return simhash(f"{title} {summary}")
+
+
+def band_keys(value: int) -> List[int]:
+    """LSH keys stored for a SimHash: each band's bits, tagged with the band number"""
+    value &= _MASK
+    return [
+        band << BAND_BITS | (value >> (band * BAND_BITS)) & _BAND_MASK
+        for band in range(SIMHASH_BANDS)
+    ]
+
+
+def probe_keys(value: int) -> List[int]:
+    """Keys to look up for a SimHash: each band key and its one-bit neighbours"""
+    keys = []
+    for key in band_keys(value):
+        keys.append(key)
+        keys.extend(key ^ (1 << bit) for bit in range(BAND_BITS))
+    return keys
+
+
+class BandLocks:
+    """
+    Per-probe-key locks shared by the sources stored in one sync run.
+
+    A store holds the keys its new items probe while it looks up candidates
+    and inserts, so two stores wait for each other only when their items
+    could cluster together (one's band key is among the other's probes);
+    every other store runs concurrently.
+    """
+
+    def __init__(self):
+        self._locks: Dict[int, asyncio.Lock] = {}
+
+    @asynccontextmanager
+    async def hold(self, keys: Iterable[int]) -> AsyncIterator[None]:
+        # Sorted acquisition: stores waiting on each other can't deadlock
+        held = []
+        try:
+            for key in sorted(set(keys)):
+                lock = self._locks.setdefault(key, asyncio.Lock())
+                await lock.acquire()
+                held.append(lock)
+            yield
+        finally:
+            for lock in reversed(held):
+                lock.release()
+
+
+def hamming_distance(first: int, second: int) -> int:
+    return ((first ^ second) & _MASK).bit_count()
+
+
+def cluster_window_start(now: datetime) -> datetime:
+    """Oldest createdAt a new story is clustered against"""
+    return now - timedelta(hours=NEWS_CLUSTER_WINDOW_HOURS)
+
+
+def assign_clusters(
+    docs: List[Dict[str, Any]],
+    candidates: Iterable[Dict[str, Any]],
+    max_distance: Optional[int] = None
+) -> int:
+    """
+    Set cluster_id on new news_items documents (in place).
+
+    Each doc joins the cluster of the nearest candidate (stored items, then
+    docs earlier in the list) within max_distance bits, or starts its own.
+    Docs without a simhash are left alone.
+
+    Args:
+        docs: New documents with "id" and "simhash"
+        candidates: Stored items sharing a band ({"id", "simhash", "cluster_id"})
+
+    Returns:
+        Number of docs that joined an existing cluster
+    """
+    max_distance = SIMHASH_MAX_DISTANCE if max_distance is None else max_distance
+    pool = [candidate for candidate in candidates if candidate.get("simhash") is not None]
+    joined = 0
+    for doc in docs:
+        if doc.get("simhash") is None:
+            continue
+        nearest = None
+        nearest_distance = max_distance + 1
+        for candidate in pool:
+            distance = hamming_distance(doc["simhash"], candidate["simhash"])
+            if distance < nearest_distance:
+                nearest, nearest_distance = candidate, distance
+        if nearest is not None:
+            doc["cluster_id"] = nearest.get("cluster_id") or nearest["id"]
+            joined += 1
+        else:
+            doc["cluster_id"] = doc["id"]
+        pool.append(doc)
+    return joined
@@ -0,0 +1,188 @@
+"""
+Related Stories Service
+Precomputed "related stories" for news items, so a story page reads its
+neighbours from its own document instead of scanning recent items per view.
+
+- Stories are TF-IDF vectors over title + summary (title words count
+  double), hashed into RELATED_HASH_DIMS columns so no vocabulary is kept;
+  IDF comes from the recent window the neighbours are picked from
+  (RELATED_WINDOW_DAYS, at most RELATED_POOL_LIMIT stories)
+- Only new stories are scored (one matrix product against the window); a
+  new story also enters an older story's list when it beats that story's
+  weakest neighbour
+- Neighbours are stored on news_items.related, best first:
+  [{"id", "title", "sourceName", "imageUrl", "publishedAt", "category",
+    "cluster_id", "score"}], at most RELATED_TOP_K, cosine >= RELATED_MIN_SCORE
+- Copies of the same story (services/news_clustering cluster_id) are
+  never related to each other, and each cluster appears once per list
+
+Pure NumPy; db/news.update_related_stories does the reads and writes.
+"""
+
+import hashlib
+import os
+import re
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+RELATED_TOP_K = int(os.environ.get("NEWS_RELATED_TOP_K", "6"))
+RELATED_WINDOW_DAYS = int(os.environ.get("NEWS_RELATED_WINDOW_DAYS", "14"))
+RELATED_POOL_LIMIT = int(os.environ.get("NEWS_RELATED_POOL_LIMIT", "3000"))
+RELATED_MIN_SCORE = 0.1
+RELATED_HASH_DIMS = 1 << 12
+
+TITLE_WEIGHT = 2
+
+# Fields copied into a neighbour entry
+ENTRY_FIELDS = ["id", "title", "sourceName", "imageUrl", "publishedAt", "category", "cluster_id"]
+
+WORD_REGEX = re.compile(r"[a-z][a-z0-9']+")
+STOPWORDS = {
+    "about", "after", "again", "also", "and", "are", "back", "been", "but", "can", "could",
+    "for", "from", "had", "has", "have", "her", "his", "how", "into", "its", "just", "may",
+    "more", "most", "new", "not", "now", "one", "our", "out", "over", "said", "says", "she",
+    "than", "that", "the", "their", "them", "they", "this", "two", "was", "were", "what",
+    "when", "which", "who", "why", "will", "with", "would", "you", "your", "read", "news",
+}
+
+_column_cache: Dict[str, int] = {}
+
+
+def _words(text: str) -> List[str]:
+    return [word for word in WORD_REGEX.findall((text or "").lower()) if word not in STOPWORDS]
+
+
+def _column(term: str) -> int:
+    """Stable hashed column for a term (Python's hash() changes per process)"""
+    column = _column_cache.get(term)
+    if column is None:
+        digest = hashlib.blake2b(term.encode("utf-8"), digest_size=4).digest()
+        column = _column_cache[term] = int.from_bytes(digest, "big") % RELATED_HASH_DIMS
+        if len(_column_cache) > 200_000:
+            _column_cache.clear()
+    return column
+
+
+def story_terms(doc: Dict[str, Any]) -> List[str]:
+    """Terms of a story, title words repeated TITLE_WEIGHT times"""
+    return _words(doc.get("title", "")) * TITLE_WEIGHT + _words(doc.get("summary", ""))
+
+
+def tfidf_matrix(docs: List[Dict[str, Any]]) -> np.ndarray:
+    """
+    L2-normalized rows of sublinear TF x smoothed IDF (IDF over `docs`),
+    one row per doc, RELATED_HASH_DIMS hashed columns.
+    """
+    counts = np.zeros((len(docs), RELATED_HASH_DIMS), dtype=np.float32)
+    rows, columns = [], []
+    for row, doc in enumerate(docs):
+        terms = story_terms(doc)
+        rows.extend([row] * len(terms))
+        columns.extend(_column(term) for term in terms)
+    np.add.at(counts, (np.array(rows, dtype=np.intp), np.array(columns, dtype=np.intp)), 1.0)
+
+    # In place on float32: the window matrix is the one big allocation
+    present = counts > 0
+    idf = (np.log((1 + len(docs)) / (1 + present.sum(axis=0))) + 1.0).astype(np.float32)
+    np.log(counts, out=counts, where=present)
+    counts += present
+    counts *= idf
+    norms = np.sqrt(np.einsum("ij,ij->i", counts, counts))
+    counts /= np.maximum(norms, 1e-12)[:, None]
+    return counts
+
+
+def related_entry(doc: Dict[str, Any], score: float) -> Dict[str, Any]:
+    entry = {field: doc.get(field) for field in ENTRY_FIELDS}
+    entry["score"] = round(float(score), 4)
+    return entry
+
+
+def merge_neighbours(
+    current: List[Dict[str, Any]],
+    candidates: List[Dict[str, Any]],
+    self_cluster: Optional[str] = None,
+    k: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Best k entries of current + candidates, one per story / cluster,
+    never from the story's own cluster.
+    """
+    k = RELATED_TOP_K if k is None else k
+    merged, seen = [], set()
+    for entry in sorted(current + candidates, key=lambda entry: entry["score"], reverse=True):
+        key = entry.get("cluster_id") or entry["id"]
+        if key in seen or (self_cluster and key == self_cluster):
+            continue
+        seen.add(key)
+        merged.append(entry)
+        if len(merged) == k:
+            break
+    return merged
+
+
+def plan_related(
+    pool: List[Dict[str, Any]],
+    new_ids: List[str],
+    k: Optional[int] = None,
+    min_score: float = RELATED_MIN_SCORE
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Neighbour lists to store after new stories arrived.
+
+    Args:
+        pool: The recent window, new stories included ({"id", "title",
+              "summary", "cluster_id", "related", ...})
+        new_ids: Ids of the stories not scored yet
+
+    Returns:
+        {story id: new related list} for every new story and every older
+        story whose list changed
+    """
+    k = RELATED_TOP_K if k is None else k
+    index = {doc["id"]: row for row, doc in enumerate(pool)}
+    new_rows = [index[story_id] for story_id in new_ids if story_id in index]
+    if not new_rows:
+        return {}
+
+    matrix = tfidf_matrix(pool)
+    scores = matrix[new_rows] @ matrix.T  # cosine: rows are normalized
+    clusters = np.array([doc.get("cluster_id") or doc["id"] for doc in pool], dtype=object)
+    is_new = np.zeros(len(pool), dtype=bool)
+    is_new[new_rows] = True
+
+    plans: Dict[str, List[Dict[str, Any]]] = {}
+    reverse: Dict[int, List[Dict[str, Any]]] = {}
+    for position, row in enumerate(new_rows):
+        story = pool[row]
+        row_scores = scores[position]
+        # Same story (itself or a syndicated copy) is never "related"
+        eligible = (clusters != clusters[row]) & (row_scores >= min_score)
+        eligible[row] = False
+        # Enough headroom for several copies of one story among the best
+        order = np.argsort(-np.where(eligible, row_scores, -np.inf), kind="stable")[: k * 4]
+        best = [int(column) for column in order if eligible[column]]
+
+        candidates = [related_entry(pool[column], row_scores[column]) for column in best]
+        plans[story["id"]] = merge_neighbours([], candidates, clusters[row], k)
+
+        entry = related_entry(story, 0.0)
+        for column in best:
+            if not is_new[column]:
+                reverse.setdefault(column, []).append(dict(entry, score=round(float(row_scores[column]), 4)))
+
+    for column, candidates in reverse.items():
+        neighbour = pool[column]
+        current = neighbour.get("related") or []
+        merged = merge_neighbours(current, candidates, clusters[column], k)
+        if [entry["id"] for entry in merged] != [entry["id"] for entry in current]:
+            plans[neighbour["id"]] = merged
+
+    return plans
+
+
+def related_window_start(now: datetime) -> datetime:
+    """Oldest createdAt considered for related stories"""
+    return now - timedelta(days=RELATED_WINDOW_DAYS)
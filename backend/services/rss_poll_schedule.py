@@ -0,0 +1,123 @@
+"""
+RSS Poll Schedule Service
+Per-source polling cadence for the RSS pipeline.
+
+Each source's next poll time is derived from how often it actually
+publishes (median gap between the entries in its feed, smoothed across
+polls), then backed off exponentially while it keeps failing or returning
+nothing new, always within [RSS_POLL_MIN_MINUTES, RSS_POLL_MAX_HOURS].
+The state lives in rss_feed_state next to the feed's HTTP validators; the
+scheduler ticks every RSS_POLL_TICK_MINUTES and fetches only due sources.
+"""
+
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+RSS_POLL_TICK_MINUTES = int(os.environ.get("RSS_POLL_TICK_MINUTES", "15"))
+MIN_POLL_INTERVAL_SECONDS = int(os.environ.get("RSS_POLL_MIN_MINUTES", "15")) * 60
+MAX_POLL_INTERVAL_SECONDS = int(os.environ.get("RSS_POLL_MAX_HOURS", "24")) * 3600
+
+# The old fixed cadence, used until a source's publish rate is known
+DEFAULT_POLL_INTERVAL_SECONDS = 6 * 3600
+
+BACKOFF_FACTOR = 2.0
+MAX_BACKOFF_STEPS = 10
+
+# Weight of the newest observation in the smoothed publish interval
+PUBLISH_INTERVAL_SMOOTHING = 0.5
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Mongo hands back naive UTC datetimes"""
+    if value is None or value.tzinfo is not None:
+        return value
+    return value.replace(tzinfo=timezone.utc)
+
+
+def _clamp(seconds: float) -> float:
+    return max(MIN_POLL_INTERVAL_SECONDS, min(MAX_POLL_INTERVAL_SECONDS, seconds))
+
+
+def is_due(state: Optional[Dict[str, Any]], now: datetime) -> bool:
+    """Sources never polled (or without a schedule yet) are due immediately"""
+    next_poll_at = _as_utc((state or {}).get("next_poll_at"))
+    return next_poll_at is None or next_poll_at <= now
+
+
+def due_sources(
+    sources: List[Dict[str, Any]],
+    states: Dict[str, Dict[str, Any]],
+    now: Optional[datetime] = None
+) -> List[Dict[str, Any]]:
+    """Sources whose next poll time has passed, in input order"""
+    now = now or datetime.now(timezone.utc)
+    return [source for source in sources if is_due(states.get(source["rss_url"]), now)]
+
+
+def next_poll(
+    state: Optional[Dict[str, Any]],
+    result: Dict[str, Any],
+    now: Optional[datetime] = None
+) -> Dict[str, Any]:
+    """
+    Schedule fields for a source after one sync_feed_source result.
+
+    - success with new items: poll again after the publish interval
+    - not modified / nothing new: back off, BACKOFF_FACTOR per empty poll
+    - failed: back off, BACKOFF_FACTOR per consecutive failure
+
+    Returns:
+        {"poll_interval_seconds", "next_poll_at", "publish_interval_seconds",
+         "consecutive_failures", "empty_polls", "last_polled_at", "last_poll_status"}
+    """
+    state = state or {}
+    now = now or datetime.now(timezone.utc)
+
+    publish_interval = state.get("publish_interval_seconds")
+    observed = result.get("publish_interval_seconds")
+    if observed:
+        if publish_interval:
+            publish_interval += PUBLISH_INTERVAL_SMOOTHING * (observed - publish_interval)
+        else:
+            publish_interval = observed
+
+    base = _clamp(publish_interval or DEFAULT_POLL_INTERVAL_SECONDS)
+    failures = state.get("consecutive_failures", 0)
+    empty_polls = state.get("empty_polls", 0)
+
+    if result["status"] == "failed":
+        failures += 1
+        steps = failures
+    elif result["status"] == "not_modified" or not result.get("items_added"):
+        failures = 0
+        empty_polls += 1
+        steps = empty_polls
+    else:
+        failures = empty_polls = 0
+        steps = 0
+
+    interval = _clamp(base * BACKOFF_FACTOR ** min(steps, MAX_BACKOFF_STEPS))
+    return {
+        "poll_interval_seconds": interval,
+        "next_poll_at": now + timedelta(seconds=interval),
+        "publish_interval_seconds": publish_interval,
+        "consecutive_failures": failures,
+        "empty_polls": empty_polls,
+        "last_polled_at": now,
+        "last_poll_status": result["status"],
+    }
+
+
+def plan_next_polls(
+    sources: List[Dict[str, Any]],
+    results: List[Dict[str, Any]],
+    states: Dict[str, Dict[str, Any]],
+    now: Optional[datetime] = None
+) -> List[Dict[str, Any]]:
+    """next_poll for each (source, result) pair, with the source URL added"""
+    now = now or datetime.now(timezone.utc)
+    return [
+        dict(next_poll(states.get(source["rss_url"]), result, now), url=source["rss_url"])
+        for source, result in zip(sources, results)
+    ]
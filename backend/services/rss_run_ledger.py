@@ -0,0 +1,109 @@
+"""
+RSS Run Ledger Service
+Shapes the structured record of one scheduler.run_all_feeds_job execution
+(stored by db/rss_pipeline_runs) and summarizes recent runs for the admin
+endpoints.
+
+A run document:
+    {"id", "trigger", "status", "started_at", "finished_at", "wall_seconds",
+     "stages": {"sync": {...}, "mirror": {...}, "health_report": {...}},
+     "totals": {...}, "sources": [per-source entries], "error"}
+
+status is "running", then "completed" or "failed"; "skipped" runs record a
+tick that found another run in progress (overlapped_run_id), "abandoned"
+marks a run whose process died before finishing.
+"""
+
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+# sync_feed_source timings copied onto each source entry
+SOURCE_TIMINGS = ["fetch_seconds", "parse_seconds", "prepare_seconds", "sentiment_seconds", "store_seconds"]
+
+
+def new_run(trigger: str = "scheduler", now: Optional[datetime] = None) -> Dict[str, Any]:
+    return {
+        "id": str(uuid.uuid4()),
+        "trigger": trigger,
+        "status": "running",
+        "started_at": now or datetime.now(timezone.utc),
+        "stages": {},
+    }
+
+
+def source_entry(result: Dict[str, Any]) -> Dict[str, Any]:
+    """One sync_feed_source result, flattened for the ledger"""
+    timings = result.get("timings", {})
+    entry = {
+        "source": result["source"],
+        "category": result.get("category"),
+        "status": result["status"],
+        "http_status": result.get("http_status"),
+        "bytes": result.get("bytes", 0),
+        "items_parsed": result.get("items_parsed", 0),
+        "items_added": result.get("items_added", 0),
+        "duplicates": result.get("duplicates", 0),
+        "errors": result.get("errors", 0),
+        "error": result.get("error"),
+        "quarantined": result.get("quarantined", False),
+        "next_poll_at": result.get("next_poll_at"),
+    }
+    for key in SOURCE_TIMINGS:
+        entry[key] = round(timings[key], 4) if key in timings else None
+    return entry
+
+
+def run_totals(sources: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Sums over the ledger's source entries"""
+    return {
+        "sources_synced": len(sources),
+        "sources_failed": sum(1 for source in sources if source["status"] == "failed"),
+        "sources_not_modified": sum(1 for source in sources if source["status"] == "not_modified"),
+        "bytes": sum(source["bytes"] for source in sources),
+        "items_parsed": sum(source["items_parsed"] for source in sources),
+        "items_added": sum(source["items_added"] for source in sources),
+        "duplicates": sum(source["duplicates"] for source in sources),
+        "errors": sum(source["errors"] for source in sources),
+        "sentiment_seconds": round(sum(source["sentiment_seconds"] or 0.0 for source in sources), 4),
+    }
+
+
+def source_latency_report(runs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Per-source fetch latency and outcomes over the given runs, slowest
+    (mean fetch time) first.
+    """
+    by_source: Dict[str, Dict[str, Any]] = {}
+    # Oldest first, so "last_*" ends on the newest run
+    for run in sorted(runs, key=lambda run: run["started_at"]):
+        for entry in run.get("sources", []):
+            stats = by_source.setdefault(entry["source"], {
+                "source": entry["source"],
+                "runs": 0,
+                "failures": 0,
+                "not_modified": 0,
+                "items_added": 0,
+                "bytes": 0,
+                "fetch_seconds": [],
+            })
+            stats["runs"] += 1
+            stats["failures"] += entry["status"] == "failed"
+            stats["not_modified"] += entry["status"] == "not_modified"
+            stats["items_added"] += entry.get("items_added", 0)
+            stats["bytes"] += entry.get("bytes", 0)
+            if entry.get("fetch_seconds") is not None:
+                stats["fetch_seconds"].append(entry["fetch_seconds"])
+            stats["last_status"] = entry["status"]
+            stats["last_error"] = entry.get("error")
+            stats["last_run_at"] = run["started_at"]
+
+    report = []
+    for stats in by_source.values():
+        fetches = sorted(stats.pop("fetch_seconds"))
+        stats["mean_fetch_seconds"] = round(sum(fetches) / len(fetches), 4) if fetches else None
+        stats["max_fetch_seconds"] = fetches[-1] if fetches else None
+        stats["mean_bytes"] = stats.pop("bytes") // stats["runs"]
+        report.append(stats)
+    report.sort(key=lambda stats: stats["mean_fetch_seconds"] or 0.0, reverse=True)
+    return report
@@ -0,0 +1,124 @@
+"""
+RSS Source Health Service
+Rolling health for each registered RSS source (db/rss_sources), and the
+quarantine that keeps dead or hanging feeds out of the regular sync.
+
+- success_rate and latency_seconds are exponentially smoothed over syncs
+  (HEALTH_SMOOTHING = weight of the newest sync); a 304 counts as success
+- After RSS_QUARANTINE_AFTER_FAILURES consecutive failures a source is
+  quarantined: it is left out of regular syncs and only probed once every
+  RSS_QUARANTINE_PROBE_HOURS. The first successful probe releases it.
+"""
+
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+QUARANTINE_AFTER_FAILURES = int(os.environ.get("RSS_QUARANTINE_AFTER_FAILURES", "5"))
+QUARANTINE_PROBE_SECONDS = int(os.environ.get("RSS_QUARANTINE_PROBE_HOURS", "24")) * 3600
+
+HEALTH_SMOOTHING = 0.2
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Mongo hands back naive UTC datetimes"""
+    if value is None or value.tzinfo is not None:
+        return value
+    return value.replace(tzinfo=timezone.utc)
+
+
+def _smooth(previous: Optional[float], observed: float) -> float:
+    if previous is None:
+        return observed
+    return previous + HEALTH_SMOOTHING * (observed - previous)
+
+
+def is_quarantined(source: Dict[str, Any]) -> bool:
+    return bool(source.get("quarantine", {}).get("active"))
+
+
+def pollable_sources(
+    sources: List[Dict[str, Any]],
+    now: Optional[datetime] = None
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Split active registry sources for a sync run.
+
+    Returns:
+        (regular sources, quarantined sources whose probe is due)
+    """
+    now = now or datetime.now(timezone.utc)
+    regular, probes = [], []
+    for source in sources:
+        if not source.get("active", True):
+            continue
+        if not is_quarantined(source):
+            regular.append(source)
+        elif (_as_utc(source["quarantine"].get("next_probe_at")) or now) <= now:
+            probes.append(source)
+    return regular, probes
+
+
+def next_health(source: Dict[str, Any], result: Dict[str, Any], now: Optional[datetime] = None) -> Dict[str, Any]:
+    """
+    Registry fields to set after one sync_feed_source result for `source`.
+
+    Returns:
+        {"health": {"success_rate", "latency_seconds", "consecutive_failures",
+                    "syncs", "last_status", "last_error", "last_good_at",
+                    "last_failure_at", "last_synced_at"},
+         "quarantine": {"active", "since", "next_probe_at", "reason"}}
+    """
+    now = now or datetime.now(timezone.utc)
+    health = dict(source.get("health") or {})
+    quarantine = dict(source.get("quarantine") or {"active": False})
+    succeeded = result["status"] != "failed"
+
+    health["success_rate"] = _smooth(health.get("success_rate"), 1.0 if succeeded else 0.0)
+    fetch_seconds = result.get("timings", {}).get("fetch_seconds")
+    if fetch_seconds is not None:
+        health["latency_seconds"] = _smooth(health.get("latency_seconds"), fetch_seconds)
+    health["syncs"] = health.get("syncs", 0) + 1
+    health["last_status"] = result["status"]
+    health["last_synced_at"] = now
+
+    if succeeded:
+        health["consecutive_failures"] = 0
+        health["last_good_at"] = now
+        health["last_error"] = None
+        if quarantine.get("active"):
+            quarantine = {"active": False, "released_at": now}
+    else:
+        health["consecutive_failures"] = health.get("consecutive_failures", 0) + 1
+        health["last_failure_at"] = now
+        health["last_error"] = (result.get("error") or "")[:300]
+        if quarantine.get("active"):
+            # Failed probe: wait for the next one
+            quarantine["next_probe_at"] = now + timedelta(seconds=QUARANTINE_PROBE_SECONDS)
+        elif health["consecutive_failures"] >= QUARANTINE_AFTER_FAILURES:
+            quarantine = {
+                "active": True,
+                "since": now,
+                "next_probe_at": now + timedelta(seconds=QUARANTINE_PROBE_SECONDS),
+                "reason": f"{health['consecutive_failures']} consecutive failures: {health['last_error']}",
+            }
+
+    return {"health": health, "quarantine": quarantine}
+
+
+def plan_source_health(
+    sources: List[Dict[str, Any]],
+    results: List[Dict[str, Any]],
+    now: Optional[datetime] = None
+) -> List[Dict[str, Any]]:
+    """
+    next_health for each registered (source, result) pair, with the source id
+    and the quarantine it was computed from (db/rss_sources.save_source_health
+    skips the quarantine write if that changed during the run)
+    """
+    now = now or datetime.now(timezone.utc)
+    return [
+        dict(next_health(source, result, now), id=source["id"], previous_quarantine=source.get("quarantine"))
+        for source, result in zip(sources, results)
+        if source.get("id")
+    ]
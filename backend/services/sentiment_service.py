@@ -2,10 +2,18 @@
 Sentiment Analysis Service - Phase 6.3
 Simple rule-based sentiment analysis for news and resources
 Can be upgraded to LLM-based analysis later (OpenAI, Claude, etc.)
+
+Scoring: +0.1 for each positive lexicon word and -0.1 for each negative one
+that occurs anywhere in the text (as a substring: "hopeful" counts both
+"hope" and "hopeful"). Text is split into letter runs once and each distinct
+run's lexicon hits are memoized, so a call is a handful of set lookups
+instead of a substring scan per keyword.
 """
 
 import logging
-from typing import Dict
+import re
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Tuple
 from datetime import datetime, timezone
 
 # Setup logging
@@ -13,12 +21,120 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-def analyze_text_sentiment(text: str) -> Dict[str, any]:
+# Positive keywords (weight: +0.1 each)
+POSITIVE_WORDS = frozenset([
+    'success', 'successful', 'growth', 'achievement', 'win', 'winning', 'excellent',
+    'great', 'good', 'better', 'best', 'progress', 'opportunity', 'opportunities',
+    'positive', 'celebration', 'celebrate', 'victory', 'award', 'awarded',
+    'innovation', 'innovative', 'breakthrough', 'empower', 'empowerment',
+    'inspire', 'inspiring', 'hope', 'hopeful', 'amazing', 'wonderful',
+    'fantastic', 'outstanding', 'remarkable', 'impressive', 'triumph',
+    'advance', 'advancement', 'benefit', 'beneficial', 'thriving', 'prosper'
+])
+
+# Negative keywords (weight: -0.1 each)
+NEGATIVE_WORDS = frozenset([
+    'crisis', 'failure', 'failed', 'problem', 'problems', 'issue', 'issues',
+    'concern', 'concerns', 'worry', 'worried', 'fear', 'afraid', 'threat',
+    'threaten', 'risk', 'danger', 'dangerous', 'harm', 'harmful', 'attack',
+    'violence', 'violent', 'death', 'die', 'dying', 'disaster', 'catastrophe',
+    'decline', 'declining', 'loss', 'lose', 'losing', 'defeat', 'defeated',
+    'cut', 'cuts', 'cutting', 'layoff', 'layoffs', 'unemployment',
+    'discrimination', 'discriminate', 'injustice', 'unfair', 'protest',
+    'controversy', 'controversial', 'scandal', 'corruption', 'corrupt'
+])
+
+# Lexicon entries that are single lowercase words are matched per token;
+# anything else (multi-word phrases, hyphenated terms) by substring
+_WORD_RE = re.compile(r"[a-z]+")
+
+
+def _split_lexicon(words: FrozenSet[str]) -> Tuple[FrozenSet[str], Tuple[str, ...]]:
+    single = frozenset(word for word in words if _WORD_RE.fullmatch(word))
+    return single, tuple(sorted(words - single))
+
+
+_POSITIVE_TOKENS, _POSITIVE_PHRASES = _split_lexicon(POSITIVE_WORDS)
+_NEGATIVE_TOKENS, _NEGATIVE_PHRASES = _split_lexicon(NEGATIVE_WORDS)
+_LEXICON_LENGTHS = sorted({len(word) for word in _POSITIVE_TOKENS | _NEGATIVE_TOKENS})
+
+
+_NO_HITS: Tuple[FrozenSet[str], FrozenSet[str]] = (frozenset(), frozenset())
+
+# token -> lexicon hits; news vocabulary is small, so this stays bounded
+_TOKEN_HITS: Dict[str, Tuple[FrozenSet[str], FrozenSet[str]]] = {}
+_TOKEN_HITS_MAX = 200000
+
+
+def _token_hits(token: str) -> Tuple[FrozenSet[str], FrozenSet[str]]:
+    """Positive / negative lexicon words contained in a single letter run"""
+    positive, negative = set(), set()
+    for length in _LEXICON_LENGTHS:
+        for start in range(len(token) - length + 1):
+            piece = token[start:start + length]
+            if piece in _POSITIVE_TOKENS:
+                positive.add(piece)
+            if piece in _NEGATIVE_TOKENS:
+                negative.add(piece)
+    hits = (frozenset(positive), frozenset(negative)) if positive or negative else _NO_HITS
+    
+    if len(_TOKEN_HITS) >= _TOKEN_HITS_MAX:
+        _TOKEN_HITS.clear()
+    _TOKEN_HITS[token] = hits
+    return hits
+
+
+def lexicon_hits(text: str) -> Tuple[int, int]:
+    """Number of distinct positive and negative lexicon words in text"""
+    text_lower = text.lower()
+    positive, negative = set(), set()
+    cached = _TOKEN_HITS.get
+    for token in set(_WORD_RE.findall(text_lower)):
+        hits = cached(token) or _token_hits(token)
+        if hits is not _NO_HITS:
+            positive |= hits[0]
+            negative |= hits[1]
+    
+    positive_count = len(positive) + sum(1 for phrase in _POSITIVE_PHRASES if phrase in text_lower)
+    negative_count = len(negative) + sum(1 for phrase in _NEGATIVE_PHRASES if phrase in text_lower)
+    return positive_count, negative_count
+
+
+@lru_cache(maxsize=1024)
+def _score_and_label(positive_count: int, negative_count: int) -> Tuple[float, str]:
+    """
+    Score / label for hit counts.
+    
+    Accumulates in the same order as the original per-keyword loop so float
+    rounding (and therefore the stored score) is unchanged.
+    """
+    score = 0.0
+    for _ in range(positive_count):
+        score += 0.1
+    for _ in range(negative_count):
+        score -= 0.1
+    
+    # Normalize score to -1.0 to 1.0 range
+    score = max(-1.0, min(1.0, score))
+    
+    # Determine label based on score
+    if score > 0.15:
+        label = "positive"
+    elif score < -0.15:
+        label = "negative"
+    else:
+        label = "neutral"
+    
+    return round(score, 3), label
+
+
+def analyze_text_sentiment(text: str, analyzed_at: datetime = None) -> Dict[str, any]:
     """
     Analyze sentiment of text using simple rule-based approach
     
     Args:
         text: String to analyze (typically title + summary/description)
+        analyzed_at: Timestamp to record (defaults to now)
     
     Returns:
         dict: {
@@ -35,100 +151,56 @@ def analyze_text_sentiment(text: str) -> Dict[str, any]:
     Future Enhancement:
         Replace with OpenAI GPT-5, Claude Sonnet 4, or other LLM for semantic analysis
     """
+    analyzed_at = analyzed_at or datetime.now(timezone.utc)
     
     if not text or not text.strip():
-        logger.warning("Empty text provided for sentiment analysis")
+        logger.debug("Empty text provided for sentiment analysis")
         return {
             "score": 0.0,
             "label": "neutral",
-            "analyzed_at": datetime.now(timezone.utc)
+            "analyzed_at": analyzed_at
         }
     
     try:
-        # Simple keyword-based sentiment scoring
-        text_lower = text.lower()
-        
-        # Positive keywords (weight: +0.1 each)
-        positive_words = [
-            'success', 'successful', 'growth', 'achievement', 'win', 'winning', 'excellent',
-            'great', 'good', 'better', 'best', 'progress', 'opportunity', 'opportunities',
-            'positive', 'celebration', 'celebrate', 'victory', 'award', 'awarded',
-            'innovation', 'innovative', 'breakthrough', 'empower', 'empowerment',
-            'inspire', 'inspiring', 'hope', 'hopeful', 'amazing', 'wonderful',
-            'fantastic', 'outstanding', 'remarkable', 'impressive', 'triumph',
-            'advance', 'advancement', 'benefit', 'beneficial', 'thriving', 'prosper'
-        ]
-        
-        # Negative keywords (weight: -0.1 each)
-        negative_words = [
-            'crisis', 'failure', 'failed', 'problem', 'problems', 'issue', 'issues',
-            'concern', 'concerns', 'worry', 'worried', 'fear', 'afraid', 'threat',
-            'threaten', 'risk', 'danger', 'dangerous', 'harm', 'harmful', 'attack',
-            'violence', 'violent', 'death', 'die', 'dying', 'disaster', 'catastrophe',
-            'decline', 'declining', 'loss', 'lose', 'losing', 'defeat', 'defeated',
-            'cut', 'cuts', 'cutting', 'layoff', 'layoffs', 'unemployment',
-            'discrimination', 'discriminate', 'injustice', 'unfair', 'protest',
-            'controversy', 'controversial', 'scandal', 'corruption', 'corrupt'
-        ]
-        
-        # Calculate sentiment score
-        score = 0.0
-        
-        # Count positive words
-        for word in positive_words:
-            if word in text_lower:
-                score += 0.1
-        
-        # Count negative words
-        for word in negative_words:
-            if word in text_lower:
-                score -= 0.1
-        
-        # Normalize score to -1.0 to 1.0 range
-        # Cap at -1.0 and 1.0
-        score = max(-1.0, min(1.0, score))
-        
-        # Determine label based on score
-        if score > 0.15:
-            label = "positive"
-        elif score < -0.15:
-            label = "negative"
-        else:
-            label = "neutral"
-        
-        result = {
-            "score": round(score, 3),
+        score, label = _score_and_label(*lexicon_hits(text))
+        logger.debug(f"Sentiment analysis: score={score}, label={label}")
+        return {
+            "score": score,
             "label": label,
-            "analyzed_at": datetime.now(timezone.utc)
+            "analyzed_at": analyzed_at
         }
         
-        logger.info(f"Sentiment analysis: score={result['score']}, label={result['label']}")
-        return result
-        
     except Exception as e:
         logger.error(f"Sentiment analysis error: {e}")
         # Return neutral sentiment on error
         return {
             "score": 0.0,
             "label": "neutral",
-            "analyzed_at": datetime.now(timezone.utc)
+            "analyzed_at": analyzed_at
         }
 
 
-def analyze_batch_sentiment(texts: list) -> list:
+def analyze_batch_sentiment(texts: List[str]) -> List[Dict[str, any]]:
     """
     Analyze sentiment for multiple texts in batch
     
+    The batch shares one analyzed_at timestamp, and repeated texts (e.g. the
+    same wire story from several feeds) are scored once.
+    
     Args:
         texts: List of strings to analyze
     
     Returns:
-        list: List of sentiment dictionaries
+        list: List of sentiment dictionaries, in input order
     """
+    analyzed_at = datetime.now(timezone.utc)
+    scored: Dict[str, Dict[str, any]] = {}
     results = []
     for text in texts:
-        result = analyze_text_sentiment(text)
-        results.append(result)
+        key = text if isinstance(text, str) else ""
+        if key not in scored:
+            scored[key] = analyze_text_sentiment(text, analyzed_at)
+        results.append(dict(scored[key]))
     return results
 
 
@@ -1,14 +1,27 @@
 """
 Trending Service - Phase 7.6.4
 Computes trending scores for news items based on recency and sentiment intensity
+
+The TrendingIndex keeps per-section leaderboards in memory. Each entry stores
+its decay reference time (publishedAt) and its constant sentiment component,
+so scores decay lazily at read time; the scheduler rebuilds the boards from
+the recent window and ingest / sentiment updates patch them in between.
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from datetime import datetime, timezone
+import asyncio
+import heapq
 import math
+import os
+
 
+# Recent items considered for trending, and candidates kept per leaderboard
+TRENDING_WINDOW = int(os.environ.get("TRENDING_WINDOW", "200"))
+TRENDING_TOP_N = int(os.environ.get("TRENDING_TOP_N", "100"))
 
-def compute_trending_score(item: Dict[str, Any]) -> float:
+
+def compute_trending_score(item: Dict[str, Any], now: Optional[datetime] = None) -> float:
     """
     Compute trending score for a news item.
     
@@ -23,7 +36,7 @@ def compute_trending_score(item: Dict[str, Any]) -> float:
         Trending score between 0.0 and 1.0
     """
     # Recency score (exponential decay)
-    recency_score = compute_recency_score(item.get('publishedAt'))
+    recency_score = compute_recency_score(item.get('publishedAt'), now)
     
     # Sentiment intensity (strong emotions trend more)
     sentiment_intensity = compute_sentiment_intensity(item.get('sentiment_score'))
@@ -34,7 +47,7 @@ def compute_trending_score(item: Dict[str, Any]) -> float:
     return round(trending_score, 4)
 
 
-def compute_recency_score(published_at) -> float:
+def compute_recency_score(published_at, now: Optional[datetime] = None) -> float:
     """
     Compute recency score using exponential decay.
     
@@ -42,24 +55,17 @@ def compute_recency_score(published_at) -> float:
     
     Args:
         published_at: datetime object or ISO string
+        now: Reference time (default: current time)
         
     Returns:
         Score between 0.0 and 1.0
     """
-    if not published_at:
+    published_at = _parse_published(published_at)
+    if published_at is None:
         return 0.0
     
-    # Convert to datetime if string
-    if isinstance(published_at, str):
-        try:
-            published_at = datetime.fromisoformat(published_at.replace('Z', '+00:00'))
-        except:
-            return 0.0
-    
     # Calculate age in hours
-    now = datetime.now(timezone.utc)
-    if published_at.tzinfo is None:
-        published_at = published_at.replace(tzinfo=timezone.utc)
+    now = now or datetime.now(timezone.utc)
     
     age_hours = (now - published_at).total_seconds() / 3600.0
     
@@ -73,6 +79,23 @@ def compute_recency_score(published_at) -> float:
     return min(1.0, recency_score)
 
 
+def _parse_published(published_at) -> Optional[datetime]:
+    """publishedAt as an aware datetime, or None if missing/unparseable"""
+    if not published_at:
+        return None
+    
+    # Convert to datetime if string
+    if isinstance(published_at, str):
+        try:
+            published_at = datetime.fromisoformat(published_at.replace('Z', '+00:00'))
+        except:
+            return None
+    
+    if published_at.tzinfo is None:
+        published_at = published_at.replace(tzinfo=timezone.utc)
+    return published_at
+
+
 def compute_sentiment_intensity(sentiment_score) -> float:
     """
     Compute sentiment intensity score.
@@ -116,10 +139,11 @@ def get_trending_items(
     for item in items:
         # Skip if section filter doesn't match
         if section and section != 'all':
-            # Check category field for section match
-            item_category = (item.get('category') or '').lower()
-            from services.news_categorization_service import categorize_news_item
-            item_section = categorize_news_item(item)
+            # Section is stored at ingest; categorize only legacy items
+            item_section = item.get('section')
+            if not item_section:
+                from services.news_categorization_service import categorize_news_item
+                item_section = categorize_news_item(item)
             
             if item_section != section:
                 continue
@@ -185,3 +209,159 @@ def compute_sentiment_summary(items: List[Dict[str, Any]]) -> Dict[str, Any]:
     summary['dominant_tone'] = dominant_tone
     
     return summary
+
+
+# ==========================================
+# MAINTAINED TRENDING INDEX
+# ==========================================
+
+class TrendingIndex:
+    """
+    In-memory trending leaderboards: one per homepage section plus "all".
+    
+    Each board holds at most TRENDING_TOP_N candidate ids in publishedAt
+    order. Reads rescore only those candidates at the current time, so a
+    request costs O(TRENDING_TOP_N) no matter how many items exist.
+    """
+    
+    def __init__(self, window: int = TRENDING_WINDOW, top_n: int = TRENDING_TOP_N):
+        self.window = window
+        self.top_n = top_n
+        self.refreshed_at: Optional[datetime] = None
+        self._entries: Dict[str, Dict[str, Any]] = {}  # item id -> entry
+        self._keys: Dict[str, str] = {}  # dedupe key -> item id
+        self._boards: Dict[str, List[str]] = {}  # section -> candidate ids
+        self._lock = asyncio.Lock()
+    
+    @staticmethod
+    def _section_of(item: Dict[str, Any]) -> str:
+        # Section is stored at ingest; categorize only legacy items
+        section = item.get('section')
+        if not section:
+            from services.news_categorization_service import categorize_news_item
+            section = categorize_news_item(item)
+        return section
+    
+    def _make_entry(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        published = _parse_published(item.get('publishedAt'))
+        return {
+            "item": item,
+            "published": published,
+            "order": published.timestamp() if published else float("-inf"),
+            "intensity": compute_sentiment_intensity(item.get('sentiment_score')),
+            "section": self._section_of(item),
+        }
+    
+    @staticmethod
+    def _score(entry: Dict[str, Any], now: datetime) -> float:
+        recency_score = compute_recency_score(entry["published"], now)
+        return round((0.60 * recency_score) + (0.40 * entry["intensity"]), 4)
+    
+    def _build_board(self, ids: List[str], now: datetime) -> List[str]:
+        """Keep the top_n scorers, stored newest-first for stable tie order"""
+        entries = self._entries
+        ids = sorted(ids, key=lambda i: entries[i]["order"], reverse=True)
+        if len(ids) > self.top_n:
+            keep = set(heapq.nlargest(self.top_n, ids, key=lambda i: self._score(entries[i], now)))
+            ids = [i for i in ids if i in keep]
+        return ids
+    
+    def _rebuild_boards(self, sections, now: datetime) -> None:
+        for section in sections:
+            if section == 'all':
+                ids = list(self._entries)
+            else:
+                ids = [i for i, e in self._entries.items() if e["section"] == section]
+            self._boards[section] = self._build_board(ids, now)
+    
+    def load(self, items: List[Dict[str, Any]], now: Optional[datetime] = None) -> None:
+        """Replace the index with already prepared (deduped, ISO-dated) items"""
+        now = now or datetime.now(timezone.utc)
+        from db.news import make_dedupe_key
+        
+        self._entries = {}
+        self._keys = {}
+        for item in items:
+            self._entries[item["id"]] = self._make_entry(item)
+            self._keys[make_dedupe_key(item)] = item["id"]
+        
+        sections = {e["section"] for e in self._entries.values()} | {'all'}
+        self._boards = {}
+        self._rebuild_boards(sections, now)
+        self.refreshed_at = now
+    
+    async def refresh(self, if_empty: bool = False) -> int:
+        """Rebuild every board from the recent window. Returns items indexed."""
+        from db.news import get_latest_news, prepare_news_items
+        
+        async with self._lock:
+            if if_empty and self.refreshed_at is not None:
+                return len(self._entries)
+            items = prepare_news_items(await get_latest_news(limit=self.window))
+            self.load(items)
+            return len(items)
+    
+    def add_item(self, item: Dict[str, Any], now: Optional[datetime] = None) -> bool:
+        """
+        Index a newly ingested story. Returns False for duplicates.
+        The stored document may carry Mongo's _id; it is not exposed.
+        """
+        from db.news import make_dedupe_key, prepare_news_items
+        
+        if self.refreshed_at is None:
+            return False  # Nothing loaded yet; the first refresh will include it
+        
+        key = make_dedupe_key(item)
+        if key in self._keys or item.get("id") in self._entries:
+            return False
+        
+        item = prepare_news_items([{k: v for k, v in item.items() if k != "_id"}])[0]
+        entry = self._make_entry(item)
+        self._entries[item["id"]] = entry
+        self._keys[key] = item["id"]
+        self._rebuild_boards({entry["section"], 'all'}, now or datetime.now(timezone.utc))
+        return True
+    
+    def update_sentiment(
+        self,
+        item_id: str,
+        sentiment_score: float,
+        sentiment_label: str,
+        sentiment_at=None,
+        now: Optional[datetime] = None
+    ) -> bool:
+        """Rescore an indexed story after its sentiment changed"""
+        from services.heavy_content_service import enrich_item_with_banner_data
+        
+        entry = self._entries.get(item_id)
+        if entry is None:
+            return False
+        
+        item = entry["item"]
+        item['sentiment_score'] = sentiment_score
+        item['sentiment_label'] = sentiment_label
+        if sentiment_at is not None:
+            item['sentiment_at'] = sentiment_at.isoformat() if hasattr(sentiment_at, 'isoformat') else sentiment_at
+        enrich_item_with_banner_data(item)
+        
+        entry["intensity"] = compute_sentiment_intensity(sentiment_score)
+        self._rebuild_boards({entry["section"], 'all'}, now or datetime.now(timezone.utc))
+        return True
+    
+    def top(self, section: Optional[str] = None, limit: int = 10, now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Top trending items for a section ('all' / None for global)"""
+        now = now or datetime.now(timezone.utc)
+        ids = self._boards.get(section or 'all', [])
+        scored = [(i, self._score(self._entries[i], now)) for i in ids]
+        best = heapq.nlargest(limit, scored, key=lambda pair: pair[1])
+        return [dict(self._entries[i]["item"], trending_score=score) for i, score in best]
+    
+    async def get_top(self, section: Optional[str] = None, limit: int = 10) -> List[Dict[str, Any]]:
+        """top(), loading the index on first use if the scheduler hasn't yet"""
+        if self.refreshed_at is None:
+            await self.refresh(if_empty=True)
+        return self.top(section, limit)
+
+
+# Process-wide index used by /api/news/trending, the ingest path and the scheduler
+trending_index = TrendingIndex()
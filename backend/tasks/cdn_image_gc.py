@@ -0,0 +1,150 @@
+"""
+CDN Image Garbage Collection Task
+
+Scheduled task that deletes mirrored image files nothing uses any more:
+renditions of images no news item or featured media references (deleted
+or re-mirrored items), flat legacy files no item points at, and temp
+files left by interrupted writes. Runs daily.
+
+Only files older than CDN_GC_GRACE_HOURS are deleted, so renditions a
+mirror run has just written, before its references are flushed, are safe.
+"""
+
+import asyncio
+import os
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from db.news_images import delete_orphan_images, iter_referenced_images
+from utils import cdn_mirror
+from utils.news_image_store import CDN_BASE_URL, scan_mirror_files
+
+CDN_GC_GRACE_HOURS = int(os.environ.get("CDN_GC_GRACE_HOURS", "48"))
+
+
+def _remove(path: str) -> bool:
+    try:
+        os.remove(path)
+        return True
+    except FileNotFoundError:
+        return False
+
+
+def _remove_empty_dirs(directories) -> None:
+    """Shard directories emptied by the sweep (deepest first)"""
+    for directory in sorted(directories, key=len, reverse=True):
+        for path in (directory, os.path.dirname(directory)):
+            try:
+                os.rmdir(path)
+            except OSError:
+                break  # not empty
+
+
+async def collect_orphan_images(
+    root: Optional[str] = None,
+    grace_hours: Optional[int] = None,
+    dry_run: bool = False
+) -> Dict[str, Any]:
+    """
+    Delete unreferenced mirror files older than the grace period.
+
+    Args:
+        root: Mirror directory (cdn_mirror.LOCAL_MIRROR_DIR if omitted)
+        grace_hours: Minimum file age (CDN_GC_GRACE_HOURS if omitted)
+        dry_run: Report what would be deleted without deleting
+
+    Returns:
+        {"files_scanned", "files_kept", "files_recent", "files_deleted",
+         "bytes_reclaimed", "images_deleted", "legacy_files_deleted", ...}
+    """
+    root = root or cdn_mirror.LOCAL_MIRROR_DIR
+    grace_hours = CDN_GC_GRACE_HOURS if grace_hours is None else grace_hours
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=grace_hours)
+    cutoff_mtime = cutoff.timestamp()
+
+    # Everything referenced, streamed from Mongo before the disk is walked:
+    # a file stored after this point is newer than the cutoff anyway
+    referenced = set()
+    async for name in iter_referenced_images(CDN_BASE_URL):
+        referenced.add(name)
+
+    stats = {
+        "files_scanned": 0,
+        "files_kept": 0,
+        "files_recent": 0,
+        "files_deleted": 0,
+        "bytes_reclaimed": 0,
+        "images_deleted": 0,
+        "legacy_files_deleted": 0,
+    }
+    orphans: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    strays: List[Dict[str, Any]] = []  # legacy and temp files: no news_images document
+
+    # Directory walks block; keep them off the event loop
+    files = await asyncio.to_thread(lambda: list(scan_mirror_files(root)))
+    for file in files:
+        stats["files_scanned"] += 1
+        temp = file["filename"].endswith(".tmp")
+        if not temp and (file["hash"] or file["filename"]) in referenced:
+            stats["files_kept"] += 1
+        elif file["mtime"] >= cutoff_mtime:
+            stats["files_recent"] += 1
+        elif file["hash"] and not temp:
+            orphans[file["hash"]].append(file)
+        else:
+            strays.append(file)
+
+    # Images referenced or reused since the walk started keep their files
+    deletable = set(orphans) if dry_run else await delete_orphan_images(sorted(orphans), cutoff)
+    stats["files_kept"] += sum(len(orphans[digest]) for digest in set(orphans) - deletable)
+    stats["images_deleted"] = len(deletable)
+
+    doomed = [file for digest in deletable for file in orphans[digest]] + strays
+
+    def _sweep() -> None:
+        emptied = set()
+        for file in doomed:
+            if dry_run or _remove(file["path"]):
+                stats["files_deleted"] += 1
+                stats["bytes_reclaimed"] += file["bytes"]
+                if file["hash"]:
+                    emptied.add(os.path.dirname(file["path"]))
+                elif not file["filename"].endswith(".tmp"):
+                    stats["legacy_files_deleted"] += 1
+        if not dry_run:
+            _remove_empty_dirs(emptied)
+
+    await asyncio.to_thread(_sweep)
+
+    stats.update(
+        root=root,
+        grace_hours=grace_hours,
+        dry_run=dry_run,
+        timestamp=datetime.utcnow().isoformat() + "Z"
+    )
+    return stats
+
+
+async def run_cdn_image_gc():
+    """
+    Sweep the CDN mirror directory and report bytes reclaimed.
+
+    This function is called by APScheduler daily.
+    """
+    print(f"[CDN GC] Sweep started at {datetime.now(timezone.utc).isoformat()}")
+    started = time.perf_counter()
+
+    try:
+        stats = await collect_orphan_images()
+        print(
+            f"[CDN GC] Scanned {stats['files_scanned']} files, deleted {stats['files_deleted']} "
+            f"({stats['images_deleted']} images, {stats['legacy_files_deleted']} legacy files), "
+            f"reclaimed {stats['bytes_reclaimed'] / (1024 * 1024):.1f} MB "
+            f"in {time.perf_counter() - started:.1f}s"
+        )
+        return {"success": True, **stats}
+    except Exception as e:
+        print(f"[CDN GC] Sweep error: {e}")
+        return {"success": False, "error": str(e)}
@@ -0,0 +1,30 @@
+"""
+Social Engagement Reconciliation Task
+
+Scheduled task that repairs drifted like_count / comment_count values on
+social_posts by recomputing them from social_reactions and social_comments.
+Runs every 6 hours.
+"""
+
+from datetime import datetime, timezone
+from db.social_posts import reconcile_engagement_counts
+
+
+async def run_engagement_reconciliation():
+    """
+    Recompute engagement counters and bulk-repair any that drifted.
+    
+    This function is called by APScheduler every 6 hours.
+    """
+    print(f"[Engagement] Reconciliation started at {datetime.now(timezone.utc).isoformat()}")
+    
+    try:
+        stats = await reconcile_engagement_counts()
+        print(
+            f"[Engagement] Scanned {stats['posts_scanned']} posts, repaired {stats['posts_repaired']} "
+            f"({stats['like_fixes']} like counts, {stats['comment_fixes']} comment counts)"
+        )
+        return {"success": True, **stats}
+    except Exception as e:
+        print(f"[Engagement] Reconciliation error: {e}")
+        return {"success": False, "error": str(e)}
@@ -4,11 +4,13 @@ BANIBS RSS Aggregation Pipeline
 This file is authoritative for how external news is ingested.
 
 Rules:
-- Sources come from config/rss_sources.py only.
+- Sources come from the rss_sources registry (db/rss_sources), seeded from
+  config/rss_sources.py; admins edit it at /api/admin/rss/sources.
 - DO NOT rename fields in NewsItem without updating the homepage.
 - DO NOT remove fingerprint-based dedupe.
 - /api/news/rss-sync is a protected admin endpoint and MUST remain stable.
-- Scheduler calls the same logic every 6 hours to keep BANIBS fresh.
+- Scheduler calls the same logic on a short tick, fetching only sources
+  that are due (services/rss_poll_schedule); this endpoint syncs them all.
 """
 
 from fastapi import APIRouter, Depends
@@ -17,8 +19,9 @@ from datetime import datetime
 import sys
 sys.path.append('/app/backend')
 
-from config.rss_sources import RSS_SOURCES
-from utils.rss_parser import fetch_and_store_feed
+from db.rss_sources import load_rss_sources
+from services.rss_source_health import pollable_sources
+from utils.rss_parser import sync_feed_sources
 
 # BANIBS Branded Fallback Image (used for all news items without images)
 FALLBACK_IMAGE = "/static/img/fallbacks/news_default.jpg"
@@ -41,40 +44,17 @@ async def sync_rss_feeds():
     from utils.cdn_mirror import mirror_all_images
     from scripts.rss_health_report import generate_health_report, write_report_to_log
     
-    results = []
-    total_new_items = 0
+    # Step 1: RSS ingestion (only active, non-quarantined sources), fetched
+    # concurrently; unchanged feeds answer 304 and report status "not_modified"
+    registry = await load_rss_sources()
+    active_sources, _ = pollable_sources(registry)
     
-    # Step 1: RSS ingestion (only active sources)
-    active_sources = [s for s in RSS_SOURCES if s.get('active', True)]
-    
-    for source in active_sources:
-        try:
-            count = await fetch_and_store_feed(
-                url=source["rss_url"],
-                category=source["category"],
-                source_name=source["source_name"],
-                limit=5,  # Fetch 5 most recent items per source
-                fallback_image=FALLBACK_IMAGE,
-                region=source.get("region"),  # Pass region from RSS source config
-                is_black_owned=source.get("is_black_owned", False),
-                is_black_focus=source.get("is_black_focus", False)
-            )
-            results.append({
-                "source": source["source_name"],
-                "category": source["category"],
-                "region": source.get("region", "Unknown"),
-                "items_added": count,
-                "status": "success"
-            })
-            total_new_items += count
-        except Exception as e:
-            results.append({
-                "source": source["source_name"],
-                "category": source["category"],
-                "region": source.get("region", "Unknown"),
-                "error": str(e),
-                "status": "failed"
-            })
+    results = await sync_feed_sources(
+        active_sources,
+        limit=5,  # Fetch 5 most recent items per source
+        fallback_image_for=lambda source: FALLBACK_IMAGE
+    )
+    total_new_items = sum(result.get("items_added", 0) for result in results)
     
     # Step 2: Mirror/optimize images
     try:
@@ -94,7 +74,7 @@ async def sync_rss_feeds():
         "ranAt": datetime.utcnow().isoformat() + "Z",
         "total_sources": len(active_sources),
         "total_active_sources": len(active_sources),
-        "total_configured_sources": len(RSS_SOURCES),
+        "total_configured_sources": len(registry),
         "total_new_items": total_new_items,
         "ingestResults": results,
         "mirrorResult": mirror_result,
@@ -0,0 +1,35 @@
+"""
+Social Timeline Maintenance Task
+
+Scheduled task that keeps fan-out home timelines healthy:
+1. Trims timelines back to TIMELINE_MAX_ENTRIES
+2. Runs the consistency checker over recent posts and repairs drift
+Runs every hour.
+"""
+
+from datetime import datetime, timezone
+from db.social_timelines import trim_all_timelines, check_timeline_consistency
+
+
+async def run_timeline_maintenance():
+    """
+    Trim over-cap timelines and repair delivery drift for recent posts.
+    
+    This function is called by APScheduler every hour.
+    """
+    print(f"[Timelines] Maintenance started at {datetime.now(timezone.utc).isoformat()}")
+    
+    result = {"success": True}
+    
+    try:
+        result["trim"] = await trim_all_timelines()
+        report = await check_timeline_consistency(sample_size=200, repair=True)
+        result["consistency"] = {
+            k: v for k, v in report.items() if k != "inconsistent_posts"
+        }
+        print(f"[Timelines] Maintenance completed: {result}")
+    except Exception as e:
+        print(f"[Timelines] Maintenance error: {e}")
+        result = {"success": False, "error": str(e)}
+    
+    return result
@@ -0,0 +1,25 @@
+"""
+Trending Refresh Task
+
+Scheduled task that rebuilds the in-memory trending leaderboards from the
+most recent news window. Ingest and sentiment updates patch the boards in
+between runs. Runs every 10 minutes.
+"""
+
+from datetime import datetime, timezone
+from services.trending_service import trending_index
+
+
+async def run_trending_refresh():
+    """
+    Rebuild the per-section trending leaderboards.
+    
+    This function is called by APScheduler every 10 minutes.
+    """
+    try:
+        indexed = await trending_index.refresh()
+        print(f"[Trending] Refreshed leaderboards from {indexed} stories at {datetime.now(timezone.utc).isoformat()}")
+        return {"success": True, "indexed": indexed}
+    except Exception as e:
+        print(f"[Trending] Refresh error: {e}")
+        return {"success": False, "error": str(e)}
@@ -0,0 +1,513 @@
+"""
+Shared test fixtures
+In-memory stand-in for the Motor database so DB-layer logic can be tested
+without a running MongoDB. Every collection call is counted on `db.queries`.
+"""
+
+import copy
+import os
+import re
+from collections import Counter
+from datetime import datetime, timezone
+
+import pytest
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+# db.connection reads these at import time; the Motor client connects lazily,
+# so tests that use the in-memory fake never touch a real server.
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "banibs_test")
+
+
+def _get_path(doc, path):
+    value = doc
+    parts = path.split(".")
+    for position, part in enumerate(parts):
+        if isinstance(value, list):
+            # "related.id" reaches into arrays of subdocuments, like Mongo
+            rest = ".".join(parts[position:])
+            found = [_get_path(item, rest) for item in value]
+            values = [v for v, exists in found if exists]
+            return values, bool(values)
+        if isinstance(value, dict) and part in value:
+            value = value[part]
+        else:
+            return None, False
+    return value, True
+
+
+def _as_bson_time(value):
+    # Mongo stores every datetime as UTC: naive and aware values compare
+    if isinstance(value, datetime) and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _compare(op, actual, expected):
+    if actual is None:
+        return False
+    actual, expected = _as_bson_time(actual), _as_bson_time(expected)
+    try:
+        if op == "$lt":
+            return actual < expected
+        if op == "$lte":
+            return actual <= expected
+        if op == "$gt":
+            return actual > expected
+        if op == "$gte":
+            return actual >= expected
+    except TypeError:
+        return False
+    raise NotImplementedError(op)
+
+
+def _match_value(actual, exists, condition):
+    if isinstance(condition, dict) and any(k.startswith("$") for k in condition):
+        for op, expected in condition.items():
+            if op == "$in":
+                values = actual if isinstance(actual, list) else [actual]
+                if not any(v in expected for v in values):
+                    return False
+            elif op == "$nin":
+                values = actual if isinstance(actual, list) else [actual]
+                if any(v in expected for v in values):
+                    return False
+            elif op == "$ne":
+                if actual == expected:
+                    return False
+            elif op == "$exists":
+                if bool(exists) != bool(expected):
+                    return False
+            elif op == "$regex":
+                flags = re.IGNORECASE if "i" in condition.get("$options", "") else 0
+                if not isinstance(actual, str) or not re.search(expected, actual, flags):
+                    return False
+            elif op == "$options":
+                continue
+            elif op in ("$lt", "$lte", "$gt", "$gte"):
+                if not _compare(op, actual, expected):
+                    return False
+            else:
+                raise NotImplementedError(op)
+        return True
+    if isinstance(actual, list) and not isinstance(condition, list):
+        return condition in actual
+    return _as_bson_time(actual) == _as_bson_time(condition)
+
+
+def matches(doc, query):
+    for key, condition in (query or {}).items():
+        if key == "$or":
+            if not any(matches(doc, q) for q in condition):
+                return False
+        elif key == "$and":
+            if not all(matches(doc, q) for q in condition):
+                return False
+        elif key == "$nor":
+            if any(matches(doc, q) for q in condition):
+                return False
+        else:
+            actual, exists = _get_path(doc, key)
+            if not _match_value(actual, exists, condition):
+                return False
+    return True
+
+
+def _project(doc, projection):
+    doc = copy.deepcopy(doc)
+    if not projection:
+        return doc
+    include = {k for k, v in projection.items() if v and k != "_id"}
+    if include:
+        result = {k: doc[k] for k in include if k in doc}
+        if projection.get("_id", 1) and "_id" in doc:
+            result["_id"] = doc["_id"]
+        return result
+    for key, value in projection.items():
+        if not value:
+            doc.pop(key, None)
+    return doc
+
+
+def _set_path(doc, path, value):
+    parts = path.split(".")
+    for part in parts[:-1]:
+        doc = doc.setdefault(part, {})
+    doc[parts[-1]] = value
+
+
+def _apply_update(doc, update):
+    for op, fields in update.items():
+        for key, value in fields.items():
+            if op == "$set":
+                _set_path(doc, key, value)
+            elif op == "$setOnInsert":
+                continue
+            elif op == "$inc":
+                current, _ = _get_path(doc, key)
+                _set_path(doc, key, (current or 0) + value)
+            elif op == "$unset":
+                doc.pop(key, None)
+            elif op == "$push":
+                current, _ = _get_path(doc, key)
+                current = list(current or [])
+                if isinstance(value, dict) and "$each" in value:
+                    current.extend(value["$each"])
+                    if "$slice" in value:
+                        n = value["$slice"]
+                        current = current[n:] if n < 0 else current[:n]
+                else:
+                    current.append(value)
+                _set_path(doc, key, current)
+            elif op == "$addToSet":
+                current, _ = _get_path(doc, key)
+                current = list(current or [])
+                values = value["$each"] if isinstance(value, dict) and "$each" in value else [value]
+                for item in values:
+                    if item not in current:
+                        current.append(item)
+                _set_path(doc, key, current)
+            elif op == "$pull":
+                current, _ = _get_path(doc, key)
+                if isinstance(value, dict):
+                    # Pull by condition: {"$pull": {"related": {"id": ...}}}
+                    kept = [v for v in (current or []) if not (isinstance(v, dict) and matches(v, value))]
+                else:
+                    kept = [v for v in (current or []) if v != value]
+                _set_path(doc, key, kept)
+            elif op == "$max":
+                current, _ = _get_path(doc, key)
+                if current is None or value > current:
+                    _set_path(doc, key, value)
+            else:
+                raise NotImplementedError(op)
+
+
+class FakeResult:
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+class FakeCursor:
+    def __init__(self, docs, projection=None):
+        self._docs = docs
+        self._projection = projection
+        self._sort = []
+        self._skip = 0
+        self._limit = 0
+
+    def sort(self, key, direction=None):
+        if isinstance(key, list):
+            self._sort = list(key)
+        else:
+            self._sort = [(key, direction if direction is not None else 1)]
+        return self
+
+    def skip(self, n):
+        self._skip = n
+        return self
+
+    def limit(self, n):
+        self._limit = n
+        return self
+
+    def _materialize(self):
+        docs = list(self._docs)
+        for key, direction in reversed(self._sort):
+            present = [d for d in docs if _get_path(d, key)[0] is not None]
+            missing = [d for d in docs if _get_path(d, key)[0] is None]
+            present.sort(key=lambda d: _get_path(d, key)[0], reverse=direction < 0)
+            docs = present + missing if direction < 0 else missing + present
+        docs = docs[self._skip:]
+        if self._limit:
+            docs = docs[:self._limit]
+        return [_project(d, self._projection) for d in docs]
+
+    async def to_list(self, length=None):
+        docs = self._materialize()
+        return docs[:length] if length else docs
+
+    def __aiter__(self):
+        self._iter = iter(self._materialize())
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._iter)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+def _eval_expr(doc, expr):
+    if isinstance(expr, str) and expr.startswith("$"):
+        return _get_path(doc, expr[1:])[0]
+    return expr
+
+
+def _run_pipeline(docs, pipeline):
+    docs = [copy.deepcopy(d) for d in docs]
+    for stage in pipeline:
+        (op, spec), = stage.items()
+        if op == "$match":
+            docs = [d for d in docs if matches(d, spec)]
+        elif op == "$group":
+            groups = {}
+            for d in docs:
+                key = _eval_expr(d, spec["_id"])
+                if isinstance(spec["_id"], dict):
+                    key = tuple(sorted((k, _eval_expr(d, v)) for k, v in spec["_id"].items()))
+                group = groups.setdefault(key, {"_id": key if not isinstance(key, tuple) else dict(key)})
+                for field, acc in spec.items():
+                    if field == "_id":
+                        continue
+                    (acc_op, acc_expr), = acc.items()
+                    value = _eval_expr(d, acc_expr)
+                    if acc_op == "$sum":
+                        group[field] = group.get(field, 0) + (value or 0)
+                    elif acc_op == "$avg":
+                        group.setdefault("__avg_" + field, []).append(value)
+                        values = group["__avg_" + field]
+                        group[field] = sum(values) / len(values)
+                    elif acc_op == "$max":
+                        if field not in group or value > group[field]:
+                            group[field] = value
+                    elif acc_op == "$min":
+                        if field not in group or value < group[field]:
+                            group[field] = value
+                    elif acc_op == "$first":
+                        group.setdefault(field, value)
+                    elif acc_op == "$push":
+                        group.setdefault(field, []).append(value)
+                    else:
+                        raise NotImplementedError(acc_op)
+            docs = [{k: v for k, v in g.items() if not k.startswith("__avg_")} for g in groups.values()]
+        elif op == "$sort":
+            docs = FakeCursor(docs).sort(list(spec.items()))._materialize()
+        elif op == "$limit":
+            docs = docs[:spec]
+        elif op == "$skip":
+            docs = docs[spec:]
+        elif op == "$project":
+            docs = [_project(d, {k: v for k, v in spec.items() if v in (0, 1, True, False)}) for d in docs]
+        else:
+            raise NotImplementedError(op)
+    return docs
+
+
+class FakeCollection:
+    def __init__(self, db, name):
+        self.db = db
+        self.name = name
+        self.docs = []
+        self.unique_keys = []
+
+    def _count(self, op):
+        self.db.queries[(self.name, op)] += 1
+
+    def _check_unique(self, doc, ignore=None):
+        for keys in self.unique_keys:
+            if not all(_get_path(doc, k)[1] for k in keys):
+                continue
+            for other in self.docs:
+                if other is ignore:
+                    continue
+                if all(_get_path(other, k)[0] == _get_path(doc, k)[0] for k in keys):
+                    raise DuplicateKeyError(f"E11000 duplicate key on {keys}", 11000)
+
+    async def create_index(self, keys, unique=False, **kwargs):
+        if isinstance(keys, str):
+            keys = [(keys, 1)]
+        if unique:
+            self.unique_keys.append([k for k, _ in keys])
+        return "_".join(k for k, _ in keys)
+
+    def find(self, query=None, projection=None):
+        self._count("find")
+        return FakeCursor([d for d in self.docs if matches(d, query)], projection)
+
+    async def find_one(self, query=None, projection=None, sort=None):
+        self._count("find_one")
+        cursor = FakeCursor([d for d in self.docs if matches(d, query)], projection)
+        if sort:
+            cursor.sort(sort)
+        docs = cursor.limit(1)._materialize()
+        return docs[0] if docs else None
+
+    def aggregate(self, pipeline, **kwargs):
+        self._count("aggregate")
+        return FakeCursor(_run_pipeline(self.docs, pipeline))
+
+    async def count_documents(self, query=None, **kwargs):
+        self._count("count_documents")
+        return sum(1 for d in self.docs if matches(d, query))
+
+    async def estimated_document_count(self):
+        self._count("estimated_document_count")
+        return len(self.docs)
+
+    async def insert_one(self, doc):
+        self._count("insert_one")
+        self._check_unique(doc)
+        self.docs.append(copy.deepcopy(doc))
+        return FakeResult(inserted_id=doc.get("id"))
+
+    async def insert_many(self, docs, ordered=True):
+        self._count("insert_many")
+        inserted = []
+        write_errors = []
+        for index, doc in enumerate(docs):
+            try:
+                self._check_unique(doc)
+            except DuplicateKeyError as e:
+                write_errors.append({"index": index, "code": 11000, "errmsg": str(e)})
+                if ordered:
+                    break
+                continue
+            self.docs.append(copy.deepcopy(doc))
+            inserted.append(doc.get("id"))
+        if write_errors:
+            # Like pymongo: the non-duplicate docs are written, then it raises
+            raise BulkWriteError({"writeErrors": write_errors, "nInserted": len(inserted)})
+        return FakeResult(inserted_ids=inserted)
+
+    def _upsert_doc(self, query, update):
+        doc = {k: v for k, v in query.items() if not k.startswith("$") and not isinstance(v, dict)}
+        doc.update(copy.deepcopy(update.get("$setOnInsert", {})))
+        _apply_update(doc, update)
+        return doc
+
+    async def update_one(self, query, update, upsert=False):
+        self._count("update_one")
+        for doc in self.docs:
+            if matches(doc, query):
+                _apply_update(doc, update)
+                return FakeResult(matched_count=1, modified_count=1, upserted_id=None)
+        if upsert:
+            doc = self._upsert_doc(query, update)
+            self._check_unique(doc)
+            self.docs.append(doc)
+            return FakeResult(matched_count=0, modified_count=0, upserted_id=doc.get("id"))
+        return FakeResult(matched_count=0, modified_count=0, upserted_id=None)
+
+    async def update_many(self, query, update, upsert=False):
+        self._count("update_many")
+        n = 0
+        for doc in self.docs:
+            if matches(doc, query):
+                _apply_update(doc, update)
+                n += 1
+        return FakeResult(matched_count=n, modified_count=n)
+
+    async def find_one_and_update(self, query, update, projection=None, upsert=False, return_document=False):
+        self._count("find_one_and_update")
+        for doc in self.docs:
+            if matches(doc, query):
+                before = _project(doc, projection)
+                _apply_update(doc, update)
+                return _project(doc, projection) if return_document else before
+        if upsert:
+            doc = self._upsert_doc(query, update)
+            self.docs.append(doc)
+            return _project(doc, projection) if return_document else None
+        return None
+
+    async def delete_one(self, query):
+        self._count("delete_one")
+        for i, doc in enumerate(self.docs):
+            if matches(doc, query):
+                del self.docs[i]
+                return FakeResult(deleted_count=1)
+        return FakeResult(deleted_count=0)
+
+    async def delete_many(self, query):
+        self._count("delete_many")
+        before = len(self.docs)
+        self.docs = [d for d in self.docs if not matches(d, query)]
+        return FakeResult(deleted_count=before - len(self.docs))
+
+    async def bulk_write(self, requests, ordered=True):
+        self._count("bulk_write")
+        inserted = modified = upserted = 0
+        write_errors = []
+        for index, request in enumerate(requests):
+            kind = type(request).__name__
+            doc = getattr(request, "_doc", None)
+            flt = getattr(request, "_filter", None)
+            upd = getattr(request, "_doc", None)
+            upsert = bool(getattr(request, "_upsert", False))
+            try:
+                if kind == "InsertOne":
+                    self._check_unique(doc)
+                    self.docs.append(copy.deepcopy(doc))
+                    inserted += 1
+                elif kind == "UpdateOne":
+                    target = next((d for d in self.docs if matches(d, flt)), None)
+                    if target is not None:
+                        _apply_update(target, upd)
+                        modified += 1
+                    elif upsert:
+                        self.docs.append(self._upsert_doc(flt, upd))
+                        upserted += 1
+                elif kind == "ReplaceOne":
+                    target = next((d for d in self.docs if matches(d, flt)), None)
+                    if target is not None:
+                        target.clear()
+                        target.update(copy.deepcopy(upd))
+                        modified += 1
+                    elif upsert:
+                        self.docs.append(copy.deepcopy(upd))
+                        upserted += 1
+                elif kind == "UpdateMany":
+                    for target in self.docs:
+                        if matches(target, flt):
+                            _apply_update(target, upd)
+                            modified += 1
+                elif kind == "DeleteOne":
+                    for i, target in enumerate(self.docs):
+                        if matches(target, flt):
+                            del self.docs[i]
+                            break
+                else:
+                    raise NotImplementedError(kind)
+            except DuplicateKeyError as e:
+                write_errors.append({"index": index, "code": 11000, "errmsg": str(e)})
+                if ordered:
+                    break
+        return FakeResult(
+            inserted_count=inserted,
+            modified_count=modified,
+            upserted_count=upserted,
+            write_errors=write_errors,
+        )
+
+
+class FakeDB:
+    """Minimal async Motor-like database backed by Python lists"""
+
+    def __init__(self):
+        self._collections = {}
+        self.queries = Counter()
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+    def __getitem__(self, name):
+        if name not in self._collections:
+            self._collections[name] = FakeCollection(self, name)
+        return self._collections[name]
+
+    def total_queries(self, collection=None):
+        return sum(
+            count for (coll, _), count in self.queries.items()
+            if collection is None or coll == collection
+        )
+
+    def reset_queries(self):
+        self.queries.clear()
+
+
+@pytest.fixture
+def fake_db():
+    return FakeDB()
@@ -0,0 +1,188 @@
+"""
+CDN Image GC Tests
+The GC job deletes mirror files nothing references once they are older
+than the grace period, and reports the bytes reclaimed; the layout
+migration moves flat legacy files into the sharded store and rewrites the
+items pointing at them.
+"""
+
+import io
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from PIL import Image
+
+import db.news_images as news_images
+import scripts.migrate_cdn_mirror_layout as migration
+import tasks.cdn_image_gc as cdn_image_gc
+from tasks.cdn_image_gc import collect_orphan_images
+from utils.news_image_store import CDN_BASE_URL, content_hash, render_news_image, scan_mirror_files
+
+OLD = time.time() - 7 * 24 * 3600
+
+
+def jpeg(color, width=400, height=300):
+    out = io.BytesIO()
+    Image.new("RGB", (width, height), color).save(out, format="JPEG")
+    return out.getvalue()
+
+
+def store(root, color, age=OLD):
+    """Render an image into the store, backdating its files"""
+    data = jpeg(color)
+    image = render_news_image(data, content_hash(data), str(root))
+    for file in scan_mirror_files(str(root)):
+        if file["hash"] == image["hash"]:
+            os.utime(file["path"], (age, age))
+    return image
+
+
+def legacy_file(root, name, age=OLD):
+    path = root / name
+    path.write_bytes(jpeg((10, 200, 10)))
+    os.utime(path, (age, age))
+    return path
+
+
+def files_of(root, digest):
+    return [file for file in scan_mirror_files(str(root)) if file["hash"] == digest]
+
+
+@pytest.fixture
+def gc_db(fake_db, monkeypatch):
+    async def _get_db():
+        return fake_db
+    monkeypatch.setattr(news_images, "get_db", _get_db)
+    monkeypatch.setattr(migration, "get_db", _get_db)
+    return fake_db
+
+
+class TestCollectOrphanImages:
+
+    @pytest.mark.asyncio
+    async def test_unreferenced_old_files_are_deleted(self, gc_db, tmp_path):
+        used = store(tmp_path, (200, 0, 0))
+        counted = store(tmp_path, (0, 200, 0))
+        orphan = store(tmp_path, (0, 0, 200))
+        gc_db.news_items.docs.append({"id": "n1", "imageHash": used["hash"]})
+        stale = datetime.now(timezone.utc) - timedelta(days=7)
+        gc_db.news_images.docs.extend([
+            {"hash": counted["hash"], "refs": 1, "updated_at": stale},
+            {"hash": orphan["hash"], "refs": 0, "updated_at": stale},
+        ])
+        orphan_bytes = sum(file["bytes"] for file in files_of(tmp_path, orphan["hash"]))
+
+        stats = await collect_orphan_images(str(tmp_path), grace_hours=48)
+
+        assert files_of(tmp_path, used["hash"]) and files_of(tmp_path, counted["hash"])
+        assert files_of(tmp_path, orphan["hash"]) == []
+        assert not os.path.exists(os.path.join(tmp_path, orphan["hash"][:2], orphan["hash"][2:4]))
+        assert [doc["hash"] for doc in gc_db.news_images.docs] == [counted["hash"]]
+        assert (stats["images_deleted"], stats["bytes_reclaimed"]) == (1, orphan_bytes)
+        assert stats["files_deleted"] == len(orphan["renditions"]) + 1  # + manifest
+
+    @pytest.mark.asyncio
+    async def test_grace_period_protects_new_and_reused_images(self, gc_db, tmp_path):
+        fresh = store(tmp_path, (200, 0, 0), age=time.time())
+        reused = store(tmp_path, (0, 200, 0))
+        # A mirror run just reused it: refs not flushed yet, but touched
+        gc_db.news_images.docs.append({"hash": reused["hash"], "refs": 0, "updated_at": datetime.now(timezone.utc)})
+
+        stats = await collect_orphan_images(str(tmp_path), grace_hours=48)
+
+        assert stats["files_deleted"] == 0
+        assert files_of(tmp_path, fresh["hash"]) and files_of(tmp_path, reused["hash"])
+        assert len(gc_db.news_images.docs) == 1
+
+    @pytest.mark.asyncio
+    async def test_legacy_and_temp_files(self, gc_db, tmp_path):
+        legacy_file(tmp_path, "20240101_aaaaaaaaaaaa.jpg")
+        kept = legacy_file(tmp_path, "20240101_bbbbbbbbbbbb.jpg")
+        gc_db.featured_media.docs.append({"id": "m1", "thumbnailUrl": f"{CDN_BASE_URL}/{kept.name}"})
+        image = store(tmp_path, (200, 0, 0))
+        gc_db.news_items.docs.append({"id": "n1", "imageHash": image["hash"]})
+        shard = tmp_path / image["hash"][:2] / image["hash"][2:4]
+        temp = shard / f"{image['hash']}-lg.jpg.123.tmp"
+        temp.write_bytes(b"partial")
+        os.utime(temp, (OLD, OLD))
+
+        stats = await collect_orphan_images(str(tmp_path), grace_hours=48)
+
+        assert sorted(os.listdir(tmp_path)) == sorted([kept.name, image["hash"][:2]])
+        assert not temp.exists()
+        assert (stats["legacy_files_deleted"], stats["files_deleted"], stats["images_deleted"]) == (1, 2, 0)
+
+    @pytest.mark.asyncio
+    async def test_dry_run_deletes_nothing(self, gc_db, tmp_path):
+        orphan = store(tmp_path, (0, 0, 200))
+        gc_db.news_images.docs.append({"hash": orphan["hash"], "refs": 0})
+
+        stats = await collect_orphan_images(str(tmp_path), grace_hours=48, dry_run=True)
+
+        assert stats["images_deleted"] == 1 and stats["bytes_reclaimed"] > 0
+        assert files_of(tmp_path, orphan["hash"]) and len(gc_db.news_images.docs) == 1
+
+    @pytest.mark.asyncio
+    async def test_missing_mirror_dir(self, gc_db, tmp_path):
+        stats = await collect_orphan_images(str(tmp_path / "missing"))
+        assert stats["files_scanned"] == 0
+
+    @pytest.mark.asyncio
+    async def test_scheduled_job_reports(self, gc_db, tmp_path, monkeypatch):
+        monkeypatch.setattr(cdn_image_gc.cdn_mirror, "LOCAL_MIRROR_DIR", str(tmp_path))
+        legacy_file(tmp_path, "20240101_aaaaaaaaaaaa.jpg")
+
+        result = await cdn_image_gc.run_cdn_image_gc()
+
+        assert result["success"] and result["legacy_files_deleted"] == 1
+
+
+class TestLayoutMigration:
+
+    @pytest.mark.asyncio
+    async def test_referenced_flat_files_move_into_store(self, gc_db, tmp_path):
+        shared = legacy_file(tmp_path, "20240101_aaaaaaaaaaaa.jpg")
+        unused = legacy_file(tmp_path, "20240101_bbbbbbbbbbbb.jpg")
+        broken = tmp_path / "20240101_cccccccccccc.jpg"
+        broken.write_bytes(b"not an image")
+        url = f"{CDN_BASE_URL}/{shared.name}"
+        gc_db.news_items.docs.extend([
+            {"id": "n1", "imageUrl": url},
+            {"id": "n2", "imageUrl": url},
+            {"id": "n3", "imageUrl": f"{CDN_BASE_URL}/{broken.name}"},
+        ])
+        gc_db.featured_media.docs.append({"id": "m1", "thumbnailUrl": url})
+
+        stats = await migration.migrate_legacy_files(str(tmp_path), workers=0)
+
+        assert (stats["migrated"], stats["items_rewritten"], stats["unreferenced"], stats["failed"]) == (1, 3, 1, 1)
+        assert not shared.exists() and unused.exists() and broken.exists()
+        n1, n2, n3 = gc_db.news_items.docs
+        assert n1["imageUrl"] == n2["imageUrl"] != url
+        assert n1["imageUrl"].startswith(f"{CDN_BASE_URL}/{n1['imageHash']}-")
+        assert files_of(tmp_path, n1["imageHash"])
+        assert gc_db.featured_media.docs[0]["thumbnailHash"] == n1["imageHash"]
+        assert n3["imageUrl"].endswith(broken.name)
+        [image] = gc_db.news_images.docs
+        assert image["refs"] == 3
+        # The original external URL is unknown; the legacy CDN URL isn't one
+        assert not image.get("source_urls")
+        assert n1["mirror_state"]["migrated_from"] == url and "source_url" not in n1["mirror_state"]
+
+        # Nothing left for the migration; GC removes the unreferenced file
+        assert (await migration.migrate_legacy_files(str(tmp_path), workers=0))["migrated"] == 0
+        stats = await collect_orphan_images(str(tmp_path), grace_hours=48)
+        assert not unused.exists() and broken.exists()
+        assert stats["images_deleted"] == 0
+
+    @pytest.mark.asyncio
+    async def test_dry_run_changes_nothing(self, gc_db, tmp_path):
+        shared = legacy_file(tmp_path, "20240101_aaaaaaaaaaaa.jpg")
+        gc_db.news_items.docs.append({"id": "n1", "imageUrl": f"{CDN_BASE_URL}/{shared.name}"})
+
+        stats = await migration.migrate_legacy_files(str(tmp_path), dry_run=True)
+
+        assert (stats["migrated"], stats["items_rewritten"]) == (1, 1)
+        assert shared.exists() and gc_db.news_items.docs[0]["imageUrl"].endswith(shared.name)
@@ -0,0 +1,285 @@
+"""
+CDN Mirror Tests
+Images are downloaded concurrently from a local aiohttp server (each URL
+once), rendered off the loop into the content-addressed store and written
+with one bulk_write per collection; failed items back off via mirror_state
+instead of being retried on every run.
+"""
+
+import asyncio
+import io
+import os
+import pytest
+from datetime import datetime, timedelta
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from PIL import Image
+
+import db.news_images as news_images
+import utils.cdn_mirror as cdn_mirror
+from db.news_images import release_image_refs
+from utils.cdn_mirror import CDN_BASE_URL, ImageMirror, mirror_all_images
+from utils.news_image_store import content_hash, resolve_cdn_file
+
+
+def jpeg(width=1600, height=900):
+    out = io.BytesIO()
+    Image.new("RGB", (width, height), (120, 40, 200)).save(out, format="JPEG")
+    return out.getvalue()
+
+
+class ImageServer:
+    """Serves /img/{name}.jpg; unknown names 404"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.images = {}
+        self.streamed = set()  # names repeated without end, chunked and without Content-Length
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def handle(self, request):
+        name = request.match_info["name"]
+        self.requests.append(name)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if name not in self.images:
+                return web.Response(status=404)
+            if name in self.streamed:
+                return await self.stream(request, self.images[name])
+            return web.Response(body=self.images[name], content_type="image/jpeg")
+        finally:
+            self.in_flight -= 1
+
+    async def stream(self, request, body):
+        resp = web.StreamResponse(headers={"Content-Type": "image/jpeg"})
+        resp.enable_chunked_encoding()
+        await resp.prepare(request)
+        try:
+            while True:
+                await resp.write(body)
+        except ConnectionResetError:
+            return resp
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/img/{name}.jpg", self.handle)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        return self
+
+    def url(self, name):
+        return str(self.server.make_url(f"/img/{name}.jpg"))
+
+    async def close(self):
+        await self.server.close()
+
+
+@pytest.fixture
+def mirror_db(fake_db, monkeypatch):
+    async def _get_db():
+        return fake_db
+    monkeypatch.setattr(cdn_mirror, "get_db", _get_db)
+    monkeypatch.setattr(news_images, "get_db", _get_db)
+    return fake_db
+
+
+def news(item_id, image_url):
+    return {"id": item_id, "title": item_id, "imageUrl": image_url}
+
+
+class TestMirrorAllImages:
+
+    @pytest.mark.asyncio
+    async def test_mirrors_each_url_once_with_bulk_writes(self, mirror_db, tmp_path):
+        server = await ImageServer().start()
+        photo = jpeg()
+        # "wire" is the same photo under another outlet's URL
+        server.images.update({"a": photo, "wire": photo, "b": jpeg(400, 300)})
+        shared, wire, other = server.url("a"), server.url("wire"), server.url("b")
+        mirror_db.news_items.docs.extend([
+            news("n1", shared), news("n2", shared), news("n3", other), news("n6", wire),
+            news("n4", f"{CDN_BASE_URL}/done.jpg"), news("n5", cdn_mirror.FALLBACK_IMAGES["Business"]),
+        ])
+        mirror_db.featured_media.docs.append({"id": "m1", "thumbnailUrl": shared})
+        try:
+            async with ImageMirror(mirror_dir=str(tmp_path), workers=0) as mirror:
+                result = await mirror_all_images(mirror)
+        finally:
+            await server.close()
+
+        assert result["total_processed"] == 5 and result["mirrored_successfully"] == 5
+        assert result["unique_images"] == 3 and result["downloaded"] == 3
+        assert sorted(server.requests) == ["a", "b", "wire"]
+
+        digest = content_hash(photo)
+        items = {doc["id"]: doc for doc in mirror_db.news_items.docs}
+        assert items["n1"]["imageUrl"] == f"{CDN_BASE_URL}/{digest}-lg.jpg"
+        assert items["n6"]["imageUrl"] == items["n2"]["imageUrl"] == items["n1"]["imageUrl"]
+        assert items["n1"]["imageHash"] == digest
+        assert (items["n1"]["imageWidth"], items["n1"]["imageHeight"]) == (1280, 720)
+        assert items["n1"]["imageSrcset"]["webp"] == ", ".join(
+            f"{CDN_BASE_URL}/{digest}-{name}.webp {width}w" for name, width in [("sm", 320), ("md", 768), ("lg", 1280)]
+        )
+        assert items["n1"]["mirror_state"]["source_url"] == shared
+        assert "mirror_state" not in items["n4"] and "mirror_state" not in items["n5"]
+
+        # Smaller source: never upscaled, no duplicate sizes
+        assert items["n3"]["imageSrcset"]["jpeg"].count("w,") == 1 and items["n3"]["imageWidth"] == 400
+
+        media = mirror_db.featured_media.docs[0]
+        assert media["thumbnailUrl"] == items["n1"]["imageUrl"] and media["thumbnailHash"] == digest
+        assert "updatedAt" in media
+
+        # One stored image for the shared photo, referenced by 4 items
+        images = {doc["hash"]: doc for doc in mirror_db.news_images.docs}
+        assert len(images) == 2
+        assert images[digest]["refs"] == 4
+        assert sorted(images[digest]["source_urls"]) == sorted([shared, wire])
+
+        assert mirror_db.queries[("news_items", "bulk_write")] == 1
+        assert mirror_db.queries[("featured_media", "bulk_write")] == 1
+        assert mirror_db.total_queries() == 6  # 2 finds, image lookup, 3 bulk writes
+
+        shard = tmp_path / digest[:2] / digest[2:4]
+        assert sorted(os.listdir(shard)) == sorted(
+            [f"{digest}-{name}.{ext}" for name in ["sm", "md", "lg"] for ext in ["webp", "jpg"]] + [f"{digest}.json"]
+        )
+        with Image.open(shard / f"{digest}-md.webp") as img:
+            assert img.size == (768, 432) and img.format == "WEBP"
+
+    @pytest.mark.asyncio
+    async def test_known_urls_are_not_downloaded_again(self, mirror_db, tmp_path):
+        server = await ImageServer().start()
+        server.images["a"] = jpeg(600, 400)
+        mirror_db.news_items.docs.append(news("n1", server.url("a")))
+        try:
+            async with ImageMirror(mirror_dir=str(tmp_path), workers=0) as mirror:
+                await mirror_all_images(mirror)
+                # A later story reuses the same image URL
+                mirror_db.news_items.docs.append(news("n2", server.url("a")))
+                second = await mirror_all_images(mirror)
+        finally:
+            await server.close()
+
+        assert second["mirrored_successfully"] == 1 and second["downloaded"] == 0
+        assert server.requests == ["a"]
+        assert mirror_db.news_items.docs[1]["imageUrl"] == mirror_db.news_items.docs[0]["imageUrl"]
+        assert mirror_db.news_images.docs[0]["refs"] == 2
+
+        await release_image_refs([doc["imageHash"] for doc in mirror_db.news_items.docs] + [None])
+        assert mirror_db.news_images.docs[0]["refs"] == 0
+
+    @pytest.mark.asyncio
+    async def test_undecodable_image_fails(self, mirror_db, tmp_path):
+        server = await ImageServer().start()
+        server.images["bad"] = b"<html>not an image</html>"
+        mirror_db.news_items.docs.append(news("n1", server.url("bad")))
+        try:
+            async with ImageMirror(mirror_dir=str(tmp_path), workers=0) as mirror:
+                result = await mirror_all_images(mirror)
+        finally:
+            await server.close()
+
+        assert result["failed_or_skipped"] == 1
+        assert "decodable" in mirror_db.news_items.docs[0]["mirror_state"]["last_error"]
+        assert mirror_db.news_images.docs == []
+
+    @pytest.mark.asyncio
+    async def test_failures_back_off(self, mirror_db, tmp_path):
+        server = await ImageServer().start()
+        missing = server.url("missing")
+        mirror_db.news_items.docs.append(news("n1", missing))
+        try:
+            async with ImageMirror(mirror_dir=str(tmp_path), workers=0) as mirror:
+                first = await mirror_all_images(mirror)
+                second = await mirror_all_images(mirror)
+
+                state = mirror_db.news_items.docs[0]["mirror_state"]
+                assert state["status"] == "failed" and state["attempts"] == 1
+                assert "404" in state["last_error"]
+                assert timedelta(minutes=29) < state["next_attempt_at"] - datetime.utcnow() <= timedelta(minutes=30)
+
+                state["next_attempt_at"] = datetime.utcnow() - timedelta(seconds=1)
+                third = await mirror_all_images(mirror)
+        finally:
+            await server.close()
+
+        assert first["failed_or_skipped"] == 1
+        assert second["total_processed"] == 0
+        assert third["failed_or_skipped"] == 1
+        assert server.requests == ["missing", "missing"]
+        state = mirror_db.news_items.docs[0]["mirror_state"]
+        assert state["attempts"] == 2
+        assert state["next_attempt_at"] - datetime.utcnow() > timedelta(minutes=59)
+        assert mirror_db.news_items.docs[0]["imageUrl"] == missing
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit_and_checkpoints(self, mirror_db, tmp_path, monkeypatch):
+        monkeypatch.setattr(cdn_mirror, "MIRROR_FLUSH_BATCH", 2)
+        server = await ImageServer(delay=0.02).start()
+        for i in range(6):
+            server.images[f"i{i}"] = jpeg(200, 100)
+            mirror_db.news_items.docs.append(news(f"n{i}", server.url(f"i{i}")))
+        try:
+            async with ImageMirror(mirror_dir=str(tmp_path), per_host=2, workers=0) as mirror:
+                result = await mirror_all_images(mirror)
+        finally:
+            await server.close()
+
+        assert result["mirrored_successfully"] == 6
+        assert server.max_in_flight == 2
+        assert mirror_db.queries[("news_items", "bulk_write")] == 3
+        assert all(doc["imageUrl"].startswith(CDN_BASE_URL) for doc in mirror_db.news_items.docs)
+
+
+class TestImageMirror:
+
+    @pytest.mark.asyncio
+    async def test_renders_in_worker_process(self, tmp_path):
+        server = await ImageServer().start()
+        server.images["big"] = jpeg(2000, 1000)
+        try:
+            async with ImageMirror(mirror_dir=str(tmp_path), workers=1) as mirror:
+                result = await mirror.mirror(server.url("big"))
+                again = await mirror.mirror(server.url("big"))
+        finally:
+            await server.close()
+
+        assert result["error"] is None and again["image"] == result["image"]
+        sizes = [(r["name"], r["format"], r["width"], r["height"]) for r in result["image"]["renditions"]]
+        assert sizes == [
+            ("sm", "webp", 320, 160), ("sm", "jpeg", 320, 160),
+            ("md", "webp", 768, 384), ("md", "jpeg", 768, 384),
+            ("lg", "webp", 1280, 640), ("lg", "jpeg", 1280, 640),
+        ]
+        assert not [name for _, _, names in os.walk(tmp_path) for name in names if name.endswith(".tmp")]
+
+    @pytest.mark.asyncio
+    async def test_body_without_length_stops_at_limit(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(cdn_mirror, "MAX_IMAGE_BYTES", 4096)
+        server = await ImageServer().start()
+        server.images["endless"] = b"x" * 1024
+        server.streamed.add("endless")
+        try:
+            async with ImageMirror(mirror_dir=str(tmp_path), workers=1) as mirror:
+                result = await asyncio.wait_for(mirror.mirror(server.url("endless")), timeout=5)
+        finally:
+            await server.close()
+
+        assert result["image"] is None and "too large" in result["error"]
+
+
+class TestResolveCdnFile:
+
+    def test_content_addressed_names_map_to_shards(self):
+        digest = "ab" + "c" * 62
+        assert resolve_cdn_file(f"{digest}-md.webp", "/cdn") == (f"/cdn/ab/cc/{digest}-md.webp", True)
+        assert resolve_cdn_file("20250101_0123456789ab.jpg", "/cdn") == ("/cdn/20250101_0123456789ab.jpg", False)
+
+    def test_unsafe_names_are_rejected(self):
+        for name in ["../etc/passwd", "..jpg", ".hidden.jpg", "x.json", f"{'a' * 64}.json", "a/b.jpg"]:
+            assert resolve_cdn_file(name, "/cdn") is None
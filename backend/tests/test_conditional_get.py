@@ -0,0 +1,221 @@
+"""
+Conditional GET Tests
+Catalog listings answer If-None-Match / If-Modified-Since with a 304 from an
+ids/timestamps-only version probe, without reading the full documents;
+requests without validators read the listing once.
+"""
+
+import pytest
+from datetime import datetime, timezone, timedelta
+
+from fastapi import Response
+from starlette.requests import Request
+
+import db.resources as db_resources
+import routes.community as community_routes
+import routes.resources as resources_routes
+from utils.conditional_get import (
+    LISTING_VERSION_PROJECTION,
+    http_date,
+    is_not_modified,
+    listing_validators
+)
+
+
+BASE = datetime(2025, 5, 1, 12, 0, 0, tzinfo=timezone.utc)
+
+
+def make_request(**headers):
+    raw = [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw})
+
+
+class TestValidators:
+
+    def test_etag_tracks_ids_timestamps_and_extras(self):
+        docs = [{"id": "a", "updated_at": BASE}, {"id": "b", "updated_at": BASE - timedelta(days=1)}]
+        etag, last_modified = listing_validators(docs)
+
+        assert etag.startswith('"') and etag.endswith('"')
+        assert last_modified == BASE
+        assert listing_validators(list(docs)) == (etag, last_modified)
+        assert listing_validators(docs[::-1])[0] != etag
+        assert listing_validators(docs[:1])[0] != etag
+        assert listing_validators(docs, 10)[0] != etag
+        bumped = [dict(docs[0]), dict(docs[1], updated_at=BASE + timedelta(seconds=1))]
+        assert listing_validators(bumped)[0] != etag
+
+    def test_iso_strings_and_created_at_fallback(self):
+        docs = [{"id": "a", "created_at": "2025-05-01T12:00:00"}, {"id": "b"}]
+        assert listing_validators(docs)[1] == BASE
+
+    def test_if_none_match(self):
+        etag = '"abc"'
+        assert is_not_modified(make_request(if_none_match='"abc"'), etag, BASE)
+        assert is_not_modified(make_request(if_none_match='"x", W/"abc"'), etag, BASE)
+        assert is_not_modified(make_request(if_none_match="*"), etag, BASE)
+        assert not is_not_modified(make_request(if_none_match='"x"'), etag, BASE)
+        # ETag wins over a date that would have matched
+        assert not is_not_modified(
+            make_request(if_none_match='"x"', if_modified_since=http_date(BASE)), etag, BASE
+        )
+
+    def test_if_modified_since(self):
+        stamp = BASE.replace(microsecond=500)
+        assert is_not_modified(make_request(if_modified_since=http_date(BASE)), '"e"', stamp)
+        assert not is_not_modified(
+            make_request(if_modified_since=http_date(BASE - timedelta(seconds=1))), '"e"', stamp
+        )
+        assert not is_not_modified(make_request(if_modified_since="garbage"), '"e"', stamp)
+        assert not is_not_modified(make_request(if_modified_since=http_date(BASE)), '"e"', None)
+        assert not is_not_modified(make_request(), '"e"', stamp)
+
+
+def seed_resources(fake_db):
+    for i in range(3):
+        fake_db.banibs_resources.docs.append({
+            "_id": i, "id": f"r{i}", "title": f"Resource {i}", "description": "d",
+            "category": "Business Support", "type": "Article", "tags": [],
+            "author_id": "u1", "author_name": "Editor", "view_count": 0, "featured": False,
+            "created_at": BASE, "updated_at": BASE + timedelta(minutes=i),
+            "published_at": BASE + timedelta(hours=i),
+        })
+
+
+def list_resources(request):
+    return resources_routes.list_resources(
+        request, Response(), category=None, type=None, tags=None, featured=None,
+        search=None, limit=20, skip=0
+    )
+
+
+class TestResourcesListing:
+
+    @pytest.mark.asyncio
+    async def test_304_from_probe(self, fake_db, monkeypatch):
+        monkeypatch.setattr(db_resources, "resources_collection", fake_db.banibs_resources)
+        seed_resources(fake_db)
+        response = Response()
+
+        first = await resources_routes.list_resources(
+            make_request(), response, category=None, type=None, tags=None, featured=None,
+            search=None, limit=20, skip=0
+        )
+        etag = response.headers["etag"]
+        assert [r.id for r in first.resources] == ["r2", "r1", "r0"]
+        assert response.headers["last-modified"] == http_date(BASE + timedelta(minutes=2))
+
+        fake_db.reset_queries()
+        cached = await list_resources(make_request(if_none_match=etag))
+
+        assert cached.status_code == 304
+        assert cached.headers["etag"] == etag
+        # Only the probe ran: one count and one projected find
+        assert fake_db.queries[("banibs_resources", "find")] == 1
+
+    @pytest.mark.asyncio
+    async def test_edit_or_delete_changes_etag(self, fake_db, monkeypatch):
+        monkeypatch.setattr(db_resources, "resources_collection", fake_db.banibs_resources)
+        seed_resources(fake_db)
+        response = Response()
+        await resources_routes.list_resources(
+            make_request(), response, category=None, type=None, tags=None, featured=None,
+            search=None, limit=20, skip=0
+        )
+        etag = response.headers["etag"]
+
+        fake_db.banibs_resources.docs[0]["updated_at"] = BASE + timedelta(days=1)
+        edited = await list_resources(make_request(if_none_match=etag))
+        assert edited.resources[2].updated_at == BASE + timedelta(days=1)
+
+        del fake_db.banibs_resources.docs[0]
+        deleted = await list_resources(make_request(if_none_match=etag))
+        assert deleted.total == 2
+
+    @pytest.mark.asyncio
+    async def test_listing_query_runs_once_per_200(self, fake_db, monkeypatch):
+        monkeypatch.setattr(db_resources, "resources_collection", fake_db.banibs_resources)
+        seed_resources(fake_db)
+
+        await list_resources(make_request())
+        assert fake_db.queries[("banibs_resources", "find")] == 1
+        assert fake_db.queries[("banibs_resources", "count_documents")] == 1
+
+        # Stale revalidation: probe (count + ids) then the page, counted once
+        fake_db.reset_queries()
+        stale = await list_resources(make_request(if_none_match='"stale"'))
+        assert stale.total == 3
+        assert fake_db.queries[("banibs_resources", "find")] == 2
+        assert fake_db.queries[("banibs_resources", "count_documents")] == 1
+
+
+class TestCommunityListings:
+
+    @pytest.fixture
+    def community_db(self, fake_db, monkeypatch):
+        monkeypatch.setattr(community_routes, "get_db_client", lambda: fake_db)
+        for i in range(3):
+            fake_db.health_resources.docs.append({
+                "_id": i, "id": f"h{i}", "title": f"Guide {i}", "slug": f"guide-{i}",
+                "created_at": (BASE + timedelta(days=i)).replace(tzinfo=None).isoformat(),
+                "updated_at": (BASE + timedelta(days=i)).replace(tzinfo=None).isoformat(),
+            })
+        return fake_db
+
+    @pytest.mark.asyncio
+    async def test_health_resources_conditional(self, community_db):
+        response = Response()
+        first = await community_routes.get_health_resources(
+            make_request(), response, category=None, tags=None, limit=50
+        )
+        etag, last_modified = response.headers["etag"], response.headers["last-modified"]
+        assert [r["id"] for r in first["resources"]] == ["h2", "h1", "h0"]
+
+        community_db.reset_queries()
+        by_etag = await community_routes.get_health_resources(
+            make_request(if_none_match=etag), Response(), category=None, tags=None, limit=50
+        )
+        by_date = await community_routes.get_health_resources(
+            make_request(if_modified_since=last_modified), Response(), category=None, tags=None, limit=50
+        )
+
+        assert by_etag.status_code == 304 and by_date.status_code == 304
+        assert community_db.queries[("health_resources", "find")] == 2
+
+        community_db.health_resources.docs[0]["updated_at"] = (BASE + timedelta(days=5)).replace(tzinfo=None).isoformat()
+        fresh = await community_routes.get_health_resources(
+            make_request(if_none_match=etag, if_modified_since=last_modified), Response(),
+            category=None, tags=None, limit=50
+        )
+        assert fresh["total"] == 3
+
+    @pytest.mark.asyncio
+    async def test_probe_uses_same_query(self, community_db, monkeypatch):
+        calls = []
+        original = community_routes.CommunityDB.get_health_resources
+
+        async def spy(self, **kwargs):
+            calls.append(kwargs)
+            return await original(self, **kwargs)
+        monkeypatch.setattr(community_routes.CommunityDB, "get_health_resources", spy)
+
+        await community_routes.get_health_resources(
+            make_request(if_none_match='"stale"'), Response(), category="Insurance", tags="a,b", limit=10
+        )
+
+        assert calls[0] == dict(calls[1], projection=LISTING_VERSION_PROJECTION)
+
+    @pytest.mark.asyncio
+    async def test_unconditional_request_reads_once(self, community_db):
+        probed = Response()
+        await community_routes.get_health_resources(
+            make_request(if_none_match='"stale"'), probed, category=None, tags=None, limit=50
+        )
+        community_db.reset_queries()
+        response = Response()
+
+        await community_routes.get_health_resources(make_request(), response, category=None, tags=None, limit=50)
+
+        assert community_db.queries[("health_resources", "find")] == 1
+        # Same validators as the probe computes
+        assert response.headers["etag"] == probed.headers["etag"]
@@ -0,0 +1,149 @@
+"""
+Vectorized Feed Ranking Tests - Phase C Circle Trust Order
+The live NumPy ranking engine must reproduce the scalar shadow-mode order
+exactly, including ties, BLOCKED exclusion and top-k truncation.
+"""
+
+import random
+import pytest
+from datetime import datetime, timezone, timedelta
+
+from services import feed_ranker
+from services.feed_ranker import (
+    FeedRankerService,
+    rank_feed_by_trust,
+    rank_feed_by_trust_vectorized,
+    TRUST_TIER_WEIGHTS
+)
+
+
+NOW = datetime(2025, 6, 1, 12, 0, 0, tzinfo=timezone.utc)
+TIERS = list(TRUST_TIER_WEIGHTS.keys())
+
+
+def make_corpus(n, seed):
+    rng = random.Random(seed)
+    posts, relationships = [], {}
+    for i in range(n):
+        author = f"author-{rng.randrange(max(1, n // 4))}"
+        relationships.setdefault(author, rng.choice(TIERS))
+        post = {
+            "id": f"post-{i}",
+            "author_id": author,
+            "created_at": NOW - timedelta(seconds=rng.randrange(-600, 14 * 86400), microseconds=rng.randrange(10**6)),
+            "like_count": rng.choice([0, 0, 1, 3, 17, 250]),
+            "comment_count": rng.choice([0, 0, 2, 9]),
+        }
+        if rng.random() < 0.3:
+            post["view_count"] = rng.randrange(5000)
+        if rng.random() < 0.2:
+            post["share_count"] = rng.randrange(20)
+        if rng.random() < 0.05:
+            post["created_at"] = None
+        posts.append(post)
+    return posts, relationships
+
+
+def scalar_ids(posts, relationships, top_k=None):
+    ranked = rank_feed_by_trust(posts, "viewer", relationships, now=NOW)
+    ids = [p["id"] for p in ranked]
+    return ids if top_k is None else ids[:top_k]
+
+
+def vector_ids(posts, relationships, top_k=None):
+    return [p["id"] for p in rank_feed_by_trust_vectorized(posts, relationships, top_k=top_k, now=NOW)]
+
+
+class TestScoreParity:
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_scores_match_scalar(self, seed):
+        posts, relationships = make_corpus(300, seed)
+
+        scores, visible = FeedRankerService.score_posts_vectorized(posts, relationships, NOW)
+        expected = {
+            p["id"]: p["trust_score"]["total_score"]
+            for p in rank_feed_by_trust(posts, "viewer", relationships, now=NOW)
+        }
+
+        for i, post in enumerate(posts):
+            if visible[i]:
+                assert scores[i] == expected[post["id"]]
+            else:
+                assert post["id"] not in expected
+
+
+class TestOrderParity:
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_full_order_identical(self, seed):
+        posts, relationships = make_corpus(400, seed)
+        assert vector_ids(posts, relationships) == scalar_ids(posts, relationships)
+
+    @pytest.mark.parametrize("top_k", [1, 5, 20, 399, 1000])
+    def test_top_k_identical(self, top_k):
+        posts, relationships = make_corpus(400, 42)
+        assert vector_ids(posts, relationships, top_k) == scalar_ids(posts, relationships, top_k)
+
+    def test_ties_keep_chronological_order(self):
+        # Identical scores everywhere: stable order must be input order, even across the k boundary
+        posts = [
+            {"id": f"p{i}", "author_id": "a", "created_at": NOW - timedelta(hours=1)}
+            for i in range(10)
+        ]
+        assert vector_ids(posts, {"a": "COOL"}, top_k=4) == ["p0", "p1", "p2", "p3"]
+        assert vector_ids(posts, {"a": "COOL"}, top_k=4) == scalar_ids(posts, {"a": "COOL"}, 4)
+
+    def test_blocked_excluded_and_not_copied(self):
+        posts = [
+            {"id": "b", "author_id": "blocked", "created_at": NOW},
+            {"id": "ok", "author_id": "friend", "created_at": NOW},
+        ]
+
+        ranked = rank_feed_by_trust_vectorized(posts, {"blocked": "BLOCKED", "friend": "PEOPLES"}, now=NOW)
+
+        assert [p["id"] for p in ranked] == ["ok"]
+        assert ranked[0] is posts[1]
+        assert "trust_score" not in ranked[0]
+
+    def test_empty_and_all_blocked(self):
+        assert rank_feed_by_trust_vectorized([], {}) == []
+        posts = [{"id": "x", "author_id": "a", "created_at": NOW}]
+        assert rank_feed_by_trust_vectorized(posts, {"a": "BLOCKED"}) == []
+
+
+    def test_naive_timestamps_are_utc(self):
+        # Motor returns naive UTC datetimes (the client isn't tz_aware)
+        posts, relationships = make_corpus(200, 11)
+        naive = [dict(p, created_at=p["created_at"] and p["created_at"].replace(tzinfo=None)) for p in posts]
+
+        assert vector_ids(naive, relationships) == vector_ids(posts, relationships)
+        assert scalar_ids(naive, relationships) == scalar_ids(posts, relationships)
+
+
+class TestLiveTrustFeed:
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("base", [datetime.now(timezone.utc), datetime.utcnow()], ids=["aware", "naive"])
+    async def test_pages_follow_ranked_order(self, fake_db, base):
+        posts, relationships = make_corpus(60, 7)
+        for i, post in enumerate(posts):
+            post.update({
+                "created_at": base - timedelta(minutes=i),
+                "text": "", "is_deleted": False, "is_hidden": False,
+            })
+            fake_db.social_posts.docs.append(post)
+        for author, tier in relationships.items():
+            fake_db.banibs_users.docs.append({"id": author, "name": author})
+            fake_db.relationships.docs.append({"owner_user_id": "viewer", "target_user_id": author, "tier": tier})
+
+        page1 = await feed_ranker.get_trust_ranked_feed("viewer", page=1, page_size=10, db=fake_db)
+        page2 = await feed_ranker.get_trust_ranked_feed("viewer", page=2, page_size=10, db=fake_db)
+
+        visible = [p for p in posts if TRUST_TIER_WEIGHTS[relationships[p["author_id"]]] >= 0]
+        assert page1["total_items"] == len(visible)
+        ranked_ids = [p["id"] for p in page1["items"] + page2["items"]]
+        assert len(ranked_ids) == 20 and len(set(ranked_ids)) == 20
+        assert all(relationships[p["author"]["id"]] != "BLOCKED" for p in page1["items"])
+        # One relationships lookup for the whole window
+        assert fake_db.queries[("relationships", "find")] == 2
@@ -0,0 +1,199 @@
+"""
+Feed Shadow Log Writer Tests - Phase C Circle Trust Order
+Shadow comparisons are sampled, queued and flushed in batches; stats are
+served from daily rollups instead of scanning raw logs.
+"""
+
+import asyncio
+import pytest
+from datetime import datetime, timezone, timedelta
+
+from services import feed_analytics
+from services.feed_analytics import (
+    ShadowLogWriter,
+    log_shadow_feed_comparison,
+    get_shadow_mode_stats,
+    rebuild_shadow_rollups,
+    write_shadow_logs
+)
+
+
+def comparison(ts, entropy=1.0, warnings=None, total=10, reordered=3, delta=0.5):
+    return {
+        "id": f"log-{ts.isoformat()}-{entropy}",
+        "viewer_id": "viewer",
+        "timestamp": ts,
+        "total_posts": total,
+        "posts_reordered": reordered,
+        "avg_rank_delta": delta,
+        "diversity_analysis": {"diversity_entropy": entropy},
+        "suppression_warnings": warnings or [],
+    }
+
+
+class TestSampling:
+
+    @pytest.mark.asyncio
+    async def test_unsampled_view_writes_nothing(self, fake_db):
+        result = await log_shadow_feed_comparison(
+            "viewer", [{"id": "a"}], [{"id": "a"}], {"a": 0},
+            {"diversity_entropy": 0.0, "tier_percentages": {}}, db=fake_db, sample_rate=0.0
+        )
+
+        assert result is None
+        assert fake_db.total_queries() == 0
+
+
+class TestBatchedWriter:
+
+    @pytest.mark.asyncio
+    async def test_flush_on_size_uses_insert_many(self, fake_db):
+        writer = ShadowLogWriter(max_queue=100, batch_size=5, flush_interval=60, db=fake_db)
+        now = datetime.now(timezone.utc)
+
+        for i in range(12):
+            writer.enqueue(comparison(now + timedelta(seconds=i)))
+        await asyncio.sleep(0)  # let the size trigger run
+        await writer.close()
+
+        assert len(fake_db.feed_shadow_logs.docs) == 12
+        assert fake_db.queries[("feed_shadow_logs", "insert_many")] == 3
+        assert fake_db.queries[("feed_shadow_logs", "insert_one")] == 0
+        assert writer.stats["written"] == 12
+
+    @pytest.mark.asyncio
+    async def test_flush_on_interval(self, fake_db):
+        writer = ShadowLogWriter(max_queue=100, batch_size=50, flush_interval=0.01, db=fake_db)
+
+        writer.enqueue(comparison(datetime.now(timezone.utc)))
+        for _ in range(50):
+            if fake_db.feed_shadow_logs.docs:
+                break
+            await asyncio.sleep(0.01)
+
+        assert len(fake_db.feed_shadow_logs.docs) == 1
+        await writer.close()
+
+    @pytest.mark.asyncio
+    async def test_full_queue_drops_and_counts(self, fake_db):
+        writer = ShadowLogWriter(max_queue=3, batch_size=100, flush_interval=60, db=fake_db)
+        now = datetime.now(timezone.utc)
+
+        accepted = [writer.enqueue(comparison(now)) for _ in range(5)]
+        await writer.close()
+
+        assert accepted == [True, True, True, False, False]
+        assert writer.stats["dropped"] == 2
+        assert len(fake_db.feed_shadow_logs.docs) == 3
+
+    @pytest.mark.asyncio
+    async def test_request_path_only_enqueues(self, fake_db, monkeypatch):
+        writer = ShadowLogWriter(max_queue=10, batch_size=10, flush_interval=60, db=fake_db)
+        monkeypatch.setattr(feed_analytics, "shadow_log_writer", writer)
+
+        doc = await log_shadow_feed_comparison(
+            "viewer", [{"id": "a"}, {"id": "b"}], [{"id": "b"}, {"id": "a"}], {"a": -1, "b": 1},
+            {"diversity_entropy": 0.5, "tier_percentages": {}}, sample_rate=1.0
+        )
+
+        assert doc["posts_reordered"] == 2
+        assert fake_db.total_queries() == 0
+        assert writer.pending == 1
+        await writer.close()
+        assert len(fake_db.feed_shadow_logs.docs) == 1
+
+
+class TestRollupStats:
+
+    @pytest.mark.asyncio
+    async def test_stats_match_raw_log_aggregation(self, fake_db):
+        writer = ShadowLogWriter(batch_size=4, db=fake_db)
+        day1 = datetime(2025, 3, 3, 10, tzinfo=timezone.utc)
+        day2 = day1 + timedelta(days=1)
+        warning = "⚠️ PEOPLES tier dominates feed (>70%) - diversity concern"
+        logs = [
+            comparison(day1, entropy=1.0, warnings=[warning], total=10, reordered=2, delta=1.0),
+            comparison(day1, entropy=2.0, total=20, reordered=4, delta=3.0),
+            comparison(day2, entropy=0.5, warnings=[warning], total=5, reordered=0, delta=0.0),
+        ]
+        for log in logs:
+            writer.enqueue(log)
+        await writer.close()
+        fake_db.reset_queries()
+
+        stats = await get_shadow_mode_stats(day1, day2 + timedelta(hours=1), db=fake_db)
+
+        assert fake_db.queries[("feed_shadow_logs", "find")] == 0
+        assert stats["total_comparisons"] == 3
+        assert stats["total_posts_analyzed"] == 35
+        assert stats["total_reordered"] == 6
+        assert stats["avg_rank_delta"] == pytest.approx(4.0 / 3)
+        assert stats["avg_diversity_entropy"] == pytest.approx(3.5 / 3)
+        assert stats["suppression_warnings"] == {warning: 2}
+
+    @pytest.mark.asyncio
+    async def test_empty_range(self, fake_db):
+        stats = await get_shadow_mode_stats(db=fake_db)
+        assert stats["total_comparisons"] == 0
+
+
+class TestRollupRepair:
+
+    @pytest.mark.asyncio
+    async def test_history_before_rollups_is_backfilled(self, fake_db):
+        day1 = datetime(2025, 3, 3, 10, tzinfo=timezone.utc)
+        day2 = day1 + timedelta(days=1)
+        warning = "⚠️ PEOPLES tier dominates feed (>70%) - diversity concern"
+        # Logged before the rollups existed
+        fake_db.feed_shadow_logs.docs.extend([
+            comparison(day1, entropy=1.0, warnings=[warning], total=10, reordered=2, delta=1.0),
+            comparison(day1, entropy=2.0, total=20, reordered=4, delta=3.0),
+        ])
+        await write_shadow_logs([comparison(day2, entropy=0.5, total=5, reordered=0, delta=0.0)], db=fake_db)
+
+        result = await rebuild_shadow_rollups(batch_size=1, db=fake_db)
+        stats = await get_shadow_mode_stats(day1, day2, db=fake_db)
+
+        assert result == {"logs": 3, "days_rebuilt": 1, "days_kept": 1}
+        assert (stats["total_comparisons"], stats["total_posts_analyzed"], stats["total_reordered"]) == (3, 35, 6)
+        assert stats["suppression_warnings"] == {warning: 1}
+        assert (await rebuild_shadow_rollups(db=fake_db))["days_rebuilt"] == 0
+
+    @pytest.mark.asyncio
+    async def test_partial_insert_rolls_up_stored_logs_only(self, fake_db):
+        fake_db.feed_shadow_logs.unique_keys.append(["id"])
+        now = datetime(2025, 3, 3, 10, tzinfo=timezone.utc)
+        first = comparison(now)
+        await write_shadow_logs([first], db=fake_db)
+
+        result = await write_shadow_logs([first, comparison(now, entropy=2.0)], db=fake_db)
+
+        assert result == {"written": 1, "rollup_error": None}
+        assert (await get_shadow_mode_stats(now, now, db=fake_db))["total_comparisons"] == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_rollup_is_flagged_and_rebuilt(self, fake_db, monkeypatch):
+        writer = ShadowLogWriter(db=fake_db)
+        now = datetime(2025, 3, 3, 10, tzinfo=timezone.utc)
+        writer.enqueue(comparison(now))
+        await writer.close()
+        real_bulk_write = fake_db.feed_shadow_daily.bulk_write
+
+        async def failing_rollup(requests, ordered=True):
+            if any("$inc" in request._doc for request in requests):
+                raise ConnectionError("rollup write timed out")
+            return await real_bulk_write(requests, ordered=ordered)
+        monkeypatch.setattr(fake_db.feed_shadow_daily, "bulk_write", failing_rollup)
+
+        writer.enqueue(comparison(now, entropy=2.0))
+        await writer.close()
+
+        # The logs are stored; only the rollup missed them
+        assert writer.stats["written"] == 2 and writer.stats["rollup_errors"] == 1
+        [rollup] = fake_db.feed_shadow_daily.docs
+        assert rollup["needs_rebuild"] and rollup["total_comparisons"] == 1
+
+        assert (await rebuild_shadow_rollups(db=fake_db))["days_rebuilt"] == 1
+        [rollup] = fake_db.feed_shadow_daily.docs
+        assert "needs_rebuild" not in rollup and rollup["total_comparisons"] == 2
+        assert rollup["sum_diversity_entropy"] == pytest.approx(3.0)
@@ -0,0 +1,185 @@
+"""
+Black News Tagging Tests
+The compiled single-pass scanner must tag exactly like the original
+per-keyword re.search implementation (kept below as the reference), and the
+retag backfill must only write items whose tags change.
+"""
+
+import random
+import re
+import pytest
+
+import db.news as db_news
+import db.rss_sources as rss_sources
+from services import black_news_tagging_service as tagging
+from services.black_news_tagging_service import (
+    AFRICA_KEYWORDS,
+    BLACK_CONTEXT_PHRASES,
+    BLACK_IDENTITY_KEYWORDS,
+    CARIBBEAN_KEYWORDS,
+    HBCU_KEYWORDS,
+    KeywordScanner,
+    determine_black_focus_type,
+    is_black_focused_content,
+    tag_black_news_item
+)
+
+
+# ---------------------------------------------------------------------------
+# Reference: the per-keyword implementation the scanner replaced
+# ---------------------------------------------------------------------------
+
+def reference_focus_type(text, source_category=None):
+    text_lower = text.lower()
+    if any(re.search(p, text_lower) for p in HBCU_KEYWORDS):
+        return 'hbcu'
+    if any(re.search(p, text_lower) for p in AFRICA_KEYWORDS):
+        return 'africa'
+    if any(re.search(p, text_lower) for p in CARIBBEAN_KEYWORDS):
+        return 'caribbean'
+    civil_rights_indicators = ['civil rights', 'racial justice', 'police brutality',
+                               'discrimination', 'protest', 'activism', 'blm']
+    if any(indicator in text_lower for indicator in civil_rights_indicators):
+        return 'civil_rights'
+    if source_category in ['Entertainment', 'Culture / Civil Rights']:
+        if any(re.search(p, text_lower) for p in BLACK_IDENTITY_KEYWORDS):
+            return 'culture'
+    if 'black-owned' in text_lower or 'black business' in text_lower:
+        return 'business'
+    us_indicators = ['atlanta', 'detroit', 'chicago', 'harlem', 'baltimore', 'washington']
+    if any(indicator in text_lower for indicator in us_indicators):
+        if any(re.search(p, text_lower) for p in BLACK_IDENTITY_KEYWORDS):
+            return 'black_us'
+    if any(re.search(p, text_lower) for p in BLACK_IDENTITY_KEYWORDS):
+        return 'diaspora'
+    return None
+
+
+def reference_is_focused(title, description=''):
+    text = f"{title} {description}".lower()
+    if any(re.search(p, text) for p in BLACK_IDENTITY_KEYWORDS):
+        return True
+    if any(re.search(p, text) for p in BLACK_CONTEXT_PHRASES):
+        return True
+    if sum(1 for p in AFRICA_KEYWORDS if re.search(p, text)) >= 2:
+        return True
+    if any(re.search(p, text) for p in CARIBBEAN_KEYWORDS):
+        return True
+    if any(re.search(p, text) for p in HBCU_KEYWORDS):
+        return True
+    return False
+
+
+# ---------------------------------------------------------------------------
+# Fixture corpus
+# ---------------------------------------------------------------------------
+
+PHRASES = [
+    "Black", "black", "BLACK", "blackburn", "Blackstone", "African American", "African-American",
+    "Afro-Latina", "afrolatino", "Afro Caribbean", "Pan-African", "pan african", "diaspora",
+    "Africa", "African", "Africans", "South Africa", "South African", "Nigeria", "nigerian",
+    "Kenya", "Ghana", "Ethiopia", "Senegal", "Tanzania", "Zimbabwe", "Rwanda",
+    "Caribbean", "Jamaica", "Haiti", "Trinidad and Tobago", "Barbados", "Bahamas",
+    "Grenada", "Grenade", "West Indies", "HBCU", "HBCUs", "historically Black colleges",
+    "Howard University", "Spelman", "Morehouse", "Hampton University",
+    "Black community", "black voters", "Black-owned", "black business", "Black Lives Matter",
+    "African Union summit", "african leaders", "civil rights movement", "civil rights",
+    "racial justice", "racial equity", "racial discrimination", "discrimination",
+    "police brutality", "police shooting of a Black man", "police shooting\nblack",
+    "protest", "protesters", "activism", "BLM", "blmx", "Atlanta", "Detroit", "Chicago",
+    "Harlem", "Baltimore", "Washington", "unblack people", "Zimbabwean", "grenadines",
+]
+
+FILLER = ["the", "mayor", "announced", "new", "funding", "for", "schools", "in", "after",
+          "weeks", "of", "talks", "-", ",", ":", "report", "says", "2025", "?", "(", ")"]
+
+CATEGORIES = [None, "Entertainment", "Culture / Civil Rights", "Africa Watch", "Caribbean Watch",
+              "Business & Finance", "Rights & Justice", "Education", "HBCU News", "Sports"]
+
+
+def make_corpus(n=600, seed=11):
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(n):
+        words = rng.choices(FILLER, k=rng.randrange(0, 12))
+        for phrase in rng.sample(PHRASES, rng.randrange(0, 4)):
+            words.insert(rng.randrange(0, len(words) + 1), phrase)
+        text = " ".join(words)
+        split = rng.randrange(0, len(text) + 1)
+        corpus.append((text[:split], text[split:], rng.choice(CATEGORIES)))
+    # Every phrase on its own, and glued to neighbours
+    for phrase in PHRASES:
+        corpus.append((phrase, "", None))
+        corpus.append((f"x{phrase}x", "", "Entertainment"))
+    return corpus
+
+
+CORPUS = make_corpus()
+
+
+class TestParity:
+
+    def test_scanner_matches_reference(self):
+        for title, description, category in CORPUS:
+            text = f"{title} {description}"
+            assert is_black_focused_content(title, description) == reference_is_focused(title, description), text
+            assert determine_black_focus_type(text, category) == reference_focus_type(text, category), text
+
+    def test_tagged_items_are_identical(self):
+        def reference_tag(item, category):
+            description = item.get('summary', '')
+            if reference_is_focused(item['title'], description):
+                focus = reference_focus_type(f"{item['title']} {description}", category)
+                return dict(item, is_black_focus=True, black_focus_type=focus or 'diaspora')
+            return dict(item, is_black_focus=False, black_focus_type=None)
+
+        for title, description, category in CORPUS:
+            item = {"title": title, "summary": description}
+            expected = reference_tag(item, category)
+            assert tag_black_news_item(dict(item), source_category=category) == expected
+
+    def test_counts_distinct_patterns(self):
+        scanner = KeywordScanner({"africa": AFRICA_KEYWORDS, "other": [r'\bzzz\b']})
+        counts = scanner.scan("south africa and african nations; africa again")
+        assert counts == {"africa": 3, "other": 0}
+
+    def test_one_scan_per_item(self, monkeypatch):
+        calls = []
+        original = tagging.BLACK_NEWS_SCANNER.scan
+        monkeypatch.setattr(tagging.BLACK_NEWS_SCANNER, "scan", lambda text: calls.append(text) or original(text))
+
+        tag_black_news_item({"title": "Black-owned bakery opens in Harlem", "summary": ""})
+
+        assert len(calls) == 1
+
+
+class TestRetag:
+
+    @pytest.mark.asyncio
+    async def test_bulk_retag_updates_only_changes(self, fake_db, monkeypatch):
+        async def _get_db():
+            return fake_db
+        monkeypatch.setattr(db_news, "news_collection", fake_db.news_items)
+        monkeypatch.setattr(rss_sources, "get_db", _get_db)
+        fake_db.rss_sources.docs.extend([
+            {"id": "wire", "source_name": "Wire", "is_black_owned": False},
+            # An admin flagged this source in the registry; config doesn't know it
+            {"id": "voices", "source_name": "Voices", "is_black_focus": True, "admin_edited": True},
+        ])
+        docs = [
+            {"_id": 1, "title": "Spelman expands STEM", "summary": "", "category": "Education", "sourceName": "Wire"},
+            {"_id": 2, "title": "Markets rally", "summary": "", "category": "Business & Finance", "sourceName": "Wire",
+             "is_black_focus": False, "black_focus_type": None},
+            {"_id": 3, "title": "Anything", "summary": "", "category": "Culture / Civil Rights", "sourceName": "Voices"},
+        ]
+        fake_db.news_items.docs.extend(docs)
+
+        first = await db_news.retag_black_news(batch_size=1)
+        second = await db_news.retag_black_news()
+
+        assert first == {"scanned": 3, "updated": 2}
+        assert second == {"scanned": 3, "updated": 0}
+        assert fake_db.news_items.docs[0]["black_focus_type"] == "hbcu"
+        # Source flags come from the RSS source registry
+        assert fake_db.news_items.docs[2]["black_focus_type"] == "culture"
+        assert fake_db.queries[("news_items", "bulk_write")] == 2
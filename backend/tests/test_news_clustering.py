@@ -0,0 +1,175 @@
+"""
+News Clustering Tests
+Near-duplicate stories (the same wire story from several outlets) get one
+cluster_id at ingest through a SimHash band lookup, and listings show each
+cluster once.
+"""
+
+import asyncio
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+import db.news as db_news
+import utils.rss_parser as rss_parser
+from db.news import prepare_news_items
+from services import moderation_service
+from services.news_clustering import (
+    SIMHASH_MAX_DISTANCE,
+    BandLocks,
+    assign_clusters,
+    band_keys,
+    hamming_distance,
+    probe_keys,
+    story_simhash,
+)
+from utils.feed_processing import prepare_feed_items
+
+TITLE = "Supreme Court rules on voting rights case in Alabama"
+SUMMARY = ("The Supreme Court on Thursday ruled that Alabama must redraw its congressional map "
+           "to include a second majority-Black district, in a surprise decision.")
+
+# The same story as carried by other outlets
+SYNDICATED = [
+    (f"{TITLE} - AP", SUMMARY),
+    (TITLE, f"{SUMMARY} Read the full story."),
+]
+UNRELATED = ("Stocks rally as inflation cools",
+             "Wall Street rose on Thursday after new figures showed inflation slowing for a third month.")
+
+
+def prepared(source_name, *stories):
+    items = [{"title": title, "summary": summary, "publishedAt": datetime(2025, 6, 1, 12, i)}
+             for i, (title, summary) in enumerate(stories)]
+    return prepare_feed_items(items, url=f"https://{source_name}.example.com/feed",
+                              category="Global Diaspora", source_name=source_name, limit=10)
+
+
+@pytest.fixture
+def news_db(fake_db, monkeypatch):
+    monkeypatch.setattr(rss_parser, "news_collection", fake_db.news_items)
+    fake_db.news_items.unique_keys.append(["fingerprint"])
+
+    async def _no_moderation(**kwargs):
+        return {"should_moderate": False}
+    monkeypatch.setattr(moderation_service, "handle_content_moderation", _no_moderation)
+    return fake_db
+
+
+class TestSimHash:
+
+    def test_syndicated_copies_are_close(self):
+        original = story_simhash(TITLE, SUMMARY)
+        for title, summary in SYNDICATED:
+            assert hamming_distance(original, story_simhash(title, summary)) <= SIMHASH_MAX_DISTANCE
+        assert hamming_distance(original, story_simhash(*UNRELATED)) > 2 * SIMHASH_MAX_DISTANCE
+
+    def test_fits_signed_int64(self):
+        hashes = [story_simhash(f"Story {i}", f"Summary number {i}") for i in range(200)]
+        assert all(-(1 << 63) <= value < (1 << 63) for value in hashes)
+        assert any(value < 0 for value in hashes)
+
+    def test_close_hashes_are_probed(self):
+        rng = random.Random(7)
+        for _ in range(500):
+            value = rng.getrandbits(64)
+            flipped = value
+            for bit in rng.sample(range(64), SIMHASH_MAX_DISTANCE):
+                flipped ^= 1 << bit
+            assert set(probe_keys(value)) & set(band_keys(flipped))
+
+    def test_probes_cover_each_band_and_its_neighbours(self):
+        value = story_simhash(TITLE, SUMMARY)
+        probes = probe_keys(value)
+        assert set(band_keys(value)) <= set(probes)
+        assert len(set(probes)) == len(probes) == len(band_keys(value)) * 17
+
+
+class TestAssignClusters:
+
+    def test_joins_nearest_candidate_or_starts_own(self):
+        base = story_simhash(TITLE, SUMMARY)
+        candidates = [
+            {"id": "far", "simhash": base ^ 0b1111, "cluster_id": "far-cluster"},
+            {"id": "near", "simhash": base ^ 0b1, "cluster_id": "near-cluster"},
+        ]
+        docs = [{"id": "copy", "simhash": base}, {"id": "other", "simhash": story_simhash(*UNRELATED)}]
+
+        assert assign_clusters(docs, candidates) == 1
+        assert [doc["cluster_id"] for doc in docs] == ["near-cluster", "other"]
+
+    def test_copies_within_one_batch_cluster_together(self):
+        docs = [{"id": "first", "simhash": story_simhash(TITLE, SUMMARY)},
+                {"id": "second", "simhash": story_simhash(*SYNDICATED[0])}]
+
+        assign_clusters(docs, [])
+
+        assert [doc["cluster_id"] for doc in docs] == ["first", "first"]
+
+
+class TestIngestClustering:
+
+    @pytest.mark.asyncio
+    async def test_copy_from_another_source_joins_cluster(self, news_db):
+        await rss_parser.store_news_docs(prepared("wire", (TITLE, SUMMARY)), "wire")
+        stats = await rss_parser.store_news_docs(prepared("essence", SYNDICATED[0], UNRELATED), "essence")
+
+        assert stats["inserted"] == 2
+        original, copy, unrelated = news_db.news_items.docs
+        assert copy["cluster_id"] == original["cluster_id"] == original["id"]
+        assert unrelated["cluster_id"] == unrelated["id"]
+        # Fingerprints and cluster candidates come from one query per store
+        assert news_db.queries[("news_items", "find")] == 2
+
+    @pytest.mark.asyncio
+    async def test_old_stories_are_not_candidates(self, news_db):
+        await rss_parser.store_news_docs(prepared("wire", (TITLE, SUMMARY)), "wire")
+        news_db.news_items.docs[0]["createdAt"] -= timedelta(days=30)
+
+        await rss_parser.store_news_docs(prepared("essence", SYNDICATED[0]), "essence")
+
+        old, new = news_db.news_items.docs
+        assert new["cluster_id"] == new["id"] != old["cluster_id"]
+
+    @pytest.mark.asyncio
+    async def test_sources_stored_together_share_clusters(self, news_db):
+        locks = BandLocks()
+        await asyncio.gather(*[
+            rss_parser.store_news_docs(prepared(source, story), source, locks)
+            for source, story in [("wire", (TITLE, SUMMARY)), ("essence", SYNDICATED[0]), ("grio", SYNDICATED[1])]
+        ])
+
+        assert len({doc["cluster_id"] for doc in news_db.news_items.docs}) == 1
+
+    @pytest.mark.asyncio
+    async def test_unrelated_stores_do_not_wait(self, news_db):
+        locks = BandLocks()
+        async with locks.hold(probe_keys(story_simhash(TITLE, SUMMARY))):
+            stats = await asyncio.wait_for(
+                rss_parser.store_news_docs(prepared("markets", UNRELATED), "markets", locks), timeout=1)
+        assert stats["inserted"] == 1
+
+    @pytest.mark.asyncio
+    async def test_rebuild_rekeys_stored_bands(self, news_db, monkeypatch):
+        monkeypatch.setattr(db_news, "news_collection", news_db.news_items)
+        await rss_parser.store_news_docs(prepared("wire", (TITLE, SUMMARY)), "wire")
+        news_db.news_items.docs[0]["simhash_bands"] = [1, 2, 3]
+
+        stats = await db_news.rebuild_simhash_bands()
+        await rss_parser.store_news_docs(prepared("essence", SYNDICATED[0]), "essence")
+
+        assert stats == {"scanned": 1, "updated": 1}
+        original, copy = news_db.news_items.docs
+        assert copy["cluster_id"] == original["cluster_id"]
+        assert (await db_news.rebuild_simhash_bands())["updated"] == 0
+
+    @pytest.mark.asyncio
+    async def test_listings_show_a_cluster_once(self, news_db):
+        await rss_parser.store_news_docs(prepared("wire", (TITLE, SUMMARY), UNRELATED), "wire")
+        await rss_parser.store_news_docs(prepared("essence", *SYNDICATED), "essence")
+
+        items = prepare_news_items(sorted(news_db.news_items.docs, key=lambda doc: doc["createdAt"], reverse=True))
+
+        assert len(items) == 2
+        assert {item["title"] for item in items} >= {UNRELATED[0]}
@@ -0,0 +1,139 @@
+"""
+News Section Tests - Phase 7.6.1 / 7.6.3
+Sections are computed once at ingest (or by the backfill) and the homepage /
+section endpoints read them by index without re-categorizing per request.
+"""
+
+import pytest
+from datetime import datetime, timedelta
+
+import db.news as db_news
+import db.featured_media as featured_media
+import routes.news as news_routes
+from services import news_categorization_service as categorization
+from services.news_categorization_service import (
+    categorize_news_item,
+    compute_section_fields,
+    filter_items_by_section,
+    SECTION_PAGE_KEYS
+)
+
+
+BASE = datetime(2025, 5, 1, 12, 0, 0)
+
+CORPUS = [
+    {"title": "Fed raises rates", "category": "Business & Finance", "region": "Global", "sourceName": "Reuters"},
+    {"title": "Election night recap", "category": "World News", "region": "Americas", "sourceName": "NPR"},
+    {"title": "New album drops", "category": "Entertainment", "region": None, "sourceName": "Billboard"},
+    {"title": "Police arrest suspect", "category": "Community", "region": "Africa", "sourceName": "Local"},
+    {"title": "University adds STEM seats", "category": "Education", "region": "Caribbean", "sourceName": "UNCF"},
+    {"title": "AI startup raises seed", "category": "Science & Tech", "region": "Europe", "sourceName": "Wired"},
+    {"title": "NBA finals preview", "category": "Sports", "region": "Americas", "sourceName": "ESPN"},
+    {"title": "Vaccine trial results", "category": "Health & Wellness", "region": "Asia", "sourceName": "CDC"},
+    {"title": "Heritage month art show", "category": "Culture / Civil Rights", "region": "Global", "sourceName": "Ebony"},
+    {"title": "Untitled", "category": "", "region": "", "sourceName": ""},
+]
+
+
+def make_items():
+    return [
+        dict(item, id=f"n{i}", summary="s", fingerprint=f"fp{i}", isFeatured=False,
+             publishedAt=BASE - timedelta(hours=i))
+        for i, item in enumerate(CORPUS)
+    ]
+
+
+class TestSectionFields:
+
+    def test_section_matches_categorizer(self):
+        for item in make_items():
+            assert compute_section_fields(item)["section"] == categorize_news_item(item)
+
+    @pytest.mark.parametrize("section", SECTION_PAGE_KEYS)
+    def test_tags_match_section_filter(self, section):
+        items = make_items()
+        expected = [item["id"] for item in filter_items_by_section(items, section)]
+
+        tagged = [item["id"] for item in items if section in compute_section_fields(item)["section_tags"]]
+
+        assert tagged == expected
+
+    def test_keyword_pages(self):
+        fields = compute_section_fields(make_items()[3])
+        assert "crime" in fields["section_tags"]
+
+        fields = compute_section_fields(make_items()[1])
+        assert fields["section"] == "us"
+        assert "politics" in fields["section_tags"]
+
+
+@pytest.fixture
+def news_db(fake_db, monkeypatch):
+    monkeypatch.setattr(db_news, "news_collection", fake_db.news_items)
+    monkeypatch.setattr(news_routes, "news_collection", fake_db.news_items)
+
+    async def _no_media():
+        return None
+    monkeypatch.setattr(featured_media, "get_featured_media", _no_media)
+    monkeypatch.setattr(featured_media, "get_latest_media_with_thumbnail", _no_media)
+    return fake_db
+
+
+class TestBackfill:
+
+    @pytest.mark.asyncio
+    async def test_fills_missing_and_is_idempotent(self, news_db):
+        for i, item in enumerate(make_items()):
+            news_db.news_items.docs.append(dict(item, _id=i))
+
+        first = await db_news.backfill_news_sections(batch_size=3)
+        second = await db_news.backfill_news_sections()
+        full = await db_news.backfill_news_sections(recompute_all=True)
+
+        assert first == {"scanned": len(CORPUS), "updated": len(CORPUS)}
+        assert second == {"scanned": 0, "updated": 0}
+        assert full == {"scanned": len(CORPUS), "updated": 0}
+        for doc in news_db.news_items.docs:
+            assert doc["section"] == categorize_news_item(doc)
+
+
+class TestEndpoints:
+
+    def seed(self, news_db):
+        for i, item in enumerate(make_items()):
+            news_db.news_items.docs.append(dict(item, _id=i, **compute_section_fields(item)))
+
+    @pytest.mark.asyncio
+    async def test_homepage_reads_stored_sections(self, news_db, monkeypatch):
+        self.seed(news_db)
+        news_db.news_items.docs[2]["isFeatured"] = True
+
+        def _fail(item):
+            raise AssertionError("homepage must not categorize per request")
+        monkeypatch.setattr(categorization, "categorize_news_item", _fail)
+
+        payload = await news_routes.build_homepage_payload()
+
+        assert payload["hero"]["id"] == "n2"
+        assert [i["id"] for i in payload["sections"]["business"]] == ["n0"]
+        assert [i["id"] for i in payload["sections"]["us"]] == ["n1", "n4", "n6", "n7"]
+        assert all(i["mapped_section"] == "us" for i in payload["sections"]["us"])
+        assert "n2" not in {i["id"] for i in payload["top_stories"]}
+        assert len(payload["top_stories"]) == 6
+        # one read per homepage section, plus hero and the trending window
+        assert news_db.queries[("news_items", "find")] == len(news_routes.HOMEPAGE_SECTIONS) + 1
+        assert news_db.queries[("news_items", "find_one")] == 1
+
+    @pytest.mark.asyncio
+    async def test_section_page_uses_tags(self, news_db, monkeypatch):
+        self.seed(news_db)
+        expected = [i["id"] for i in filter_items_by_section(make_items(), "politics")]
+
+        def _fail(item):
+            raise AssertionError("section page must not categorize per request")
+        monkeypatch.setattr(categorization, "categorize_news_item", _fail)
+
+        payload = await news_routes.build_section_payload("politics", page=1, page_size=20)
+
+        assert [i["id"] for i in payload["items"]] == expected
+        assert payload["total_items"] == len(expected)
@@ -0,0 +1,220 @@
+"""
+News Snapshot Cache Tests
+Public news endpoints are served from pre-serialized snapshots: hits skip
+the builder, stale entries are served while a single background rebuild
+runs, and concurrent misses share one build.
+"""
+
+import asyncio
+import json
+import pytest
+from datetime import datetime, timedelta
+
+from fastapi import HTTPException
+from starlette.requests import Request
+
+import db.news as db_news
+import routes.news as news_routes
+from utils import snapshot_cache
+from utils.snapshot_cache import SnapshotCache, snapshot_key, serialize_payload
+
+
+def make_request(**headers):
+    raw = [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw})
+
+
+class Builder:
+    """Counts calls and lets a test hold a build open"""
+
+    def __init__(self):
+        self.calls = 0
+        self.gate = None
+
+    async def __call__(self):
+        self.calls += 1
+        version = self.calls
+        if self.gate is not None:
+            await self.gate.wait()
+        return {"version": version, "at": datetime(2025, 1, 1)}
+
+
+class TestSnapshotCache:
+
+    def test_key_ignores_none_and_order(self):
+        assert snapshot_key("section", section="us", region=None, page=2) == "section?page=2&section=us"
+        assert snapshot_key("section", page=2, section="us") == snapshot_key("section", section="us", page=2)
+        assert snapshot_key("latest") == "latest"
+
+    def test_serialization_matches_fastapi(self):
+        body = serialize_payload({"at": datetime(2025, 1, 1), "title": "Café"})
+        assert body == b'{"at":"2025-01-01T00:00:00","title":"Caf\xc3\xa9"}'
+
+    @pytest.mark.asyncio
+    async def test_hit_skips_builder(self):
+        cache, build = SnapshotCache(ttl_seconds=60), Builder()
+
+        first = await cache.get("k", build)
+        second = await cache.get("k", build)
+
+        assert first is second
+        assert json.loads(first)["version"] == 1
+        assert build.calls == 1
+        assert cache.stats["hits"] == 1 and cache.stats["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_build(self):
+        cache, build = SnapshotCache(), Builder()
+        build.gate = asyncio.Event()
+
+        waiters = [asyncio.ensure_future(cache.get("k", build)) for _ in range(20)]
+        await asyncio.sleep(0)
+        build.gate.set()
+        bodies = await asyncio.gather(*waiters)
+
+        assert build.calls == 1
+        assert len(set(bodies)) == 1
+
+    @pytest.mark.asyncio
+    async def test_invalidate_serves_stale_with_single_refresh(self):
+        cache, build = SnapshotCache(), Builder()
+        await cache.get("k", build)
+        cache.invalidate()
+        build.gate = asyncio.Event()
+
+        stale = await asyncio.gather(*[cache.get("k", build) for _ in range(10)])
+
+        assert all(json.loads(body)["version"] == 1 for body in stale)
+        assert build.calls == 2  # exactly one background rebuild
+        build.gate.set()
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert json.loads(await cache.get("k", build))["version"] == 2
+        assert cache.stats["stale_hits"] == 10
+
+    @pytest.mark.asyncio
+    async def test_clear_discards_build_in_progress(self):
+        cache, build = SnapshotCache(ttl_seconds=60), Builder()
+        build.gate = asyncio.Event()
+        before = asyncio.ensure_future(cache.get("k", build))
+        while not build.calls:
+            await asyncio.sleep(0)
+
+        # Editorial delete lands while the build is reading the old data
+        cache.clear()
+        after = asyncio.ensure_future(cache.get("k", build))
+        await asyncio.sleep(0)
+        build.gate.set()
+
+        assert json.loads(await before)["version"] == 1
+        assert json.loads(await after)["version"] == 2  # not joined to the pre-clear build
+        assert json.loads(await cache.get("k", build))["version"] == 2
+        assert build.calls == 2 and cache.stats["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_refreshes_in_background(self):
+        cache, build = SnapshotCache(ttl_seconds=0), Builder()
+        await cache.get("k", build)
+
+        assert json.loads(await cache.get("k", build))["version"] == 1
+        await asyncio.sleep(0)
+        assert build.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_errors_are_not_cached(self):
+        cache = SnapshotCache()
+        calls = []
+
+        async def failing():
+            calls.append(1)
+            raise HTTPException(status_code=400, detail="bad")
+
+        for _ in range(2):
+            with pytest.raises(HTTPException):
+                await cache.get("k", failing)
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_lru_bound(self):
+        cache, build = SnapshotCache(max_entries=2), Builder()
+        for key in ["a", "b", "c"]:
+            await cache.get(key, build)
+
+        assert list(cache._entries) == ["b", "c"]
+
+
+class TestNewsEndpoints:
+
+    @pytest.mark.asyncio
+    async def test_latest_served_from_snapshot_until_cleared(self, fake_db, monkeypatch):
+        monkeypatch.setattr(news_routes, "news_collection", fake_db.news_items)
+        monkeypatch.setattr(db_news, "news_collection", fake_db.news_items)
+        cache = SnapshotCache()
+        monkeypatch.setattr(news_routes, "news_snapshot_cache", cache)
+        monkeypatch.setattr(snapshot_cache, "news_snapshot_cache", cache)
+        base = datetime(2025, 5, 1)
+        for i in range(3):
+            fake_db.news_items.docs.append({
+                "_id": i, "id": f"n{i}", "title": f"T{i}", "summary": "s", "category": "World",
+                "fingerprint": f"fp{i}", "publishedAt": base - timedelta(hours=i),
+            })
+
+        first = await news_routes.get_latest_news_feed(make_request())
+        fake_db.reset_queries()
+        second = await news_routes.get_latest_news_feed(make_request())
+
+        assert first.media_type == "application/json"
+        assert [i["id"] for i in json.loads(second.body)] == ["n0", "n1", "n2"]
+        assert fake_db.total_queries() == 0
+
+        cache.clear()
+        await news_routes.get_latest_news_feed(make_request())
+        assert fake_db.queries[("news_items", "find")] == 1
+
+    @pytest.mark.asyncio
+    async def test_conditional_get_is_304_from_snapshot(self, fake_db, monkeypatch):
+        monkeypatch.setattr(news_routes, "news_collection", fake_db.news_items)
+        monkeypatch.setattr(db_news, "news_collection", fake_db.news_items)
+        monkeypatch.setattr(news_routes, "news_snapshot_cache", SnapshotCache())
+        fake_db.news_items.docs.append({"_id": 1, "id": "n1", "title": "T", "summary": "s", "category": "World",
+                                        "fingerprint": "fp", "publishedAt": datetime(2025, 5, 1)})
+
+        first = await news_routes.get_latest_news_feed(make_request())
+        etag, last_modified = first.headers["etag"], first.headers["last-modified"]
+        fake_db.reset_queries()
+
+        by_etag = await news_routes.get_latest_news_feed(make_request(if_none_match=etag))
+        by_date = await news_routes.get_latest_news_feed(make_request(if_modified_since=last_modified))
+        changed = await news_routes.get_latest_news_feed(make_request(if_none_match='"other"'))
+
+        assert by_etag.status_code == 304 and by_etag.body == b""
+        assert by_etag.headers["etag"] == etag
+        assert by_date.status_code == 304
+        assert changed.status_code == 200 and changed.body == first.body
+        assert fake_db.total_queries() == 0
+
+    @pytest.mark.asyncio
+    async def test_identical_rebuild_keeps_validators(self):
+        cache, build = SnapshotCache(), Builder()
+
+        async def same():
+            return {"static": True}
+
+        first = await cache.get_entry("k", same)
+        cache.invalidate()
+        await cache.get_entry("k", same)
+        await asyncio.sleep(0)
+        rebuilt = await cache.get_entry("k", same)
+
+        assert cache.stats["builds"] == 2
+        assert rebuilt["etag"] == first["etag"]
+        assert rebuilt["last_modified"] == first["last_modified"]
+
+        changed = await cache.get_entry("other", build)
+        assert changed["etag"] != first["etag"]
+
+    @pytest.mark.asyncio
+    async def test_invalid_section_is_400_without_caching(self):
+        with pytest.raises(HTTPException) as exc:
+            await news_routes.get_news_section(section="nope", page=1, page_size=20, sentiment=None, region=None)
+        assert exc.value.status_code == 400
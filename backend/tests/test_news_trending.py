@@ -0,0 +1,116 @@
+"""
+Trending Index Tests - Phase 7.6.4
+The maintained leaderboards must return the same ranking as scoring the
+recent window from scratch, stay current on ingest / sentiment updates, and
+serve /api/news/trending without touching the database.
+"""
+
+import random
+import pytest
+from datetime import datetime, timezone, timedelta
+
+import db.news as db_news
+import routes.news as news_routes
+from db.news import prepare_news_items
+from services import trending_service
+from services.trending_service import TrendingIndex, compute_trending_score
+
+
+NOW = datetime(2025, 6, 1, 12, 0, 0, tzinfo=timezone.utc)
+SECTIONS = ["us", "world", "business", "tech", "sports"]
+
+
+def make_items(n, seed=3):
+    rng = random.Random(seed)
+    items = []
+    for i in range(n):
+        items.append({
+            "id": f"n{i}",
+            "title": f"Story {i}",
+            "summary": "s",
+            "fingerprint": f"fp{i}",
+            "section": rng.choice(SECTIONS),
+            "publishedAt": (NOW - timedelta(minutes=rng.randrange(0, 4 * 24 * 60))).replace(tzinfo=None),
+            "sentiment_score": rng.choice([None, 0.0, 0.2, -0.5, 0.9, -0.95]),
+        })
+    items.sort(key=lambda item: item["publishedAt"], reverse=True)
+    return items
+
+
+def expected_top(items, section, limit):
+    pool = [item for item in items if section in (None, "all") or item["section"] == section]
+    scored = [(item["id"], compute_trending_score(item, NOW)) for item in pool]
+    scored.sort(key=lambda pair: pair[1], reverse=True)
+    return scored[:limit]
+
+
+class TestLeaderboards:
+
+    @pytest.mark.parametrize("section", [None] + SECTIONS)
+    @pytest.mark.parametrize("limit", [1, 10, 50])
+    def test_matches_full_recompute(self, section, limit):
+        items = prepare_news_items(make_items(200))
+        index = TrendingIndex(top_n=100)
+        index.load(items, now=NOW)
+
+        top = index.top(section, limit, now=NOW)
+
+        assert [(i["id"], i["trending_score"]) for i in top] == expected_top(items, section, limit)
+
+    def test_decay_is_applied_at_read_time(self):
+        # Fresh but neutral vs. a day old but intense: the fresh story leads
+        # at first and falls behind as it decays, with no refresh in between
+        fresh = {"id": "fresh", "fingerprint": "f", "section": "us", "publishedAt": NOW, "sentiment_score": 0.0}
+        intense = {"id": "intense", "fingerprint": "i", "section": "us",
+                   "publishedAt": NOW - timedelta(hours=24), "sentiment_score": 0.5}
+        index = TrendingIndex()
+        index.load(prepare_news_items([fresh, intense]), now=NOW)
+
+        later = NOW + timedelta(hours=24)
+        assert [i["id"] for i in index.top("us", 2, now=NOW)] == ["fresh", "intense"]
+        assert [i["id"] for i in index.top("us", 2, now=later)] == ["intense", "fresh"]
+        assert index.top("us", 1, now=later)[0]["trending_score"] == compute_trending_score(intense, later)
+
+    def test_add_item_dedupes_and_ranks(self):
+        index = TrendingIndex()
+        index.load(prepare_news_items(make_items(20)), now=NOW)
+
+        doc = {"_id": "mongo-oid", "id": "new", "title": "Breaking", "fingerprint": "fresh",
+               "section": "tech", "publishedAt": NOW.replace(tzinfo=None), "sentiment_score": -0.95}
+        assert index.add_item(doc, now=NOW) is True
+        assert index.add_item(dict(doc, id="dupe"), now=NOW) is False
+
+        top = index.top("tech", 1, now=NOW)[0]
+        assert top["id"] == "new"
+        assert "_id" not in top
+        assert top["heavy_content"] is True
+
+    def test_sentiment_update_rescores(self):
+        items = prepare_news_items(make_items(30))
+        index = TrendingIndex()
+        index.load(items, now=NOW)
+        last = min(items, key=lambda i: compute_trending_score(i, NOW))
+
+        assert index.update_sentiment(last["id"], 1.0, "positive", now=NOW) is True
+        assert index.update_sentiment("missing", 1.0, "positive") is False
+
+        ids = [i["id"] for i in index.top("all", 30, now=NOW)]
+        assert ids.index(last["id"]) < len(ids) - 1
+
+
+class TestEndpoint:
+
+    @pytest.mark.asyncio
+    async def test_reads_do_not_query(self, fake_db, monkeypatch):
+        monkeypatch.setattr(db_news, "news_collection", fake_db.news_items)
+        monkeypatch.setattr(trending_service, "trending_index", TrendingIndex())
+        for i, item in enumerate(make_items(60)):
+            fake_db.news_items.docs.append(dict(item, _id=i))
+
+        first = await news_routes.get_trending_news_analytics(section=None, limit=10)
+        fake_db.reset_queries()
+        second = await news_routes.get_trending_news_analytics(section="us", limit=5)
+
+        assert len(first["items"]) == 10
+        assert all(i["section"] == "us" for i in second["items"])
+        assert fake_db.total_queries() == 0
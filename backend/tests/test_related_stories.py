@@ -0,0 +1,144 @@
+"""
+Related Stories Tests
+Each story stores its most similar recent stories (TF-IDF cosine over title
++ summary); the pipeline scores only new stories, older lists take in a new
+story when it ranks among their best, and the endpoint is one read.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+import db.news as db_news
+import db.news_images as news_images
+import routes.news as news_routes
+from services.related_stories import merge_neighbours, plan_related, tfidf_matrix
+
+NOW = datetime(2025, 6, 1, 12, 0, 0)
+
+STORIES = {
+    "court": ("Supreme Court rules on Alabama voting map",
+              "Justices ordered Alabama to redraw its congressional voting map with a second Black district."),
+    "court-copy": ("Supreme Court rules on Alabama voting map - AP",
+                   "Justices ordered Alabama to redraw its congressional voting map with a second Black district."),
+    "louisiana": ("Louisiana voting map challenged after Alabama ruling",
+                  "Civil rights groups cite the Alabama voting map decision in a new congressional district suit."),
+    "stocks": ("Stocks rally as inflation cools",
+               "Wall Street rose after figures showed inflation slowing for a third month."),
+    "fed": ("Fed holds rates as inflation cools",
+            "The Federal Reserve kept interest rates steady, pointing to cooling inflation figures."),
+}
+
+
+def story(story_id, cluster_id=None, **fields):
+    title, summary = STORIES[story_id]
+    return dict({
+        "id": story_id, "title": title, "summary": summary, "sourceName": "Wire",
+        "imageUrl": f"https://cdn.banibs.com/news/{story_id}.jpg", "category": "Global Diaspora",
+        "publishedAt": NOW, "createdAt": NOW, "cluster_id": cluster_id or story_id,
+    }, **fields)
+
+
+def ids(entries):
+    return [entry["id"] for entry in entries]
+
+
+class TestPlanRelated:
+
+    def test_rows_are_unit_vectors(self):
+        matrix = tfidf_matrix([story(story_id) for story_id in STORIES])
+        assert matrix.shape[0] == len(STORIES)
+        assert abs(float((matrix[0] ** 2).sum()) - 1.0) < 1e-5
+
+    def test_neighbours_ranked_without_own_cluster(self):
+        pool = [story(story_id) for story_id in ["court", "louisiana", "stocks", "fed"]]
+        pool.append(story("court-copy", cluster_id="court"))
+
+        plans = plan_related(pool, ["court"], k=3)
+
+        # The syndicated copy is the same story, not a related one
+        assert ids(plans["court"]) == ["louisiana"]
+        assert plans["court"][0]["score"] > 0.1
+        assert set(plans["court"][0]) >= {"title", "sourceName", "imageUrl", "publishedAt", "category"}
+
+    def test_min_score_leaves_unrelated_stories_out(self):
+        pool = [story("stocks"), story("louisiana")]
+        assert plan_related(pool, ["stocks"]) == {"stocks": []}
+
+    def test_new_story_enters_older_lists(self):
+        fed = story("fed", related=[{"id": "weak", "cluster_id": "weak", "score": 0.12}])
+        pool = [story("stocks"), fed, story("court")]
+
+        plans = plan_related(pool, ["stocks"], k=2)
+
+        assert ids(plans["stocks"]) == ["fed"]
+        assert ids(plans["fed"]) == ["stocks", "weak"]
+        assert "court" not in plans  # list unchanged: not rewritten
+
+    def test_one_entry_per_cluster(self):
+        entries = [{"id": "a", "cluster_id": "x", "score": 0.9}, {"id": "b", "cluster_id": "x", "score": 0.8},
+                   {"id": "c", "cluster_id": "c", "score": 0.5}, {"id": "d", "cluster_id": "self", "score": 0.95}]
+        assert ids(merge_neighbours([], entries, "self", k=5)) == ["a", "c"]
+
+
+@pytest.fixture
+def related_db(fake_db, monkeypatch):
+    async def _get_db():
+        return fake_db
+    monkeypatch.setattr(db_news, "news_collection", fake_db.news_items)
+    monkeypatch.setattr(news_routes, "news_collection", fake_db.news_items)
+    monkeypatch.setattr(news_images, "get_db", _get_db)
+    return fake_db
+
+
+class TestRelatedIndex:
+
+    @pytest.mark.asyncio
+    async def test_only_new_stories_are_scored(self, related_db):
+        related_db.news_items.docs.extend([story("court"), story("louisiana")])
+        stats = await db_news.update_related_stories(now=NOW)
+        assert (stats["scored"], stats["updated"]) == (2, 2)
+
+        related_db.news_items.docs.extend([story("stocks"), story("fed")])
+        stats = await db_news.update_related_stories(now=NOW)
+
+        assert (stats["pool"], stats["scored"]) == (4, 2)
+        court, louisiana, stocks, fed = related_db.news_items.docs
+        assert ids(court["related"]) == ["louisiana"] and ids(fed["related"]) == ["stocks"]
+        assert all(doc["related_at"] == NOW for doc in related_db.news_items.docs)
+        assert (await db_news.update_related_stories(now=NOW))["scored"] == 0
+
+    @pytest.mark.asyncio
+    async def test_stories_outside_window_are_ignored(self, related_db):
+        related_db.news_items.docs.extend([story("court", createdAt=NOW - timedelta(days=30)), story("louisiana")])
+
+        await db_news.update_related_stories(now=NOW)
+
+        old, new = related_db.news_items.docs
+        assert new["related"] == [] and "related_at" not in old
+
+    @pytest.mark.asyncio
+    async def test_endpoint_is_one_read(self, related_db):
+        related_db.news_items.docs.extend([story("court"), story("louisiana")])
+        await db_news.update_related_stories(now=NOW)
+        related_db.queries.clear()
+
+        payload = await news_routes.get_related_news("court")
+
+        assert related_db.queries == {("news_items", "find_one"): 1}
+        [entry] = payload["items"]
+        assert (entry["id"], entry["publishedAt"]) == ("louisiana", NOW.isoformat() + "Z")
+        with pytest.raises(HTTPException) as missing:
+            await news_routes.get_related_news("missing")
+        assert missing.value.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_deleted_story_leaves_related_lists(self, related_db):
+        related_db.news_items.docs.extend([story("court"), story("louisiana")])
+        await db_news.update_related_stories(now=NOW)
+
+        await news_routes.delete_news_item("louisiana", current_user={})
+
+        [court] = related_db.news_items.docs
+        assert court["related"] == []
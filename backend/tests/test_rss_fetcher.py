@@ -0,0 +1,209 @@
+"""
+RSS Fetcher Tests
+Feeds are fetched concurrently from a local aiohttp server: global and
+per-host limits hold, stored ETag / Last-Modified are sent back, and a 304
+skips parsing and storage.
+"""
+
+import asyncio
+import pytest
+from datetime import datetime, timedelta, timezone
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+import db.rss_feed_state as feed_state
+import utils.feed_processing as feed_processing
+import utils.rss_parser as rss_parser
+from services import moderation_service
+from utils.rss_fetcher import FeedFetcher
+
+
+def rss(*titles):
+    items = "".join(
+        f"<item><title>{title}</title><link>https://example.com/{i}</link>"
+        f"<description>Story {i} about community growth</description>"
+        f"<pubDate>Mon, 0{i + 1} Jun 2025 12:00:00 GMT</pubDate></item>"
+        for i, title in enumerate(titles)
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>T</title>{items}</channel></rss>'
+
+
+class FeedServer:
+    """Fixture feeds with ETag / Last-Modified support and concurrency tracking"""
+
+    LAST_MODIFIED = "Mon, 02 Jun 2025 12:00:00 GMT"
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.feeds = {}
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def handle(self, request):
+        name = request.match_info["name"]
+        self.requests.append((name, request.headers.get("If-None-Match"), request.headers.get("If-Modified-Since")))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if name not in self.feeds:
+                return web.Response(status=500)
+            body = self.feeds[name]
+            etag = f'"{name}-{len(body)}"'
+            if request.headers.get("If-None-Match") == etag:
+                return web.Response(status=304, headers={"ETag": etag})
+            return web.Response(text=body, content_type="application/rss+xml",
+                                headers={"ETag": etag, "Last-Modified": self.LAST_MODIFIED})
+        finally:
+            self.in_flight -= 1
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/{name}.xml", self.handle)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        return self
+
+    def url(self, name):
+        return str(self.server.make_url(f"/{name}.xml"))
+
+    async def close(self):
+        await self.server.close()
+
+
+@pytest.fixture
+def ingest_db(fake_db, monkeypatch):
+    monkeypatch.setattr(rss_parser, "news_collection", fake_db.news_items)
+    monkeypatch.setattr(feed_processing, "RSS_PARSE_WORKERS", 0)
+
+    async def _get_db():
+        return fake_db
+    monkeypatch.setattr(feed_state, "get_db", _get_db)
+
+    async def _no_moderation(**kwargs):
+        return {"should_moderate": False}
+    monkeypatch.setattr(moderation_service, "handle_content_moderation", _no_moderation)
+    return fake_db
+
+
+def make_source(server, name, **extra):
+    return dict({"source_name": name.title(), "category": "Global Diaspora", "rss_url": server.url(name)}, **extra)
+
+
+class TestFeedFetcher:
+
+    @pytest.mark.asyncio
+    async def test_conditional_request(self):
+        server = await FeedServer().start()
+        server.feeds["a"] = rss("One")
+        try:
+            async with FeedFetcher() as fetcher:
+                first = await fetcher.fetch(server.url("a"))
+                again = await fetcher.fetch(server.url("a"), {"etag": first["etag"], "last_modified": first["last_modified"]})
+        finally:
+            await server.close()
+
+        assert first["status"] == 200 and b"<title>One</title>" in first["content"]
+        assert first["last_modified"] == FeedServer.LAST_MODIFIED
+        assert again["not_modified"] is True and again["content"] is None
+        assert again["last_modified"] == FeedServer.LAST_MODIFIED
+        assert server.requests[1] == ("a", first["etag"], FeedServer.LAST_MODIFIED)
+
+    @pytest.mark.asyncio
+    async def test_global_and_per_host_limits(self):
+        one, two = await FeedServer(delay=0.05).start(), await FeedServer(delay=0.05).start()
+        for server in (one, two):
+            for i in range(6):
+                server.feeds[f"f{i}"] = rss(f"Story {i}")
+        try:
+            async with FeedFetcher(concurrency=3, per_host=2) as fetcher:
+                tasks = [fetcher.fetch(server.url(f"f{i}")) for i in range(6) for server in (one, two)]
+                results = await asyncio.gather(*tasks)
+        finally:
+            await one.close()
+            await two.close()
+
+        assert all(result["status"] == 200 for result in results)
+        assert one.max_in_flight == 2 and two.max_in_flight <= 2
+        assert one.max_in_flight + two.max_in_flight >= 3
+
+
+class TestSyncFeedSources:
+
+    @pytest.mark.asyncio
+    async def test_second_run_is_not_modified(self, ingest_db, monkeypatch):
+        server = await FeedServer().start()
+        server.feeds["alpha"] = rss("Alpha one", "Alpha two")
+        server.feeds["beta"] = rss("Beta one")
+        sources = [make_source(server, "alpha"), make_source(server, "beta"), make_source(server, "broken")]
+        alpha_url, beta_url = sources[0]["rss_url"], sources[1]["rss_url"]
+        try:
+            first = await rss_parser.sync_feed_sources(sources, limit=5)
+
+            def _no_parse(content):
+                raise AssertionError("304 must not be parsed")
+            monkeypatch.setattr(feed_processing, "parse_feed_content", _no_parse)
+            second = await rss_parser.sync_feed_sources(sources[:2], limit=5)
+        finally:
+            await server.close()
+
+        assert [(r["source"], r["status"], r.get("items_added")) for r in first] == [
+            ("Alpha", "success", 2), ("Beta", "success", 1), ("Broken", "failed", None)
+        ]
+        assert first[2]["error"] and first[2]["http_status"] == 500
+        assert [(r["status"], r["items_added"]) for r in second] == [("not_modified", 0), ("not_modified", 0)]
+        assert all("feed_state" not in r for r in first + second)
+        assert set(first[0]["timings"]) == {
+            "fetch_seconds", "parse_seconds", "prepare_seconds", "sentiment_seconds", "store_seconds"
+        }
+        assert set(second[0]["timings"]) == {"fetch_seconds"}
+        assert (first[0]["http_status"], first[0]["items_parsed"]) == (200, 2)
+        assert first[0]["bytes"] == len(server.feeds["alpha"])
+        assert (second[0]["http_status"], second[0]["bytes"]) == (304, 0)
+        assert len(ingest_db.news_items.docs) == 3
+
+        # Validators are stored per URL; the failed feed has none
+        stored = {doc["url"]: doc for doc in ingest_db.rss_feed_state.docs}
+        assert {url for url, doc in stored.items() if doc.get("etag")} == {alpha_url, beta_url}
+        assert stored[alpha_url]["last_status"] == 304
+        assert stored[sources[2]["rss_url"]]["consecutive_failures"] == 1
+        assert ingest_db.queries[("rss_feed_state", "find")] == 2
+
+    @pytest.mark.asyncio
+    async def test_changed_feed_is_refetched(self, ingest_db):
+        server = await FeedServer().start()
+        server.feeds["alpha"] = rss("Alpha one")
+        sources = [make_source(server, "alpha", is_black_focus=True)]
+        try:
+            await rss_parser.sync_feed_sources(sources)
+            server.feeds["alpha"] = rss("Alpha one", "Alpha breaking news")
+            second = await rss_parser.sync_feed_sources(sources)
+        finally:
+            await server.close()
+
+        assert second[0]["status"] == "success" and second[0]["items_added"] == 1
+        assert {doc["title"] for doc in ingest_db.news_items.docs} == {"Alpha one", "Alpha breaking news"}
+        assert all(doc["is_black_focus"] for doc in ingest_db.news_items.docs)
+
+    @pytest.mark.asyncio
+    async def test_only_due_sources_are_fetched(self, ingest_db):
+        server = await FeedServer().start()
+        server.feeds["alpha"] = rss("Alpha one", "Alpha two")
+        sources = [make_source(server, "alpha"), make_source(server, "broken")]
+        try:
+            first = await rss_parser.sync_due_feed_sources(sources)
+            fetched = len(server.requests)
+            again = await rss_parser.sync_due_feed_sources(sources)
+            later = await rss_parser.sync_due_feed_sources(sources, now=datetime.now(timezone.utc) + timedelta(days=2))
+        finally:
+            await server.close()
+
+        assert [r["status"] for r in first] == ["success", "failed"]
+        assert all(r["next_poll_at"] > datetime.now(timezone.utc) for r in first)
+        assert again == [] and len(server.requests) == fetched + 2
+        assert [r["status"] for r in later] == ["not_modified", "failed"]
+
+        states = {doc["url"]: doc for doc in ingest_db.rss_feed_state.docs}
+        assert states[sources[0]["rss_url"]]["empty_polls"] == 1
+        assert states[sources[1]["rss_url"]]["consecutive_failures"] == 2
@@ -0,0 +1,167 @@
+"""
+RSS Ingest Tests
+Feeds are parsed into documents in worker processes (or in-process with
+workers=0); a feed's fingerprints are resolved with one $in query and new
+items are written with one unordered insert_many. The unique fingerprint
+index turns races with a concurrent run into duplicate counts instead of
+double inserts.
+"""
+
+import asyncio
+import pytest
+from datetime import datetime
+
+import utils.feed_processing as feed_processing
+import utils.rss_parser as rss_parser
+from services import moderation_service
+from utils.feed_processing import FeedProcessor, make_fingerprint, process_feed_payload
+from utils.rss_parser import store_feed_items
+
+
+SOURCE = "Wire"
+
+
+def feed(*titles):
+    return [
+        {"title": title, "summary": f"<p>{title} summary</p>", "publishedAt": datetime(2025, 6, 1, 12, i),
+         "sourceUrl": f"https://example.com/{i}"}
+        for i, title in enumerate(titles)
+    ]
+
+
+PAYLOAD = (
+    '<?xml version="1.0"?><rss version="2.0"><channel><title>T</title>'
+    "<item><title>Seen</title><pubDate>Sun, 01 Jun 2025 12:00:00 GMT</pubDate></item>"
+    "<item><title>Fresh</title><description>&lt;p&gt;Great &amp;amp; hopeful news for Harlem&lt;/p&gt;</description>"
+    "<pubDate>Mon, 02 Jun 2025 12:00:00 GMT</pubDate></item>"
+    "<item><title>Fresh</title><pubDate>Mon, 02 Jun 2025 11:00:00 GMT</pubDate></item>"
+    "</channel></rss>"
+).encode()
+
+OPTIONS = {"url": "https://example.com/feed", "category": "Global Diaspora", "source_name": SOURCE, "limit": 10}
+
+# Per-call values that legitimately differ between runs
+VOLATILE = {"id", "createdAt", "sentiment_at"}
+
+
+def stable(prepared):
+    docs = [{k: v for k, v in doc.items() if k not in VOLATILE} for doc in prepared["docs"]]
+    return dict(prepared, docs=docs, timings=None)
+
+
+@pytest.fixture
+def news_db(fake_db, monkeypatch):
+    monkeypatch.setattr(rss_parser, "news_collection", fake_db.news_items)
+    fake_db.news_items.unique_keys.append(["fingerprint"])
+
+    async def _no_moderation(**kwargs):
+        return {"should_moderate": False}
+    monkeypatch.setattr(moderation_service, "handle_content_moderation", _no_moderation)
+    return fake_db
+
+
+def store(items, limit=10):
+    return store_feed_items(items, url="https://example.com/feed", category="Global Diaspora",
+                            source_name=SOURCE, limit=limit)
+
+
+class TestStoreFeedItems:
+
+    @pytest.mark.asyncio
+    async def test_one_lookup_one_insert(self, news_db):
+        for title in ["Old one", "Old two"]:
+            news_db.news_items.docs.append({"id": title, "title": title, "fingerprint": make_fingerprint(SOURCE, title)})
+
+        stats = await store(feed("Old one", "New A", "New A", "", "New B", "Old two", "New C"))
+
+        assert stats == {"inserted": 3, "duplicates": 3, "errors": 0}
+        assert [doc["title"] for doc in news_db.news_items.docs[2:]] == ["New A", "New B", "New C"]
+        assert news_db.news_items.docs[2]["summary"] == "New A summary"
+        assert news_db.queries[("news_items", "find")] == 1
+        assert news_db.queries[("news_items", "insert_many")] == 1
+        assert news_db.queries[("news_items", "find_one")] == 0
+        assert news_db.queries[("news_items", "insert_one")] == 0
+
+    @pytest.mark.asyncio
+    async def test_limit_applies_before_dedupe(self, news_db):
+        stats = await store(feed("A", "B", "C", "D"), limit=2)
+        assert stats["inserted"] == 2
+        assert {doc["title"] for doc in news_db.news_items.docs} == {"A", "B"}
+
+    @pytest.mark.asyncio
+    async def test_concurrent_insert_is_a_duplicate(self, news_db, monkeypatch):
+        original_find = news_db.news_items.find
+
+        def racing_find(query=None, projection=None):
+            cursor = original_find(query, projection)
+            # Another sync stores "Race" between our lookup and our insert
+            news_db.news_items.docs.append({"id": "other", "title": "Race", "fingerprint": make_fingerprint(SOURCE, "Race")})
+            return cursor
+        monkeypatch.setattr(news_db.news_items, "find", racing_find)
+
+        stats = await store(feed("Race", "Calm"))
+
+        assert stats == {"inserted": 1, "duplicates": 1, "errors": 0}
+        assert [doc["title"] for doc in news_db.news_items.docs].count("Race") == 1
+
+    @pytest.mark.asyncio
+    async def test_bad_item_is_an_error(self, news_db, monkeypatch):
+        build = feed_processing.build_news_doc
+
+        def flaky_build(item, title, *args, **kwargs):
+            if title == "Broken":
+                raise ValueError("bad entry")
+            return build(item, title, *args, **kwargs)
+        monkeypatch.setattr(feed_processing, "build_news_doc", flaky_build)
+
+        stats = await store(feed("Fine", "Broken"))
+
+        assert stats == {"inserted": 1, "duplicates": 0, "errors": 1}
+
+
+class TestFeedProcessor:
+
+    def test_payload_is_plain_documents(self):
+        prepared = process_feed_payload(PAYLOAD, **OPTIONS)
+
+        assert (prepared["duplicates"], prepared["errors"]) == (1, 0)
+        assert [doc["title"] for doc in prepared["docs"]] == ["Seen", "Fresh"]
+        fresh = prepared["docs"][1]
+        assert fresh["summary"] == "Great & hopeful news for Harlem"
+        assert fresh["fingerprint"] == make_fingerprint(SOURCE, "Fresh")
+        assert fresh["sentiment_label"] == "positive"
+        assert "section" in fresh and "section_tags" in fresh
+        assert set(prepared["timings"]) == {"parse_seconds", "prepare_seconds", "sentiment_seconds"}
+
+    @pytest.mark.asyncio
+    async def test_pool_matches_in_process(self):
+        async with FeedProcessor(workers=0) as inline:
+            expected = await inline.process(PAYLOAD, **OPTIONS)
+        async with FeedProcessor(workers=1) as pooled:
+            assert pooled._pool is not None
+            results = await asyncio.gather(*[pooled.process(PAYLOAD, **OPTIONS) for _ in range(3)])
+
+        assert all(stable(result) == stable(expected) for result in results)
+
+
+class StaticFetcher:
+    def __init__(self, content):
+        self.content = content
+
+    async def fetch(self, url, validators=None):
+        return {"url": url, "status": 200, "not_modified": False, "content": self.content,
+                "etag": '"v1"', "last_modified": None}
+
+
+class TestSyncReport:
+
+    @pytest.mark.asyncio
+    async def test_per_source_counts(self, news_db):
+        news_db.news_items.docs.append({"id": "x", "title": "Seen", "fingerprint": make_fingerprint(SOURCE, "Seen")})
+        source = {"source_name": SOURCE, "category": "Global Diaspora", "rss_url": "https://example.com/feed"}
+
+        async with FeedProcessor(workers=0) as processor:
+            result = await rss_parser.sync_feed_source(StaticFetcher(PAYLOAD), source, processor=processor)
+
+        assert (result["status"], result["items_added"], result["duplicates"], result["errors"]) == ("success", 1, 2, 0)
+        assert result["feed_state"]["etag"] == '"v1"'
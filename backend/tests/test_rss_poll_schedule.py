@@ -0,0 +1,101 @@
+"""
+RSS Poll Schedule Tests
+Next poll times follow each source's observed publish interval, back off
+exponentially on failures and empty polls, and stay within the min / max
+bounds.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from services import rss_poll_schedule as schedule
+from services.rss_poll_schedule import due_sources, next_poll, plan_next_polls
+from utils.feed_processing import estimate_publish_interval
+
+NOW = datetime(2025, 6, 1, 12, 0, tzinfo=timezone.utc)
+HOUR = 3600
+
+
+def success(items_added=3, publish_interval=None):
+    return {"status": "success", "items_added": items_added, "publish_interval_seconds": publish_interval}
+
+
+class TestNextPoll:
+
+    def test_interval_follows_publish_rate(self):
+        busy = next_poll(None, success(publish_interval=60), NOW)
+        hourly = next_poll(None, success(publish_interval=2 * HOUR), NOW)
+        weekly = next_poll(None, success(publish_interval=7 * 24 * HOUR), NOW)
+
+        assert busy["poll_interval_seconds"] == schedule.MIN_POLL_INTERVAL_SECONDS
+        assert hourly["poll_interval_seconds"] == 2 * HOUR
+        assert hourly["next_poll_at"] == NOW + timedelta(hours=2)
+        assert weekly["poll_interval_seconds"] == schedule.MAX_POLL_INTERVAL_SECONDS
+
+    def test_unknown_rate_uses_default(self):
+        first = next_poll(None, success(), NOW)
+        assert first["poll_interval_seconds"] == schedule.DEFAULT_POLL_INTERVAL_SECONDS
+        assert first["publish_interval_seconds"] is None
+
+    def test_publish_interval_is_smoothed(self):
+        state = next_poll(None, success(publish_interval=4 * HOUR), NOW)
+        state = next_poll(state, success(publish_interval=2 * HOUR), NOW)
+        assert state["publish_interval_seconds"] == 3 * HOUR
+
+        # A 304 carries no observation; the estimate is kept
+        state = next_poll(state, {"status": "not_modified"}, NOW)
+        assert state["publish_interval_seconds"] == 3 * HOUR
+
+    def test_failures_back_off_exponentially_then_reset(self):
+        state = next_poll(None, success(publish_interval=HOUR), NOW)
+        intervals = []
+        for _ in range(7):
+            state = next_poll(state, {"status": "failed"}, NOW)
+            intervals.append(state["poll_interval_seconds"] / HOUR)
+
+        assert intervals == [2, 4, 8, 16, 24, 24, 24]
+        assert state["consecutive_failures"] == 7
+
+        state = next_poll(state, success(), NOW)
+        assert state["consecutive_failures"] == 0 and state["poll_interval_seconds"] == HOUR
+
+    def test_empty_polls_back_off(self):
+        state = next_poll(None, success(publish_interval=HOUR), NOW)
+        state = next_poll(state, {"status": "not_modified"}, NOW)
+        state = next_poll(state, success(items_added=0), NOW)
+
+        assert state["empty_polls"] == 2
+        assert state["poll_interval_seconds"] == 4 * HOUR
+        assert state["last_poll_status"] == "success"
+
+
+class TestDueSources:
+
+    def test_unscheduled_and_overdue_sources_are_due(self):
+        sources = [{"rss_url": url} for url in ["new", "late", "later", "naive"]]
+        states = {
+            "late": {"next_poll_at": NOW - timedelta(minutes=1)},
+            "later": {"next_poll_at": NOW + timedelta(minutes=1)},
+            # Mongo returns naive UTC datetimes
+            "naive": {"next_poll_at": (NOW - timedelta(minutes=1)).replace(tzinfo=None)},
+        }
+        assert [s["rss_url"] for s in due_sources(sources, states, NOW)] == ["new", "late", "naive"]
+
+    def test_plan_keys_by_url(self):
+        plans = plan_next_polls([{"rss_url": "a"}], [{"status": "failed"}], {}, NOW)
+        assert plans[0]["url"] == "a" and plans[0]["consecutive_failures"] == 1
+
+
+class TestPublishInterval:
+
+    def test_median_gap(self):
+        base = datetime(2025, 6, 1, tzinfo=timezone.utc)
+        items = [{"publishedAt": base + timedelta(hours=h)} for h in [0, 1, 2, 3, 10]]
+        # Mixed naive / aware dates compare in UTC
+        items.append({"publishedAt": (base + timedelta(hours=4)).replace(tzinfo=None)})
+
+        assert estimate_publish_interval(items) == HOUR
+
+    def test_too_few_dates(self):
+        when = datetime(2025, 6, 1)
+        assert estimate_publish_interval([{"publishedAt": when}, {"publishedAt": when}]) is None
+        assert estimate_publish_interval([]) is None
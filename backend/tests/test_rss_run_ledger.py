@@ -0,0 +1,192 @@
+"""
+RSS Run Ledger Tests
+run_all_feeds_job records one document per run with per-stage and
+per-source metrics; a run that finds another in progress is recorded as
+skipped, and a run left behind by a dead process stops blocking.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import scheduler
+from db import rss_pipeline_runs, rss_sources
+from services.rss_run_ledger import source_entry, source_latency_report
+
+NOW = datetime(2025, 6, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def sync_result(source, status="success", items_added=2, fetch_seconds=0.5, **extra):
+    result = {
+        "source": source,
+        "category": "Global Diaspora",
+        "status": status,
+        "http_status": {"success": 200, "not_modified": 304, "failed": 500}[status],
+        "bytes": 1000 if status == "success" else 0,
+        "items_parsed": 10 if status == "success" else 0,
+        "items_added": items_added if status == "success" else 0,
+        "duplicates": 1 if status == "success" else 0,
+        "errors": 0,
+        "timings": {"fetch_seconds": fetch_seconds},
+    }
+    if status == "success":
+        result["timings"].update(parse_seconds=0.01, prepare_seconds=0.02, sentiment_seconds=0.005, store_seconds=0.03)
+    if status == "failed":
+        result["error"] = "500 Internal Server Error"
+    return dict(result, **extra)
+
+
+MIRROR_RESULT = {
+    "total_processed": 2, "mirrored_successfully": 2, "failed_or_skipped": 0,
+    "unique_images": 2, "downloaded": 1, "timestamp": "2025-06-01T12:00:00Z",
+}
+
+
+@pytest.fixture
+def pipeline(fake_db, monkeypatch):
+    """run_all_feeds_job against the fake db with stubbed stages; records which stages ran"""
+    async def _get_db():
+        return fake_db
+    monkeypatch.setattr(rss_pipeline_runs, "get_db", _get_db)
+    monkeypatch.setattr(rss_sources, "get_db", _get_db)
+    fake_db.rss_pipeline_runs.unique_keys.append(["running_lock"])
+    fake_db.rss_sources.docs.append({
+        "id": "alpha", "source_name": "Alpha", "category": "Global Diaspora",
+        "rss_url": "https://alpha.example.com/feed", "active": True,
+    })
+
+    calls = []
+    state = {"results": [sync_result("Alpha"), sync_result("Beta", "not_modified")]}
+
+    async def _sync(sources, **kwargs):
+        calls.append("sync")
+        if isinstance(state["results"], Exception):
+            raise state["results"]
+        return state["results"]
+
+    async def _mirror():
+        calls.append("mirror")
+        return MIRROR_RESULT
+
+    async def _related():
+        calls.append("related")
+        return {"pool": 2, "scored": 2, "updated": 2}
+
+    async def _health():
+        calls.append("health_report")
+        return "report"
+
+    monkeypatch.setattr(scheduler, "sync_due_feed_sources", _sync)
+    monkeypatch.setattr(scheduler, "mirror_all_images", _mirror)
+    monkeypatch.setattr(scheduler, "update_related_stories", _related)
+    monkeypatch.setattr(scheduler, "generate_health_report", _health)
+    monkeypatch.setattr(scheduler, "write_report_to_log", lambda report: None)
+    fake_db.calls = calls
+    fake_db.state = state
+    return fake_db
+
+
+class TestRunLedger:
+
+    @pytest.mark.asyncio
+    async def test_run_is_recorded_with_stage_and_source_metrics(self, pipeline):
+        await scheduler.run_all_feeds_job()
+
+        [run] = pipeline.rss_pipeline_runs.docs
+        assert run["status"] == "completed"
+        assert "running_lock" not in run
+        assert run["wall_seconds"] >= 0 and run["finished_at"] >= run["started_at"]
+        assert set(run["stages"]) == {"sync", "mirror", "related", "health_report"}
+        assert run["stages"]["sync"]["sources_due"] == 2
+        assert run["stages"]["mirror"]["downloaded"] == 1
+
+        alpha, beta = run["sources"]
+        assert (alpha["http_status"], alpha["bytes"], alpha["items_parsed"]) == (200, 1000, 10)
+        assert (alpha["items_added"], alpha["duplicates"]) == (2, 1)
+        assert alpha["sentiment_seconds"] == 0.005
+        assert (beta["status"], beta["http_status"], beta["parse_seconds"]) == ("not_modified", 304, None)
+        assert run["totals"]["items_added"] == 2
+        assert run["totals"]["sources_not_modified"] == 1
+
+    @pytest.mark.asyncio
+    async def test_nothing_new_skips_mirror_but_is_recorded(self, pipeline):
+        pipeline.state["results"] = [sync_result("Beta", "not_modified")]
+
+        await scheduler.run_all_feeds_job()
+
+        assert pipeline.calls == ["sync"]
+        [run] = pipeline.rss_pipeline_runs.docs
+        assert run["status"] == "completed"
+        assert set(run["stages"]) == {"sync"}
+
+    @pytest.mark.asyncio
+    async def test_failed_run_keeps_error(self, pipeline):
+        pipeline.state["results"] = RuntimeError("database unavailable")
+
+        await scheduler.run_all_feeds_job()
+
+        [run] = pipeline.rss_pipeline_runs.docs
+        assert (run["status"], run["error"]) == ("failed", "database unavailable")
+        assert "health_report" in run["stages"]
+
+    @pytest.mark.asyncio
+    async def test_overlapping_run_is_skipped(self, pipeline):
+        await pipeline.rss_pipeline_runs.insert_one({
+            "id": "in-progress", "status": "running", "started_at": datetime.now(timezone.utc),
+            "running_lock": rss_pipeline_runs.RUNNING_LOCK,
+        })
+
+        await scheduler.run_all_feeds_job()
+
+        assert pipeline.calls == []
+        skipped = [run for run in pipeline.rss_pipeline_runs.docs if run["status"] == "skipped"]
+        assert len(skipped) == 1
+        assert skipped[0]["overlapped_run_id"] == "in-progress"
+        assert skipped[0]["skipped_reason"] == "run_in_progress"
+
+    @pytest.mark.asyncio
+    async def test_stale_run_is_abandoned(self, pipeline):
+        stale = datetime.now(timezone.utc) - timedelta(minutes=rss_pipeline_runs.RUN_STALE_AFTER_MINUTES + 1)
+        await pipeline.rss_pipeline_runs.insert_one({
+            "id": "dead", "status": "running", "started_at": stale,
+            "running_lock": rss_pipeline_runs.RUNNING_LOCK,
+        })
+
+        await scheduler.run_all_feeds_job()
+
+        runs = {run["id"]: run for run in pipeline.rss_pipeline_runs.docs}
+        assert runs.pop("dead")["status"] == "abandoned"
+        [run] = runs.values()
+        assert run["status"] == "completed"
+        assert "sync" in pipeline.calls
+
+    @pytest.mark.asyncio
+    async def test_skipped_scheduler_tick_is_recorded(self, pipeline):
+        await rss_pipeline_runs.record_skipped_run({"id": "tick", "started_at": NOW}, reason="max_instances")
+
+        [run] = pipeline.rss_pipeline_runs.docs
+        assert (run["status"], run["skipped_reason"], run["overlapped_run_id"]) == ("skipped", "max_instances", None)
+
+
+class TestSourceLatencyReport:
+
+    def test_slowest_sources_first(self):
+        runs = [
+            {"started_at": NOW - timedelta(hours=1), "sources": [
+                source_entry(sync_result("Fast", fetch_seconds=0.1)),
+                source_entry(sync_result("Slow", fetch_seconds=4.0)),
+            ]},
+            {"started_at": NOW, "sources": [
+                source_entry(sync_result("Fast", fetch_seconds=0.3)),
+                source_entry(sync_result("Slow", "failed", fetch_seconds=20.0)),
+            ]},
+        ]
+
+        slow, fast = source_latency_report(runs)
+
+        assert slow["source"] == "Slow"
+        assert (slow["runs"], slow["failures"], slow["max_fetch_seconds"]) == (2, 1, 20.0)
+        assert slow["mean_fetch_seconds"] == 12.0
+        assert (slow["last_status"], slow["last_run_at"]) == ("failed", NOW)
+        assert fast["mean_fetch_seconds"] == 0.2
+        assert (fast["items_added"], fast["mean_bytes"]) == (4, 1000)
@@ -0,0 +1,219 @@
+"""
+RSS Source Registry Tests
+Sources live in db.rss_sources, seeded from config without overwriting
+admin edits; repeated failures quarantine a source until a periodic probe
+succeeds.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from db import rss_sources as registry
+from middleware import auth_guard
+from routes import admin_rss
+from services.jwt_service import JWTService
+from services import rss_source_health as source_health
+from services.rss_source_health import next_health, plan_source_health, pollable_sources
+
+NOW = datetime(2025, 6, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def source(source_id="alpha", **fields):
+    return dict({
+        "id": source_id, "source_name": source_id.title(), "category": "Global Diaspora",
+        "rss_url": f"https://{source_id}.example.com/feed", "active": True,
+    }, **fields)
+
+
+def result(status="success", fetch_seconds=0.5):
+    outcome = {"status": status, "timings": {"fetch_seconds": fetch_seconds}}
+    if status == "failed":
+        outcome["error"] = "Timeout fetching feed"
+    return outcome
+
+
+def fail_times(src, count, start=NOW):
+    for i in range(count):
+        src = dict(src, **next_health(src, result("failed"), start + timedelta(minutes=i)))
+    return src
+
+
+@pytest.fixture
+def registry_db(fake_db, monkeypatch):
+    async def _get_db():
+        return fake_db
+    monkeypatch.setattr(registry, "get_db", _get_db)
+    fake_db.rss_sources.unique_keys.append(["id"])
+    return fake_db
+
+
+class TestSourceHealth:
+
+    def test_health_is_smoothed(self):
+        src = source()
+        src.update(next_health(src, result(fetch_seconds=1.0), NOW))
+        assert src["health"]["success_rate"] == 1.0
+        assert src["health"]["latency_seconds"] == 1.0
+
+        src.update(next_health(src, result("failed", fetch_seconds=6.0), NOW))
+        assert src["health"]["success_rate"] == pytest.approx(1.0 - source_health.HEALTH_SMOOTHING)
+        assert src["health"]["latency_seconds"] == pytest.approx(2.0)
+        assert (src["health"]["syncs"], src["health"]["consecutive_failures"]) == (2, 1)
+        assert src["health"]["last_error"] == "Timeout fetching feed"
+
+    def test_not_modified_counts_as_success(self):
+        src = fail_times(source(), 2)
+        src.update(next_health(src, result("not_modified"), NOW))
+        assert src["health"]["consecutive_failures"] == 0
+        assert src["health"]["last_good_at"] == NOW
+
+    def test_quarantined_after_consecutive_failures(self):
+        src = fail_times(source(), source_health.QUARANTINE_AFTER_FAILURES - 1)
+        assert not src["quarantine"]["active"]
+
+        src = fail_times(src, 1, start=NOW + timedelta(hours=1))
+        quarantine = src["quarantine"]
+        assert quarantine["active"]
+        assert quarantine["since"] == NOW + timedelta(hours=1)
+        assert quarantine["next_probe_at"] == quarantine["since"] + timedelta(seconds=source_health.QUARANTINE_PROBE_SECONDS)
+        assert "Timeout fetching feed" in quarantine["reason"]
+
+    def test_failed_probe_waits_for_next_and_success_releases(self):
+        src = fail_times(source(), source_health.QUARANTINE_AFTER_FAILURES)
+        since = src["quarantine"]["since"]
+
+        probe_at = NOW + timedelta(days=1)
+        src.update(next_health(src, result("failed"), probe_at))
+        assert src["quarantine"]["active"] and src["quarantine"]["since"] == since
+        assert src["quarantine"]["next_probe_at"] == probe_at + timedelta(seconds=source_health.QUARANTINE_PROBE_SECONDS)
+
+        src.update(next_health(src, result(), probe_at + timedelta(days=1)))
+        assert src["quarantine"] == {"active": False, "released_at": probe_at + timedelta(days=1)}
+        assert src["health"]["consecutive_failures"] == 0
+
+    def test_pollable_sources_split(self):
+        healthy = source("healthy")
+        inactive = source("inactive", active=False)
+        waiting = source("waiting", quarantine={"active": True, "next_probe_at": NOW + timedelta(hours=1)})
+        # Mongo returns naive UTC datetimes
+        due = source("due", quarantine={"active": True, "next_probe_at": (NOW - timedelta(hours=1)).replace(tzinfo=None)})
+
+        regular, probes = pollable_sources([healthy, inactive, waiting, due], NOW)
+
+        assert [s["id"] for s in regular] == ["healthy"]
+        assert [s["id"] for s in probes] == ["due"]
+
+    def test_plan_skips_unregistered_sources(self):
+        unregistered = {"source_name": "Ad hoc", "rss_url": "https://adhoc.example.com/feed"}
+        updates = plan_source_health([source(), unregistered], [result(), result()], NOW)
+        assert [update["id"] for update in updates] == ["alpha"]
+
+
+class TestSourceRegistry:
+
+    @pytest.mark.asyncio
+    async def test_seed_keeps_admin_edits_and_health(self, registry_db):
+        await registry.seed_rss_sources([source("alpha"), source("beta")])
+        await registry.update_rss_source("beta", {"rss_url": "https://beta.example.com/new-feed"})
+        await registry.save_source_health([dict(next_health(source(), result(), NOW), id="alpha")])
+
+        stats = await registry.seed_rss_sources([
+            source("alpha", source_name="Alpha News"),
+            source("beta"),
+            source("gamma"),
+        ])
+
+        assert stats == {"seeded": 2, "kept": 1}
+        sources = {doc["id"]: doc for doc in await registry.get_rss_sources()}
+        assert set(sources) == {"alpha", "beta", "gamma"}
+        assert sources["alpha"]["source_name"] == "Alpha News"
+        assert sources["alpha"]["health"]["syncs"] == 1
+        assert sources["alpha"]["origin"] == "config"
+        assert sources["beta"]["rss_url"] == "https://beta.example.com/new-feed"
+        assert sources["beta"]["admin_edited"]
+
+    @pytest.mark.asyncio
+    async def test_load_seeds_empty_registry(self, registry_db, monkeypatch):
+        monkeypatch.setattr("config.rss_sources.RSS_SOURCES", [source("alpha"), source("beta")])
+
+        sources = await registry.load_rss_sources()
+
+        assert sorted(doc["id"] for doc in sources) == ["alpha", "beta"]
+
+    @pytest.mark.asyncio
+    async def test_release_quarantine(self, registry_db):
+        quarantined = fail_times(source(), source_health.QUARANTINE_AFTER_FAILURES)
+        await registry.seed_rss_sources([source()])
+        await registry.save_source_health([dict(health=quarantined["health"], quarantine=quarantined["quarantine"], id="alpha")])
+
+        released = await registry.release_quarantine("alpha")
+
+        assert not released["quarantine"]["active"]
+        assert released["quarantine"]["released_by"] == "admin"
+        assert released["health"]["consecutive_failures"] == 0
+        regular, probes = pollable_sources([released], NOW)
+        assert [s["id"] for s in regular] == ["alpha"] and probes == []
+
+    @pytest.mark.asyncio
+    async def test_release_during_run_is_kept(self, registry_db):
+        quarantined = fail_times(source(), source_health.QUARANTINE_AFTER_FAILURES)
+        await registry.seed_rss_sources([source()])
+        await registry.save_source_health([dict(health=quarantined["health"], quarantine=quarantined["quarantine"], id="alpha")])
+
+        # The run reads the registry and fails its probe; an admin releases before it saves
+        [started] = await registry.get_rss_sources()
+        plans = plan_source_health([started], [result("failed")], NOW + timedelta(days=1))
+        await registry.release_quarantine("alpha")
+        await registry.save_source_health(plans)
+
+        [stored] = await registry.get_rss_sources()
+        assert not stored["quarantine"]["active"] and stored["quarantine"]["released_by"] == "admin"
+        assert stored["health"]["consecutive_failures"] == 0
+        assert stored["health"]["syncs"] == started["health"]["syncs"] + 1
+
+        # Without a release in between, the probe result is stored
+        [started] = await registry.get_rss_sources()
+        await registry.save_source_health(plan_source_health([started], [result("failed")], NOW + timedelta(days=2)))
+        [stored] = await registry.get_rss_sources()
+        assert stored["health"]["consecutive_failures"] == 1
+
+class TestAdminAccess:
+
+    @pytest.fixture
+    def client(self, registry_db, monkeypatch):
+        registry_db.rss_sources.docs.append(source(
+            health={"last_error": "HTTP 500 from upstream"}, quarantine={"reason": "5 failures"}
+        ))
+        users = {
+            "mod": {"id": "mod", "roles": ["moderator"]},
+            "member": {"id": "member", "roles": ["user"]},
+        }
+
+        async def _get_user_by_id(user_id):
+            return users.get(user_id)
+        monkeypatch.setattr(auth_guard, "get_user_by_id", _get_user_by_id)
+        app = FastAPI()
+        app.include_router(admin_rss.router)
+        return TestClient(app)
+
+    @staticmethod
+    def bearer(user_id, roles):
+        token = JWTService.create_access_token(user_id, f"{user_id}@example.com", roles, "basic")
+        return {"Authorization": f"Bearer {token}"}
+
+    @pytest.mark.parametrize("path", ["/sources", "/stats", "/categories", "/health"])
+    def test_registry_reads_require_admin(self, client, path):
+        url = f"/api/admin/rss{path}"
+
+        assert client.get(url).status_code == 401
+        assert client.get(url, headers=self.bearer("member", ["user"])).status_code == 403
+
+    def test_moderator_sees_source_health(self, client):
+        response = client.get("/api/admin/rss/sources", headers=self.bearer("mod", ["moderator"]))
+
+        assert response.status_code == 200
+        [entry] = response.json()["sources"]
+        assert entry["health"]["last_error"] == "HTTP 500 from upstream"
@@ -0,0 +1,129 @@
+"""
+Sentiment Service Tests - Phase 6.3
+The tokenized lexicon lookup must reproduce the original substring-scan
+scores and labels exactly (the original is kept below as the reference).
+"""
+
+import random
+from datetime import datetime, timezone
+
+from services import sentiment_service
+from services.sentiment_service import (
+    NEGATIVE_WORDS,
+    POSITIVE_WORDS,
+    analyze_batch_sentiment,
+    analyze_text_sentiment,
+    lexicon_hits
+)
+
+
+# Original keyword order: the float accumulation order matters for parity
+REFERENCE_POSITIVE = [
+    'success', 'successful', 'growth', 'achievement', 'win', 'winning', 'excellent',
+    'great', 'good', 'better', 'best', 'progress', 'opportunity', 'opportunities',
+    'positive', 'celebration', 'celebrate', 'victory', 'award', 'awarded',
+    'innovation', 'innovative', 'breakthrough', 'empower', 'empowerment',
+    'inspire', 'inspiring', 'hope', 'hopeful', 'amazing', 'wonderful',
+    'fantastic', 'outstanding', 'remarkable', 'impressive', 'triumph',
+    'advance', 'advancement', 'benefit', 'beneficial', 'thriving', 'prosper'
+]
+REFERENCE_NEGATIVE = [
+    'crisis', 'failure', 'failed', 'problem', 'problems', 'issue', 'issues',
+    'concern', 'concerns', 'worry', 'worried', 'fear', 'afraid', 'threat',
+    'threaten', 'risk', 'danger', 'dangerous', 'harm', 'harmful', 'attack',
+    'violence', 'violent', 'death', 'die', 'dying', 'disaster', 'catastrophe',
+    'decline', 'declining', 'loss', 'lose', 'losing', 'defeat', 'defeated',
+    'cut', 'cuts', 'cutting', 'layoff', 'layoffs', 'unemployment',
+    'discrimination', 'discriminate', 'injustice', 'unfair', 'protest',
+    'controversy', 'controversial', 'scandal', 'corruption', 'corrupt'
+]
+
+
+def reference_sentiment(text):
+    """The per-keyword substring scan the tokenized lookup replaced"""
+    if not text or not text.strip():
+        return 0.0, "neutral"
+    text_lower = text.lower()
+    score = 0.0
+    for word in REFERENCE_POSITIVE:
+        if word in text_lower:
+            score += 0.1
+    for word in REFERENCE_NEGATIVE:
+        if word in text_lower:
+            score -= 0.1
+    score = max(-1.0, min(1.0, score))
+    if score > 0.15:
+        label = "positive"
+    elif score < -0.15:
+        label = "negative"
+    else:
+        label = "neutral"
+    return round(score, 3), label
+
+
+# Words that contain lexicon entries (window, diet, executed...) or are
+# near misses, plus case / punctuation / unicode noise
+TRICKY = ["window", "winter", "diet", "studied", "executed", "scuttle", "hopefully", "HOPE",
+          "Award-winning", "non-violent", "unemployment's", "fearless", "goodbye", "bestow",
+          "café", "naïve", "résumé", "KELVINK", "İstanbul", "lose-lose", "prosperity",
+          "threatened", "riskier", "harmless", "advanced", "benefits", "die-hard", "issue\nissues"]
+FILLER = ["the", "city", "council", "said", "on", "monday", "report", "2025", "—", ",", ".", "!", "\t"]
+
+
+def make_corpus(n=1500, seed=5):
+    rng = random.Random(seed)
+    vocabulary = REFERENCE_POSITIVE + REFERENCE_NEGATIVE + TRICKY
+    corpus = ["", "   ", "no keywords here"]
+    for _ in range(n):
+        words = rng.choices(FILLER, k=rng.randrange(0, 15)) + rng.choices(vocabulary, k=rng.randrange(0, 14))
+        rng.shuffle(words)
+        joiner = rng.choice([" ", "", "-", " / "])
+        text = joiner.join(words)
+        corpus.append(text.upper() if rng.random() < 0.1 else text)
+    return corpus
+
+
+CORPUS = make_corpus()
+
+
+class TestParity:
+
+    def test_matches_reference(self):
+        for text in CORPUS:
+            result = analyze_text_sentiment(text)
+            assert (result["score"], result["label"]) == reference_sentiment(text), repr(text)
+
+    def test_substring_semantics(self):
+        # "hopeful" holds both "hope" and "hopeful"; "window" holds "win"
+        assert lexicon_hits("Hopeful window") == (3, 0)
+        assert lexicon_hits("a diet of cuts") == (0, 3)
+
+    def test_batch_matches_single(self):
+        results = analyze_batch_sentiment(CORPUS[:300] + CORPUS[:10])
+
+        assert [(r["score"], r["label"]) for r in results] == [reference_sentiment(t) for t in CORPUS[:300] + CORPUS[:10]]
+        assert len({r["analyzed_at"] for r in results}) == 1
+        assert results[0] is not results[300]
+
+    def test_lexicons_are_frozen(self):
+        assert isinstance(POSITIVE_WORDS, frozenset) and isinstance(NEGATIVE_WORDS, frozenset)
+        assert POSITIVE_WORDS == frozenset(REFERENCE_POSITIVE)
+        assert NEGATIVE_WORDS == frozenset(REFERENCE_NEGATIVE)
+
+    def test_phrase_entries(self, monkeypatch):
+        monkeypatch.setattr(sentiment_service, "_POSITIVE_PHRASES", ("record high",))
+        assert lexicon_hits("Stocks hit a record high") == (1, 0)
+        assert lexicon_hits("record-high") == (0, 0)
+
+
+class TestLogging:
+
+    def test_no_info_logging_per_call(self, caplog):
+        caplog.set_level("INFO", logger=sentiment_service.logger.name)
+        analyze_text_sentiment("Great success")
+        analyze_text_sentiment("")
+        assert caplog.records == []
+
+    def test_explicit_timestamp(self):
+        at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        assert analyze_text_sentiment("growth", at)["analyzed_at"] == at
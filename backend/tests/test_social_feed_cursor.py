@@ -0,0 +1,111 @@
+"""
+Social Feed Keyset Pagination Tests
+Cursor mode must walk the feed in (created_at, id) DESC order without gaps
+or duplicates, including posts that share a timestamp.
+"""
+
+import pytest
+from datetime import datetime, timezone, timedelta
+
+import db.social_posts as social_posts
+from db.social_posts import encode_feed_cursor, decode_feed_cursor
+
+
+BASE = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def patched_db(fake_db, monkeypatch):
+    async def _get_db():
+        return fake_db
+    monkeypatch.setattr(social_posts, "get_db", _get_db)
+
+    fake_db.banibs_users.docs.extend([
+        {"id": "alice", "name": "Alice"},
+        {"id": "bob", "name": "Bob"},
+    ])
+    for i in range(25):
+        fake_db.social_posts.docs.append({
+            "id": f"post-{i:02d}",
+            "author_id": "alice" if i % 2 else "bob",
+            "text": str(i),
+            # Pairs of posts share a timestamp to exercise the id tie-breaker
+            "created_at": BASE + timedelta(minutes=i // 2),
+            "updated_at": BASE,
+            "is_deleted": i == 7,
+            "is_hidden": False,
+        })
+    return fake_db
+
+
+async def walk(fetch, **kwargs):
+    ids, cursor, pages = [], None, 0
+    while True:
+        page = await fetch(cursor=cursor, **kwargs)
+        ids.extend(p["id"] for p in page["items"])
+        pages += 1
+        if not page["has_more"]:
+            assert page["next_cursor"] is None
+            return ids, pages
+        cursor = page["next_cursor"]
+
+
+class TestCursorCodec:
+
+    def test_round_trip(self):
+        cursor = encode_feed_cursor({"id": "abc", "created_at": BASE})
+        assert decode_feed_cursor(cursor) == (BASE, "abc")
+
+    def test_cursor_is_opaque(self):
+        cursor = encode_feed_cursor({"id": "abc", "created_at": BASE})
+        assert "abc" not in cursor and "=" not in cursor
+
+    @pytest.mark.parametrize("bad", ["not-a-cursor", "e30", "!!!"])
+    def test_rejects_garbage(self, bad):
+        with pytest.raises(ValueError):
+            decode_feed_cursor(bad)
+
+
+class TestFeedByCursor:
+
+    @pytest.mark.asyncio
+    async def test_walk_matches_page_mode_order(self, patched_db):
+        ids, pages = await walk(social_posts.get_feed_by_cursor, page_size=5)
+
+        expected = sorted(
+            (p for p in patched_db.social_posts.docs if not p["is_deleted"]),
+            key=lambda p: (p["created_at"], p["id"]),
+            reverse=True
+        )
+        assert ids == [p["id"] for p in expected]
+        assert len(ids) == len(set(ids)) == 24
+        assert pages == 5
+
+    @pytest.mark.asyncio
+    async def test_no_count_or_skip(self, patched_db):
+        patched_db.reset_queries()
+
+        page = await social_posts.get_feed_by_cursor(page_size=10)
+
+        assert patched_db.queries[("social_posts", "count_documents")] == 0
+        assert page["total_items"] is None
+        assert page["total_is_estimate"] is False
+
+    @pytest.mark.asyncio
+    async def test_include_total_uses_estimate(self, patched_db):
+        page = await social_posts.get_feed_by_cursor(page_size=10, include_total=True)
+
+        assert page["total_items"] == 25
+        assert page["total_is_estimate"] is True
+        assert patched_db.queries[("social_posts", "count_documents")] == 0
+
+    @pytest.mark.asyncio
+    async def test_user_posts_by_cursor(self, patched_db):
+        ids, _ = await walk(social_posts.get_user_posts_by_cursor, user_id="alice", page_size=4)
+
+        assert ids == [f"post-{i:02d}" for i in range(23, 0, -2) if i != 7]
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor_raises(self, patched_db):
+        with pytest.raises(ValueError):
+            await social_posts.get_feed_by_cursor(cursor="garbage")
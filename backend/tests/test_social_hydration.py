@@ -0,0 +1,154 @@
+"""
+Social Hydration Tests
+Feed / post / comment enrichment must cost a constant number of queries,
+independent of page size (no per-post author or reaction lookups).
+"""
+
+import pytest
+from datetime import datetime, timezone, timedelta
+
+import db.social_posts as social_posts
+from db.social_hydration import hydrate_posts, hydrate_comments
+
+
+def seed(fake_db, n_posts, n_authors=5, viewer_id="viewer"):
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    for a in range(n_authors):
+        fake_db.banibs_users.docs.append({
+            "id": f"user-{a}",
+            "name": f"User {a}",
+            "avatar_url": f"/avatars/{a}.png",
+            "profile": {"handle": f"user{a}"} if a % 2 == 0 else None,
+        })
+    for i in range(n_posts):
+        fake_db.social_posts.docs.append({
+            "id": f"post-{i}",
+            "author_id": f"user-{i % n_authors}",
+            "text": f"post {i}",
+            "media": [{"url": "/media/x.jpg", "type": "image"}] if i % 3 == 0 else [],
+            "like_count": 0,
+            "comment_count": 0,
+            "created_at": base + timedelta(minutes=i),
+            "updated_at": base + timedelta(minutes=i),
+            "is_deleted": False,
+            "is_hidden": False,
+        })
+        if i % 2 == 0:
+            fake_db.social_reactions.docs.append({"post_id": f"post-{i}", "user_id": viewer_id})
+
+
+@pytest.fixture
+def patched_db(fake_db, monkeypatch):
+    async def _get_db():
+        return fake_db
+    monkeypatch.setattr(social_posts, "get_db", _get_db)
+    return fake_db
+
+
+class TestHydratePosts:
+    """Batched author + viewer-like resolution"""
+
+    @pytest.mark.asyncio
+    async def test_enriches_author_and_like_state(self, fake_db):
+        seed(fake_db, 4)
+        posts = await fake_db.social_posts.find({}, {"_id": 0}).to_list(None)
+
+        enriched = await hydrate_posts(fake_db, posts, "viewer")
+
+        assert [p["id"] for p in enriched] == ["post-0", "post-1", "post-2", "post-3"]
+        assert enriched[0]["author"] == {
+            "id": "user-0",
+            "display_name": "User 0",
+            "avatar_url": "/avatars/0.png",
+            "handle": "user0",
+        }
+        assert enriched[1]["author"]["handle"] is None
+        assert [p["viewer_has_liked"] for p in enriched] == [True, False, True, False]
+        assert enriched[0]["media_urls"][0].endswith("/media/x.jpg")
+
+    @pytest.mark.asyncio
+    async def test_drops_posts_with_missing_author(self, fake_db):
+        seed(fake_db, 3)
+        posts = await fake_db.social_posts.find({}, {"_id": 0}).to_list(None)
+        posts[1]["author_id"] = "ghost"
+
+        enriched = await hydrate_posts(fake_db, posts)
+
+        assert [p["id"] for p in enriched] == ["post-0", "post-2"]
+
+    @pytest.mark.asyncio
+    async def test_anonymous_viewer_skips_reaction_query(self, fake_db):
+        seed(fake_db, 3)
+        posts = await fake_db.social_posts.find({}, {"_id": 0}).to_list(None)
+        fake_db.reset_queries()
+
+        enriched = await hydrate_posts(fake_db, posts, None)
+
+        assert fake_db.total_queries("social_reactions") == 0
+        assert not any(p["viewer_has_liked"] for p in enriched)
+
+    @pytest.mark.asyncio
+    async def test_comments_single_author_query(self, fake_db):
+        seed(fake_db, 0)
+        comments = [
+            {"id": f"c{i}", "post_id": "p", "author_id": f"user-{i % 5}", "text": "hi"}
+            for i in range(12)
+        ]
+
+        enriched = await hydrate_comments(fake_db, comments)
+
+        assert len(enriched) == 12
+        assert fake_db.total_queries("banibs_users") == 1
+
+
+class TestConstantQueryCount:
+    """Query count must not grow with page size"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("page_size", [1, 5, 20, 50])
+    async def test_get_feed_constant_queries(self, patched_db, page_size):
+        seed(patched_db, 60)
+        patched_db.reset_queries()
+
+        feed = await social_posts.get_feed(page=1, page_size=page_size, viewer_id="viewer")
+
+        assert len(feed["items"]) == page_size
+        assert patched_db.total_queries("banibs_users") == 1
+        assert patched_db.total_queries("social_reactions") == 1
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("page_size", [1, 20, 50])
+    async def test_get_user_posts_constant_queries(self, patched_db, page_size):
+        seed(patched_db, 300)
+        patched_db.reset_queries()
+
+        result = await social_posts.get_user_posts("user-0", page=1, page_size=page_size, viewer_id="viewer")
+
+        assert len(result["items"]) == page_size
+        assert patched_db.total_queries("banibs_users") == 1
+        assert patched_db.total_queries("social_reactions") == 1
+
+    @pytest.mark.asyncio
+    async def test_get_comments_constant_queries(self, patched_db):
+        seed(patched_db, 1)
+        for i in range(30):
+            patched_db.social_comments.docs.append({
+                "id": f"c{i}", "post_id": "post-0", "author_id": f"user-{i % 5}",
+                "text": "hi", "is_deleted": False,
+                "created_at": datetime(2025, 1, 1, tzinfo=timezone.utc) + timedelta(seconds=i),
+            })
+        patched_db.reset_queries()
+
+        result = await social_posts.get_comments("post-0", page=1, page_size=30)
+
+        assert len(result["items"]) == 30
+        assert patched_db.total_queries("banibs_users") == 1
+
+    @pytest.mark.asyncio
+    async def test_get_post_by_id_matches_feed_item(self, patched_db):
+        seed(patched_db, 5)
+
+        feed = await social_posts.get_feed(page=1, page_size=5, viewer_id="viewer")
+        single = await social_posts.get_post_by_id("post-2", viewer_id="viewer")
+
+        assert single == next(p for p in feed["items"] if p["id"] == "post-2")
@@ -0,0 +1,148 @@
+"""
+Social Like Toggle Tests
+toggle_like must be atomic under double-taps and keep like_count in sync;
+reconciliation repairs counters that drifted anyway.
+"""
+
+import asyncio
+import pytest
+from datetime import datetime, timedelta, timezone
+
+from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
+
+import db.indices as indices
+import db.social_posts as social_posts
+
+
+@pytest.fixture
+def ldb(fake_db, monkeypatch):
+    async def _get_db():
+        return fake_db
+    monkeypatch.setattr(social_posts, "get_db", _get_db)
+
+    # Unique (post_id, user_id), as created by ensure_social_posts_indices
+    fake_db.social_reactions.unique_keys.append(["post_id", "user_id"])
+    fake_db.social_posts.docs.append({
+        "id": "p1", "author_id": "a", "like_count": 0, "comment_count": 0,
+        "created_at": datetime.now(timezone.utc),
+    })
+    return fake_db
+
+
+def like_count(db, post_id="p1"):
+    return next(p for p in db.social_posts.docs if p["id"] == post_id)["like_count"]
+
+
+class TestToggleLike:
+
+    @pytest.mark.asyncio
+    async def test_like_then_unlike(self, ldb):
+        assert await social_posts.toggle_like("p1", "u1") == {"liked": True, "like_count": 1}
+        assert await social_posts.toggle_like("p1", "u2") == {"liked": True, "like_count": 2}
+        assert await social_posts.toggle_like("p1", "u1") == {"liked": False, "like_count": 1}
+        assert len(ldb.social_reactions.docs) == 1
+
+    @pytest.mark.asyncio
+    async def test_round_trips(self, ldb):
+        ldb.reset_queries()
+        await social_posts.toggle_like("p1", "u1")
+
+        # delete_one (miss) + insert_one + find_one_and_update
+        assert ldb.total_queries() == 3
+        assert ldb.queries[("social_posts", "find_one_and_update")] == 1
+        assert ldb.queries[("social_posts", "find_one")] == 0
+
+    @pytest.mark.asyncio
+    async def test_concurrent_like_counts_once(self, ldb, monkeypatch):
+        # Simulate a double-tap where both requests miss on delete before either inserts
+        real_delete = ldb.social_reactions.delete_one
+
+        async def racing_delete(query):
+            result = await real_delete(query)
+            await asyncio.sleep(0)
+            return result
+        monkeypatch.setattr(ldb.social_reactions, "delete_one", racing_delete)
+
+        results = await asyncio.gather(
+            social_posts.toggle_like("p1", "u1"),
+            social_posts.toggle_like("p1", "u1"),
+        )
+
+        assert all(r["liked"] for r in results)
+        assert len(ldb.social_reactions.docs) == 1
+        assert like_count(ldb) == 1
+
+    @pytest.mark.asyncio
+    async def test_missing_post_returns_none_and_leaves_no_reaction(self, ldb):
+        assert await social_posts.toggle_like("nope", "u1") is None
+        assert ldb.social_reactions.docs == []
+
+
+class TestReconciliation:
+
+    @pytest.mark.asyncio
+    async def test_repairs_drift_with_bulk_write(self, ldb):
+        ldb.social_posts.docs.append({"id": "p2", "author_id": "a", "like_count": 7, "comment_count": 1})
+        ldb.social_posts.docs[0].update({"like_count": -2, "comment_count": 5})
+        ldb.social_reactions.docs.extend([
+            {"post_id": "p1", "user_id": "u1"},
+            {"post_id": "p1", "user_id": "u2"},
+            {"post_id": "p2", "user_id": "u1"},
+        ])
+        ldb.social_comments.docs.extend([
+            {"post_id": "p1", "is_deleted": False},
+            {"post_id": "p1", "is_deleted": True},
+            {"post_id": "p2", "is_deleted": False},
+        ])
+
+        stats = await social_posts.reconcile_engagement_counts()
+
+        assert stats == {"posts_scanned": 2, "posts_repaired": 2, "like_fixes": 2, "comment_fixes": 1}
+        assert ldb.social_posts.docs[0]["like_count"] == 2
+        assert ldb.social_posts.docs[0]["comment_count"] == 1
+        assert ldb.social_posts.docs[1]["like_count"] == 1
+        assert ldb.queries[("social_posts", "bulk_write")] == 1
+
+        again = await social_posts.reconcile_engagement_counts()
+        assert again["posts_repaired"] == 0
+
+    @pytest.mark.asyncio
+    async def test_duplicate_reactions_removed_before_unique_index(self, ldb):
+        # Left by toggles that raced before the unique index existed
+        early = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        ldb.social_reactions.docs.extend([
+            {"_id": ObjectId(), "post_id": "p1", "user_id": "u1", "created_at": early + timedelta(seconds=1)},
+            {"_id": ObjectId(), "post_id": "p1", "user_id": "u1", "created_at": early},
+            {"_id": ObjectId(), "post_id": "p1", "user_id": "u1", "created_at": early + timedelta(seconds=2)},
+            {"_id": ObjectId(), "post_id": "p1", "user_id": "u2", "created_at": early},
+        ])
+        ldb.social_posts.docs[0]["like_count"] = 4
+
+        stats = await social_posts.remove_duplicate_reactions()
+        await social_posts.reconcile_engagement_counts()
+
+        assert stats == {"pairs": 1, "removed": 2}
+        assert [(r["user_id"], r["created_at"]) for r in ldb.social_reactions.docs] == [("u1", early), ("u2", early)]
+        assert like_count(ldb) == 2
+        # Unliking now removes the user's only reaction
+        assert await social_posts.toggle_like("p1", "u1") == {"liked": False, "like_count": 1}
+        assert await social_posts.remove_duplicate_reactions() == {"pairs": 0, "removed": 0}
+
+    @pytest.mark.asyncio
+    async def test_unique_index_failure_keeps_other_indices(self, fake_db, monkeypatch):
+        async def _get_db():
+            return fake_db
+        monkeypatch.setattr(indices, "get_db", _get_db)
+        built = []
+
+        async def create_index(keys, unique=False, **kwargs):
+            if unique:
+                raise DuplicateKeyError("E11000 duplicate key error")  # duplicates not removed yet
+            built.append([k for k, _ in keys])
+        monkeypatch.setattr(fake_db.social_reactions, "create_index", create_index)
+
+        await indices.ensure_social_posts_indices()
+
+        assert built == [["user_id", "post_id"]]
+        assert ["id"] in fake_db.social_posts.unique_keys
@@ -0,0 +1,224 @@
+"""
+Social Timeline Fan-out Tests
+Fan-out-on-write delivery must follow circle_edges, respect BLOCKED and
+SAFE MODE in both directions, switch high-degree authors to read-time merge,
+and stay repairable via the consistency checker.
+"""
+
+import pytest
+from datetime import datetime, timezone, timedelta
+
+import db.social_posts as social_posts
+import db.social_timelines as timelines
+from db.relationships import (
+    TIER_PEOPLES,
+    TIER_COOL,
+    TIER_OTHERS,
+    TIER_OTHERS_SAFE_MODE,
+    TIER_BLOCKED
+)
+
+
+BASE = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def edge(owner, target, tier):
+    return {"ownerUserId": owner, "targetUserId": target, "tier": tier}
+
+
+@pytest.fixture
+def tdb(fake_db, monkeypatch):
+    async def _get_db():
+        return fake_db
+    monkeypatch.setattr(social_posts, "get_db", _get_db)
+    monkeypatch.setattr(timelines, "get_db", _get_db)
+    monkeypatch.setitem(timelines._pull_authors_cache, "ids", None)
+
+    for uid in ["author", "fan1", "fan2", "blocked_fan", "safe_fan", "muted_by_author", "stranger", "celeb"]:
+        fake_db.banibs_users.docs.append({"id": uid, "name": uid})
+
+    fake_db.circle_edges.docs.extend([
+        edge("fan1", "author", TIER_PEOPLES),
+        edge("fan2", "author", TIER_OTHERS),
+        edge("blocked_fan", "author", TIER_BLOCKED),
+        edge("safe_fan", "author", TIER_OTHERS_SAFE_MODE),
+        edge("muted_by_author", "author", TIER_COOL),
+        edge("author", "muted_by_author", TIER_BLOCKED),
+        edge("fan1", "celeb", TIER_COOL),
+    ])
+    return fake_db
+
+
+async def create(db, post_id, author_id, minutes):
+    post = {
+        "id": post_id,
+        "author_id": author_id,
+        "text": post_id,
+        "created_at": BASE + timedelta(minutes=minutes),
+        "updated_at": BASE,
+        "is_deleted": False,
+        "is_hidden": False,
+    }
+    db.social_posts.docs.append(dict(post))
+    return await timelines.fan_out_post(post)
+
+
+def owners_of(db, post_id):
+    return sorted(e["owner_id"] for e in db.social_timelines.docs if e["post_id"] == post_id)
+
+
+class TestFanOut:
+
+    @pytest.mark.asyncio
+    async def test_delivers_to_circle_respecting_block_and_safe_mode(self, tdb):
+        result = await create(tdb, "p1", "author", 0)
+
+        assert result["mode"] == "push"
+        assert owners_of(tdb, "p1") == ["author", "fan1", "fan2"]
+
+    @pytest.mark.asyncio
+    async def test_high_degree_author_is_pulled_at_read_time(self, tdb, monkeypatch):
+        monkeypatch.setattr(timelines, "FANOUT_MAX_DEGREE", 0)
+
+        result = await create(tdb, "c1", "celeb", 5)
+
+        assert result["mode"] == "pull"
+        assert owners_of(tdb, "c1") == ["celeb"]
+        assert tdb.social_pull_authors.docs[0]["author_id"] == "celeb"
+
+        page = await timelines.get_home_timeline("fan1", page_size=10)
+        assert [p["id"] for p in page["items"]] == ["c1"]
+
+        page = await timelines.get_home_timeline("fan2", page_size=10)
+        assert page["items"] == []
+
+
+class TestHomeTimeline:
+
+    @pytest.mark.asyncio
+    async def test_paginates_merged_timeline(self, tdb, monkeypatch):
+        for i in range(5):
+            await create(tdb, f"a{i}", "author", i * 2)
+        monkeypatch.setattr(timelines, "FANOUT_MAX_DEGREE", 0)
+        for i in range(3):
+            await create(tdb, f"c{i}", "celeb", i * 2 + 1)
+        await create(tdb, "s0", "stranger", 100)
+
+        ids, cursor = [], None
+        while True:
+            page = await timelines.get_home_timeline("fan1", cursor=cursor, page_size=3)
+            ids.extend(p["id"] for p in page["items"])
+            if not page["has_more"]:
+                break
+            cursor = page["next_cursor"]
+
+        assert ids == ["a4", "a3", "c2", "a2", "c1", "a1", "c0", "a0"]
+
+    @pytest.mark.asyncio
+    async def test_read_is_single_range_scan(self, tdb):
+        for i in range(30):
+            await create(tdb, f"a{i:02d}", "author", i)
+        tdb.reset_queries()
+
+        await timelines.get_home_timeline("fan1", page_size=20)
+
+        assert tdb.queries[("social_timelines", "find")] == 1
+        assert tdb.queries[("social_posts", "count_documents")] == 0
+
+    @pytest.mark.asyncio
+    async def test_hides_deleted_posts_and_later_blocks(self, tdb):
+        await create(tdb, "p1", "author", 0)
+        await create(tdb, "p2", "author", 1)
+        tdb.social_posts.docs[1]["is_deleted"] = True
+
+        page = await timelines.get_home_timeline("fan1")
+        assert [p["id"] for p in page["items"]] == ["p1"]
+
+        tdb.circle_edges.docs.append(edge("fan1", "author", TIER_BLOCKED))
+        page = await timelines.get_home_timeline("fan1")
+        assert page["items"] == []
+
+
+class TestMaintenance:
+
+    @pytest.mark.asyncio
+    async def test_trim_enforces_cap(self, tdb, monkeypatch):
+        for i in range(10):
+            await create(tdb, f"a{i}", "author", i)
+
+        stats = await timelines.trim_all_timelines(max_entries=4)
+
+        assert stats["timelines_trimmed"] == 3
+        remaining = sorted(e["post_id"] for e in tdb.social_timelines.docs if e["owner_id"] == "fan1")
+        assert remaining == ["a6", "a7", "a8", "a9"]
+
+    @pytest.mark.asyncio
+    async def test_backfill_is_idempotent(self, tdb):
+        now = datetime.now(timezone.utc)
+        tdb.social_posts.docs.append({
+            "id": "old", "author_id": "author", "created_at": now - timedelta(days=1),
+            "is_deleted": False, "is_hidden": False,
+        })
+
+        first = await timelines.backfill_timelines(days=7)
+        second = await timelines.backfill_timelines(days=7)
+
+        assert first["entries_written"] == 3
+        assert second["entries_written"] == 0
+        assert owners_of(tdb, "old") == ["author", "fan1", "fan2"]
+
+    @pytest.mark.asyncio
+    async def test_backfill_clears_pull_flag_once_under_cap(self, tdb, monkeypatch):
+        monkeypatch.setattr(timelines, "FANOUT_MAX_DEGREE", 0)
+        await create(tdb, "c1", "celeb", 0)
+        monkeypatch.setattr(timelines, "FANOUT_MAX_DEGREE", 5000)
+        tdb.social_posts.docs[0]["created_at"] = datetime.now(timezone.utc) - timedelta(days=1)
+
+        # Still flagged: fan-out keeps pulling until the backfill has re-delivered
+        assert (await create(tdb, "c2", "celeb", 1))["mode"] == "pull"
+
+        stats = await timelines.backfill_timelines(days=7)
+
+        assert stats["pull_authors_cleared"] == 1
+        assert tdb.social_pull_authors.docs == []
+        assert owners_of(tdb, "c1") == ["celeb", "fan1"]
+        assert (await create(tdb, "c3", "celeb", 2))["mode"] == "push"
+
+    @pytest.mark.asyncio
+    async def test_backfill_trims_to_cap(self, tdb, monkeypatch):
+        monkeypatch.setattr(timelines, "TIMELINE_MAX_ENTRIES", 2)
+        now = datetime.now(timezone.utc)
+        tdb.social_posts.docs.extend({
+            "id": f"p{i}", "author_id": "author", "created_at": now - timedelta(hours=i),
+            "is_deleted": False, "is_hidden": False,
+        } for i in range(5))
+
+        stats = await timelines.backfill_timelines(days=7, batch_size=2)
+
+        assert stats["entries_trimmed"] == 9
+        assert owners_of(tdb, "p0") == owners_of(tdb, "p1") == ["author", "fan1", "fan2"]
+        assert owners_of(tdb, "p4") == []
+
+    @pytest.mark.asyncio
+    async def test_consistency_checker_reports_and_repairs(self, tdb):
+        await create(tdb, "p1", "author", 0)
+        await create(tdb, "p2", "author", 1)
+        # Drift: fan2 lost an entry, the author blocked fan1 afterwards, p2 was deleted
+        tdb.social_timelines.docs = [
+            e for e in tdb.social_timelines.docs if not (e["owner_id"] == "fan2" and e["post_id"] == "p1")
+        ]
+        tdb.circle_edges.docs.append(edge("author", "fan1", TIER_BLOCKED))
+        tdb.social_posts.docs[1]["is_deleted"] = True
+
+        report = await timelines.check_timeline_consistency()
+        assert report["missing_entries"] == 1
+        assert report["unexpected_entries"] == 1
+        assert report["stale_entries"] == 3
+        assert sorted(report["inconsistent_posts"]) == ["p1", "p2"]
+
+        await timelines.check_timeline_consistency(repair=True)
+        assert owners_of(tdb, "p1") == ["author", "fan2"]
+        assert owners_of(tdb, "p2") == []
+
+        clean = await timelines.check_timeline_consistency()
+        assert clean["inconsistent_posts"] == []
@@ -6,21 +6,54 @@ Mirrors external RSS images to cdn.banibs.com/news and optimizes them.
 This ensures:
 - Fast loading (served from our domain)
 - Reliable availability (no broken external links)
-- Consistent sizing (max 1280px width)
-- Optimized file sizes (~85% JPEG quality)
+- Responsive sizing (sm / md / lg WebP + JPEG renditions, max 1280px)
+- Each distinct image stored once (content-addressed, utils/news_image_store)
+
+How a run works:
+- Downloads are async, bounded globally (CDN_MIRROR_CONCURRENCY) and per
+  host (CDN_MIRROR_PER_HOST); each distinct image URL is fetched once even
+  when several items share it, and not at all if an earlier run stored it
+- Renditions are rendered in a process pool (CDN_MIRROR_WORKERS,
+  utils/process_pool) instead of on the event loop; identical bytes from
+  different URLs reuse the stored files
+- Items get imageUrl (largest JPEG) plus imageSrcset / imageHash /
+  imageWidth / imageHeight; news_images reference counts are bumped
+- Each item records a mirror_state; failed items are retried with
+  exponential backoff (next_attempt_at) instead of on every run
+- URL rewrites are flushed with bulk_write every MIRROR_FLUSH_BATCH results,
+  so an interrupted run keeps the work it finished
 """
 
+import asyncio
 import os
-import requests
+from collections import defaultdict
 from urllib.parse import urlparse
-import hashlib
-from PIL import Image
-import io
-from datetime import datetime
-from motor.motor_asyncio import AsyncIOMotorClient
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+import aiohttp
+
+from db.connection import get_db
+from db.news_images import add_image_refs, get_images_for_urls
+from utils.news_image_store import CDN_BASE_URL, content_hash, render_news_image, srcset_fields
+from utils.process_pool import ProcessPool
 
 LOCAL_MIRROR_DIR = "/var/www/cdn.banibs.com/news"
-CDN_BASE_URL = "https://cdn.banibs.com/news"
+
+CDN_MIRROR_CONCURRENCY = int(os.environ.get("CDN_MIRROR_CONCURRENCY", "8"))
+CDN_MIRROR_PER_HOST = int(os.environ.get("CDN_MIRROR_PER_HOST", "4"))
+CDN_MIRROR_WORKERS = int(os.environ.get("CDN_MIRROR_WORKERS", str(min(4, os.cpu_count() or 1))))
+CDN_MIRROR_TIMEOUT_SECONDS = float(os.environ.get("CDN_MIRROR_TIMEOUT_SECONDS", "30"))
+
+MAX_IMAGE_BYTES = 20 * 1024 * 1024
+DOWNLOAD_CHUNK_BYTES = 64 * 1024
+MIRROR_FLUSH_BATCH = 100
+
+# Failed items wait 30 min, 1 h, 2 h, ... up to a week between attempts
+MIRROR_RETRY_BASE_SECONDS = 30 * 60
+MIRROR_RETRY_MAX_SECONDS = 7 * 24 * 3600
+
+USER_AGENT = "BANIBS-CDN-Mirror/1.0"
 
 # Fallback images that should NOT be mirrored
 FALLBACK_IMAGES = {
@@ -32,175 +65,226 @@ FALLBACK_IMAGES = {
 }
 
 
-def _generate_cdn_filename(original_url: str) -> str:
-    """Generate a unique filename for CDN storage"""
-    url_hash = hashlib.sha256(original_url.encode()).hexdigest()[:12]
-    timestamp = datetime.utcnow().strftime("%Y%m%d")
-    return f"{timestamp}_{url_hash}.jpg"
-
-
-def _optimize_image(image_data: bytes, max_width: int = 1280) -> bytes:
-    """Optimize image: resize and compress"""
-    try:
-        img = Image.open(io.BytesIO(image_data))
-        
-        # Convert to RGB if needed
-        if img.mode in ("RGBA", "P"):
-            img = img.convert("RGB")
-        
-        # Resize if too wide
-        if img.width > max_width:
-            ratio = max_width / img.width
-            new_height = int(img.height * ratio)
-            img = img.resize((max_width, new_height), Image.Resampling.LANCZOS)
-        
-        # Save optimized
-        output = io.BytesIO()
-        img.save(output, format="JPEG", quality=85, optimize=True)
-        return output.getvalue()
-    
-    except Exception as e:
-        print(f"Image optimization failed: {e}")
-        return image_data
-
-
-def _download_and_mirror_image(image_url: str) -> str | None:
-    """Download external image, optimize it, save locally, return CDN URL"""
-    if not image_url or image_url in FALLBACK_IMAGES.values():
-        return image_url  # Skip fallbacks
-    
-    if image_url.startswith(CDN_BASE_URL):
-        return image_url  # Already mirrored
-    
-    try:
-        # Ensure mirror directory exists
-        os.makedirs(LOCAL_MIRROR_DIR, exist_ok=True)
-        
-        # Generate filename
-        cdn_filename = _generate_cdn_filename(image_url)
-        local_path = os.path.join(LOCAL_MIRROR_DIR, cdn_filename)
-        cdn_url = f"{CDN_BASE_URL}/{cdn_filename}"
-        
-        # Skip if already exists
-        if os.path.exists(local_path):
-            return cdn_url
-        
-        # Download original image
-        headers = {"User-Agent": "BANIBS-CDN-Mirror/1.0"}
-        response = requests.get(image_url, headers=headers, timeout=30)
-        response.raise_for_status()
-        
-        # Optimize and save
-        optimized_data = _optimize_image(response.content)
-        
-        with open(local_path, "wb") as f:
-            f.write(optimized_data)
-        
-        print(f"Mirrored: {image_url} -> {cdn_url}")
-        return cdn_url
-    
-    except Exception as e:
-        print(f"Failed to mirror {image_url}: {e}")
-        return image_url  # Return original on failure
-
-
-async def mirror_all_images():
+def retry_delay(attempts: int) -> timedelta:
+    """Backoff before the next attempt after `attempts` consecutive failures"""
+    seconds = MIRROR_RETRY_BASE_SECONDS * 2 ** min(max(attempts - 1, 0), 20)
+    return timedelta(seconds=min(seconds, MIRROR_RETRY_MAX_SECONDS))
+
+
+class ImageMirror:
+    """
+    Shared HTTP session, concurrency limits and optimize pool for one run.
+
+    Usage:
+        async with ImageMirror() as mirror:
+            result = await mirror.mirror(image_url)
+    """
+
+    def __init__(
+        self,
+        mirror_dir: Optional[str] = None,
+        concurrency: int = CDN_MIRROR_CONCURRENCY,
+        per_host: int = CDN_MIRROR_PER_HOST,
+        workers: Optional[int] = None,
+        timeout_seconds: float = CDN_MIRROR_TIMEOUT_SECONDS
+    ):
+        # Resolved at call time so scripts can point a whole run elsewhere
+        self.mirror_dir = mirror_dir or LOCAL_MIRROR_DIR
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.timeout = aiohttp.ClientTimeout(total=timeout_seconds)
+        self._global = asyncio.Semaphore(concurrency)
+        self._hosts: Dict[str, asyncio.Semaphore] = defaultdict(lambda: asyncio.Semaphore(self.per_host))
+        self._pool = ProcessPool(CDN_MIRROR_WORKERS if workers is None else workers, name="CDN image render")
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def __aenter__(self) -> "ImageMirror":
+        await self._pool.__aenter__()
+        self._session = aiohttp.ClientSession(
+            timeout=self.timeout,
+            headers={"User-Agent": USER_AGENT},
+            connector=aiohttp.TCPConnector(limit=self.concurrency, limit_per_host=self.per_host)
+        )
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self._session.close()
+        self._session = None
+        await self._pool.__aexit__(*exc)
+
+    async def mirror(self, image_url: str) -> Dict[str, Any]:
+        """
+        Download one external image and store its renditions.
+
+        Returns:
+            {"url": image_url, "image": render metadata | None, "error": str | None}
+        """
+        try:
+            host = urlparse(image_url).netloc.lower()
+            async with self._global, self._hosts[host]:
+                async with self._session.get(image_url) as resp:
+                    resp.raise_for_status()
+                    if (resp.content_length or 0) > MAX_IMAGE_BYTES:
+                        raise ValueError(f"image too large ({resp.content_length} bytes)")
+                    # Streamed so a body without Content-Length is cut off at the limit
+                    chunks, size = [], 0
+                    async for chunk in resp.content.iter_chunked(DOWNLOAD_CHUNK_BYTES):
+                        size += len(chunk)
+                        if size > MAX_IMAGE_BYTES:
+                            raise ValueError(f"image too large (over {MAX_IMAGE_BYTES} bytes)")
+                        chunks.append(chunk)
+                    image_data = b"".join(chunks)
+
+            image = await self._pool.run(render_news_image, image_data, content_hash(image_data), self.mirror_dir)
+            return {"url": image_url, "image": image, "error": None}
+
+        except Exception as e:
+            return {"url": image_url, "image": None, "error": str(e) or type(e).__name__}
+
+
+def _pending_query(field: str, excluded: Dict[str, Any], now: datetime) -> Dict[str, Any]:
+    """External images on `field` that aren't waiting out a retry backoff"""
+    return {
+        field: {"$exists": True, "$ne": None},
+        "$nor": [{field: {"$regex": f"^{CDN_BASE_URL}"}}, excluded],
+        "$or": [
+            {"mirror_state.next_attempt_at": {"$exists": False}},
+            {"mirror_state.next_attempt_at": {"$lte": now}},
+        ],
+    }
+
+
+# (collection, image URL field, srcset field prefix, exclusion for fallback images, touch updatedAt)
+MIRROR_TARGETS = [
+    ("news_items", "imageUrl", "image", {"imageUrl": {"$in": list(FALLBACK_IMAGES.values())}}, False),
+    ("featured_media", "thumbnailUrl", "thumbnail", {"thumbnailUrl": {"$regex": "^https://cdn.banibs.com/fallback/"}}, True),
+]
+
+
+def _mirror_update(target: tuple, doc: Dict[str, Any], result: Dict[str, Any], now: datetime):
+    """UpdateOne recording one item's mirror outcome"""
+    from pymongo import UpdateOne
+
+    _, field, prefix, _, touch_updated_at = target
+    if result["image"]:
+        update = srcset_fields(result["image"], prefix)
+        update[field] = update.pop("url")
+        update["mirror_state"] = {"status": "mirrored", "source_url": result["url"], "mirrored_at": now}
+        if touch_updated_at:
+            update["updatedAt"] = now
+    else:
+        attempts = (doc.get("mirror_state") or {}).get("attempts", 0) + 1
+        update = {"mirror_state": {
+            "status": "failed",
+            "attempts": attempts,
+            "last_error": result["error"][:300],
+            "next_attempt_at": now + retry_delay(attempts),
+        }}
+    return UpdateOne({"id": doc["id"]}, {"$set": update})
+
+
+async def _flush(db, ops: Dict[str, List[Any]], refs: Dict[str, Dict[str, Any]]) -> None:
+    # References first: a crash in between leaves an image over-counted
+    # (kept too long), never under-counted (deleted while in use)
+    await add_image_refs(refs)
+    refs.clear()
+    for collection, pending in ops.items():
+        if pending:
+            await db[collection].bulk_write(pending, ordered=False)
+            pending.clear()
+
+
+async def mirror_all_images(mirror: Optional[ImageMirror] = None) -> Dict[str, Any]:
     """
     Find all NewsItems with external imageUrls and FeaturedMedia with external thumbnailUrls,
     mirror them to CDN, and update the database with new CDN URLs.
+
+    Items that failed before are skipped until their mirror_state.next_attempt_at.
+
+    Args:
+        mirror: Open ImageMirror to use (one is opened for the run if omitted)
     """
-    mongo_url = os.environ.get('MONGO_URL')
-    db_name = os.environ.get('DB_NAME')
-    
-    client = AsyncIOMotorClient(mongo_url)
-    db = client[db_name]
-    news_collection = db.news_items
-    media_collection = db.featured_media
-    
-    try:
-        total_processed = 0
-        mirrored_count = 0
-        failed_count = 0
-        
-        # 1. Mirror NewsItem images
-        query = {
-            "imageUrl": {"$exists": True, "$ne": None},
-            "$nor": [
-                {"imageUrl": {"$regex": f"^{CDN_BASE_URL}"}},
-                {"imageUrl": {"$in": list(FALLBACK_IMAGES.values())}}
-            ]
-        }
-        
-        news_items = await news_collection.find(query, {"_id": 0}).to_list(length=None)
-        
-        for item in news_items:
-            original_url = item.get("imageUrl")
-            if not original_url:
-                continue
-                
-            total_processed += 1
-            
-            # Mirror the image
-            cdn_url = _download_and_mirror_image(original_url)
-            
-            if cdn_url and cdn_url != original_url:
-                # Update database with new CDN URL
-                await news_collection.update_one(
-                    {"id": item["id"]},
-                    {"$set": {"imageUrl": cdn_url}}
-                )
-                mirrored_count += 1
-            else:
-                failed_count += 1
-        
-        # 2. Mirror FeaturedMedia thumbnails  
-        media_query = {
-            "thumbnailUrl": {"$exists": True, "$ne": None},
-            "$nor": [
-                {"thumbnailUrl": {"$regex": f"^{CDN_BASE_URL}"}},
-                {"thumbnailUrl": {"$regex": "^https://cdn.banibs.com/fallback/"}}
-            ]
-        }
-        
-        media_items = await media_collection.find(media_query, {"_id": 0}).to_list(length=None)
-        
-        for item in media_items:
-            original_url = item.get("thumbnailUrl")
-            if not original_url:
-                continue
-                
-            total_processed += 1
-            
-            # Mirror the thumbnail
-            cdn_url = _download_and_mirror_image(original_url)
-            
-            if cdn_url and cdn_url != original_url:
-                # Update database with new CDN URL
-                await media_collection.update_one(
-                    {"id": item["id"]},
-                    {"$set": {"thumbnailUrl": cdn_url, "updatedAt": datetime.utcnow()}}
-                )
-                mirrored_count += 1
-            else:
-                failed_count += 1
-        
-        return {
-            "total_processed": total_processed,
-            "mirrored_successfully": mirrored_count,
-            "failed_or_skipped": failed_count,
-            "timestamp": datetime.utcnow().isoformat() + "Z"
-        }
-    
-    finally:
-        client.close()
+    db = await get_db()
+    now = datetime.utcnow()
+
+    # Distinct image URL -> items using it
+    targets: Dict[str, List[tuple]] = defaultdict(list)
+    for target in MIRROR_TARGETS:
+        collection, field, _, excluded, _ = target
+        items = await db[collection].find(
+            _pending_query(field, excluded, now),
+            {"_id": 0, "id": 1, field: 1, "mirror_state": 1}
+        ).to_list(length=None)
+        for item in items:
+            if item.get(field):
+                targets[item[field]].append((target, item))
+
+    # URLs an earlier run already stored need no download
+    known = await get_images_for_urls(list(targets))
+
+    total_processed = 0
+    mirrored_count = 0
+    failed_count = 0
+    downloaded = 0
+    ops: Dict[str, List[Any]] = defaultdict(list)
+    refs: Dict[str, Dict[str, Any]] = {}
+
+    async def _resolve(active: ImageMirror, url: str) -> Dict[str, Any]:
+        nonlocal downloaded
+        if url in known:
+            return {"url": url, "image": known[url], "error": None}
+        downloaded += 1
+        return await active.mirror(url)
+
+    async def _run(active: ImageMirror) -> None:
+        nonlocal total_processed, mirrored_count, failed_count
+        tasks = [asyncio.ensure_future(_resolve(active, url)) for url in targets]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                result = await next_done
+                users = targets[result["url"]]
+                for target, item in users:
+                    total_processed += 1
+                    ops[target[0]].append(_mirror_update(target, item, result, now))
+                if result["image"]:
+                    mirrored_count += len(users)
+                    ref = refs.setdefault(result["image"]["hash"], {"count": 0, "image": result["image"], "source_urls": set()})
+                    ref["count"] += len(users)
+                    ref["source_urls"].add(result["url"])
+                else:
+                    failed_count += len(users)
+                    print(f"Failed to mirror {result['url']}: {result['error']}")
+
+                # Checkpoint: finished work survives an interrupted run
+                if sum(len(pending) for pending in ops.values()) >= MIRROR_FLUSH_BATCH:
+                    await _flush(db, ops, refs)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await _flush(db, ops, refs)
+
+    if targets:
+        if mirror is None:
+            async with ImageMirror() as own_mirror:
+                await _run(own_mirror)
+        else:
+            await _run(mirror)
+
+    return {
+        "total_processed": total_processed,
+        "mirrored_successfully": mirrored_count,
+        "failed_or_skipped": failed_count,
+        "unique_images": len(targets),
+        "downloaded": downloaded,
+        "timestamp": datetime.utcnow().isoformat() + "Z"
+    }
 
 
 def main():
     """CLI entry point for manual mirror operations"""
-    import asyncio
     result = asyncio.run(mirror_all_images())
     print(f"Mirror complete: {result}")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,160 @@
+"""
+Conditional GET - Catalog Listings
+ETag / Last-Modified validators for public list endpoints that clients poll
+(community hub catalogs, resources).
+
+A revalidation (If-None-Match / If-Modified-Since) is checked against a
+version probe: the listing's own query run with LISTING_VERSION_PROJECTION,
+so Mongo returns only ids and timestamps for the same filter / sort / skip /
+limit. A match is answered with a 304 before the full documents are read or
+validated. Unconditional requests skip the probe; their validators come from
+the page that was fetched anyway.
+
+- ETag: strong, sha1 over the newest updated_at (falling back to created_at)
+  plus the result ids in order (plus any extras, e.g. the listing total)
+- Last-Modified: that newest timestamp, in HTTP-date format
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from fastapi import Request, Response
+
+LISTING_VERSION_PROJECTION = {"_id": 0, "id": 1, "updated_at": 1, "created_at": 1}
+
+# Clients may store the body but must revalidate before reusing it
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+
+def _as_utc(value: Any) -> Optional[datetime]:
+    """Timestamps are stored as datetimes or ISO strings (community hub)"""
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def listing_validators(docs: Iterable[Dict[str, Any]], *extra: Any) -> Tuple[str, Optional[datetime]]:
+    """
+    (etag, last_modified) for a version probe result.
+
+    Any edit that bumps updated_at, and any insert / delete / reorder that
+    changes the page's ids, produces a new ETag.
+    """
+    ids: List[str] = []
+    newest: Optional[datetime] = None
+    for doc in docs:
+        ids.append(str(doc.get("id")))
+        stamp = _as_utc(doc.get("updated_at") or doc.get("created_at"))
+        if stamp is not None and (newest is None or stamp > newest):
+            newest = stamp
+
+    digest = hashlib.sha1()
+    digest.update((newest.isoformat() if newest else "-").encode("utf-8"))
+    for part in ids + [str(value) for value in extra]:
+        digest.update(b"\x00")
+        digest.update(part.encode("utf-8"))
+    return f'"{digest.hexdigest()}"', newest
+
+
+def http_date(value: datetime) -> str:
+    """RFC 7231 HTTP-date"""
+    return format_datetime(_as_utc(value), usegmt=True)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    # Weak comparison, as RFC 7232 requires for If-None-Match
+    candidates = [tag.strip() for tag in header.split(",")]
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    """
+    True when the client's cached copy is current.
+
+    If-None-Match takes precedence; If-Modified-Since is only consulted when
+    the client sent no ETag (RFC 7232 section 6).
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since is None:
+            return False
+        # HTTP-dates have one-second resolution
+        return last_modified.replace(microsecond=0) <= _as_utc(since)
+    return False
+
+
+def set_validators(response: Response, etag: str, last_modified: Optional[datetime]) -> None:
+    """Attach ETag / Last-Modified (and revalidation policy) to a response"""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = REVALIDATE_CACHE_CONTROL
+    if last_modified is not None:
+        response.headers["Last-Modified"] = http_date(last_modified)
+
+
+def not_modified_response(etag: str, last_modified: Optional[datetime]) -> Response:
+    """Empty 304 carrying the same validators a 200 would"""
+    response = Response(status_code=304)
+    set_validators(response, etag, last_modified)
+    return response
+
+
+def is_revalidation(request: Request) -> bool:
+    """True when the client sent validators, i.e. a 304 is possible"""
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def check_not_modified(request: Request, response: Response, probe: Iterable[Dict[str, Any]], *extra: Any) -> Optional[Response]:
+    """
+    Evaluate a version probe for a listing endpoint.
+
+    Sets the validators on the endpoint's response and returns a 304 response
+    when the client is current; returns None when the full listing should be
+    built.
+    """
+    etag, last_modified = listing_validators(probe, *extra)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(etag, last_modified)
+    set_validators(response, etag, last_modified)
+    return None
+
+
+async def fetch_listing(
+    request: Request,
+    response: Response,
+    fetch: Callable[..., Awaitable[List[Dict[str, Any]]]]
+) -> Union[Response, List[Dict[str, Any]]]:
+    """
+    Run a listing query under conditional GET.
+
+    fetch(projection=None) runs the listing query. A revalidation runs the
+    version probe first and returns the 304 response when the client is
+    current; otherwise the full page is fetched once and the validators are
+    computed from it.
+    """
+    if is_revalidation(request):
+        not_modified = check_not_modified(request, response, await fetch(projection=LISTING_VERSION_PROJECTION))
+        if not_modified:
+            return not_modified
+
+    docs = await fetch()
+    set_validators(response, *listing_validators(docs))
+    return docs
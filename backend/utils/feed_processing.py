@@ -0,0 +1,382 @@
+"""
+RSS Feed Processing
+CPU-bound half of the RSS pipeline: feedparser, HTML cleaning,
+fingerprints, SimHashes, rule-based sentiment, Black News tags and section fields.
+
+FeedProcessor runs process_feed_payload for each downloaded feed in a
+process pool (RSS_PARSE_WORKERS processes, utils/process_pool) so a sync
+doesn't block the event loop that serves API traffic; only plain dicts come
+back for the bulk insert. With workers=0 everything runs in-process (tests,
+scripts).
+
+Workers are spawned and import this module fresh, so it must not open
+database connections at import time.
+"""
+
+import hashlib
+import os
+import re
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+import feedparser
+
+from models.news import NewsItemDB
+from services.news_clustering import band_keys, story_simhash
+from utils.process_pool import ProcessPool
+
+# 0 = parse in-process on the event loop
+RSS_PARSE_WORKERS = int(os.environ.get("RSS_PARSE_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+
+def make_fingerprint(source_name: str, title: str) -> str:
+    """
+    Create a deterministic hash for deduplication
+    Format: SHA256(sourceName::title)
+    """
+    raw = f"{source_name}::{title}".encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()
+
+
+IMG_TAG_REGEX = re.compile(r'<img[^>]+src=["\']([^"\']+)["\']', re.IGNORECASE)
+
+def _is_probably_image_url(url: str) -> bool:
+    """
+    Quick validation that a URL looks like an image.
+    Checks scheme, netloc, and common image extensions.
+    """
+    if not url:
+        return False
+    try:
+        parsed = urlparse(url)
+        if parsed.scheme not in ("http", "https") or not parsed.netloc:
+            return False
+        # Check common image extensions
+        path_lower = parsed.path.lower()
+        return any(path_lower.endswith(ext) for ext in [".jpg", ".jpeg", ".png", ".webp", ".gif", ".svg"])
+    except Exception:
+        return False
+
+def _extract_image(entry):
+    """
+    Phase 6.5.3 - Enhanced image extraction from RSS entry.
+    Priority:
+      1) media:content / media:thumbnail (RSS media namespace)
+      2) enclosure with image/* type (RSS 2.0)
+      3) <img> tag inside summary/content (HTML parsing)
+      4) (Future) OG image scraping from article URL (disabled for performance)
+    
+    Returns image URL or None if no valid image found.
+    """
+    # 1. media:content (WordPress, TechCrunch, many modern RSS feeds)
+    media_content = entry.get("media_content") or entry.get("media:content")
+    if isinstance(media_content, list) and media_content:
+        for m in media_content:
+            url = (m.get("url") or "").strip()
+            if _is_probably_image_url(url):
+                return url
+
+    # 2. media:thumbnail (common in YouTube, podcasts, etc.)
+    media_thumb = entry.get("media_thumbnail") or entry.get("media:thumbnail")
+    if isinstance(media_thumb, list) and media_thumb:
+        for t in media_thumb:
+            url = (t.get("url") or "").strip()
+            if _is_probably_image_url(url):
+                return url
+
+    # 3. enclosure or link of type image/* (RSS 2.0 standard)
+    enclosures = entry.get("enclosures") or entry.get("links") or []
+    for enc in enclosures:
+        enc_type = (enc.get("type") or "").lower()
+        url = (enc.get("href") or enc.get("url") or "").strip()
+        if enc_type.startswith("image/") and _is_probably_image_url(url):
+            return url
+
+    # 4. First <img> tag inside summary/content HTML (very common fallback)
+    html_candidates = []
+    
+    # Check summary
+    if "summary" in entry:
+        html_candidates.append(entry.get("summary") or "")
+    
+    # Check content (feedparser may return list of dicts or string)
+    if "content" in entry:
+        content_val = entry.get("content")
+        if isinstance(content_val, list) and content_val:
+            html_candidates.extend(c.get("value", "") for c in content_val)
+        elif isinstance(content_val, str):
+            html_candidates.append(content_val)
+    
+    # Check description as fallback
+    if "description" in entry:
+        html_candidates.append(entry.get("description") or "")
+    
+    # Parse HTML for <img> tags
+    for html in html_candidates:
+        if not html:
+            continue
+        for match in IMG_TAG_REGEX.findall(html):
+            url = match.strip()
+            if _is_probably_image_url(url):
+                return url
+
+    # 5. OPTIONAL: OG image scraping (disabled by default for performance)
+    # Could be enabled behind a feature flag in future:
+    # - Fetches article HTML and extracts og:image meta tag
+    # - Adds ~1-3 seconds per article, so guard with limits
+    # - Useful for sources that don't include images in RSS
+
+    # No valid image found
+    return None
+
+def _extract_published(entry):
+    for key in ["published", "pubDate", "updated"]:
+        if entry.get(key):
+            try:
+                return parsedate_to_datetime(entry[key])
+            except Exception:
+                pass
+    return datetime.utcnow()
+
+
+def parse_feed_content(content: bytes) -> List[Dict[str, Any]]:
+    """
+    Parse a downloaded RSS/Atom payload.
+    Returns list of dictionaries compatible with NewsItem schema.
+    """
+    feed = feedparser.parse(content)
+
+    items = []
+    for entry in feed.entries:
+        title = entry.get("title", "").strip()
+        summary = entry.get("summary", "") or entry.get("description", "")
+        image = _extract_image(entry)
+        published = _extract_published(entry)
+        link = entry.get("link", "")
+
+        items.append({
+            "title": title,
+            "summary": summary.strip()[:500],
+            "imageUrl": image,
+            "publishedAt": published,
+            "sourceUrl": link,
+        })
+
+    return items
+
+
+def clean_html(text: str) -> str:
+    """Strip HTML tags and clean text"""
+    if not text:
+        return ""
+    # Remove HTML tags
+    text = re.sub(r'<[^<]+?>', '', text)
+    # Decode HTML entities
+    text = text.replace('&nbsp;', ' ').replace('&amp;', '&')
+    text = text.replace('&lt;', '<').replace('&gt;', '>')
+    text = text.replace('&quot;', '"').replace('&#39;', "'")
+    # Clean whitespace
+    text = re.sub(r'\s+', ' ', text).strip()
+    return text
+
+
+def build_news_doc(
+    item: Dict[str, Any],
+    title: str,
+    fingerprint: str,
+    url: str,
+    category: str,
+    source_name: str,
+    fallback_image: Optional[str] = None,
+    region: Optional[str] = None,
+    is_black_owned: bool = False,
+    is_black_focus: bool = False,
+    timings: Optional[Dict[str, float]] = None
+) -> Dict[str, Any]:
+    """
+    Shape one parsed feed entry into a news_items document: cleaned summary,
+    fallback image, sentiment, SimHash, Black News tags and section fields.
+    Time spent on sentiment is added to timings["sentiment_seconds"] if given.
+    """
+    # Get image URL or use fallback
+    image_url = item.get("imageUrl")
+    if not image_url and fallback_image:
+        image_url = fallback_image
+    
+    # Clean and limit summary
+    summary = item.get('summary', '')
+    summary = clean_html(summary) if summary else f"Read more on {source_name}"
+    summary = summary[:500]  # Limit to 500 chars
+    
+    # Phase 6.3: Analyze sentiment (fail gracefully if error)
+    sentiment_score = 0.0
+    sentiment_label = "neutral"
+    sentiment_at = None
+    sentiment_started = time.perf_counter()
+    try:
+        from services.sentiment_service import analyze_text_sentiment
+        text_for_sentiment = f"{title} {summary}"
+        sentiment_result = analyze_text_sentiment(text_for_sentiment)
+        sentiment_score = sentiment_result["score"]
+        sentiment_label = sentiment_result["label"]
+        sentiment_at = sentiment_result["analyzed_at"]
+    except Exception as sentiment_error:
+        print(f"Sentiment analysis failed for {title[:50]}: {sentiment_error}")
+        # Continue without sentiment - don't break RSS sync
+    if timings is not None:
+        timings["sentiment_seconds"] = timings.get("sentiment_seconds", 0.0) + time.perf_counter() - sentiment_started
+    
+    # Create news item
+    news_item = NewsItemDB(
+        title=title[:200],  # Limit title length
+        summary=summary,
+        category=category,
+        region=region,  # Geographic region from RSS source config
+        imageUrl=image_url,
+        publishedAt=item.get('publishedAt') or datetime.utcnow(),
+        sourceUrl=item.get('sourceUrl', url),
+        sourceName=source_name,
+        isFeatured=False,
+        external=True,  # RSS content is external
+        fingerprint=fingerprint
+    )
+    
+    # Convert to dict and add sentiment fields
+    news_dict = news_item.dict()
+    news_dict["sentiment_score"] = sentiment_score
+    news_dict["sentiment_label"] = sentiment_label
+    news_dict["sentiment_at"] = sentiment_at
+    
+    # Near-duplicate lookup keys; cluster_id is assigned when stored
+    news_dict["simhash"] = story_simhash(title, summary)
+    news_dict["simhash_bands"] = band_keys(news_dict["simhash"])
+    
+    # Apply Black News tagging
+    from services.black_news_tagging_service import tag_black_news_item
+    news_dict = tag_black_news_item(
+        news_dict,
+        source_is_black_owned=is_black_owned,
+        source_is_black_focus=is_black_focus,
+        source_category=category
+    )
+    
+    # Persist homepage section + section page tags once, at ingest
+    from services.news_categorization_service import compute_section_fields
+    news_dict.update(compute_section_fields(news_dict))
+    
+    return news_dict
+
+
+def estimate_publish_interval(feed_items: List[Dict[str, Any]]) -> Optional[float]:
+    """
+    Median gap in seconds between consecutive entry publish times, or None
+    when the feed has fewer than two distinct dates.
+    """
+    stamps = set()
+    for item in feed_items:
+        published = item.get("publishedAt")
+        if isinstance(published, datetime):
+            if published.tzinfo is not None:
+                published = published.astimezone(timezone.utc).replace(tzinfo=None)
+            stamps.add(published)
+    
+    ordered = sorted(stamps)
+    gaps = sorted((later - earlier).total_seconds() for earlier, later in zip(ordered, ordered[1:]))
+    if not gaps:
+        return None
+    return gaps[len(gaps) // 2]
+
+
+def prepare_feed_items(
+    feed_items: List[Dict[str, Any]],
+    url: str,
+    category: str,
+    source_name: str,
+    limit: int = 5,
+    fallback_image: Optional[str] = None,
+    region: Optional[str] = None,
+    is_black_owned: bool = False,
+    is_black_focus: bool = False
+) -> Dict[str, Any]:
+    """
+    Fingerprint and build news_items documents for parsed feed items
+    (limited to the most recent), dropping in-feed repeats.
+    
+    Returns:
+        {"docs": [news_items documents], "duplicates": n, "errors": n,
+         "items_parsed": entries in the feed,
+         "publish_interval_seconds": estimate over the whole feed,
+         "timings": {"sentiment_seconds": s}}
+    """
+    prepared = {
+        "docs": [],
+        "duplicates": 0,
+        "errors": 0,
+        "items_parsed": len(feed_items),
+        "publish_interval_seconds": estimate_publish_interval(feed_items),
+        "timings": {"sentiment_seconds": 0.0},
+    }
+    seen = set()
+    for item in feed_items[:limit]:
+        title = item.get('title', '').strip()
+        if not title:
+            continue  # Skip entries without titles
+        
+        fingerprint = make_fingerprint(source_name, title)
+        if fingerprint in seen:
+            prepared["duplicates"] += 1
+            continue
+        seen.add(fingerprint)
+        
+        try:
+            prepared["docs"].append(build_news_doc(
+                item, title, fingerprint,
+                url=url,
+                category=category,
+                source_name=source_name,
+                fallback_image=fallback_image,
+                region=region,
+                is_black_owned=is_black_owned,
+                is_black_focus=is_black_focus,
+                timings=prepared["timings"]
+            ))
+        except Exception as build_error:
+            prepared["errors"] += 1
+            print(f"Skipping RSS item {title[:50]} from {source_name}: {build_error}")
+    
+    return prepared
+
+
+def process_feed_payload(content: bytes, **options: Any) -> Dict[str, Any]:
+    """
+    Parse a downloaded feed and prepare its documents (prepare_feed_items
+    keyword arguments). Runs inside FeedProcessor's worker processes.
+    timings gains parse_seconds and prepare_seconds (sentiment included).
+    """
+    started = time.perf_counter()
+    feed_items = parse_feed_content(content)
+    parsed = time.perf_counter()
+    prepared = prepare_feed_items(feed_items, **options)
+    prepared["timings"]["parse_seconds"] = parsed - started
+    prepared["timings"]["prepare_seconds"] = time.perf_counter() - parsed
+    return prepared
+
+
+class FeedProcessor(ProcessPool):
+    """
+    Process pool for one sync run (utils/process_pool).
+    
+    Usage:
+        async with FeedProcessor() as processor:
+            prepared = await processor.process(content, url=..., category=..., source_name=...)
+    """
+    
+    def __init__(self, workers: Optional[int] = None):
+        super().__init__(RSS_PARSE_WORKERS if workers is None else workers, name="RSS parse")
+    
+    async def process(self, content: bytes, **options: Any) -> Dict[str, Any]:
+        """process_feed_payload, off the event loop when a pool is running"""
+        return await self.run(process_feed_payload, content, **options)
@@ -1,5 +1,5 @@
 """
-Image processing utilities for profile photos
+Image processing utilities for profile photos and mirrored news images
 Phase 9.0.1 - Profile Photos
 
 Handles:
@@ -7,6 +7,8 @@ Handles:
 - Cover image cropping (1500x500)
 - EXIF stripping for privacy
 - WebP conversion for optimization
+- News image resize + JPEG re-encode (the CDN mirror's original
+  single-rendition format; utils/news_image_store now renders mirrors)
 """
 
 from PIL import Image, ImageOps
@@ -58,3 +60,29 @@ def process_cover(raw_bytes: bytes, width: int = 1500, height: int = 500) -> byt
         out = BytesIO()
         im.save(out, format="WEBP", quality=88, method=6)
         return out.getvalue()
+
+
+def optimize_news_image(image_data: bytes, max_width: int = 1280) -> bytes:
+    """Optimize image: resize and compress (original bytes if it can't be decoded)"""
+    try:
+        img = Image.open(BytesIO(image_data))
+        
+        # Convert to RGB if needed
+        if img.mode in ("RGBA", "P"):
+            img = img.convert("RGB")
+        
+        # Resize if too wide
+        if img.width > max_width:
+            ratio = max_width / img.width
+            new_height = int(img.height * ratio)
+            img = img.resize((max_width, new_height), Image.Resampling.LANCZOS)
+        
+        # Save optimized
+        output = BytesIO()
+        img.save(output, format="JPEG", quality=85, optimize=True)
+        return output.getvalue()
+    
+    except Exception as e:
+        print(f"Image optimization failed: {e}")
+        return image_data
+
@@ -0,0 +1,187 @@
+"""
+News Image Store
+Content-addressed storage for mirrored news images.
+
+- Files are keyed by the SHA-256 of the downloaded bytes, so the same wire
+  photo used by several outlets is stored once
+- Each image gets sm / md / lg renditions (320 / 768 / 1280 px wide, never
+  upscaled) in WebP and JPEG, generated once
+- On disk: {root}/{hash[:2]}/{hash[2:4]}/{hash}-{size}.{ext}. Public URLs
+  stay flat (cdn.banibs.com/news/{hash}-{size}.{ext}); server.py's
+  /cdn/news/{filename} maps them to their shard with resolve_cdn_file
+- A {hash}.json manifest is written after the renditions and marks the
+  image complete
+- db/news_images keeps rendition metadata and a reference count of the
+  items using each image; tasks/cdn_image_gc deletes files nothing uses
+  (scan_mirror_files)
+- Flat files from the old mirror ({date}_{urlhash}.jpg in the root) are
+  moved into the store by scripts/migrate_cdn_mirror_layout.py
+
+render_news_image runs in the CDN mirror's worker processes, so this module
+has no database imports.
+"""
+
+import hashlib
+import json
+import os
+import re
+from io import BytesIO
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from PIL import Image, ImageOps
+
+CDN_BASE_URL = "https://cdn.banibs.com/news"
+
+# (name, max width), smallest first
+RENDITIONS = [("sm", 320), ("md", 768), ("lg", 1280)]
+
+# format -> (extension, PIL format, save options)
+FORMATS = {
+    "webp": ("webp", "WEBP", {"quality": 80, "method": 4}),
+    "jpeg": ("jpg", "JPEG", {"quality": 85, "optimize": True, "progressive": True}),
+}
+
+CONTENT_FILENAME_RE = re.compile(r"^([0-9a-f]{64})-(sm|md|lg)\.(webp|jpg)$")
+# Renditions, manifests and the temp files of interrupted writes
+STORED_FILENAME_RE = re.compile(r"^([0-9a-f]{64})(?:-(?:sm|md|lg)\.(?:webp|jpg)|\.json)(?:\.\d+\.tmp)?$")
+SHARD_NAME_RE = re.compile(r"^[0-9a-f]{2}$")
+LEGACY_FILENAME_RE = re.compile(r"^[A-Za-z0-9_.-]+\.(jpg|jpeg|png|webp|gif)$")
+
+
+def content_hash(image_data: bytes) -> str:
+    return hashlib.sha256(image_data).hexdigest()
+
+
+def shard_dir(root: str, digest: str) -> str:
+    return os.path.join(root, digest[:2], digest[2:4])
+
+
+def rendition_filename(digest: str, name: str, fmt: str) -> str:
+    return f"{digest}-{name}.{FORMATS[fmt][0]}"
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    """Temp file + rename: a half-written file is never served"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def render_news_image(image_data: bytes, digest: str, root: str) -> Dict[str, Any]:
+    """
+    Write every rendition of an image (skipped if its manifest exists).
+
+    Returns:
+        {"hash", "width", "height", "renditions": [{"name", "format",
+         "filename", "width", "height", "bytes"}]}
+
+    Raises ValueError if the bytes aren't a decodable image.
+    """
+    directory = shard_dir(root, digest)
+    manifest_path = os.path.join(directory, f"{digest}.json")
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            return json.load(f)
+
+    try:
+        img = Image.open(BytesIO(image_data))
+        img = ImageOps.exif_transpose(img).convert("RGB")
+    except Exception as e:
+        raise ValueError(f"not a decodable image: {e}") from e
+
+    os.makedirs(directory, exist_ok=True)
+    renditions: List[Dict[str, Any]] = []
+    for name, max_width in RENDITIONS:
+        width = min(max_width, img.width)
+        if renditions and renditions[-1]["width"] == width:
+            continue  # source is narrower than this size; nothing new to store
+        height = max(1, round(img.height * width / img.width))
+        resized = img if width == img.width else img.resize((width, height), Image.Resampling.LANCZOS)
+
+        for fmt, (ext, pil_format, options) in FORMATS.items():
+            out = BytesIO()
+            resized.save(out, format=pil_format, **options)
+            filename = rendition_filename(digest, name, fmt)
+            _write_atomic(os.path.join(directory, filename), out.getvalue())
+            renditions.append({
+                "name": name,
+                "format": fmt,
+                "filename": filename,
+                "width": width,
+                "height": resized.height,
+                "bytes": out.tell(),
+            })
+
+    meta = {"hash": digest, "width": img.width, "height": img.height, "renditions": renditions}
+    _write_atomic(manifest_path, json.dumps(meta).encode("utf-8"))
+    return meta
+
+
+def srcset_fields(meta: Dict[str, Any], prefix: str = "image") -> Dict[str, Any]:
+    """
+    Item fields for a stored image: the largest JPEG as the default src,
+    plus a srcset per format for clients to pick a rendition.
+
+    prefix "image" -> imageSrcset / imageHash / imageWidth / imageHeight
+    """
+    srcset: Dict[str, str] = {}
+    for fmt in FORMATS:
+        candidates = [r for r in meta["renditions"] if r["format"] == fmt]
+        srcset[fmt] = ", ".join(f"{CDN_BASE_URL}/{r['filename']} {r['width']}w" for r in candidates)
+
+    largest = [r for r in meta["renditions"] if r["format"] == "jpeg"][-1]
+    return {
+        "url": f"{CDN_BASE_URL}/{largest['filename']}",
+        f"{prefix}Srcset": srcset,
+        f"{prefix}Hash": meta["hash"],
+        f"{prefix}Width": largest["width"],
+        f"{prefix}Height": largest["height"],
+    }
+
+
+def resolve_cdn_file(filename: str, root: str) -> Optional[Tuple[str, bool]]:
+    """
+    Local path for a /cdn/news/{filename} request, and whether it is
+    content-addressed (immutable). None for names that can't be served.
+    Flat legacy mirror files are still served from the root.
+    """
+    match = CONTENT_FILENAME_RE.match(filename)
+    if match:
+        return os.path.join(shard_dir(root, match.group(1)), filename), True
+    if LEGACY_FILENAME_RE.match(filename) and not filename.startswith("."):
+        return os.path.join(root, filename), False
+    return None
+
+
+def scan_mirror_files(root: str) -> Iterator[Dict[str, Any]]:
+    """
+    Walk the mirror directory: content-addressed files in the shard
+    directories, plus flat legacy files in the root.
+
+    Yields:
+        {"path", "filename", "hash" (None for legacy files), "bytes", "mtime"}
+    """
+    try:
+        top = list(os.scandir(root))
+    except FileNotFoundError:
+        return
+
+    for entry in top:
+        if entry.is_file(follow_symlinks=False):
+            if LEGACY_FILENAME_RE.match(entry.name) and not entry.name.startswith("."):
+                stat = entry.stat(follow_symlinks=False)
+                yield {"path": entry.path, "filename": entry.name, "hash": None,
+                       "bytes": stat.st_size, "mtime": stat.st_mtime}
+            continue
+        if not (entry.is_dir(follow_symlinks=False) and SHARD_NAME_RE.match(entry.name)):
+            continue
+        for sub in os.scandir(entry.path):
+            if not (sub.is_dir(follow_symlinks=False) and SHARD_NAME_RE.match(sub.name)):
+                continue
+            for file in os.scandir(sub.path):
+                match = STORED_FILENAME_RE.match(file.name)
+                if match and file.is_file(follow_symlinks=False):
+                    stat = file.stat(follow_symlinks=False)
+                    yield {"path": file.path, "filename": file.name, "hash": match.group(1),
+                           "bytes": stat.st_size, "mtime": stat.st_mtime}
@@ -0,0 +1,66 @@
+"""
+Off-loop Process Pool
+Async wrapper around a ProcessPoolExecutor for CPU-bound pipeline work
+(feed parsing, image optimization), so it doesn't block the event loop that
+serves API traffic.
+
+- One pool per run, opened as an async context manager
+- "spawn" workers: forking a process that runs an event loop and database
+  driver threads is unsafe. Workers import the target function's module
+  fresh, so those modules must not open connections at import time.
+- workers=0 runs everything in-process (tests, scripts); if the pool can't
+  start or breaks mid-run, work falls back to in-process
+"""
+
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ProcessPool:
+    """
+    Usage:
+        async with ProcessPool(workers=4, name="image optimize") as pool:
+            result = await pool.run(fn, *args, **kwargs)
+    """
+
+    def __init__(self, workers: int, name: str = "process pool"):
+        self.workers = workers
+        self.name = name
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    async def __aenter__(self) -> "ProcessPool":
+        if self.workers > 0:
+            try:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            except (OSError, NotImplementedError) as e:
+                logger.warning(f"{self.name} pool unavailable, running in-process: {e}")
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        if self._pool is not None:
+            # Don't block the loop while workers exit
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """fn(*args, **kwargs), on a worker process when the pool is running"""
+        if self._pool is None:
+            return fn(*args, **kwargs)
+
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._pool, partial(fn, *args, **kwargs))
+        except BrokenProcessPool:
+            logger.error(f"{self.name} pool died; running in-process for the rest of this run")
+            self._pool = None
+            return fn(*args, **kwargs)
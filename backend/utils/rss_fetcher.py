@@ -0,0 +1,108 @@
+"""
+Async RSS Fetcher
+Concurrent, non-blocking feed downloads for the RSS pipeline.
+
+- One aiohttp session per sync run
+- Global cap on in-flight requests (RSS_FETCH_CONCURRENCY) plus a per-host
+  cap (RSS_FETCH_PER_HOST) so several feeds on one publisher don't hammer it
+- Conditional requests: the caller passes the ETag / Last-Modified stored
+  from the previous fetch; an unchanged feed answers 304 and is not parsed
+"""
+
+import asyncio
+import os
+from collections import defaultdict
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+import aiohttp
+
+RSS_FETCH_CONCURRENCY = int(os.environ.get("RSS_FETCH_CONCURRENCY", "16"))
+RSS_FETCH_PER_HOST = int(os.environ.get("RSS_FETCH_PER_HOST", "2"))
+RSS_FETCH_TIMEOUT_SECONDS = float(os.environ.get("RSS_FETCH_TIMEOUT_SECONDS", "20"))
+
+USER_AGENT = "BANIBSFeedAgent/1.0"
+
+
+class FeedFetcher:
+    """
+    Shared session + concurrency limits for one batch of feed fetches.
+
+    Usage:
+        async with FeedFetcher() as fetcher:
+            result = await fetcher.fetch(url, {"etag": ..., "last_modified": ...})
+    """
+
+    def __init__(
+        self,
+        concurrency: int = RSS_FETCH_CONCURRENCY,
+        per_host: int = RSS_FETCH_PER_HOST,
+        timeout_seconds: float = RSS_FETCH_TIMEOUT_SECONDS
+    ):
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.timeout = aiohttp.ClientTimeout(total=timeout_seconds)
+        self._global = asyncio.Semaphore(concurrency)
+        self._hosts: Dict[str, asyncio.Semaphore] = defaultdict(lambda: asyncio.Semaphore(self.per_host))
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def __aenter__(self) -> "FeedFetcher":
+        self._session = aiohttp.ClientSession(
+            timeout=self.timeout,
+            headers={"User-Agent": USER_AGENT},
+            # Connection reuse is bounded by our own semaphores
+            connector=aiohttp.TCPConnector(limit=self.concurrency, limit_per_host=self.per_host)
+        )
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self._session.close()
+        self._session = None
+
+    async def fetch(self, url: str, validators: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        GET a feed, conditionally when validators are known.
+
+        Returns:
+            {
+                "url": str,
+                "status": int,
+                "not_modified": bool,   # True on 304; content is None
+                "content": bytes | None,
+                "etag": str | None,     # validators to store for next time
+                "last_modified": str | None
+            }
+
+        Raises aiohttp.ClientError / asyncio.TimeoutError on network errors
+        and aiohttp.ClientResponseError on non-2xx/304 statuses.
+        """
+        headers = {}
+        if validators:
+            if validators.get("etag"):
+                headers["If-None-Match"] = validators["etag"]
+            if validators.get("last_modified"):
+                headers["If-Modified-Since"] = validators["last_modified"]
+
+        host = urlparse(url).netloc.lower()
+        async with self._global, self._hosts[host]:
+            async with self._session.get(url, headers=headers) as resp:
+                if resp.status == 304:
+                    return {
+                        "url": url,
+                        "status": 304,
+                        "not_modified": True,
+                        "content": None,
+                        # Servers may refresh validators on a 304
+                        "etag": resp.headers.get("ETag") or (validators or {}).get("etag"),
+                        "last_modified": resp.headers.get("Last-Modified") or (validators or {}).get("last_modified"),
+                    }
+                resp.raise_for_status()
+                content = await resp.read()
+                return {
+                    "url": url,
+                    "status": resp.status,
+                    "not_modified": False,
+                    "content": content,
+                    "etag": resp.headers.get("ETag"),
+                    "last_modified": resp.headers.get("Last-Modified"),
+                }
@@ -1,176 +1,51 @@
 """
 RSS Feed Utilities
 Fetches, parses, and stores RSS feed items with deduplication
+
+Feeds are downloaded concurrently with utils/rss_fetcher.FeedFetcher
+(global + per-host limits, conditional requests) and parsed into documents
+in utils/feed_processing.FeedProcessor's worker processes;
+sync_feed_sources is the entry point for the scheduler and
+/api/news/rss-sync.
 """
 
-import feedparser
-import hashlib
+import asyncio
 import requests
+import time
+from contextlib import AsyncExitStack, nullcontext
 from datetime import datetime
-from typing import Dict, List, Optional
-from models.news import NewsItemDB
+from typing import Any, Callable, Dict, List, Optional
 from motor.motor_asyncio import AsyncIOMotorClient
 import os
-import re
-from email.utils import parsedate_to_datetime
+
+from db.rss_feed_state import get_feed_states, save_feed_validators, save_poll_schedules
+from db.rss_sources import save_source_health
+from services.news_clustering import BandLocks, assign_clusters, cluster_window_start, probe_keys
+from services.rss_poll_schedule import due_sources, plan_next_polls
+from services.rss_source_health import plan_source_health
+# Parsing and document shaping live in feed_processing so pool workers can
+# import them without a database connection
+from utils.feed_processing import (
+    FeedProcessor,
+    parse_feed_content,
+    prepare_feed_items,
+    process_feed_payload,
+)
+from utils.rss_fetcher import FeedFetcher
 
 # Database connection
 client = AsyncIOMotorClient(os.environ['MONGO_URL'])
 db = client[os.environ['DB_NAME']]
 news_collection = db.news_items
 
-def make_fingerprint(source_name: str, title: str) -> str:
-    """
-    Create a deterministic hash for deduplication
-    Format: SHA256(sourceName::title)
-    """
-    raw = f"{source_name}::{title}".encode("utf-8")
-    return hashlib.sha256(raw).hexdigest()
-
-import re
-from urllib.parse import urlparse
-
-IMG_TAG_REGEX = re.compile(r'<img[^>]+src=["\']([^"\']+)["\']', re.IGNORECASE)
-
-def _is_probably_image_url(url: str) -> bool:
-    """
-    Quick validation that a URL looks like an image.
-    Checks scheme, netloc, and common image extensions.
-    """
-    if not url:
-        return False
-    try:
-        parsed = urlparse(url)
-        if parsed.scheme not in ("http", "https") or not parsed.netloc:
-            return False
-        # Check common image extensions
-        path_lower = parsed.path.lower()
-        return any(path_lower.endswith(ext) for ext in [".jpg", ".jpeg", ".png", ".webp", ".gif", ".svg"])
-    except Exception:
-        return False
-
-def _extract_image(entry):
-    """
-    Phase 6.5.3 - Enhanced image extraction from RSS entry.
-    Priority:
-      1) media:content / media:thumbnail (RSS media namespace)
-      2) enclosure with image/* type (RSS 2.0)
-      3) <img> tag inside summary/content (HTML parsing)
-      4) (Future) OG image scraping from article URL (disabled for performance)
-    
-    Returns image URL or None if no valid image found.
-    """
-    # 1. media:content (WordPress, TechCrunch, many modern RSS feeds)
-    media_content = entry.get("media_content") or entry.get("media:content")
-    if isinstance(media_content, list) and media_content:
-        for m in media_content:
-            url = (m.get("url") or "").strip()
-            if _is_probably_image_url(url):
-                return url
-
-    # 2. media:thumbnail (common in YouTube, podcasts, etc.)
-    media_thumb = entry.get("media_thumbnail") or entry.get("media:thumbnail")
-    if isinstance(media_thumb, list) and media_thumb:
-        for t in media_thumb:
-            url = (t.get("url") or "").strip()
-            if _is_probably_image_url(url):
-                return url
-
-    # 3. enclosure or link of type image/* (RSS 2.0 standard)
-    enclosures = entry.get("enclosures") or entry.get("links") or []
-    for enc in enclosures:
-        enc_type = (enc.get("type") or "").lower()
-        url = (enc.get("href") or enc.get("url") or "").strip()
-        if enc_type.startswith("image/") and _is_probably_image_url(url):
-            return url
-
-    # 4. First <img> tag inside summary/content HTML (very common fallback)
-    html_candidates = []
-    
-    # Check summary
-    if "summary" in entry:
-        html_candidates.append(entry.get("summary") or "")
-    
-    # Check content (feedparser may return list of dicts or string)
-    if "content" in entry:
-        content_val = entry.get("content")
-        if isinstance(content_val, list) and content_val:
-            html_candidates.extend(c.get("value", "") for c in content_val)
-        elif isinstance(content_val, str):
-            html_candidates.append(content_val)
-    
-    # Check description as fallback
-    if "description" in entry:
-        html_candidates.append(entry.get("description") or "")
-    
-    # Parse HTML for <img> tags
-    for html in html_candidates:
-        if not html:
-            continue
-        for match in IMG_TAG_REGEX.findall(html):
-            url = match.strip()
-            if _is_probably_image_url(url):
-                return url
-
-    # 5. OPTIONAL: OG image scraping (disabled by default for performance)
-    # Could be enabled behind a feature flag in future:
-    # - Fetches article HTML and extracts og:image meta tag
-    # - Adds ~1-3 seconds per article, so guard with limits
-    # - Useful for sources that don't include images in RSS
-
-    # No valid image found
-    return None
-
-def _extract_published(entry):
-    for key in ["published", "pubDate", "updated"]:
-        if entry.get(key):
-            try:
-                return parsedate_to_datetime(entry[key])
-            except Exception:
-                pass
-    return datetime.utcnow()
-
-
 def parse_rss_feed(url: str):
     """
-    Fetch and normalize RSS/Atom feed at `url`.
-    Returns list of dictionaries compatible with NewsItem schema.
+    Fetch (blocking) and normalize RSS/Atom feed at `url`.
+    For scripts only; the async pipeline uses FeedFetcher + parse_feed_content.
     """
     resp = requests.get(url, headers={"User-Agent": "BANIBSFeedAgent/1.0"}, timeout=20)
     resp.raise_for_status()
-    feed = feedparser.parse(resp.content)
-
-    items = []
-    for entry in feed.entries:
-        title = entry.get("title", "").strip()
-        summary = entry.get("summary", "") or entry.get("description", "")
-        image = _extract_image(entry)
-        published = _extract_published(entry)
-        link = entry.get("link", "")
-
-        items.append({
-            "title": title,
-            "summary": summary.strip()[:500],
-            "imageUrl": image,
-            "publishedAt": published,
-            "sourceUrl": link,
-        })
-
-    return items
-
-def clean_html(text: str) -> str:
-    """Strip HTML tags and clean text"""
-    if not text:
-        return ""
-    # Remove HTML tags
-    text = re.sub(r'<[^<]+?>', '', text)
-    # Decode HTML entities
-    text = text.replace('&nbsp;', ' ').replace('&amp;', '&')
-    text = text.replace('&lt;', '<').replace('&gt;', '>')
-    text = text.replace('&quot;', '"').replace('&#39;', "'")
-    # Clean whitespace
-    text = re.sub(r'\s+', ' ', text).strip()
-    return text
+    return parse_feed_content(resp.content)
 
 async def fetch_and_store_feed(
     url: str, 
@@ -180,7 +55,8 @@ async def fetch_and_store_feed(
     fallback_image: Optional[str] = None, 
     region: Optional[str] = None,
     is_black_owned: bool = False,
-    is_black_focus: bool = False
+    is_black_focus: bool = False,
+    fetcher: Optional[FeedFetcher] = None
 ) -> int:
     """
     Fetch RSS feed and store items in database with deduplication
@@ -194,88 +70,142 @@ async def fetch_and_store_feed(
         region: Geographic region (Americas, Africa, Caribbean, etc.)
         is_black_owned: Whether the source is Black-owned/operated
         is_black_focus: Whether the source centers Black communities
+        fetcher: Shared FeedFetcher (a one-off session is opened if omitted)
     
     Returns:
         Number of new items stored
     """
     try:
-        # Use the new parse_rss_feed function
-        feed_items = parse_rss_feed(url)
-        
-        stored_count = 0
+        if fetcher is None:
+            async with FeedFetcher() as own_fetcher:
+                response = await own_fetcher.fetch(url)
+        else:
+            response = await fetcher.fetch(url)
+    except Exception as e:
+        print(f"Error fetching RSS feed {source_name}: {str(e)}")
+        raise
+    
+    stats = await store_feed_items(
+        parse_feed_content(response["content"]),
+        url=url,
+        category=category,
+        source_name=source_name,
+        limit=limit,
+        fallback_image=fallback_image,
+        region=region,
+        is_black_owned=is_black_owned,
+        is_black_focus=is_black_focus
+    )
+    return stats["inserted"]
+
+
+async def store_feed_items(
+    feed_items: List[Dict[str, Any]],
+    url: str,
+    category: str,
+    source_name: str,
+    limit: int = 5,
+    fallback_image: Optional[str] = None,
+    region: Optional[str] = None,
+    is_black_owned: bool = False,
+    is_black_focus: bool = False
+) -> Dict[str, int]:
+    """
+    Store parsed feed items (parse_feed_content output) with deduplication,
+    preparing the documents in-process.
+    
+    Returns:
+        {"inserted": n, "duplicates": n, "errors": n}
+    """
+    prepared = prepare_feed_items(
+        feed_items,
+        url=url,
+        category=category,
+        source_name=source_name,
+        limit=limit,
+        fallback_image=fallback_image,
+        region=region,
+        is_black_owned=is_black_owned,
+        is_black_focus=is_black_focus
+    )
+    return await store_news_docs(prepared, source_name)
+
+
+async def store_news_docs(
+    prepared: Dict[str, Any],
+    source_name: str,
+    cluster_locks: Optional[BandLocks] = None
+) -> Dict[str, int]:
+    """
+    Insert prepared documents (prepare_feed_items output) that aren't stored yet.
+    
+    One query resolves all fingerprints and finds near-duplicate candidates
+    (items stored in the cluster window matching a SimHash band probe), and
+    the new items are written with one unordered insert_many. The unique
+    fingerprint index rejects anything a concurrent run inserted in between;
+    those count as duplicates, not errors.
+    
+    New items get a cluster_id (services/news_clustering). Sources synced
+    together share cluster_locks: a store whose items probe the same band
+    keys as another's waits for it, so its lookup sees what the other
+    inserted; unrelated stores don't wait.
+    
+    Returns:
+        {"inserted": n, "duplicates": n, "errors": n}
+    """
+    from pymongo.errors import BulkWriteError
+    
+    stats = {"inserted": 0, "duplicates": prepared["duplicates"], "errors": prepared["errors"]}
+    
+    try:
+        if not prepared["docs"]:
+            return stats
         
-        # Process entries (limit to most recent)
-        for item in feed_items[:limit]:
-            title = item.get('title', '').strip()
-            if not title:
-                continue  # Skip entries without titles
-            
-            # Generate fingerprint for deduplication
-            fingerprint = make_fingerprint(source_name, title)
-            
-            # Check if item already exists
-            existing = await news_collection.find_one({"fingerprint": fingerprint})
-            if existing:
-                continue  # Skip duplicates
+        bands = sorted({
+            key for doc in prepared["docs"] if doc.get("simhash") is not None for key in probe_keys(doc["simhash"])
+        })
+        async with cluster_locks.hold(bands) if cluster_locks else nullcontext():
+            # One query for every fingerprint already stored + cluster candidates
+            since = cluster_window_start(datetime.utcnow())
+            lookup = [{"fingerprint": {"$in": [doc["fingerprint"] for doc in prepared["docs"]]}}]
+            if bands:
+                lookup.append({"simhash_bands": {"$in": bands}, "createdAt": {"$gte": since}})
+            existing = await news_collection.find(
+                {"$or": lookup},
+                {"_id": 0, "id": 1, "fingerprint": 1, "simhash": 1, "cluster_id": 1, "createdAt": 1}
+            ).to_list(length=None)
+            stored = {doc.get("fingerprint") for doc in existing}
+            docs = [doc for doc in prepared["docs"] if doc["fingerprint"] not in stored]
+            stats["duplicates"] += len(prepared["docs"]) - len(docs)
             
-            # Get image URL or use fallback
-            image_url = item.get("imageUrl")
-            if not image_url and fallback_image:
-                image_url = fallback_image
+            if not docs:
+                return stats
             
-            # Clean and limit summary
-            summary = item.get('summary', '')
-            summary = clean_html(summary) if summary else f"Read more on {source_name}"
-            summary = summary[:500]  # Limit to 500 chars
+            assign_clusters(docs, [doc for doc in existing if doc.get("createdAt") and doc["createdAt"] >= since])
             
-            # Phase 6.3: Analyze sentiment (fail gracefully if error)
-            sentiment_score = 0.0
-            sentiment_label = "neutral"
-            sentiment_at = None
+            # Store in database; unordered so one rejected item doesn't stop the rest
+            failed = set()
             try:
-                from services.sentiment_service import analyze_text_sentiment
-                text_for_sentiment = f"{title} {summary}"
-                sentiment_result = analyze_text_sentiment(text_for_sentiment)
-                sentiment_score = sentiment_result["score"]
-                sentiment_label = sentiment_result["label"]
-                sentiment_at = sentiment_result["analyzed_at"]
-            except Exception as sentiment_error:
-                print(f"Sentiment analysis failed for {title[:50]}: {sentiment_error}")
-                # Continue without sentiment - don't break RSS sync
-            
-            # Create news item
-            news_item = NewsItemDB(
-                title=title[:200],  # Limit title length
-                summary=summary,
-                category=category,
-                region=region,  # Geographic region from RSS source config
-                imageUrl=image_url,
-                publishedAt=item.get('publishedAt') or datetime.utcnow(),
-                sourceUrl=item.get('sourceUrl', url),
-                sourceName=source_name,
-                isFeatured=False,
-                external=True,  # RSS content is external
-                fingerprint=fingerprint
-            )
-            
-            # Convert to dict and add sentiment fields
-            news_dict = news_item.dict()
-            news_dict["sentiment_score"] = sentiment_score
-            news_dict["sentiment_label"] = sentiment_label
-            news_dict["sentiment_at"] = sentiment_at
-            
-            # Apply Black News tagging
-            from services.black_news_tagging_service import tag_black_news_item
-            news_dict = tag_black_news_item(
-                news_dict,
-                source_is_black_owned=is_black_owned,
-                source_is_black_focus=is_black_focus,
-                source_category=category
-            )
-            
-            # Store in database
-            await news_collection.insert_one(news_dict)
-            stored_count += 1
+                await news_collection.insert_many(docs, ordered=False)
+            except BulkWriteError as bulk_error:
+                for write_error in (bulk_error.details or {}).get("writeErrors", []):
+                    failed.add(write_error["index"])
+                    if write_error.get("code") == 11000:
+                        stats["duplicates"] += 1
+                    else:
+                        stats["errors"] += 1
+                        print(f"Insert failed for RSS item from {source_name}: {write_error.get('errmsg')}")
+        
+        inserted = [doc for index, doc in enumerate(docs) if index not in failed]
+        stats["inserted"] = len(inserted)
+        
+        for news_dict in inserted:
+            # Keep the in-memory trending leaderboards current between refreshes
+            try:
+                from services.trending_service import trending_index
+                trending_index.add_item(news_dict)
+            except Exception as trending_error:
+                print(f"Trending index update failed for {news_dict['title'][:50]}: {trending_error}")
             
             # Phase 6.4: Route to moderation if needed (fail gracefully if error)
             try:
@@ -283,16 +213,191 @@ async def fetch_and_store_feed(
                 await handle_content_moderation(
                     content_id=news_dict["id"],
                     content_type="news",
-                    title=title[:200],
-                    sentiment_label=sentiment_label,
-                    sentiment_score=sentiment_score
+                    title=news_dict["title"],
+                    sentiment_label=news_dict["sentiment_label"],
+                    sentiment_score=news_dict["sentiment_score"]
                 )
             except Exception as mod_error:
-                print(f"Moderation routing failed for {title[:50]}: {mod_error}")
+                print(f"Moderation routing failed for {news_dict['title'][:50]}: {mod_error}")
                 # Continue without moderation - don't break RSS sync
         
-        return stored_count
+        return stats
     
     except Exception as e:
-        print(f"Error fetching RSS feed {source_name}: {str(e)}")
+        print(f"Error storing RSS feed {source_name}: {str(e)}")
         raise
+
+
+async def sync_feed_source(
+    fetcher: FeedFetcher,
+    source: Dict[str, Any],
+    validators: Optional[Dict[str, Any]] = None,
+    limit: int = 5,
+    fallback_image: Optional[str] = None,
+    processor: Optional[FeedProcessor] = None,
+    cluster_locks: Optional[BandLocks] = None
+) -> Dict[str, Any]:
+    """
+    Conditionally fetch one configured source and store its new items.
+    A 304 short-circuits parsing and storage. Parsing runs on the
+    processor's worker processes (in-process if omitted); cluster_locks is
+    passed to store_news_docs.
+    
+    Returns the per-source result used by /api/news/rss-sync, with
+    items_added / duplicates / errors from store_news_docs, http_status,
+    bytes, items_parsed and per-stage "timings" (fetch, parse, prepare,
+    sentiment and store seconds, for the stages that ran). "feed_state"
+    carries the validators to persist (absent on failure, so the next run
+    refetches unconditionally).
+    """
+    result = {
+        "source": source["source_name"],
+        "category": source["category"],
+        "region": source.get("region", "Unknown"),
+    }
+    timings = result["timings"] = {}
+    try:
+        started = time.perf_counter()
+        response = await fetcher.fetch(source["rss_url"], validators)
+        timings["fetch_seconds"] = time.perf_counter() - started
+        result["http_status"] = response["status"]
+        result["bytes"] = len(response["content"] or b"")
+        if response["not_modified"]:
+            stats = {"inserted": 0, "duplicates": 0, "errors": 0}
+            result["status"] = "not_modified"
+        else:
+            options = {
+                "url": source["rss_url"],
+                "category": source["category"],
+                "source_name": source["source_name"],
+                "limit": limit,
+                "fallback_image": fallback_image,
+                "region": source.get("region"),
+                "is_black_owned": source.get("is_black_owned", False),
+                "is_black_focus": source.get("is_black_focus", False),
+            }
+            if processor is None:
+                prepared = process_feed_payload(response["content"], **options)
+            else:
+                prepared = await processor.process(response["content"], **options)
+            timings.update(prepared["timings"])
+            started = time.perf_counter()
+            stats = await store_news_docs(prepared, source["source_name"], cluster_locks)
+            timings["store_seconds"] = time.perf_counter() - started
+            result["status"] = "success"
+            result["items_parsed"] = prepared["items_parsed"]
+            result["publish_interval_seconds"] = prepared["publish_interval_seconds"]
+        result["items_added"] = stats["inserted"]
+        result["duplicates"] = stats["duplicates"]
+        result["errors"] = stats["errors"]
+        result["feed_state"] = {
+            "url": source["rss_url"],
+            "etag": response["etag"],
+            "last_modified": response["last_modified"],
+            "status": response["status"],
+        }
+    except Exception as e:
+        result["status"] = "failed"
+        result["error"] = str(e) or type(e).__name__
+        if getattr(e, "status", None):
+            result["http_status"] = e.status  # aiohttp.ClientResponseError
+    return result
+
+
+async def sync_feed_sources(
+    sources: List[Dict[str, Any]],
+    limit: int = 5,
+    fallback_image_for: Optional[Callable[[Dict[str, Any]], Optional[str]]] = None,
+    fetcher: Optional[FeedFetcher] = None,
+    processor: Optional[FeedProcessor] = None,
+    feed_states: Optional[Dict[str, Dict[str, Any]]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Fetch and store all sources concurrently (bounded by the fetcher's
+    global / per-host limits), sending each feed's stored ETag /
+    Last-Modified and saving the new ones afterwards. Downloaded feeds are
+    parsed in the processor's worker processes. Every source's next poll
+    time is recorded from the outcome (see sync_due_feed_sources), and
+    registered sources' health / quarantine state is updated
+    (services/rss_source_health).
+    
+    Args:
+        sources: Registry sources (db/rss_sources) or RSS_SOURCES entries
+        limit: Items stored per source
+        fallback_image_for: source -> fallback image URL
+        fetcher: Shared FeedFetcher (one is opened for the run if omitted)
+        processor: Shared FeedProcessor (one is opened for the run if omitted)
+        feed_states: rss_feed_state docs by URL, if the caller already loaded them
+    
+    Returns:
+        One result dict per source, in input order, including next_poll_at
+    """
+    if feed_states is None:
+        feed_states = await get_feed_states([source["rss_url"] for source in sources])
+    
+    async def _run(active_fetcher: FeedFetcher, active_processor: FeedProcessor) -> List[Dict[str, Any]]:
+        # Syndicated copies of one story often arrive in the same run
+        cluster_locks = BandLocks()
+        return await asyncio.gather(*[
+            sync_feed_source(
+                active_fetcher,
+                source,
+                feed_states.get(source["rss_url"]),
+                limit=limit,
+                fallback_image=fallback_image_for(source) if fallback_image_for else None,
+                processor=active_processor,
+                cluster_locks=cluster_locks
+            )
+            for source in sources
+        ])
+    
+    async with AsyncExitStack() as stack:
+        if fetcher is None:
+            fetcher = await stack.enter_async_context(FeedFetcher())
+        if processor is None:
+            processor = await stack.enter_async_context(FeedProcessor())
+        results = await _run(fetcher, processor)
+    
+    await save_feed_validators([result.pop("feed_state") for result in results if "feed_state" in result])
+    
+    schedules = plan_next_polls(sources, results, feed_states)
+    await save_poll_schedules(schedules)
+    for result, schedule in zip(results, schedules):
+        result["next_poll_at"] = schedule["next_poll_at"]
+    
+    health = {update["id"]: update for update in plan_source_health(sources, results)}
+    await save_source_health(list(health.values()))
+    for source, result in zip(sources, results):
+        if source.get("id") in health:
+            result["quarantined"] = health[source["id"]]["quarantine"]["active"]
+    return results
+
+
+async def sync_due_feed_sources(
+    sources: List[Dict[str, Any]],
+    limit: int = 5,
+    fallback_image_for: Optional[Callable[[Dict[str, Any]], Optional[str]]] = None,
+    now: Optional[datetime] = None,
+    probes: Optional[List[Dict[str, Any]]] = None
+) -> List[Dict[str, Any]]:
+    """
+    sync_feed_sources for the sources whose next poll time has passed
+    (services/rss_poll_schedule); the scheduler ticks often and calls this.
+    `probes` (quarantined sources due a probe) are synced regardless of
+    their poll schedule.
+    
+    Returns:
+        One result dict per due source and probe (empty when nothing is due)
+    """
+    probes = probes or []
+    feed_states = await get_feed_states([source["rss_url"] for source in sources + probes])
+    due = due_sources(sources, feed_states, now) + probes
+    if not due:
+        return []
+    return await sync_feed_sources(
+        due,
+        limit=limit,
+        fallback_image_for=fallback_image_for,
+        feed_states=feed_states
+    )
+
@@ -0,0 +1,189 @@
+"""
+Snapshot Cache - Public News Endpoints
+Pre-serialized JSON snapshots for anonymous endpoints whose payload is the
+same for every visitor and only changes when the RSS pipeline (or an editor)
+changes news_items.
+
+- Entries are keyed by endpoint + params and hold the final response bytes,
+  so a hit skips Mongo, Pydantic validation and JSON encoding.
+- Stale-while-revalidate: an expired (or invalidated) entry is still served
+  while exactly one background rebuild runs for that key.
+- Single-flight: concurrent misses for the same key share one build.
+- Conditional GET: each entry carries a strong ETag (hash of its bytes) and
+  the time its bytes last changed, so If-None-Match / If-Modified-Since are
+  answered with a 304 straight from the cache.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional
+from urllib.parse import urlencode
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from utils.conditional_get import is_not_modified, not_modified_response, set_validators
+
+logger = logging.getLogger(__name__)
+
+NEWS_SNAPSHOT_TTL_SECONDS = float(os.environ.get("NEWS_SNAPSHOT_TTL_SECONDS", "300"))
+NEWS_SNAPSHOT_MAX_ENTRIES = int(os.environ.get("NEWS_SNAPSHOT_MAX_ENTRIES", "512"))
+
+
+def snapshot_key(endpoint: str, **params) -> str:
+    """Stable cache key: endpoint plus its non-None params in sorted order"""
+    query = urlencode(sorted((k, v) for k, v in params.items() if v is not None))
+    return f"{endpoint}?{query}" if query else endpoint
+
+
+def serialize_payload(payload: Any) -> bytes:
+    """Encode exactly as FastAPI's default JSONResponse would"""
+    return JSONResponse(content=jsonable_encoder(payload)).body
+
+
+class SnapshotCache:
+    """
+    In-process LRU of serialized responses with stale-while-revalidate.
+
+    invalidate() bumps a generation counter instead of dropping entries, so
+    the first request after a pipeline run still gets an instant (stale)
+    answer and triggers the rebuild. clear() (editorial removals) also
+    discards builds already running, so nothing read before it is served.
+    """
+
+    def __init__(self, ttl_seconds: float = NEWS_SNAPSHOT_TTL_SECONDS, max_entries: int = NEWS_SNAPSHOT_MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._generation = 0
+        self._cleared = 0  # bumped by clear(); builds started before it aren't stored
+        self.stats = {"hits": 0, "stale_hits": 0, "misses": 0, "builds": 0, "errors": 0, "not_modified": 0}
+
+    def _is_fresh(self, entry: Dict[str, Any]) -> bool:
+        return (
+            entry["generation"] == self._generation
+            and time.monotonic() - entry["built_at"] < self.ttl_seconds
+        )
+
+    async def _build(self, key: str, builder: Callable[[], Awaitable[Any]]) -> Dict[str, Any]:
+        generation, cleared = self._generation, self._cleared
+        body = serialize_payload(await builder())
+        self.stats["builds"] += 1
+
+        etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        previous = self._entries.get(key)
+        # A rebuild that produced the same bytes keeps its Last-Modified, so
+        # If-Modified-Since clients stay current across TTL refreshes
+        if previous is not None and previous["etag"] == etag:
+            last_modified = previous["last_modified"]
+        else:
+            last_modified = datetime.now(timezone.utc)
+
+        entry = {
+            "body": body,
+            "etag": etag,
+            "last_modified": last_modified,
+            "built_at": time.monotonic(),
+            "generation": generation,
+        }
+        if cleared != self._cleared:
+            # Read before a clear(): only the requests already waiting get it
+            return entry
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+    def _start_build(self, key: str, builder: Callable[[], Awaitable[Any]]) -> asyncio.Future:
+        """Return the in-flight build for key, starting one if none is running"""
+        task = self._inflight.get(key)
+        if task is not None:
+            return task
+
+        task = asyncio.ensure_future(self._build(key, builder))
+        self._inflight[key] = task
+
+        def _done(t):
+            if self._inflight.get(key) is t:
+                del self._inflight[key]
+            if not t.cancelled() and t.exception() is not None:
+                self.stats["errors"] += 1
+                logger.warning(f"Snapshot build failed for {key}: {t.exception()}")
+
+        task.add_done_callback(_done)
+        return task
+
+    async def get_entry(self, key: str, builder: Callable[[], Awaitable[Any]]) -> Dict[str, Any]:
+        """
+        Snapshot entry for key: body, etag and last_modified.
+
+        builder is an async callable returning the JSON-able payload; its
+        exceptions (e.g. HTTPException for bad params) propagate on a miss
+        and are never cached.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            if self._is_fresh(entry):
+                self.stats["hits"] += 1
+            else:
+                self.stats["stale_hits"] += 1
+                self._start_build(key, builder)
+            return entry
+
+        self.stats["misses"] += 1
+        # Shielded so a disconnecting client doesn't cancel the shared build
+        return await asyncio.shield(self._start_build(key, builder))
+
+    async def get(self, key: str, builder: Callable[[], Awaitable[Any]]) -> bytes:
+        """Serialized payload for key (see get_entry)"""
+        return (await self.get_entry(key, builder))["body"]
+
+    async def response(
+        self,
+        key: str,
+        builder: Callable[[], Awaitable[Any]],
+        request: Optional[Request] = None
+    ) -> Response:
+        """
+        get() wrapped as a ready-to-send JSON response with validators.
+
+        When request carries a matching If-None-Match / If-Modified-Since the
+        answer is an empty 304 instead.
+        """
+        entry = await self.get_entry(key, builder)
+        if request is not None and is_not_modified(request, entry["etag"], entry["last_modified"]):
+            self.stats["not_modified"] += 1
+            return not_modified_response(entry["etag"], entry["last_modified"])
+
+        response = Response(content=entry["body"], media_type="application/json")
+        set_validators(response, entry["etag"], entry["last_modified"])
+        return response
+
+    def invalidate(self) -> None:
+        """Mark every snapshot stale; each is rebuilt on its next request"""
+        self._generation += 1
+
+    def clear(self) -> None:
+        """
+        Drop every snapshot (next requests rebuild synchronously). Builds
+        already running may have read the removed data: they are neither
+        stored nor joined by later requests.
+        """
+        self._generation += 1
+        self._cleared += 1
+        self._entries.clear()
+        self._inflight.clear()
+
+
+# Shared by the public /api/news endpoints; invalidated by the RSS pipeline
+# and by editorial changes
+news_snapshot_cache = SnapshotCache()